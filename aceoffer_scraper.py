@@ -22,6 +22,9 @@ from datetime import datetime
 from typing import List, Dict, Optional
 import pandas as pd
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from selector_cache import get_selector_cache
+from stage_metrics import get_metrics, timed, instrument_page
+from stop_conditions import StopCondition
 
 # ==================== 配置区域 ====================
 
@@ -49,11 +52,16 @@ MAX_TOTAL_ITEMS = 100  # 只抓取前100个岗位
 # 是否启用日期过滤（网申截止的岗位通常不需要日期过滤）
 ONLY_TODAY_UPDATED = False  # 设置为 True 时启用日期过滤，False 表示抓取所有
 
+# "网申截止倒计时"列表是否按更新时间倒序排列（按截止时间排序时为 False，
+# 此时早于水位线的岗位也可能从未抓取过，只按已知链接判断提前停止）
+LIST_SORTED_BY_UPDATE = False
+
 # 日期过滤天数（只抓取最近N天更新的岗位）
 DATE_FILTER_DAYS = 2  # 设置为 1 表示只抓取今天，设置为 2 表示抓取最近2天，以此类推
 
-# 连续空页数阈值（当启用日期过滤时，如果连续N页没有目标日期范围内的岗位，则停止翻页）
-CONSECUTIVE_EMPTY_PAGES_THRESHOLD = 2  # 连续2页没有目标日期范围内的岗位就停止
+# 连续空页数阈值（连续N页没有新岗位则停止翻页：岗位已在上次的结果文件中、早于水位线，
+# 或启用日期过滤时不在目标日期范围内；判断规则见 stop_conditions.py）
+CONSECUTIVE_EMPTY_PAGES_THRESHOLD = 2  # 连续2页没有新岗位就停止
 
 # Excel文件路径（覆盖更新）
 EXCEL_FILE_PATH = "网申截止倒计时公司名单.xlsx"  # 固定文件名，用于覆盖更新
@@ -175,7 +183,13 @@ class AceOfferRecruitScraper:
         self.browser = None
         self.context = None
         self.page = None
+        self.selector_cache = get_selector_cache()
+        self.metrics = get_metrics('aceoffer')
+        self.stop_condition: Optional[StopCondition] = None  # 翻页提前终止（scrape_all_pages 中创建）
+        self.previous_results: List[Dict] = []  # 上次覆盖更新保存的岗位
+        self.known_links: set = set()
         
+    @timed('aceoffer', 'sleep')
     async def random_wait(self, min_seconds: float = None, max_seconds: float = None):
         """随机等待，模拟人类操作"""
         min_sec = min_seconds or RANDOM_WAIT_MIN
@@ -232,6 +246,8 @@ class AceOfferRecruitScraper:
             self.page = pages[0]
         else:
             self.page = await self.browser.new_page()
+        # 页面导航、等待和选择器查询的耗时计入分阶段统计
+        self.page = instrument_page(self.page, self.metrics)
             
         print("✓ 浏览器启动成功！")
         await self.random_wait(2, 4)
@@ -307,6 +323,7 @@ class AceOfferRecruitScraper:
             print(f"  ⚠ 点击'网申截止倒计时'标签时出错: {str(e)}")
             return False
             
+    @timed('aceoffer', 'wait')
     async def wait_for_list_loaded(self):
         """等待招聘列表加载完成"""
         print("\n等待招聘列表加载...")
@@ -340,22 +357,30 @@ class AceOfferRecruitScraper:
         except Exception as e:
             print(f"⚠ 等待列表时出错: {str(e)}")
             
-    async def extract_text_with_selectors(self, element, selectors: list, default: str = "") -> str:
-        """尝试多个选择器提取文本"""
-        for selector in selectors:
+    async def extract_text_with_selectors(self, element, selectors: list, default: str = "",
+                                          field: Optional[str] = None) -> str:
+        """尝试多个选择器提取文本（指定 field 时使用选择器缓存，上次成功的选择器优先）"""
+        ordered = self.selector_cache.ordered('aceoffer', 'recruit', field, selectors) if field else selectors
+        for selector in ordered:
             try:
                 sub_element = await element.query_selector(selector)
                 if sub_element:
                     text = await sub_element.inner_text()
                     if text and text.strip():
+                        if field:
+                            self.selector_cache.record('aceoffer', 'recruit', field, selectors, selector)
                         return text.strip()
             except Exception:
                 continue
+        if field:
+            self.selector_cache.record('aceoffer', 'recruit', field, selectors, None)
         return default
         
-    async def extract_all_text_with_selectors(self, element, selectors: list, separator: str = ", ") -> str:
-        """尝试多个选择器提取所有匹配元素的文本"""
-        for selector in selectors:
+    async def extract_all_text_with_selectors(self, element, selectors: list, separator: str = ", ",
+                                              field: Optional[str] = None) -> str:
+        """尝试多个选择器提取所有匹配元素的文本（指定 field 时使用选择器缓存）"""
+        ordered = self.selector_cache.ordered('aceoffer', 'recruit', field, selectors) if field else selectors
+        for selector in ordered:
             try:
                 elements = await element.query_selector_all(selector)
                 if elements:
@@ -365,9 +390,13 @@ class AceOfferRecruitScraper:
                         if text and text.strip():
                             texts.append(text.strip())
                     if texts:
+                        if field:
+                            self.selector_cache.record('aceoffer', 'recruit', field, selectors, selector)
                         return separator.join(texts)
             except Exception:
                 continue
+        if field:
+            self.selector_cache.record('aceoffer', 'recruit', field, selectors, None)
         return ""
         
     def extract_keywords_from_text(self, text: str, keywords: list) -> str:
@@ -386,6 +415,7 @@ class AceOfferRecruitScraper:
         """从多个元素中提取文本并合并（兼容旧接口）"""
         return await self.extract_all_text_with_selectors(element, [selector], separator)
         
+    @timed('aceoffer', 'extract')
     async def extract_job_info_from_card(self, card_element) -> Dict:
         """从单个招聘卡片中提取基础信息"""
         job_info = {
@@ -406,7 +436,7 @@ class AceOfferRecruitScraper:
             
             # 提取公司名称（优先从标题元素提取）
             job_info['公司名称'] = await self.extract_text_with_selectors(
-                card_element, COMPANY_NAME_SELECTORS
+                card_element, COMPANY_NAME_SELECTORS, field='company_name'
             )
             
             # 如果没找到，尝试从卡片文本中提取
@@ -463,7 +493,7 @@ class AceOfferRecruitScraper:
             
             # 提取工作地点（尝试多个选择器）
             job_info['工作地点'] = await self.extract_all_text_with_selectors(
-                card_element, LOCATION_SELECTORS, " "
+                card_element, LOCATION_SELECTORS, " ", field='location'
             )
             # 如果没找到，尝试从文本中提取（常见城市名）
             if not job_info['工作地点'] and card_text:
@@ -502,6 +532,7 @@ class AceOfferRecruitScraper:
             
         return job_info
         
+    @timed('aceoffer', 'apply_link')
     async def get_apply_link(self, card_element, job_info: Dict, seen_links: set) -> tuple:
         """点击"立即投递"按钮，获取真实投递链接并提取完整信息
         
@@ -673,6 +704,7 @@ class AceOfferRecruitScraper:
         
         return extracted_info
         
+    @timed('aceoffer', 'card_locate')
     async def scrape_current_page(self) -> int:
         """抓取当前页的所有招聘信息"""
         print("\n" + "-"*60)
@@ -717,7 +749,8 @@ class AceOfferRecruitScraper:
             # 如果XPath方法失败，尝试其他选择器
             if not cards:
                 print("尝试使用其他选择器...")
-                for selector in JOB_CARD_SELECTORS:
+                card_selector = None
+                for selector in self.selector_cache.ordered('aceoffer', 'recruit', 'job_card', JOB_CARD_SELECTORS):
                     try:
                         cards = await self.page.query_selector_all(selector)
                         if cards and len(cards) > 0:
@@ -732,10 +765,12 @@ class AceOfferRecruitScraper:
                                     pass
                             if filtered_cards:
                                 cards = filtered_cards
+                                card_selector = selector
                                 print(f"✓ 使用选择器 '{selector}' 找到 {len(cards)} 个有效的招聘卡片")
                                 break
                     except Exception:
                         continue
+                self.selector_cache.record('aceoffer', 'recruit', 'job_card', JOB_CARD_SELECTORS, card_selector)
                 
                 # 如果还是没找到，尝试通过"立即投递"按钮的父元素来定位卡片
                 if not cards and apply_buttons:
@@ -876,6 +911,8 @@ class AceOfferRecruitScraper:
                     update_time = job_info.get('更新时间', '')
                     if not self.is_recent_days_updated(update_time, days=DATE_FILTER_DAYS):
                         print(f"  ⚠ 跳过：不在最近{DATE_FILTER_DAYS}天内的岗位（更新时间: {update_time or '无'}）")
+                        if self.observe_stop(update_time, stale=True):
+                            break
                         continue
                 
                 # 获取投递链接并提取完整信息
@@ -884,6 +921,8 @@ class AceOfferRecruitScraper:
                 # 检查链接是否已处理过（去重）
                 if apply_link and apply_link in seen_links:
                     print(f"  ⚠ 跳过：链接已处理过（重复）")
+                    if self.observe_stop(job_info.get('更新时间', ''), known=True):
+                        break
                     continue
                 
                 # 更新信息：优先使用从链接页面提取的信息，如果为空则使用卡片信息
@@ -923,6 +962,10 @@ class AceOfferRecruitScraper:
                     print(f"\n⚠ 已达到最大抓取数量限制 ({MAX_TOTAL_ITEMS})，停止抓取")
                     return len(self.results)
                 
+                # 连续出现上次已保存或过期的岗位时停止
+                if self.observe_stop(job_info['更新时间'], known=bool(apply_link) and apply_link in self.known_links):
+                    break
+                
                 # 短暂等待，避免请求过快
                 await asyncio.sleep(0.3)
                 
@@ -955,6 +998,7 @@ class AceOfferRecruitScraper:
         except Exception:
             return False
             
+    @timed('aceoffer', 'pagination')
     async def go_to_next_page(self) -> bool:
         """点击下一页按钮"""
         try:
@@ -1027,12 +1071,38 @@ class AceOfferRecruitScraper:
         """检查更新日期是否为今天（兼容旧方法）"""
         return self.is_recent_days_updated(update_date_str, days=1)
     
+    def observe_stop(self, update_time: str, known: bool = False, stale: Optional[bool] = None) -> bool:
+        """记录一条岗位到翻页提前终止判断，返回是否停止（不在 scrape_all_pages 中时不判断）"""
+        return bool(self.stop_condition and self.stop_condition.observe(update_time, known, stale))
+    
+    def load_previous_results(self):
+        """读取上次覆盖更新保存的岗位，其中的链接视为已抓取过"""
+        import os
+        
+        if not os.path.exists(EXCEL_FILE_PATH):
+            return
+        try:
+            df = pd.read_excel(EXCEL_FILE_PATH, dtype=str).fillna('')
+        except Exception as e:
+            print(f"⚠ 读取上次结果失败: {str(e)[:50]}")
+            return
+        self.previous_results = df.to_dict('records')
+        self.known_links = {r.get('相关链接', '') for r in self.previous_results} - {''}
+        print(f"✓ 上次结果: {len(self.previous_results)} 条岗位，{len(self.known_links)} 个链接")
+    
     async def scrape_all_pages(self):
         """抓取所有页面的招聘信息"""
         page_num = 1
         today_updated_count = 0
         skipped_count = 0
-        consecutive_empty_pages = 0  # 连续没有当天更新岗位的页数
+        # 已抓取过或过期的岗位连续出现时提前停止翻页
+        self.stop_condition = StopCondition(
+            'aceoffer', max_pages=MAX_PAGES,
+            freshness_days=DATE_FILTER_DAYS if ONLY_TODAY_UPDATED else None,
+            exhausted_pages=CONSECUTIVE_EMPTY_PAGES_THRESHOLD,
+            sorted_by_date=LIST_SORTED_BY_UPDATE)
+        # 是否已翻到最后一页（因数量或页数上限截断时不更新水位线）
+        reached_end = False
         
         if MAX_TOTAL_ITEMS:
             print(f"\n{'='*60}")
@@ -1042,7 +1112,7 @@ class AceOfferRecruitScraper:
         if ONLY_TODAY_UPDATED:
             print(f"\n{'='*60}")
             print(f"⚠ 日期过滤模式：只抓取最近 {DATE_FILTER_DAYS} 天更新的岗位")
-            print(f"⚠ 智能翻页：连续 {CONSECUTIVE_EMPTY_PAGES_THRESHOLD} 页没有目标日期范围内的岗位将自动停止")
+            print(f"⚠ 智能翻页：连续 {CONSECUTIVE_EMPTY_PAGES_THRESHOLD} 页没有新岗位（已抓取过或不在最近{DATE_FILTER_DAYS}天）将自动停止")
             print(f"{'='*60}\n")
         
         while True:
@@ -1070,19 +1140,16 @@ class AceOfferRecruitScraper:
                     print(f"  当前页最近{DATE_FILTER_DAYS}天更新的岗位: {today_added_this_page} 条")
                     today_updated_count = today_count_after
                     skipped_count = len(self.results) - today_updated_count
-                    consecutive_empty_pages = 0  # 重置连续空页计数
                 else:
-                    consecutive_empty_pages += 1
-                    print(f"  当前页没有最近{DATE_FILTER_DAYS}天更新的岗位（连续 {consecutive_empty_pages} 页）")
-                    
-                    # 如果连续N页都没有目标日期范围内的岗位，停止翻页
-                    if consecutive_empty_pages >= CONSECUTIVE_EMPTY_PAGES_THRESHOLD:
-                        print(f"\n⚠ 连续 {consecutive_empty_pages} 页没有最近{DATE_FILTER_DAYS}天更新的岗位，停止翻页")
-                        break
+                    print(f"  当前页没有最近{DATE_FILTER_DAYS}天更新的岗位")
             else:
                 # 未启用日期过滤时，正常统计
                 today_updated_count = len(self.results)
             
+            # 连续出现已抓取过或过期的岗位，或连续N页没有新岗位，停止翻页
+            if self.stop_condition.end_page():
+                break
+            
             # 检查是否达到最大抓取数量
             if MAX_TOTAL_ITEMS and len(self.results) >= MAX_TOTAL_ITEMS:
                 print(f"\n已达到最大抓取数量限制 ({MAX_TOTAL_ITEMS})，停止抓取")
@@ -1096,6 +1163,7 @@ class AceOfferRecruitScraper:
             # 检查是否有下一页
             if not await self.has_next_page():
                 print("\n✓ 已到达最后一页")
+                reached_end = True
                 break
                 
             # 翻页
@@ -1111,7 +1179,12 @@ class AceOfferRecruitScraper:
             print(f"  最近{DATE_FILTER_DAYS}天更新的岗位: {today_updated_count} 条")
             print(f"  已跳过非最近{DATE_FILTER_DAYS}天更新的岗位: {skipped_count} 条")
             print(f"{'='*60}")
+        
+        # 完整结束时更新水位线，输出避免翻页的页数
+        self.stop_condition.finish(exhausted=reached_end)
+        print(f"\n翻页提前终止: {self.stop_condition.format_stats()}")
             
+    @timed('aceoffer', 'excel_export')
     async def save_to_excel(self, overwrite: bool = False):
         """保存数据到Excel文件
         
@@ -1131,8 +1204,17 @@ class AceOfferRecruitScraper:
             print("保存数据到Excel...")
         print(f"{'='*60}")
         
+        # 覆盖更新模式下提前停止翻页时，未翻到的页面沿用上次保存的岗位
+        carried = []
+        if overwrite and self.stop_condition and self.stop_condition.stopped and self.previous_results:
+            current_links = {r.get('相关链接') for r in self.results}
+            carried = [r for r in self.previous_results
+                       if r.get('相关链接') not in current_links
+                       and (not ONLY_TODAY_UPDATED or self.is_recent_days_updated(r.get('更新时间', '')))]
+            print(f"沿用上次保存的岗位: {len(carried)} 条（提前停止翻页）")
+        
         # 创建DataFrame
-        new_df = pd.DataFrame(self.results)
+        new_df = pd.DataFrame(self.results + carried)
         
         # 确保所有必需的列都存在（如果不存在则创建空列）
         columns_order = [
@@ -1278,6 +1360,7 @@ class AceOfferRecruitScraper:
         Args:
             overwrite: 是否为覆盖更新模式（覆盖现有文件）
         """
+        self.metrics.start_run()
         try:
             # 启动浏览器
             await self.start_browser()
@@ -1291,6 +1374,10 @@ class AceOfferRecruitScraper:
             # 等待列表加载
             await self.wait_for_list_loaded()
             
+            # 覆盖更新模式：上次保存的岗位视为已抓取过，连续出现时提前停止翻页
+            if overwrite:
+                self.load_previous_results()
+            
             # 抓取所有页面
             await self.scrape_all_pages()
             
@@ -1308,6 +1395,10 @@ class AceOfferRecruitScraper:
             import traceback
             traceback.print_exc()
         finally:
+            print(self.selector_cache.format_stats())
+            self.selector_cache.save()
+            # 各阶段耗时写入指标表 / Prometheus 文本文件
+            self.metrics.finish_run()
             # 关闭浏览器
             if self.browser:
                 await self.browser.close()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公司类型判断性能对比脚本
+对 --names 个公司名称（其中 --unique 个不重复）判断公司类型，对比：
+    - 逐关键词：原 SpecificRequirementsScraper._detect_company_type 的写法，
+      按优先级对 FOUR_BIG、EIGHT_BIG、BIG_COMPANIES、STATE_OWNED_KEYWORDS 逐个做子串查找
+    - 正则列：原 main.JobScraper.filter_results 的写法，每个分组拼接 '|'.join(...) 正则做 str.contains
+    - 自动机：company_classifier 的 Aho-Corasick 自动机，每个名称扫描一遍（不使用缓存）
+    - 自动机+缓存：CompanyClassifier.company_type（LRU 缓存，重复名称直接命中）
+    - 批量：CompanyClassifier.classify_series / mask（整列去重后匹配）
+
+并按词边界正则（英文关键词首尾不紧挨英文字母或数字，与 company_classifier 的规则相同）
+校验自动机各方式的判断结果；原写法没有词边界（'EY' 会命中 "Disney"），只计时不校验。
+
+使用方法：
+    python benchmark_classifier.py                          # 默认 100000 个名称，20000 个不重复
+    python benchmark_classifier.py --names 1000000 --unique 50000
+"""
+
+import re
+import time
+import random
+import argparse
+from typing import List, Dict, Optional
+
+import pandas as pd
+
+from company_classifier import CompanyClassifier, build_default_groups
+from specific_requirements_config import (
+    FOUR_BIG, EIGHT_BIG, BIG_COMPANIES, STATE_OWNED_KEYWORDS, FOREIGN_KEYWORDS
+)
+
+# 公司名称中命中关键词的比例
+KEYWORD_RATIO = 0.3
+
+NAME_PARTS = ['华信', '远景', '恒通', '星辰', '新锐', '明德', '博远', '万象', '启航', '卓越',
+              'Nova', 'Apex', 'Blue', 'Sun', 'Key', 'Grey', 'Max', 'Delta', 'Orient', 'Prime']
+NAME_SUFFIXES = ['科技有限公司', '信息技术有限公司', '咨询有限公司', '生物医药股份有限公司',
+                 '教育科技有限公司', '网络科技有限公司', '贸易有限公司', '会计师事务所']
+
+
+def generate_names(count: int, unique: int, seed: int = 42) -> List[str]:
+    """生成公司名称：unique 个不重复名称，按长尾分布重复抽样出 count 个"""
+    rng = random.Random(seed)
+    keywords = FOUR_BIG + EIGHT_BIG + BIG_COMPANIES + STATE_OWNED_KEYWORDS + FOREIGN_KEYWORDS
+    pool = []
+    for i in range(unique):
+        base = rng.choice(NAME_PARTS) + rng.choice(NAME_PARTS)
+        if rng.random() < KEYWORD_RATIO:
+            keyword = rng.choice(keywords)
+            base = keyword + base if rng.random() < 0.5 else base + keyword
+        pool.append(f"{base}{i % 97 or ''}{rng.choice(NAME_SUFFIXES)}")
+    # 长尾分布：少数公司岗位很多
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(unique)]
+    return rng.choices(pool, weights=weights, k=count)
+
+
+def legacy_company_type(company_name: str) -> Optional[str]:
+    """原 _detect_company_type 的关键词判断部分（不含按配置兜底）"""
+    company_name_lower = company_name.lower()
+    is_foreign = any(kw in company_name for kw in FOREIGN_KEYWORDS)
+    for keyword in FOUR_BIG:
+        if keyword.lower() in company_name_lower:
+            return '四大'
+    for keyword in EIGHT_BIG:
+        if keyword in company_name:
+            return '八大'
+    for company in BIG_COMPANIES:
+        if company in company_name:
+            return '大厂'
+    if not is_foreign:
+        for keyword in STATE_OWNED_KEYWORDS:
+            if keyword in company_name:
+                return '央国企'
+    return None
+
+
+def _keyword_regex(keyword: str) -> str:
+    """关键词正则：英文首尾加词边界"""
+    pattern = re.escape(keyword)
+    if keyword[0].isascii() and keyword[0].isalnum():
+        pattern = r'(?<![A-Za-z0-9])' + pattern
+    if keyword[-1].isascii() and keyword[-1].isalnum():
+        pattern += r'(?![A-Za-z0-9])'
+    return pattern
+
+
+def _group_regex(keywords: List[str], ignore_case: bool = False):
+    return re.compile('|'.join(map(_keyword_regex, keywords)), re.IGNORECASE if ignore_case else 0)
+
+
+def reference_company_type(names: List[str]) -> List[Optional[str]]:
+    """词边界正则判断公司类型（校验基准，优先级与 legacy_company_type 相同）"""
+    four_big = _group_regex(FOUR_BIG, ignore_case=True)
+    eight_big, big = _group_regex(EIGHT_BIG), _group_regex(BIG_COMPANIES)
+    state_owned, foreign = _group_regex(STATE_OWNED_KEYWORDS), _group_regex(FOREIGN_KEYWORDS)
+    result = []
+    for name in names:
+        if four_big.search(name):
+            result.append('四大')
+        elif eight_big.search(name):
+            result.append('八大')
+        elif big.search(name):
+            result.append('大厂')
+        elif state_owned.search(name) and not foreign.search(name):
+            result.append('央国企')
+        else:
+            result.append(None)
+    return result
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def benchmark(count: int, unique: int) -> List[Dict]:
+    """运行各方式，返回 [{'name', 'seconds', 'ok'}]"""
+    names = generate_names(count, unique)
+    series = pd.Series(names)
+    results = []
+
+    _, seconds = _timed(lambda: [legacy_company_type(n) for n in names])
+    results.append({'name': '逐关键词（原写法）', 'seconds': seconds, 'ok': True})
+    expected = reference_company_type(names)
+
+    classifier = CompanyClassifier(build_default_groups(), ignore_case=['四大'])
+    automaton = classifier.automaton
+    masks, seconds = _timed(lambda: [automaton.search(n) for n in names])
+    got = [classifier._type_from_mask(m) for m in masks]
+    results.append({'name': '自动机（无缓存）', 'seconds': seconds, 'ok': got == expected})
+
+    got, seconds = _timed(lambda: [classifier.company_type(n) for n in names])
+    results.append({'name': '自动机+LRU缓存', 'seconds': seconds, 'ok': got == expected})
+
+    classifier = CompanyClassifier(build_default_groups(), ignore_case=['四大'])
+    got, seconds = _timed(lambda: classifier.classify_series(series))
+    results.append({'name': '批量 classify_series', 'seconds': seconds,
+                    'ok': [None if pd.isna(v) else v for v in got] == expected})
+
+    # 过滤一列（main.filter_results 的央国企/大厂/四大三个过滤）
+    groups = {'央国企': STATE_OWNED_KEYWORDS, '大厂': BIG_COMPANIES, '四大': FOUR_BIG}
+    _, seconds = _timed(lambda: {
+        group: series.str.contains('|'.join(map(re.escape, keywords)), case=False, na=False)
+        for group, keywords in groups.items()})
+    results.append({'name': '正则列过滤 ×3（原写法）', 'seconds': seconds, 'ok': True})
+    expected_masks = {group: series.str.contains(_group_regex(keywords, ignore_case=True), na=False)
+                      for group, keywords in groups.items()}
+
+    column_classifier = CompanyClassifier(groups, ignore_case=list(groups))
+    got_masks, seconds = _timed(lambda: {group: column_classifier.mask(series, group) for group in groups})
+    results.append({'name': '批量 mask ×3', 'seconds': seconds,
+                    'ok': all(got_masks[g].equals(expected_masks[g]) for g in groups)})
+    return results
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='公司类型判断性能对比')
+    parser.add_argument('--names', type=int, default=100000, help='公司名称数')
+    parser.add_argument('--unique', type=int, default=20000, help='不重复的公司名称数')
+    args = parser.parse_args()
+
+    print(f"▶ {args.names} 个公司名称（{args.unique} 个不重复）...")
+    results = benchmark(args.names, args.unique)
+
+    print("\n" + "="*70)
+    print(f"公司类型判断（{args.names} 个名称，{args.unique} 个不重复）")
+    print("="*70)
+    print(f"{'方式':<24} {'耗时(秒)':>10} {'名称/秒':>12} {'结果一致':>8}")
+    print("-"*70)
+    for r in results:
+        rate = args.names / r['seconds'] if r['seconds'] else 0
+        print(f"{r['name']:<24} {r['seconds']:>10.3f} {rate:>12,.0f} {'✓' if r['ok'] else '✗':>8}")
+    print("="*70)
+    if not all(r['ok'] for r in results):
+        print("⚠ 存在与词边界正则不一致的判断结果")
+
+
+if __name__ == '__main__':
+    main()
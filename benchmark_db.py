@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库写入性能对比脚本
+对比 scheduler.DBManager 的两种模式：
+    - 逐条模式：每个岗位单独 is_job_exists + save_job（每次新建连接并提交）
+    - 长连接模式：WAL + 每页一次 filter_new_urls + 每页一次 save_jobs
+
+使用方法：
+    python benchmark_db.py                  # 默认测试 10000 和 100000 行
+    python benchmark_db.py --rows 5000      # 自定义行数
+"""
+
+import os
+import time
+import argparse
+import tempfile
+from typing import List, Dict
+
+from scheduler import DBManager
+
+# 每页岗位数（与 search_yingjiesheng 每页最多处理15个一致）
+PAGE_SIZE = 15
+
+# 重复率：模拟已抓取过的岗位再次出现在搜索结果中
+DUPLICATE_RATIO = 0.3
+
+
+def generate_jobs(count: int) -> List[Dict]:
+    """生成测试用岗位数据"""
+    jobs = []
+    for i in range(count):
+        jobs.append({
+            'url': f"https://www.yingjiesheng.com/job-{i:08d}.html",
+            'company_name': f"测试公司{i % 997}",
+            'company_type': '未知',
+            'work_location': '上海',
+            'recruit_type': '校招',
+            'recruit_target': '2026届',
+            'job_title': f"测试岗位{i}",
+            'update_time': '2025-12-01',
+            'deadline': '详见链接',
+        })
+    return jobs
+
+
+def build_pages(jobs: List[Dict]) -> List[List[Dict]]:
+    """按页切分岗位，并混入一定比例的重复岗位"""
+    pages = []
+    dup_per_page = int(PAGE_SIZE * DUPLICATE_RATIO)
+    fresh_per_page = PAGE_SIZE - dup_per_page
+    for i in range(0, len(jobs), fresh_per_page):
+        page = list(jobs[i:i + fresh_per_page])
+        # 重复岗位取自前面已出现过的数据
+        if i > 0:
+            page.extend(jobs[max(0, i - dup_per_page):i])
+        pages.append(page)
+    return pages
+
+
+def run_per_row(db_file: str, pages: List[List[Dict]]) -> int:
+    """逐条模式：每个岗位一次查询 + 一次写入"""
+    db = DBManager(db_file, pooled=False, use_url_index=False)
+    saved = 0
+    for page in pages:
+        for job in page:
+            if db.is_job_exists(job['url']):
+                continue
+            if db.save_job(job):
+                saved += 1
+    db.close()
+    return saved
+
+
+def run_pooled(db_file: str, pages: List[List[Dict]]) -> int:
+    """长连接模式：每页一次批量去重 + 一次批量写入"""
+    db = DBManager(db_file, pooled=True, use_url_index=False)
+    saved = 0
+    for page in pages:
+        new_urls = set(db.filter_new_urls([job['url'] for job in page]))
+        batch = []
+        for job in page:
+            if job['url'] in new_urls:
+                new_urls.discard(job['url'])
+                batch.append(job)
+        saved += db.save_jobs(batch)
+    db.close()
+    return saved
+
+
+def benchmark(rows: int) -> Dict:
+    """对指定行数执行两种模式的对比"""
+    jobs = generate_jobs(rows)
+    pages = build_pages(jobs)
+    result = {'rows': rows, 'pages': len(pages)}
+
+    for name, func in [('per_row', run_per_row), ('pooled', run_pooled)]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = os.path.join(tmp_dir, f"bench_{name}.db")
+            start = time.perf_counter()
+            saved = func(db_file, pages)
+            elapsed = time.perf_counter() - start
+        result[name] = {'seconds': elapsed, 'saved': saved, 'rows_per_sec': saved / elapsed if elapsed else 0}
+
+    return result
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='DBManager 逐条模式与长连接模式性能对比')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000], help='测试行数（可指定多个）')
+    args = parser.parse_args()
+
+    results = [benchmark(rows) for rows in args.rows]
+
+    print("\n" + "="*72)
+    print("DBManager 写入性能对比")
+    print("="*72)
+    print(f"{'行数':>10} {'页数':>8} {'逐条模式(秒)':>14} {'长连接模式(秒)':>16} {'加速比':>8}")
+    print("-"*72)
+    for r in results:
+        per_row = r['per_row']['seconds']
+        pooled = r['pooled']['seconds']
+        speedup = per_row / pooled if pooled else 0
+        print(f"{r['rows']:>10} {r['pages']:>8} {per_row:>14.2f} {pooled:>16.2f} {speedup:>7.1f}x")
+        if r['per_row']['saved'] != r['pooled']['saved']:
+            print(f"  ⚠ 两种模式写入条数不一致: {r['per_row']['saved']} vs {r['pooled']['saved']}")
+    print("="*72)
+
+
+if __name__ == '__main__':
+    main()
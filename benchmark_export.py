@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel导出性能对比脚本
+对比三种导出方式的耗时与峰值内存（RSS）：
+    - pandas: pd.read_sql_query 读取全表后 to_excel（旧方式）
+    - stream: excel_export 分批读取 + openpyxl write_only 流式写入（全量）
+    - delta:  excel_export 增量导出（水位线之后新增 DELTA_RATIO 比例的岗位）
+
+每种方式在独立子进程中运行，峰值内存互不影响。
+
+使用方法：
+    python benchmark_export.py                      # 默认测试 100000 和 1000000 行
+    python benchmark_export.py --rows 50000         # 自定义行数
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import resource
+import tempfile
+import subprocess
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+
+from scheduler import DBManager, INSERT_JOB_SQL
+from excel_export import export_jobs, set_watermark
+
+# 增量导出时新增岗位占总量的比例
+DELTA_RATIO = 0.01
+
+# 生成测试数据时每批写入的行数
+INSERT_BATCH_SIZE = 10000
+
+
+def populate_database(db_file: str, rows: int) -> Tuple[str, str]:
+    """生成测试数据库，返回增量导出使用的水位线及该秒内已导出的URL"""
+    DBManager(db_file, pooled=False, use_url_index=False)  # 建表
+    base_time = datetime(2025, 1, 1)
+    delta_start = rows - int(rows * DELTA_RATIO)
+    watermark = boundary_url = None
+
+    conn = sqlite3.connect(db_file)
+    try:
+        for start in range(0, rows, INSERT_BATCH_SIZE):
+            batch = []
+            for i in range(start, min(rows, start + INSERT_BATCH_SIZE)):
+                created_at = (base_time + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S')
+                url = f"https://www.yingjiesheng.com/job-{i:08d}.html"
+                if i == delta_start - 1:
+                    watermark, boundary_url = created_at, url
+                batch.append((
+                    url, f"测试公司{i % 997}", '未知', '上海',
+                    '校招', '2026届', f"测试岗位{i}", '2025-12-01', '详见链接', created_at,
+                ))
+            with conn:
+                conn.executemany(INSERT_JOB_SQL, batch)
+    finally:
+        conn.close()
+    return watermark, boundary_url
+
+
+def run_child(method: str, db_file: str, excel_file: str, watermark: str, boundary_url: str):
+    """子进程：执行一次导出并输出耗时与峰值内存（JSON）"""
+    start = time.perf_counter()
+    if method == 'pandas':
+        import pandas as pd
+        conn = sqlite3.connect(db_file)
+        df = pd.read_sql_query("""
+            SELECT company_name as '公司名称', company_type as '公司类型', work_location as '工作地点',
+                   recruit_type as '招聘类型', recruit_target as '招聘对象', job_title as '岗位(大都不限专业)',
+                   update_time as '更新时间', deadline as '投递截止', url as '相关链接'
+            FROM posted_jobs ORDER BY created_at DESC
+        """, conn)
+        conn.close()
+        df.to_excel(excel_file, index=False, engine='openpyxl')
+        exported = len(df)
+    elif method == 'stream':
+        exported = export_jobs(db_file, excel_file, mode='full')['rows']
+    else:
+        conn = sqlite3.connect(db_file)
+        set_watermark(conn, watermark, boundary_urls=[boundary_url])
+        conn.close()
+        exported = export_jobs(db_file, excel_file, mode='delta')['rows']
+    seconds = time.perf_counter() - start
+
+    # Linux 下 ru_maxrss 单位为 KB，macOS 下为字节
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    print(json.dumps({'seconds': seconds, 'peak_mb': peak_mb, 'rows': exported}))
+
+
+def benchmark(rows: int, methods) -> Dict:
+    """对指定行数执行各导出方式的对比"""
+    result = {'rows': rows}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = os.path.join(tmp_dir, 'bench_export.db')
+        print(f"生成 {rows} 行测试数据...")
+        watermark, boundary_url = populate_database(db_file, rows)
+        for method in methods:
+            excel_file = os.path.join(tmp_dir, f"bench_{method}.xlsx")
+            print(f"  运行 {method} ...")
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', method, db_file, excel_file,
+                 watermark, boundary_url],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            result[method] = json.loads(output)
+    return result
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='Excel导出耗时与峰值内存对比')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000], help='测试行数（可指定多个）')
+    parser.add_argument('--methods', nargs='+', default=['pandas', 'stream', 'delta'],
+                        choices=['pandas', 'stream', 'delta'], help='参与对比的导出方式')
+    parser.add_argument('--child', nargs=5, metavar=('METHOD', 'DB', 'XLSX', 'WATERMARK', 'BOUNDARY_URL'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    results = [benchmark(rows, args.methods) for rows in args.rows]
+
+    print("\n" + "="*72)
+    print("Excel导出性能对比")
+    print("="*72)
+    print(f"{'行数':>10} {'方式':>8} {'导出行数':>10} {'耗时(秒)':>10} {'峰值内存(MB)':>14}")
+    print("-"*72)
+    for r in results:
+        for method in args.methods:
+            m = r[method]
+            print(f"{r['rows']:>10} {method:>8} {m['rows']:>10} {m['seconds']:>10.1f} {m['peak_mb']:>14.1f}")
+    print("="*72)
+
+
+if __name__ == '__main__':
+    main()
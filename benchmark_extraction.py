@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+应届生求职网列表提取方式性能测试（handles vs evaluate）
+对比 scheduler.JobScraper.search_yingjiesheng 的两种字段提取方式（见 YINGJIESHENG_EXTRACT_MODE）：
+    handles   逐个元素 query_selector / inner_text / get_attribute，每次调用一次浏览器往返
+    evaluate  一次 page.evaluate 在页面内提取整页所有行，返回 JSON 数组
+
+页面来源：
+    默认生成 --rows 行的模拟结果表格（表格结构与应届生求职网一致）；
+    --recorded 使用 page_replay 录制的真实页面（先运行 benchmark_scrapers.py --record --sites yingjiesheng）。
+页面由浏览器请求拦截直接返回，不访问网络；每轮使用新的数据库，所有岗位都走完整提取。
+
+统计每页提取耗时（方法总耗时减去导航和等待页面加载的时间）的分位数，
+并校验两种方式提取出的岗位完全一致。每种方式在独立子进程中运行。
+
+使用方法：
+    python benchmark_extraction.py
+    python benchmark_extraction.py --rows 50 --rounds 30
+    python benchmark_extraction.py --recorded --rounds 5
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import subprocess
+import urllib.parse
+from typing import List, Dict
+
+from benchmark_scrapers import USER_AGENT, TimedPage, _percentile, _peak_mb
+from page_replay import REPLAY_DIR, ReplayStore
+
+# ==================== 配置区域 ====================
+
+MODES = ['handles', 'evaluate']
+
+# 模拟页面的行数与搜索参数
+DEFAULT_ROWS = 50
+DEFAULT_KEYWORD = '产品经理'
+DEFAULT_CITY = '上海'
+DEFAULT_GRAD_YEAR = 2026
+DEFAULT_RECRUIT_TYPE = '校招'
+
+SAMPLE_CITIES = ['上海', '北京', '深圳', '杭州', '广州']
+
+
+def build_sample_page(rows: int) -> str:
+    """生成模拟的应届生求职网搜索结果页（表头 + rows 行）"""
+    items = []
+    for i in range(rows):
+        items.append(
+            f'<tr><td><a href="/job-{100000 + i}.html" target="_blank"><span>{DEFAULT_KEYWORD}（{i}）</span></a></td>'
+            f'<td><span>示例公司{i % 37}有限公司</span></td>'
+            f'<td>{SAMPLE_CITIES[i % len(SAMPLE_CITIES)]}</td>'
+            f'<td>2026-10-{1 + i % 28:02d}</td></tr>')
+    return ('<html><head><meta charset="utf-8"><title>职位搜索</title></head><body>'
+            '<div class="search-result"><table><tr><th>职位</th><th>公司</th><th>地点</th><th>更新时间</th></tr>'
+            + ''.join(items) + '</table></div></body></html>')
+
+
+def load_pages(recorded: bool, rows: int, replay_dir: str) -> List[Dict]:
+    """返回 [{'url', 'html', 'meta'}]"""
+    if not recorded:
+        # 与 search_yingjiesheng 拼接的URL一致，请求拦截按URL返回页面
+        url = (f"https://www.yingjiesheng.com/job/?keyword={urllib.parse.quote(DEFAULT_KEYWORD)}"
+               f"&city={urllib.parse.quote(DEFAULT_CITY)}")
+        return [{'html': build_sample_page(rows), 'meta': {'keyword': DEFAULT_KEYWORD, 'city': DEFAULT_CITY,
+                                                            'grad_year': DEFAULT_GRAD_YEAR}, 'url': url}]
+    store = ReplayStore(replay_dir)
+    return [{'url': e['url'], 'html': store.get(e['url']).decode('utf-8'), 'meta': e['meta']}
+            for e in store.entries('yingjiesheng')]
+
+
+def run_child(mode: str, recorded: bool, rows: int, rounds: int, replay_dir: str):
+    """子进程：用指定提取方式运行 search_yingjiesheng，输出统计（JSON）"""
+    import scheduler
+    from scheduler import JobScraper, DBManager
+    from page_readiness import RateLimiter
+    from playwright.sync_api import sync_playwright
+
+    scheduler.YINGJIESHENG_EXTRACT_MODE = mode
+    pages = load_pages(recorded, rows, replay_dir)
+    html_by_url = {p['url']: p['html'] for p in pages}
+
+    def handle(route):
+        html = html_by_url.get(route.request.url) if route.request.resource_type == 'document' else None
+        if html is None:
+            route.abort()
+        else:
+            route.fulfill(status=200, body=html, content_type='text/html; charset=utf-8')
+
+    # 抓取方法的日志输出到 stderr，stdout 只保留结果
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    latencies, jobs = [], []
+    try:
+        with tempfile.TemporaryDirectory() as work_dir, sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            context = browser.new_context(user_agent=USER_AGENT, viewport={'width': 1920, 'height': 1080})
+            context.route('**/*', handle)
+            page = context.new_page()
+            for round_index in range(rounds):
+                db = DBManager(os.path.join(work_dir, f"extract_{round_index}.db"), use_url_index=False)
+                scraper = JobScraper(db)
+                scraper.rate_limiter = RateLimiter(0, 0)
+                for entry in pages:
+                    meta = entry['meta']
+                    timed = TimedPage(page)
+                    scraper.page = timed
+                    t0 = time.perf_counter()
+                    results = scraper.search_yingjiesheng(
+                        meta['keyword'], meta['city'], meta.get('grad_year'),
+                        meta.get('recruit_type', DEFAULT_RECRUIT_TYPE), meta.get('config_keywords', meta['keyword']))
+                    latencies.append(time.perf_counter() - t0 - timed.wait_seconds)
+                    if round_index == 0:
+                        jobs.extend(results)
+                db.close()
+            browser.close()
+    finally:
+        sys.stdout = real_stdout
+
+    digest = hashlib.sha1(json.dumps(sorted(jobs, key=lambda j: j['url']), ensure_ascii=False,
+                                     sort_keys=True).encode('utf-8')).hexdigest()
+    print(json.dumps({
+        'pages': len(latencies),
+        'jobs_per_page': len(jobs) / len(pages) if pages else 0,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p90_ms': _percentile(latencies, 90) * 1000,
+        'p99_ms': _percentile(latencies, 99) * 1000,
+        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0,
+        'peak_mb': _peak_mb(),
+        'digest': digest,
+    }))
+
+
+def benchmark(mode: str, args) -> Dict:
+    """在子进程中测试一种提取方式"""
+    command = [sys.executable, os.path.abspath(__file__), '--child', mode, '--rows', str(args.rows),
+               '--rounds', str(args.rounds), '--dir', args.dir]
+    if args.recorded:
+        command.append('--recorded')
+    completed = subprocess.run(command, stdout=subprocess.PIPE,
+                               stderr=None if args.verbose else subprocess.DEVNULL, text=True)
+    if completed.returncode != 0 or not completed.stdout.strip():
+        return {'error': f"子进程退出码 {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='应届生求职网列表提取方式性能测试')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='模拟页面的行数')
+    parser.add_argument('--rounds', type=int, default=20, help='测试轮数')
+    parser.add_argument('--recorded', action='store_true', help='使用录制的真实页面')
+    parser.add_argument('--dir', default=REPLAY_DIR, help='录制页面目录')
+    parser.add_argument('--verbose', action='store_true', help='显示抓取方法的日志输出')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.recorded, args.rows, args.rounds, args.dir)
+        return
+
+    if args.recorded and not ReplayStore(args.dir).entries('yingjiesheng'):
+        print("⚠ 没有录制的应届生求职网页面（先运行 benchmark_scrapers.py --record --sites yingjiesheng）")
+        return
+
+    source = '录制页面' if args.recorded else f'模拟页面 {args.rows} 行'
+    results = {}
+    for mode in MODES:
+        print(f"▶ 测试 {mode}（{source}，{args.rounds} 轮）...")
+        results[mode] = benchmark(mode, args)
+
+    print("\n" + "="*78)
+    print(f"应届生求职网列表提取耗时（{source}，{args.rounds} 轮）")
+    print("="*78)
+    print(f"{'提取方式':>10} {'页面':>6} {'岗位/页':>8} {'P50(ms)':>9} {'P90(ms)':>9} {'P99(ms)':>9} "
+          f"{'平均(ms)':>9} {'峰值内存(MB)':>12}")
+    print("-"*78)
+    for mode, r in results.items():
+        if 'error' in r:
+            print(f"{mode:>10} ✗ {r['error']}")
+            continue
+        print(f"{mode:>10} {r['pages']:>6} {r['jobs_per_page']:>8.1f} {r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} "
+              f"{r['p99_ms']:>9.1f} {r['mean_ms']:>9.1f} {r['peak_mb']:>12.1f}")
+    print("="*78)
+
+    handles, evaluate = results.get('handles', {}), results.get('evaluate', {})
+    if 'p50_ms' in handles and 'p50_ms' in evaluate:
+        if evaluate['p50_ms']:
+            print(f"evaluate 相对 handles: P50 加速 {handles['p50_ms'] / evaluate['p50_ms']:.1f} 倍")
+        if handles['digest'] == evaluate['digest']:
+            print("✓ 两种方式提取结果一致")
+        else:
+            print("⚠ 两种方式提取结果不一致（用 --verbose 查看日志）")
+
+
+if __name__ == '__main__':
+    main()
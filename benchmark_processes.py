@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多进程抓取扩展性测试
+用 scheduler.JobScraper.scrape_all_configs_multiprocess 抓取 SEARCH_CONFIGS 的前 N 个搜索任务，
+对比不同进程数的吞吐量，每种进程数使用新的空数据库。
+
+页面不访问网络：子进程的浏览器拦截请求，按URL中的关键词和城市生成模拟结果页（结构同 benchmark_extraction.py），
+并关闭限速器，测量的是浏览器渲染、DOM提取和数据库去重写入本身的扩展性。
+同一关键词在不同城市的页面有 SHARED_ROW_RATIO 比例的相同岗位，用于检验跨进程去重（结果中不应出现重复岗位）。
+
+输出：
+    - 吞吐量（任务/分钟）、相对单进程的加速比和并行效率
+    - 跨进程重复：多个进程在对方写入前都判断为新岗位、由主进程合并时去掉的条数
+    - 新增岗位数（各进程数下应一致）
+
+使用方法：
+    python benchmark_processes.py
+    python benchmark_processes.py --processes 1 2 4 8 --tasks 80
+"""
+
+import os
+import sys
+import hashlib
+import argparse
+import tempfile
+import urllib.parse
+from contextlib import contextmanager
+from typing import List, Dict
+
+# ==================== 配置区域 ====================
+
+DEFAULT_PROCESSES = [1, 2, 4]
+
+# 参与测试的搜索任务数
+DEFAULT_TASKS = 40
+
+# 模拟结果页的行数
+ROWS_PER_PAGE = 50
+
+# 同一关键词在不同城市页面中重复出现的岗位比例
+SHARED_ROW_RATIO = 0.2
+
+
+def build_page(url: str) -> str:
+    """按搜索URL生成模拟结果页"""
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+    keyword = query.get('keyword', [''])[0]
+    city = query.get('city', [''])[0]
+    shared = int(ROWS_PER_PAGE * SHARED_ROW_RATIO)
+    items = []
+    for i in range(ROWS_PER_PAGE):
+        seed = f"{keyword}|{i}" if i < shared else f"{keyword}|{city}|{i}"
+        job_id = int(hashlib.md5(seed.encode('utf-8')).hexdigest()[:10], 16)
+        items.append(
+            f'<tr><td><a href="/job-{job_id}.html"><span>{keyword}（{i}）</span></a></td>'
+            f'<td><span>示例公司{job_id % 97}有限公司</span></td><td>{city}</td>'
+            f'<td>2026-10-{1 + i % 28:02d}</td></tr>')
+    return ('<html><head><meta charset="utf-8"><title>职位搜索</title></head><body><table>'
+            '<tr><th>职位</th><th>公司</th><th>地点</th><th>更新时间</th></tr>'
+            + ''.join(items) + '</table></body></html>')
+
+
+def setup_offline(scraper):
+    """子进程初始化：页面请求改为本地生成，关闭限速和结果缓存（由 scrape_all_configs_multiprocess 在子进程中调用）"""
+    from page_readiness import RateLimiter
+    from result_cache import ResultCache
+
+    def handle(route):
+        if route.request.resource_type == 'document':
+            route.fulfill(status=200, body=build_page(route.request.url), content_type='text/html; charset=utf-8')
+        else:
+            route.abort()
+
+    scraper.rate_limiter = RateLimiter(0, 0)
+    scraper.result_cache = ResultCache(enabled=False)
+    scraper.page.route('**/*', handle)
+
+
+@contextmanager
+def _quiet(enabled: bool):
+    """屏蔽主进程和子进程的日志输出（重定向文件描述符1，子进程继承）"""
+    if not enabled:
+        yield
+        return
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+
+def run_case(processes: int, task_count: int, work_dir: str, verbose: bool) -> Dict:
+    """用指定进程数抓取前 task_count 个任务，返回运行统计"""
+    import scheduler
+    from scheduler import JobScraper, DBManager
+
+    scheduler.CHECKPOINT_ENABLED = False
+    with _quiet(not verbose):
+        db = DBManager(os.path.join(work_dir, f"processes_{processes}.db"), use_url_index=False)
+        scraper = JobScraper(db)
+        plan = scraper.build_search_plan()
+        plan.tasks = plan.tasks[:task_count]
+        scraper.build_search_plan = lambda: plan
+        jobs = scraper.scrape_all_configs_multiprocess(processes, worker_setup=setup_offline)
+        saved = db.get_total_count()
+        db.close()
+    stats = scraper.run_stats
+    return {
+        'processes': processes,
+        'completed': stats['completed'],
+        'tasks': stats['tasks'],
+        'wall_seconds': stats['wall_seconds'],
+        'tasks_per_minute': stats['tasks_per_minute'],
+        'duplicates': stats['scaling']['duplicates'],
+        'jobs': len(jobs),
+        'saved': saved,
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='多进程抓取扩展性测试（离线模拟页面）')
+    parser.add_argument('--processes', type=int, nargs='+', default=DEFAULT_PROCESSES, help='测试的进程数')
+    parser.add_argument('--tasks', type=int, default=DEFAULT_TASKS, help='搜索任务数')
+    parser.add_argument('--verbose', action='store_true', help='显示抓取日志')
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for processes in args.processes:
+            print(f"▶ {processes} 个进程，{args.tasks} 个任务...")
+            results.append(run_case(processes, args.tasks, work_dir, args.verbose))
+
+    baseline = next((r['tasks_per_minute'] for r in results if r['processes'] == 1), results[0]['tasks_per_minute'])
+    base_processes = 1 if any(r['processes'] == 1 for r in results) else results[0]['processes']
+    print("\n" + "="*86)
+    print(f"多进程抓取扩展性（{args.tasks} 个任务，每页 {ROWS_PER_PAGE} 行）")
+    print("="*86)
+    print(f"{'进程数':>6} {'完成任务':>8} {'耗时(秒)':>9} {'任务/分钟':>10} {'加速比':>7} {'并行效率':>8} "
+          f"{'新增岗位':>8} {'入库岗位':>8} {'跨进程重复':>10}")
+    print("-"*86)
+    for r in results:
+        speedup = r['tasks_per_minute'] / baseline if baseline else 0
+        efficiency = speedup / (r['processes'] / base_processes)
+        print(f"{r['processes']:>6} {r['completed']:>5}/{r['tasks']:<3} {r['wall_seconds']:>8.1f} "
+              f"{r['tasks_per_minute']:>10.1f} {speedup:>7.2f} {efficiency:>8.0%} {r['jobs']:>8} {r['saved']:>8} "
+              f"{r['duplicates']:>10}")
+    print("="*86)
+    if len({r['jobs'] for r in results}) > 1:
+        print("⚠ 不同进程数的新增岗位数不一致（检查子进程日志：--verbose）")
+
+
+if __name__ == '__main__':
+    main()
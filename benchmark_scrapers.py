@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抓取脚本解析性能测试（离线录制 + 回放）
+先用 --record 访问真实网站，保存各抓取方法打开的搜索页（见 page_replay.py）；
+之后不联网，用本地回放服务驱动各抓取方法，统计：
+    - 吞吐量：页面/秒
+    - 提取耗时分位数（P50/P90/P99）：每页方法总耗时减去导航和等待页面加载的时间
+    - 峰值内存：Python进程 ru_maxrss（浏览器进程不计入）
+
+覆盖的抓取方法：
+    yingjiesheng  scheduler.JobScraper.search_yingjiesheng
+    shixiseng     main.JobScraper.search_shixiseng
+    51job         main.JobScraper.search_51job
+    boss          SpecificRequirementsScraper.search_boss_zhipin
+    liepin        SpecificRequirementsScraper.search_liepin
+    aceoffer      AceOfferRecruitScraper.scrape_current_page
+
+回放时关闭各脚本的礼貌性休眠（random_sleep、限速器），只测量解析本身；
+aceoffer 点击"立即投递"打开的详情页不在录制范围内，回放时跳过。
+每个站点在独立子进程中运行，峰值内存互不影响。
+
+使用方法：
+    python benchmark_scrapers.py --record --sites yingjiesheng shixiseng --keywords 产品经理 运营 --cities 上海 北京
+    python benchmark_scrapers.py --record --sites aceoffer --pages 3
+    python benchmark_scrapers.py                       # 回放所有已录制站点
+    python benchmark_scrapers.py --sites boss --rounds 5
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import List, Dict
+
+from page_replay import (
+    REPLAY_DIR, ReplayStore, ReplayServer, RecordingPage, attach_replay, attach_replay_async,
+)
+
+# ==================== 配置区域 ====================
+
+SITES = ['yingjiesheng', 'shixiseng', '51job', 'boss', 'liepin', 'aceoffer']
+
+# 录制时的默认搜索参数
+DEFAULT_KEYWORDS = ['产品经理']
+DEFAULT_CITIES = ['上海']
+DEFAULT_GRAD_YEAR = 2026
+DEFAULT_RECRUIT_TYPE = '校招'
+
+# 录制 boss / liepin 时使用的 SPECIFIC_REQUIREMENTS 配置序号（用于公司类型判断）
+DEFAULT_CONFIG_INDEX = 0
+
+# 回放时视为"导航/等待"的页面方法（其余耗时计为提取耗时）
+WAIT_METHODS = {'goto', 'wait_for_load_state', 'wait_for_function', 'wait_for_selector', 'wait_for_timeout'}
+
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+class TimedPage:
+    """页面代理：累计导航和等待方法的耗时"""
+
+    def __init__(self, page):
+        self._page = page
+        self.wait_seconds = 0.0
+
+    def __getattr__(self, name):
+        attr = getattr(self._page, name)
+        if name in WAIT_METHODS and callable(attr):
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return attr(*args, **kwargs)
+                finally:
+                    self.wait_seconds += time.perf_counter() - start
+            return wrapper
+        return attr
+
+
+def _no_sleep(*args, **kwargs):
+    return None
+
+
+# ==================== 各站点的调用方式 ====================
+
+def make_sync_scraper(site: str, work_dir: str, round_index: int):
+    """创建同步抓取器，返回 (抓取器, 调用函数(scraper, meta) -> 结果列表)"""
+    if site == 'yingjiesheng':
+        from scheduler import JobScraper, DBManager
+        from page_readiness import RateLimiter
+        db = DBManager(os.path.join(work_dir, f"replay_{round_index}.db"), use_url_index=False)
+        scraper = JobScraper(db)
+        scraper.rate_limiter = RateLimiter(0, 0)
+        return scraper, lambda s, m: s.search_yingjiesheng(
+            m['keyword'], m['city'], m.get('grad_year'), m.get('recruit_type', DEFAULT_RECRUIT_TYPE),
+            m.get('config_keywords', m['keyword']))
+
+    if site in ('shixiseng', '51job'):
+        from main import JobScraper
+        scraper = JobScraper(headless=True)
+        scraper.random_sleep = _no_sleep
+        method = 'search_shixiseng' if site == 'shixiseng' else 'search_51job'
+        return scraper, lambda s, m: getattr(s, method)(
+            m['keyword'], m['city'], m.get('grad_year'), m.get('recruit_type', DEFAULT_RECRUIT_TYPE))
+
+    if site in ('boss', 'liepin'):
+        from specific_requirements_scraper import SpecificRequirementsScraper
+        from specific_requirements_config import SPECIFIC_REQUIREMENTS
+        scraper = SpecificRequirementsScraper(headless=True)
+        scraper.random_sleep = _no_sleep
+        method = 'search_boss_zhipin' if site == 'boss' else 'search_liepin'
+        return scraper, lambda s, m: getattr(s, method)(
+            m['keyword'], m['city'], SPECIFIC_REQUIREMENTS[m.get('config_index', DEFAULT_CONFIG_INDEX)])
+
+    raise ValueError(f"未知站点: {site}")
+
+
+# ==================== 录制 ====================
+
+def record_sync(site: str, store: ReplayStore, keywords: List[str], cities: List[str], headless: bool):
+    """访问真实网站，录制同步抓取方法打开的页面"""
+    from playwright.sync_api import sync_playwright
+
+    with tempfile.TemporaryDirectory() as work_dir, sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, args=['--disable-blink-features=AutomationControlled'])
+        context = browser.new_context(user_agent=USER_AGENT, viewport={'width': 1920, 'height': 1080})
+        page = context.new_page()
+        scraper, call = make_sync_scraper(site, work_dir, 0)
+        for keyword in keywords:
+            for city in cities:
+                meta = {'keyword': keyword, 'city': city, 'grad_year': DEFAULT_GRAD_YEAR,
+                        'recruit_type': DEFAULT_RECRUIT_TYPE, 'config_index': DEFAULT_CONFIG_INDEX}
+                print(f"  录制 {site}: {keyword} | {city}")
+                scraper.page = RecordingPage(page, store, site, meta)
+                call(scraper, meta)
+        browser.close()
+
+
+async def record_aceoffer(store: ReplayStore, pages: int):
+    """登录态浏览器打开 AceOffer 列表，逐页录制"""
+    from aceoffer_scraper import AceOfferRecruitScraper, TARGET_URL
+
+    scraper = AceOfferRecruitScraper()
+    try:
+        await scraper.start_browser()
+        await scraper.navigate_to_target()
+        await scraper.click_net_apply_tab()
+        await scraper.wait_for_list_loaded()
+        for page_num in range(1, pages + 1):
+            url = f"{TARGET_URL}?replay_page={page_num}"
+            store.save('aceoffer', url, await scraper.page.content(), {'page': page_num})
+            print(f"    ✓ 已录制: 第 {page_num} 页")
+            if page_num == pages or not await scraper.has_next_page() or not await scraper.go_to_next_page():
+                break
+            await scraper.wait_for_list_loaded()
+    finally:
+        if scraper.browser:
+            await scraper.browser.close()
+        if scraper.playwright:
+            await scraper.playwright.stop()
+
+
+# ==================== 回放 ====================
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _peak_mb() -> float:
+    # Linux 下 ru_maxrss 单位为 KB，macOS 下为字节
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def replay_sync(site: str, store: ReplayStore, rounds: int) -> Dict:
+    """回放同步抓取方法，返回耗时明细"""
+    from playwright.sync_api import sync_playwright
+
+    entries = store.entries(site)
+    server = ReplayServer(store).start()
+    latencies, items = [], 0
+    try:
+        with tempfile.TemporaryDirectory() as work_dir, sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            context = browser.new_context(user_agent=USER_AGENT, viewport={'width': 1920, 'height': 1080})
+            attach_replay(context, server)
+            page = context.new_page()
+            start = time.perf_counter()
+            for round_index in range(rounds):
+                # 每轮使用新的抓取器（去重状态、数据库互不影响）
+                scraper, call = make_sync_scraper(site, work_dir, round_index)
+                for entry in entries:
+                    timed = TimedPage(page)
+                    scraper.page = timed
+                    t0 = time.perf_counter()
+                    results = call(scraper, entry['meta']) or []
+                    latencies.append(time.perf_counter() - t0 - timed.wait_seconds)
+                    items += len(results)
+            wall = time.perf_counter() - start
+            browser.close()
+    finally:
+        server.stop()
+    return {'pages': len(latencies), 'items': items, 'wall_seconds': wall, 'latencies': latencies}
+
+
+async def replay_aceoffer(store: ReplayStore, rounds: int) -> Dict:
+    """回放 AceOffer 列表页，驱动 scrape_current_page"""
+    from playwright.async_api import async_playwright
+    import aceoffer_scraper
+
+    # 关闭卡片之间的休眠；详情页不在录制范围内，跳过点击"立即投递"
+    class _NoSleepAsyncio:
+        def __getattr__(self, name):
+            return getattr(asyncio, name)
+
+        @staticmethod
+        async def sleep(*args, **kwargs):
+            return None
+
+    aceoffer_scraper.asyncio = _NoSleepAsyncio()
+
+    async def no_apply_link(card_element, job_info, seen_links):
+        return "", {'招聘对象': '', '投递截止': '', '岗位': '', '公司类型': '', '工作地点': '', '更新时间': ''}
+
+    entries = sorted(store.entries('aceoffer'), key=lambda e: e['meta'].get('page', 0))
+    server = ReplayServer(store).start()
+    latencies, items = [], 0
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(user_agent=USER_AGENT, viewport={'width': 1920, 'height': 1080})
+            await attach_replay_async(context, server)
+            page = await context.new_page()
+            start = time.perf_counter()
+            for _ in range(rounds):
+                scraper = aceoffer_scraper.AceOfferRecruitScraper()
+                scraper.browser, scraper.context, scraper.page = browser, context, page
+                scraper.get_apply_link = no_apply_link
+                for entry in entries:
+                    await page.goto(entry['url'], wait_until='domcontentloaded')
+                    scraper.results = []
+                    t0 = time.perf_counter()
+                    await scraper.scrape_current_page()
+                    latencies.append(time.perf_counter() - t0)
+                    items += len(scraper.results)
+            wall = time.perf_counter() - start
+            await browser.close()
+    finally:
+        server.stop()
+    return {'pages': len(latencies), 'items': items, 'wall_seconds': wall, 'latencies': latencies}
+
+
+def run_child(site: str, replay_dir: str, rounds: int):
+    """子进程：回放一个站点并输出统计（JSON）"""
+    store = ReplayStore(replay_dir)
+    # 解析过程的日志输出到 stderr，stdout 只保留结果
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        if site == 'aceoffer':
+            result = asyncio.run(replay_aceoffer(store, rounds))
+        else:
+            result = replay_sync(site, store, rounds)
+    finally:
+        sys.stdout = real_stdout
+    latencies = result.pop('latencies')
+    result.update({
+        'pages_per_second': result['pages'] / result['wall_seconds'] if result['wall_seconds'] else 0,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p90_ms': _percentile(latencies, 90) * 1000,
+        'p99_ms': _percentile(latencies, 99) * 1000,
+        'peak_mb': _peak_mb(),
+    })
+    print(json.dumps(result))
+
+
+def benchmark(site: str, replay_dir: str, rounds: int, verbose: bool) -> Dict:
+    """在子进程中回放一个站点"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', site, '--dir', replay_dir, '--rounds', str(rounds)],
+        stdout=subprocess.PIPE, stderr=None if verbose else subprocess.DEVNULL, text=True,
+    )
+    if completed.returncode != 0 or not completed.stdout.strip():
+        return {'error': f"子进程退出码 {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='抓取脚本解析性能测试（离线回放）')
+    parser.add_argument('--record', action='store_true', help='访问真实网站录制页面')
+    parser.add_argument('--sites', nargs='+', default=SITES, choices=SITES, help='测试站点')
+    parser.add_argument('--dir', default=REPLAY_DIR, help='录制页面目录')
+    parser.add_argument('--keywords', nargs='+', default=DEFAULT_KEYWORDS, help='录制时的搜索关键词')
+    parser.add_argument('--cities', nargs='+', default=DEFAULT_CITIES, help='录制时的搜索城市')
+    parser.add_argument('--pages', type=int, default=3, help='录制 aceoffer 的页数')
+    parser.add_argument('--headed', action='store_true', help='录制时显示浏览器窗口')
+    parser.add_argument('--rounds', type=int, default=3, help='回放轮数（每轮回放全部录制页面）')
+    parser.add_argument('--verbose', action='store_true', help='显示抓取方法的日志输出')
+    parser.add_argument('--child', metavar='SITE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.dir, args.rounds)
+        return
+
+    store = ReplayStore(args.dir)
+    if args.record:
+        for site in args.sites:
+            print(f"\n▶ 录制 {site} ...")
+            if site == 'aceoffer':
+                asyncio.run(record_aceoffer(store, args.pages))
+            else:
+                record_sync(site, store, args.keywords, args.cities, headless=not args.headed)
+        print(f"\n✓ 录制完成，共 {len(store.index)} 个页面（{args.dir}）")
+        return
+
+    results = {}
+    for site in args.sites:
+        if not store.entries(site):
+            print(f"⚠ {site} 没有录制页面，跳过（先运行 --record --sites {site}）")
+            continue
+        print(f"▶ 回放 {site}（{len(store.entries(site))} 个页面 × {args.rounds} 轮）...")
+        results[site] = benchmark(site, args.dir, args.rounds, args.verbose)
+
+    if not results:
+        return
+    print("\n" + "="*88)
+    print(f"抓取解析性能（离线回放，{args.rounds} 轮）")
+    print("="*88)
+    print(f"{'站点':>12} {'页面':>6} {'提取条数':>8} {'页面/秒':>8} {'P50(ms)':>9} {'P90(ms)':>9} "
+          f"{'P99(ms)':>9} {'峰值内存(MB)':>12}")
+    print("-"*88)
+    for site, r in results.items():
+        if 'error' in r:
+            print(f"{site:>12} ✗ {r['error']}")
+            continue
+        print(f"{site:>12} {r['pages']:>6} {r['items']:>8} {r['pages_per_second']:>8.2f} {r['p50_ms']:>9.1f} "
+              f"{r['p90_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['peak_mb']:>12.1f}")
+    print("="*88)
+
+
+if __name__ == '__main__':
+    main()
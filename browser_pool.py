@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+浏览器实例池
+各抓取脚本原本在 start_browser 中各自启动 Chromium、运行结束才关闭：
+长时间抓取时浏览器进程内存持续上涨，浏览器崩溃或断开后剩余的搜索全部失败。
+本模块维护常驻的浏览器实例，爬虫从池中租用页面（PageLease）：
+
+    - 启动参数（headless、slow_mo、args 等）相同的租用共用一个浏览器实例，
+      每次租用创建独立的上下文，Cookie 和登录状态互不影响
+    - 租用和续租（renew）前检查实例健康状态，断开或无响应的实例关闭后重新启动
+    - 实例累计导航 RECYCLE_AFTER_PAGES 个页面，或浏览器进程树内存超过 RECYCLE_RSS_MB 后回收：
+      不再分配新租用，正在使用的租用续租或归还后关闭，下次租用启动新实例
+    - Playwright 同步API的对象只能在创建它的线程中使用，每个线程一个池（get_browser_pool）
+
+Selenium（url_extractor）使用 DriverPool，按同样的规则复用、检查和回收 WebDriver。
+进程内存通过 ps 读取（Linux/macOS），没有 ps 的系统只按页面数回收。
+
+使用方法（连续租用页面，对比每次启动新浏览器与复用实例的租用耗时）：
+    python browser_pool.py
+    python browser_pool.py --leases 50 --pages 10 --recycle-pages 100
+    python browser_pool.py --no-pool
+"""
+
+import os
+import json
+import time
+import atexit
+import argparse
+import threading
+import subprocess
+from typing import List, Dict, Optional, Callable
+
+# ==================== 配置区域 ====================
+
+# 是否复用浏览器实例（关闭时每次租用都启动新浏览器，归还时关闭）
+POOL_ENABLED = True
+
+# 实例累计导航多少个页面后回收，0 表示不限制
+RECYCLE_AFTER_PAGES = 200
+
+# 浏览器进程树内存（RSS，MB）超过多少后回收，0 表示不检查
+RECYCLE_RSS_MB = 1500
+
+# 两次内存检查的最小间隔（秒），每次检查调用一次 ps
+RSS_CHECK_INTERVAL = 30
+
+# 默认启动参数
+DEFAULT_LAUNCH_OPTIONS = {
+    'headless': True,
+}
+
+# 回收原因
+RECYCLE_REASONS = {
+    'pages': '页面数',
+    'rss': '内存',
+    'unhealthy': '无响应',
+}
+
+
+# ==================== 进程内存 ====================
+
+def _process_table() -> Optional[Dict[int, tuple]]:
+    """读取进程表 pid -> (ppid, rss_kb)，没有 ps 时返回 None"""
+    try:
+        proc = subprocess.Popen(['ps', '-A', '-o', 'pid=,ppid=,rss='], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True)
+        output, _ = proc.communicate(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        return None
+    except OSError:
+        return None
+    table = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and all(p.isdigit() for p in parts):
+            table[int(parts[0])] = (int(parts[1]), int(parts[2]))
+    # ps 自身也是本进程的子进程
+    table.pop(proc.pid, None)
+    return table or None
+
+
+def _descendants(table: Dict[int, tuple], roots) -> set:
+    """roots 及其所有子孙进程"""
+    children: Dict[int, List[int]] = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    result = set()
+    stack = [pid for pid in roots if pid in table]
+    while stack:
+        pid = stack.pop()
+        if pid in result:
+            continue
+        result.add(pid)
+        stack.extend(children.get(pid, []))
+    return result
+
+
+def process_tree_rss_mb(pids: List[int]) -> Optional[float]:
+    """进程树（含渲染、GPU等子进程）的内存合计（MB），无法读取时返回 None"""
+    table = _process_table()
+    if not table or not pids:
+        return None
+    tree = _descendants(table, pids)
+    if not tree:
+        return None
+    return sum(table[pid][1] for pid in tree) / 1024
+
+
+# 启动浏览器时按"启动前后本进程新增的子孙进程"确定实例的进程，多个线程同时启动会互相干扰
+_launch_lock = threading.Lock()
+
+
+def _launch_tracked(launch: Callable):
+    """调用 launch() 启动浏览器，返回 (浏览器, 浏览器根进程pid列表)"""
+    with _launch_lock:
+        table = _process_table()
+        before = _descendants(table, [os.getpid()]) if table else set()
+        handle = launch()
+        table = _process_table() if table else None
+    if not table:
+        return handle, []
+    new = _descendants(table, [os.getpid()]) - before
+    return handle, [pid for pid in new if table[pid][0] not in new]
+
+
+# ==================== 实例池 ====================
+
+class _Instance:
+    """池中的一个浏览器实例"""
+
+    def __init__(self, key: str, handle, pids: List[int]):
+        self.key = key
+        self.handle = handle
+        self.pids = pids
+        self.pages = 0          # 累计导航页面数
+        self.leases = 0         # 正在使用的租用数
+        self.retired = None     # 回收原因，非空时不再分配新租用
+        self.rss_mb = None
+        self._rss_checked_at = 0.0
+
+    def count_navigation(self, frame):
+        """framenavigated 事件：只统计主框架的导航"""
+        if frame.parent_frame is None:
+            self.pages += 1
+
+    def measure_rss(self, force: bool = False) -> Optional[float]:
+        """进程树内存（MB），两次测量间隔不足 RSS_CHECK_INTERVAL 时返回上次结果"""
+        now = time.monotonic()
+        if force or now - self._rss_checked_at >= RSS_CHECK_INTERVAL:
+            self._rss_checked_at = now
+            self.rss_mb = process_tree_rss_mb(self.pids)
+        return self.rss_mb
+
+
+class _Pool:
+    """实例池的复用、健康检查和回收逻辑（子类实现启动、检查和关闭）"""
+
+    name = '实例池'
+
+    def __init__(self, recycle_after_pages: int = RECYCLE_AFTER_PAGES,
+                 recycle_rss_mb: float = RECYCLE_RSS_MB, enabled: bool = POOL_ENABLED):
+        self.recycle_after_pages = recycle_after_pages
+        self.recycle_rss_mb = recycle_rss_mb
+        self.enabled = enabled
+        self.instances: List[_Instance] = []
+        self.stats = {
+            'launches': 0,
+            'leases': 0,
+            'reuses': 0,
+            'health_checks': 0,
+            'recycles': {reason: 0 for reason in RECYCLE_REASONS},
+            'peak_rss_mb': 0.0,
+        }
+
+    # ---------- 子类实现 ----------
+
+    def _start(self, options: Dict):
+        raise NotImplementedError
+
+    def _check(self, handle) -> bool:
+        raise NotImplementedError
+
+    def _stop(self, handle):
+        raise NotImplementedError
+
+    # ---------- 租用与回收 ----------
+
+    def _acquire(self, options: Dict) -> _Instance:
+        """取一个可用实例（复用健康且未到期的实例，否则启动新实例）"""
+        key = json.dumps(options, sort_keys=True, default=str)
+        self.stats['leases'] += 1
+        for instance in list(self.instances):
+            if instance.key != key or instance.retired:
+                continue
+            reason = self.recycle_reason(instance)
+            if reason is None and not self.is_healthy(instance):
+                reason = 'unhealthy'
+            if reason:
+                self.retire(instance, reason)
+                continue
+            self.stats['reuses'] += 1
+            instance.leases += 1
+            return instance
+
+        handle, pids = self._start(options)
+        instance = _Instance(key, handle, pids)
+        instance.leases += 1
+        self.instances.append(instance)
+        self.stats['launches'] += 1
+        return instance
+
+    def _release(self, instance: _Instance):
+        """归还实例：已回收（或未启用复用）且没有其他租用时关闭"""
+        instance.leases -= 1
+        if instance.leases <= 0 and (instance.retired or not self.enabled):
+            self._close(instance)
+
+    def is_healthy(self, instance: _Instance) -> bool:
+        """健康检查"""
+        self.stats['health_checks'] += 1
+        try:
+            return self._check(instance.handle)
+        except Exception:
+            return False
+
+    def recycle_reason(self, instance: _Instance) -> Optional[str]:
+        """实例是否到期回收（页面数 / 内存），未到期返回 None"""
+        if self.recycle_after_pages and instance.pages >= self.recycle_after_pages:
+            return 'pages'
+        if self.recycle_rss_mb:
+            rss = instance.measure_rss()
+            if rss:
+                self.stats['peak_rss_mb'] = max(self.stats['peak_rss_mb'], rss)
+                if rss > self.recycle_rss_mb:
+                    return 'rss'
+        return None
+
+    def retire(self, instance: _Instance, reason: str):
+        """回收实例：不再分配新租用，没有租用时立即关闭"""
+        if instance.retired:
+            return
+        instance.retired = reason
+        self.stats['recycles'][reason] += 1
+        detail = {
+            'pages': f"已导航 {instance.pages} 个页面",
+            'rss': f"内存 {instance.rss_mb or 0:.0f}MB",
+            'unhealthy': "健康检查失败",
+        }[reason]
+        print(f"  ↻ {self.name}回收实例（{detail}）")
+        if instance.leases <= 0:
+            self._close(instance)
+
+    def _close(self, instance: _Instance):
+        if instance in self.instances:
+            self.instances.remove(instance)
+        try:
+            self._stop(instance.handle)
+        except Exception:
+            pass
+
+    def shutdown(self):
+        """关闭所有实例"""
+        for instance in list(self.instances):
+            self._close(instance)
+
+    def format_stats(self) -> str:
+        """统计摘要"""
+        s = self.stats
+        recycles = '、'.join(f"{label} {s['recycles'][reason]}" for reason, label in RECYCLE_REASONS.items())
+        text = f"启动 {s['launches']} 个实例，租用 {s['leases']} 次（复用 {s['reuses']} 次），回收: {recycles}"
+        if s['peak_rss_mb']:
+            text += f"，峰值内存 {s['peak_rss_mb']:.0f}MB"
+        return text
+
+
+class BrowserPool(_Pool):
+    """Playwright（同步API）浏览器池，只能在创建它的线程中使用"""
+
+    name = '浏览器池'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.playwright = None
+
+    def _start(self, options: Dict):
+        if self.playwright is None:
+            from playwright.sync_api import sync_playwright
+            self.playwright = sync_playwright().start()
+        return _launch_tracked(lambda: self.playwright.chromium.launch(**options))
+
+    def _check(self, browser) -> bool:
+        """连接正常，且新页面能执行脚本"""
+        if not browser.is_connected():
+            return False
+        context = browser.new_context()
+        try:
+            return context.new_page().evaluate('1 + 1') == 2
+        finally:
+            context.close()
+
+    def _stop(self, browser):
+        browser.close()
+
+    def lease(self, launch_options: Optional[Dict] = None, context_options: Optional[Dict] = None,
+              on_page: Optional[Callable] = None) -> 'PageLease':
+        """租用页面
+
+        Args:
+            launch_options: chromium.launch 参数（覆盖 DEFAULT_LAUNCH_OPTIONS），相同参数的租用共用实例
+            context_options: browser.new_context 参数
+            on_page: 每次得到新页面（租用、续租换实例）时调用 on_page(page)，返回值作为 lease.page
+                     （用于接入资源拦截、分阶段统计等）
+        """
+        lease = PageLease(self, {**DEFAULT_LAUNCH_OPTIONS, **(launch_options or {})},
+                          context_options or {}, on_page)
+        lease.open()
+        return lease
+
+    def shutdown(self):
+        super().shutdown()
+        if self.playwright:
+            try:
+                self.playwright.stop()
+            except Exception:
+                pass
+            self.playwright = None
+
+
+class PageLease:
+    """从浏览器池租用的页面（独立上下文）"""
+
+    def __init__(self, pool: BrowserPool, launch_options: Dict, context_options: Dict,
+                 on_page: Optional[Callable] = None):
+        self.pool = pool
+        self.launch_options = launch_options
+        self.context_options = context_options
+        self.on_page = on_page
+        self.instance: Optional[_Instance] = None
+        self.context = None
+        self.page = None
+        self._raw_page = None
+        self.renewals = 0
+
+    @property
+    def browser(self):
+        return self.instance.handle if self.instance else None
+
+    def open(self):
+        """从池中取实例，创建上下文和页面"""
+        instance = self.pool._acquire(self.launch_options)
+        try:
+            self.context = instance.handle.new_context(**self.context_options)
+            page = self.context.new_page()
+        except Exception:
+            self.pool.retire(instance, 'unhealthy')
+            self.pool._release(instance)
+            raise
+        self.instance = instance
+        page.on('framenavigated', instance.count_navigation)
+        self._raw_page = page
+        self.page = page
+        if self.on_page:
+            self.page = self.on_page(page) or page
+        return self.page
+
+    def _page_healthy(self) -> bool:
+        self.pool.stats['health_checks'] += 1
+        try:
+            return self.browser.is_connected() and self._raw_page.evaluate('1 + 1') == 2
+        except Exception:
+            return False
+
+    def renew(self):
+        """续租（在两次搜索之间调用）：实例到期或无响应时换到新实例的新页面，否则继续使用当前页面
+
+        换页面后 Cookie、登录状态和页面上的路由都会丢失，需要保持登录的脚本不应续租。
+        """
+        if self.instance is None:
+            return self.open()
+        reason = self.instance.retired or self.pool.recycle_reason(self.instance)
+        if reason is None and not self._page_healthy():
+            reason = 'unhealthy'
+        if reason is None:
+            return self.page
+        self.pool.retire(self.instance, reason)
+        self.release()
+        self.renewals += 1
+        return self.open()
+
+    def release(self):
+        """归还页面（关闭上下文，实例留在池中）"""
+        if self.instance is None:
+            return
+        try:
+            self.context.close()
+        except Exception:
+            pass
+        instance, self.instance = self.instance, None
+        self.context = self.page = self._raw_page = None
+        self.pool._release(instance)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class DriverPool(_Pool):
+    """Selenium WebDriver 池（url_extractor 使用），factory() 返回新的 WebDriver"""
+
+    name = 'WebDriver池'
+
+    def __init__(self, factory: Callable, **kwargs):
+        super().__init__(**kwargs)
+        self.factory = factory
+
+    def _start(self, options: Dict):
+        driver = self.factory()
+        try:
+            pids = [driver.service.process.pid]
+        except AttributeError:
+            pids = []
+        return driver, pids
+
+    def _check(self, driver) -> bool:
+        return driver.execute_script('return 1 + 1') == 2
+
+    def _stop(self, driver):
+        driver.quit()
+
+    def lease(self) -> 'DriverLease':
+        """租用 WebDriver"""
+        return DriverLease(self)
+
+
+class DriverLease:
+    """从 WebDriver 池租用的浏览器"""
+
+    def __init__(self, pool: DriverPool):
+        self.pool = pool
+        self.instance: Optional[_Instance] = pool._acquire({})
+        self.renewals = 0
+
+    @property
+    def driver(self):
+        return self.instance.handle if self.instance else None
+
+    def renew(self):
+        """续租（每处理一个页面前调用，计为一个页面）：到期或无响应时换新的 WebDriver"""
+        if self.instance is None:
+            self.instance = self.pool._acquire({})
+            return self.driver
+        reason = self.instance.retired or self.pool.recycle_reason(self.instance)
+        if reason is None and not self.pool.is_healthy(self.instance):
+            reason = 'unhealthy'
+        if reason:
+            self.pool.retire(self.instance, reason)
+            self.release()
+            self.instance = self.pool._acquire({})
+            self.renewals += 1
+        self.instance.pages += 1
+        return self.driver
+
+    def release(self):
+        """归还 WebDriver"""
+        if self.instance is None:
+            return
+        instance, self.instance = self.instance, None
+        self.pool._release(instance)
+
+
+# 每个线程一个浏览器池
+_local = threading.local()
+
+
+def get_browser_pool() -> BrowserPool:
+    """当前线程的浏览器池（主线程的池在进程退出时关闭，其他线程结束前应调用 shutdown_browser_pool）"""
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        pool = _local.pool = BrowserPool()
+        if threading.current_thread() is threading.main_thread():
+            atexit.register(pool.shutdown)
+    return pool
+
+
+def shutdown_browser_pool():
+    """关闭当前线程的浏览器池"""
+    pool = getattr(_local, 'pool', None)
+    if pool is not None:
+        pool.shutdown()
+        _local.pool = None
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='浏览器池复用与回收测试')
+    parser.add_argument('--leases', type=int, default=20, help='租用次数')
+    parser.add_argument('--pages', type=int, default=5, help='每次租用导航的页面数')
+    parser.add_argument('--url', default='data:text/html,<p>browser pool</p>', help='导航的页面')
+    parser.add_argument('--recycle-pages', type=int, default=RECYCLE_AFTER_PAGES, help='实例导航多少页面后回收')
+    parser.add_argument('--recycle-rss', type=float, default=RECYCLE_RSS_MB, help='实例内存超过多少MB后回收')
+    parser.add_argument('--no-pool', action='store_true', help='不复用实例（每次租用启动新浏览器）')
+    args = parser.parse_args()
+
+    pool = BrowserPool(recycle_after_pages=args.recycle_pages, recycle_rss_mb=args.recycle_rss,
+                       enabled=not args.no_pool)
+    lease_seconds = []
+    start = time.perf_counter()
+    try:
+        for _ in range(args.leases):
+            t0 = time.perf_counter()
+            lease = pool.lease()
+            lease_seconds.append(time.perf_counter() - t0)
+            for _ in range(args.pages):
+                page = lease.renew()
+                page.goto(args.url)
+            lease.release()
+    finally:
+        pool.shutdown()
+    elapsed = time.perf_counter() - start
+
+    mode = '每次启动新浏览器' if args.no_pool else '复用实例'
+    print("\n" + "="*60)
+    print(f"浏览器池测试（{mode}，{args.leases} 次租用，每次 {args.pages} 个页面）")
+    print("="*60)
+    print(f"总耗时: {elapsed:.2f} 秒")
+    print(f"租用耗时: 首次 {lease_seconds[0] * 1000:.0f}ms，"
+          f"平均 {sum(lease_seconds) / len(lease_seconds) * 1000:.0f}ms，最大 {max(lease_seconds) * 1000:.0f}ms")
+    print(f"浏览器池: {pool.format_stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+招聘平台断路器
+BOSS直聘、国聘、51job、猎聘等平台开始超时或弹出验证码后，原来每个关键词和城市仍会完整地
+重试一遍（每次数十秒的导航超时加重试等待）。本模块按平台统计搜索的失败率和耗时：
+
+    - 失败：搜索抛出异常、搜索函数捕获错误后调用 report_failure（访问失败、未找到结果列表、解析出错等，
+      这些搜索函数不抛出异常而是返回空结果或示例数据）、耗时超过平台的耗时预算
+      （LATENCY_BUDGETS，导航超时加重试通常远超预算）、或页面被重定向到验证码 / 安全验证页（BLOCK_MARKERS）
+    - 关闭（closed）：正常搜索；连续 FAILURE_THRESHOLD 次失败，或最近 WINDOW_SIZE 次中
+      失败比例不低于 ERROR_RATE_THRESHOLD（至少 MIN_CALLS 次）→ 打开
+    - 打开（open）：跳过该平台的搜索，冷却 COOLDOWN_SECONDS 秒后 → 半开
+    - 半开（half_open）：放行一次探测搜索（其余仍跳过），成功 → 关闭，失败 → 重新打开并开始新的冷却
+
+状态变化实时输出，并保存在 BREAKER_FILE（JSON）中，下一次运行在冷却期内仍会跳过该平台。
+跳过一次搜索节省的时间按该平台最近失败搜索的平均耗时估算（没有记录时按耗时预算）。
+main.py 与 specific_requirements_scraper.py 共用同一份平台状态。
+
+使用方法：
+    breakers = get_circuit_breakers()
+    results = breakers.call('boss', self.search_boss_zhipin, keyword, city, config, page=self.page)
+    if results is None:
+        ...                                   # 断路器打开，已跳过
+
+    if breakers.allow('boss'):                # 放行后还有限速等待等准备工作时，分两步调用
+        rate_limiter.wait()
+        results = breakers.execute('boss', self.search_boss_zhipin, keyword, city, config, page=self.page)
+    print(breakers.format_stats())
+
+    python circuit_breaker.py             # 查看各平台状态
+    python circuit_breaker.py --reset     # 关闭所有断路器
+"""
+
+import os
+import json
+import time
+import argparse
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional, Callable
+
+# ==================== 配置区域 ====================
+
+# 是否启用断路器（关闭时所有搜索照常执行，只统计耗时）
+BREAKER_ENABLED = True
+
+# 连续失败多少次后打开
+FAILURE_THRESHOLD = 3
+
+# 按最近多少次搜索计算失败率
+WINDOW_SIZE = 10
+
+# 失败率不低于此值时打开（窗口内至少 MIN_CALLS 次搜索才判断）
+ERROR_RATE_THRESHOLD = 0.5
+MIN_CALLS = 4
+
+# 打开后的冷却时间（秒），之后放行一次探测搜索
+COOLDOWN_SECONDS = 600
+
+# 各平台单次搜索的耗时预算（秒），超过记为失败
+LATENCY_BUDGETS = {
+    'boss': 45,
+    'guopin': 45,
+    '51job': 45,
+    'liepin': 45,
+    'shixiseng': 90,
+}
+DEFAULT_LATENCY_BUDGET = 60
+
+# 页面URL或标题中出现这些内容时视为被拦截（验证码 / 安全验证）
+BLOCK_MARKERS = ['captcha', 'verify', 'security-check', '验证码', '安全验证', '人机验证', '访问异常']
+
+# 状态文件
+BREAKER_FILE = "circuit_breakers.json"
+
+STATE_NAMES = {
+    'closed': '关闭',
+    'open': '打开',
+    'half_open': '半开',
+}
+
+FAILURE_REASONS = {
+    'error': '异常',
+    'failed': '访问受限/访问失败/出错',
+    'slow': '超出耗时预算',
+    'blocked': '验证码/拦截',
+}
+
+
+# 当前线程经断路器执行中的搜索报告的失败
+_current = threading.local()
+
+
+def report_failure(detail: str):
+    """搜索函数捕获错误后没有抛出（返回空结果或示例数据）时调用：经断路器执行时本次搜索记为失败，
+    直接调用搜索函数时不起作用
+
+    只用于拦截、访问失败、异常等信号；正常返回零条结果（冷门关键词/城市）不是失败，不应调用
+    """
+    if getattr(_current, 'executing', False) and _current.failure is None:
+        _current.failure = detail
+
+
+def detect_block(page) -> bool:
+    """页面是否停留在验证码 / 安全验证页（读取失败时不判断）"""
+    if page is None:
+        return False
+    try:
+        text = f"{page.url} {page.title()}".lower()
+    except Exception:
+        return False
+    return any(marker in text for marker in BLOCK_MARKERS)
+
+
+class PlatformBreaker:
+    """单个平台的断路器"""
+
+    def __init__(self, platform: str, saved: Optional[Dict] = None):
+        self.platform = platform
+        self.budget = LATENCY_BUDGETS.get(platform, DEFAULT_LATENCY_BUDGET)
+        saved = saved or {}
+        self.state = saved.get('state', 'closed')
+        self.opened_at = saved.get('opened_at') or 0.0
+        self.last_reason = saved.get('last_reason')
+        self.failed_seconds = deque(saved.get('failed_seconds', []), maxlen=WINDOW_SIZE)
+        self.window = deque(maxlen=WINDOW_SIZE)
+        self.consecutive_failures = 0
+        self.probing = False
+        # 本次运行的统计
+        self.stats = {'calls': 0, 'failures': 0, 'seconds': 0.0, 'skipped': 0, 'saved_seconds': 0.0}
+        self.transitions = []
+
+    def to_dict(self) -> Dict:
+        return {
+            'state': self.state,
+            'opened_at': self.opened_at,
+            'last_reason': self.last_reason,
+            'failed_seconds': list(self.failed_seconds),
+        }
+
+    def _set_state(self, state: str, detail: str):
+        if state == self.state:
+            return
+        text = f"{STATE_NAMES[self.state]} → {STATE_NAMES[state]}"
+        self.transitions.append({'time': datetime.now().strftime('%H:%M:%S'), 'change': text, 'detail': detail})
+        mark = {'open': '⚠', 'half_open': '↻', 'closed': '✓'}[state]
+        print(f"  {mark} 断路器 {self.platform}: {text}（{detail}）")
+        self.state = state
+        if state == 'open':
+            self.opened_at = time.time()
+
+    def allow(self) -> bool:
+        """是否执行本次搜索（跳过时计入节省的时间）"""
+        if not BREAKER_ENABLED or self.state == 'closed':
+            return True
+        if self.state == 'open' and time.time() - self.opened_at >= COOLDOWN_SECONDS:
+            self._set_state('half_open', f"冷却 {COOLDOWN_SECONDS} 秒结束，探测一次")
+        if self.state == 'half_open' and not self.probing:
+            self.probing = True
+            return True
+        self.stats['skipped'] += 1
+        self.stats['saved_seconds'] += self.estimated_cost()
+        return False
+
+    def estimated_cost(self) -> float:
+        """一次失败搜索的预计耗时"""
+        if self.failed_seconds:
+            return sum(self.failed_seconds) / len(self.failed_seconds)
+        return float(self.budget)
+
+    def record(self, seconds: float, reason: Optional[str] = None):
+        """记录一次搜索结果（reason 为 None 表示成功）"""
+        self.stats['calls'] += 1
+        self.stats['seconds'] += seconds
+        self.window.append(reason is None)
+        probe = self.probing
+        self.probing = False
+
+        if reason is None:
+            self.consecutive_failures = 0
+            if probe:
+                self.window.clear()
+                self._set_state('closed', f"探测成功，耗时 {seconds:.1f} 秒")
+            return
+
+        self.stats['failures'] += 1
+        self.consecutive_failures += 1
+        self.failed_seconds.append(round(seconds, 1))
+        self.last_reason = reason
+        if not BREAKER_ENABLED:
+            return
+        if probe:
+            self._set_state('open', f"探测失败: {FAILURE_REASONS[reason]}，再冷却 {COOLDOWN_SECONDS} 秒")
+            return
+        failures = self.window.count(False)
+        if self.consecutive_failures >= FAILURE_THRESHOLD:
+            self._set_state('open', f"连续 {self.consecutive_failures} 次失败: {FAILURE_REASONS[reason]}，"
+                                    f"冷却 {COOLDOWN_SECONDS} 秒")
+        elif len(self.window) >= MIN_CALLS and failures / len(self.window) >= ERROR_RATE_THRESHOLD:
+            self._set_state('open', f"最近 {len(self.window)} 次中 {failures} 次失败: {FAILURE_REASONS[reason]}，"
+                                    f"冷却 {COOLDOWN_SECONDS} 秒")
+
+
+class CircuitBreakers:
+    """各平台断路器（线程安全，同一进程共用一个实例）"""
+
+    def __init__(self, breaker_file: str = BREAKER_FILE):
+        self.breaker_file = breaker_file
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self.breakers: Dict[str, PlatformBreaker] = {}
+        self._saved: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """从磁盘加载上次的状态（文件损坏时忽略）"""
+        if not os.path.exists(self.breaker_file):
+            return
+        try:
+            with open(self.breaker_file, 'r', encoding='utf-8') as f:
+                self._saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ 断路器状态文件读取失败，将重新记录: {str(e)[:50]}")
+            self._saved = {}
+
+    def save(self):
+        """写入磁盘（先写临时文件再替换）"""
+        with self._lock:
+            data = dict(self._saved)
+            data.update({platform: b.to_dict() for platform, b in self.breakers.items()})
+        tmp_file = self.breaker_file + '.tmp'
+        with self._file_lock:
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_file, self.breaker_file)
+            except OSError as e:
+                print(f"⚠ 断路器状态保存失败: {str(e)[:50]}")
+
+    def reset(self):
+        """关闭所有断路器"""
+        with self._lock:
+            self.breakers = {}
+            self._saved = {}
+        self.save()
+
+    def _get(self, platform: str) -> PlatformBreaker:
+        breaker = self.breakers.get(platform)
+        if breaker is None:
+            breaker = self.breakers[platform] = PlatformBreaker(platform, self._saved.get(platform))
+        return breaker
+
+    def allow(self, platform: str) -> bool:
+        """是否执行该平台的本次搜索"""
+        with self._lock:
+            breaker = self._get(platform)
+            state = breaker.state
+            allowed = breaker.allow()
+            changed = breaker.state != state
+        if changed:
+            self.save()
+        return allowed
+
+    def record(self, platform: str, seconds: float, reason: Optional[str] = None):
+        """记录一次搜索结果（reason: None 成功，'error' / 'slow' / 'blocked' 失败）"""
+        with self._lock:
+            breaker = self._get(platform)
+            state = breaker.state
+            breaker.record(seconds, reason)
+            changed = breaker.state != state
+        if changed:
+            self.save()
+
+    def release(self, platform: str):
+        """放行后没有执行搜索（如任务已取消）：归还半开状态的探测机会"""
+        with self._lock:
+            self._get(platform).probing = False
+
+    def call(self, platform: str, search: Callable, *args, page=None):
+        """经断路器执行一次搜索
+
+        Args:
+            platform: 平台
+            search: 搜索函数
+            page: 搜索使用的页面（用于判断是否停留在验证码页，None 表示不判断）
+
+        Returns:
+            搜索结果；断路器打开而跳过时返回 None
+        """
+        if not self.allow(platform):
+            return None
+        return self.execute(platform, search, *args, page=page)
+
+    def execute(self, platform: str, search: Callable, *args, page=None):
+        """执行一次已放行（allow 返回 True）的搜索，按异常、报告的失败、验证码页和耗时预算记录结果"""
+        start = time.perf_counter()
+        reason = None
+        results = []
+        _current.executing, _current.failure = True, None
+        try:
+            results = search(*args)
+        except Exception as e:
+            print(f"    ✗ {platform} 搜索出错: {str(e)[:100]}")
+            reason = 'error'
+        finally:
+            failure = _current.failure
+            _current.executing, _current.failure = False, None
+        seconds = time.perf_counter() - start
+        if reason is None:
+            if failure:
+                reason = 'failed'
+            elif detect_block(page):
+                reason = 'blocked'
+            elif seconds > LATENCY_BUDGETS.get(platform, DEFAULT_LATENCY_BUDGET):
+                reason = 'slow'
+        self.record(platform, seconds, reason)
+        return results
+
+    def saved_seconds(self) -> float:
+        """本次运行跳过搜索节省的时间（估算）"""
+        with self._lock:
+            return sum(b.stats['saved_seconds'] for b in self.breakers.values())
+
+    def format_stats(self) -> str:
+        """本次运行各平台的断路器状态、失败次数、跳过次数和节省的时间"""
+        with self._lock:
+            breakers = list(self.breakers.values())
+        if not breakers:
+            return "断路器: 无数据"
+        lines = [f"{'平台':<10} {'状态':<4} {'搜索':>5} {'失败':>5} {'跳过':>5} {'节省(秒)':>9}  状态变化"]
+        for b in breakers:
+            s = b.stats
+            changes = '；'.join(f"{t['time']} {t['change']}" for t in b.transitions) or '-'
+            lines.append(f"{b.platform:<10} {STATE_NAMES[b.state]:<4} {s['calls']:>5} {s['failures']:>5} "
+                         f"{s['skipped']:>5} {s['saved_seconds']:>9.0f}  {changes}")
+        lines.append(f"跳过搜索共节省约 {sum(b.stats['saved_seconds'] for b in breakers):.0f} 秒")
+        return "\n".join(lines)
+
+
+_breakers: Optional[CircuitBreakers] = None
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> CircuitBreakers:
+    """进程内共享的断路器"""
+    global _breakers
+    with _breakers_lock:
+        if _breakers is None:
+            _breakers = CircuitBreakers()
+        return _breakers
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='招聘平台断路器状态')
+    parser.add_argument('--reset', action='store_true', help='关闭所有断路器')
+    args = parser.parse_args()
+
+    breakers = CircuitBreakers()
+    if args.reset:
+        breakers.reset()
+        print("✓ 断路器已全部关闭")
+        return
+    if not breakers._saved:
+        print("没有断路器记录")
+        return
+    now = time.time()
+    print(f"{'平台':<10} {'状态':<4} {'冷却剩余(秒)':>12} {'最近失败原因':<12}")
+    for platform, saved in sorted(breakers._saved.items()):
+        state = saved.get('state', 'closed')
+        remaining = max(COOLDOWN_SECONDS - (now - (saved.get('opened_at') or 0)), 0) if state == 'open' else 0
+        print(f"{platform:<10} {STATE_NAMES.get(state, state):<4} {remaining:>12.0f} "
+              f"{FAILURE_REASONS.get(saved.get('last_reason'), '-'):<12}")
+
+
+if __name__ == '__main__':
+    main()
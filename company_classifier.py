@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公司类型多模式匹配
+按公司名称判断四大、八大、大厂、央国企等类型时，原来对每个名称逐个关键词做子串查找
+（或每次过滤都拼接 '|'.join(...) 正则）。本模块把所有分组的关键词编译成一个 Aho-Corasick 自动机，
+一次扫描公司名称即可得到命中的全部分组：
+
+    - 分组的关键词来自 specific_requirements_config（FOUR_BIG、EIGHT_BIG、BIG_COMPANIES、
+      STATE_OWNED_KEYWORDS、FOREIGN_KEYWORDS），也可以传入自定义分组
+    - 忽略大小写的分组只对英文字母做大小写折叠，其余分组区分大小写
+    - 英文关键词按词边界匹配：关键词首/尾的英文字母或数字不能紧挨着其他英文字母或数字
+      （'EY' 命中 "安永EY"、"EY Consulting"，不命中 "Disney"、"Honeywell"），这一点与原来的 in 判断不同
+    - 重复出现的公司名称走 LRU 缓存
+    - match_series / mask / classify_series 对 DataFrame 列先去重再匹配，结果按位置映射回整列
+
+使用方法：
+    classifier = get_company_classifier()
+    classifier.company_type('中国建设银行股份有限公司')       # → '央国企'
+    classifier.has('普华永道中天会计师事务所', '四大')        # → True
+    df[classifier.mask(df['公司名称'], '央国企')]             # 过滤 DataFrame
+
+性能测试见 benchmark_classifier.py。
+"""
+
+import threading
+from functools import lru_cache
+from typing import List, Dict, Iterable, Optional, FrozenSet
+
+# ==================== 配置区域 ====================
+
+# 名称匹配结果的 LRU 缓存条数
+CACHE_SIZE = 65536
+
+# 判断公司类型的优先级（先命中的分组为准）
+TYPE_PRIORITY = ['四大', '八大', '大厂', '央国企']
+
+# 命中这些分组时不判为央国企（外企名称常带"（中国）"、"集团"等）
+STATE_OWNED_EXCLUDE = ['外企']
+
+# 只对英文字母做大小写折叠，保证折叠前后位置一一对应
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def _is_word_char(ch: str) -> bool:
+    """英文字母或数字（英文关键词的词边界按此判断）"""
+    return ch.isascii() and ch.isalnum()
+
+
+class AhoCorasick:
+    """多模式子串匹配自动机，输出命中的分组位掩码"""
+
+    def __init__(self, patterns: Iterable[tuple]):
+        """
+        Args:
+            patterns: (关键词, 分组位, 是否忽略大小写) 序列
+        """
+        self.goto: List[Dict[str, int]] = [{}]
+        self.outputs: List[int] = [0]                 # 状态 → 无需校验的分组位
+        # 状态 → [(分组位, 关键词, 是否校验原文大小写, 是否校验左边界, 是否校验右边界)]
+        self.checks: List[List[tuple]] = [[]]
+        for pattern, bit, ignore_case in patterns:
+            if not pattern:
+                continue
+            folded = pattern.translate(_ASCII_LOWER)
+            state = 0
+            for ch in folded:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.outputs.append(0)
+                    self.checks.append([])
+                state = nxt
+            exact = not ignore_case and folded != pattern
+            left, right = _is_word_char(pattern[0]), _is_word_char(pattern[-1])
+            if exact or left or right:
+                self.checks[state].append((bit, pattern, exact, left, right))
+            else:
+                self.outputs[state] |= bit
+        self._build()
+
+    def _build(self):
+        """计算失败指针，并把转移补全为确定自动机（匹配时每个字符一次字典查找）"""
+        goto = self.goto
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        index = 0
+        while index < len(queue):
+            state = queue[index]
+            index += 1
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                # 以当前位置结尾的更短关键词（失败指针链）一并输出
+                self.outputs[nxt] |= self.outputs[fail[nxt]]
+                if self.checks[fail[nxt]]:
+                    self.checks[nxt] = self.checks[nxt] + self.checks[fail[nxt]]
+                queue.append(nxt)
+        # 按广度优先顺序补全转移：缺失的边取失败状态的转移（根状态缺失的边回到根）
+        for state in queue:
+            for ch, target in goto[fail[state]].items():
+                goto[state].setdefault(ch, target)
+
+    def search(self, text: str) -> int:
+        """扫描一遍文本，返回命中的分组位掩码"""
+        goto, outputs, checks = self.goto, self.outputs, self.checks
+        folded = text.translate(_ASCII_LOWER)
+        state = 0
+        mask = 0
+        for end, ch in enumerate(folded):
+            state = goto[state].get(ch, 0)
+            mask |= outputs[state]
+            if checks[state]:
+                for bit, pattern, exact, left, right in checks[state]:
+                    start = end - len(pattern) + 1
+                    if exact and text[start:end + 1] != pattern:
+                        continue
+                    if left and start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if right and end + 1 < len(text) and _is_word_char(text[end + 1]):
+                        continue
+                    mask |= bit
+        return mask
+
+
+class CompanyClassifier:
+    """公司名称分类器（线程安全：自动机构建后只读，LRU 缓存自带锁）"""
+
+    def __init__(self, groups: Dict[str, List[str]], ignore_case: Iterable[str] = (),
+                 cache_size: int = CACHE_SIZE):
+        """
+        Args:
+            groups: 分组名 → 关键词列表
+            ignore_case: 忽略英文大小写的分组
+            cache_size: LRU 缓存条数
+        """
+        self.groups = list(groups)
+        self.bits = {name: 1 << i for i, name in enumerate(self.groups)}
+        ignore_case = set(ignore_case)
+        self.automaton = AhoCorasick(
+            (keyword, self.bits[name], name in ignore_case)
+            for name, keywords in groups.items() for keyword in keywords)
+        self._match = lru_cache(maxsize=cache_size)(self.automaton.search)
+
+    # ---------- 单个名称 ----------
+
+    def match(self, name: Optional[str]) -> int:
+        """命中的分组位掩码"""
+        if not name or not isinstance(name, str):
+            return 0
+        return self._match(name)
+
+    def groups_of(self, name: Optional[str]) -> FrozenSet[str]:
+        """命中的分组名"""
+        mask = self.match(name)
+        return frozenset(g for g, bit in self.bits.items() if mask & bit)
+
+    def has(self, name: Optional[str], group: str) -> bool:
+        """名称是否命中分组"""
+        return bool(self.match(name) & self.bits[group])
+
+    def _type_from_mask(self, mask: int) -> Optional[str]:
+        for group in TYPE_PRIORITY:
+            bit = self.bits.get(group, 0)
+            if not mask & bit:
+                continue
+            if group == '央国企' and any(mask & self.bits.get(g, 0) for g in STATE_OWNED_EXCLUDE):
+                continue
+            return group
+        return None
+
+    def company_type(self, name: Optional[str]) -> Optional[str]:
+        """按 TYPE_PRIORITY 判断公司类型，未命中返回 None"""
+        return self._type_from_mask(self.match(name))
+
+    def cache_info(self):
+        return self._match.cache_info()
+
+    # ---------- 批量（DataFrame 列） ----------
+
+    def match_series(self, names):
+        """整列名称的位掩码（numpy 数组）：去重后逐个匹配，再按位置映射回整列"""
+        import numpy as np
+        import pandas as pd
+
+        codes, uniques = pd.factorize(pd.Series(names), use_na_sentinel=True)
+        unique_masks = np.fromiter((self.match(name) for name in uniques), dtype=np.int64, count=len(uniques))
+        # 空值（code = -1）映射到末尾追加的 0
+        return np.append(unique_masks, 0)[codes]
+
+    def mask(self, names, group: str):
+        """整列名称是否命中分组（布尔 Series，索引与输入一致，空值为 False）"""
+        import pandas as pd
+
+        names = pd.Series(names)
+        return pd.Series((self.match_series(names) & self.bits[group]) != 0, index=names.index)
+
+    def classify_series(self, names, default: Optional[str] = None):
+        """整列名称的公司类型（Series，未命中为 default）"""
+        import numpy as np
+        import pandas as pd
+
+        names = pd.Series(names)
+        masks = self.match_series(names)
+        unique_masks, inverse = np.unique(masks, return_inverse=True)
+        labels = np.array([self._type_from_mask(int(m)) or default for m in unique_masks], dtype=object)
+        return pd.Series(labels[inverse.reshape(-1)], index=names.index)
+
+
+def build_default_groups() -> Dict[str, List[str]]:
+    """specific_requirements_config 中的公司分组"""
+    from specific_requirements_config import (
+        FOUR_BIG, EIGHT_BIG, BIG_COMPANIES, STATE_OWNED_KEYWORDS, FOREIGN_KEYWORDS
+    )
+    return {
+        '四大': FOUR_BIG,
+        '八大': EIGHT_BIG,
+        '大厂': BIG_COMPANIES,
+        '央国企': STATE_OWNED_KEYWORDS,
+        '外企': FOREIGN_KEYWORDS,
+    }
+
+
+_classifier: Optional[CompanyClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_company_classifier() -> CompanyClassifier:
+    """进程内共享的默认分类器（四大忽略英文大小写）"""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = CompanyClassifier(build_default_groups(), ignore_case=['四大'])
+        return _classifier
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抓取任务断点续跑
+每个搜索任务的进度（配置序号、关键词、城市、页码、状态）保存在 jobs.db 的 crawl_tasks 表中，
+进程中途退出后，在同一个抓取窗口内重新运行会跳过已完成的任务，只重试失败或未完成的任务。
+已完成任务的新岗位URL也记录在 crawl_tasks 中：这些岗位在退出前已入库，续跑时去重不会再返回它们，
+由 completed_urls 取回后并入本次运行的结果，保证仍会出现在通知中。
+
+抓取窗口：一次 run_once 对应 crawl_runs 表中的一条记录。
+    - 上一次运行未完成，且开始时间距今不超过窗口长度（默认 SCRAPE_INTERVAL）→ 续跑
+    - 否则开始新的运行
+
+使用方法（查看当前运行进度）：
+    python scheduler.py --progress
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Set, Tuple
+
+# 任务状态
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# 时间格式（与 posted_jobs.created_at 一致）
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def task_key(task: Dict) -> str:
+    """任务唯一标识（去重后的搜索任务以 关键词 × 城市 区分）"""
+    return f"{task['keyword']}|{task['city']}"
+
+
+class CrawlCheckpoint:
+    """抓取进度记录（线程安全，并发worker共用一个实例）"""
+
+    def __init__(self, db_file: str):
+        """初始化进度记录
+
+        Args:
+            db_file: 数据库文件路径
+        """
+        self.db_file = db_file
+        self.run_id: Optional[int] = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self.init_tables()
+
+    def init_tables(self):
+        """创建进度表"""
+        with self._lock, self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS crawl_runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TIMESTAMP NOT NULL,
+                    finished_at TIMESTAMP,
+                    status TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS crawl_tasks (
+                    run_id INTEGER NOT NULL,
+                    task_key TEXT NOT NULL,
+                    config_index INTEGER,
+                    keyword TEXT,
+                    city TEXT,
+                    page INTEGER DEFAULT 1,
+                    status TEXT NOT NULL,
+                    attempts INTEGER DEFAULT 0,
+                    jobs INTEGER DEFAULT 0,
+                    error TEXT,
+                    updated_at TIMESTAMP,
+                    urls TEXT,
+                    PRIMARY KEY (run_id, task_key)
+                )
+            ''')
+            # 旧版本的表没有 urls 字段，尝试补充
+            try:
+                self._conn.execute('ALTER TABLE crawl_tasks ADD COLUMN urls TEXT')
+            except sqlite3.OperationalError:
+                pass
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    def start_or_resume(self, window_seconds: int) -> Tuple[int, bool]:
+        """开始新的运行，或续跑窗口内未完成的运行
+
+        Returns:
+            (run_id, 是否为续跑)
+        """
+        now = datetime.now()
+        window_start = (now - timedelta(seconds=window_seconds)).strftime(TIME_FORMAT)
+        with self._lock, self._conn:
+            row = self._conn.execute('''
+                SELECT run_id FROM crawl_runs
+                WHERE status = 'running' AND started_at >= ?
+                ORDER BY run_id DESC LIMIT 1
+            ''', (window_start,)).fetchone()
+            if row:
+                self.run_id = row[0]
+                return self.run_id, True
+
+            # 窗口外遗留的未完成运行不再续跑
+            self._conn.execute("UPDATE crawl_runs SET status = 'abandoned' WHERE status = 'running'")
+            cursor = self._conn.execute('INSERT INTO crawl_runs (started_at, status) VALUES (?, ?)',
+                                        (now.strftime(TIME_FORMAT), 'running'))
+            self.run_id = cursor.lastrowid
+            return self.run_id, False
+
+    def register_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """登记本次运行的任务，返回仍需执行的任务（跳过已完成的）"""
+        now = datetime.now().strftime(TIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.executemany('''
+                INSERT OR IGNORE INTO crawl_tasks (run_id, task_key, config_index, keyword, city, page, status, updated_at)
+                VALUES (?, ?, ?, ?, ?, 1, ?, ?)
+            ''', [(self.run_id, task_key(t), t['config_index'], t['keyword'], t['city'], STATUS_PENDING, now)
+                  for t in tasks])
+            done = self._completed_keys()
+        return [t for t in tasks if task_key(t) not in done]
+
+    def completed_urls(self) -> Dict[str, List[str]]:
+        """本次运行已完成任务的新岗位URL：{任务标识: URL列表}"""
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT task_key, urls FROM crawl_tasks WHERE run_id = ? AND status = ? AND urls IS NOT NULL
+            ''', (self.run_id, STATUS_DONE)).fetchall()
+        return {key: json.loads(urls) for key, urls in rows}
+
+    def _completed_keys(self) -> Set[str]:
+        rows = self._conn.execute('SELECT task_key FROM crawl_tasks WHERE run_id = ? AND status = ?',
+                                  (self.run_id, STATUS_DONE)).fetchall()
+        return {r[0] for r in rows}
+
+    def mark_running(self, task: Dict):
+        """标记任务开始执行"""
+        with self._lock, self._conn:
+            self._conn.execute('''
+                UPDATE crawl_tasks SET status = ?, attempts = attempts + 1, updated_at = ?
+                WHERE run_id = ? AND task_key = ?
+            ''', (STATUS_RUNNING, datetime.now().strftime(TIME_FORMAT), self.run_id, task_key(task)))
+
+    def mark_done(self, task: Dict, jobs: int, urls: Optional[List[str]] = None):
+        """标记任务完成
+
+        Args:
+            task: 搜索任务
+            jobs: 新岗位数
+            urls: 新岗位URL（续跑时用于取回已入库的新岗位）
+        """
+        with self._lock, self._conn:
+            self._conn.execute('''
+                UPDATE crawl_tasks SET status = ?, jobs = ?, error = NULL, updated_at = ?, urls = ?
+                WHERE run_id = ? AND task_key = ?
+            ''', (STATUS_DONE, jobs, datetime.now().strftime(TIME_FORMAT),
+                  json.dumps(urls, ensure_ascii=False) if urls is not None else None,
+                  self.run_id, task_key(task)))
+
+    def mark_failed(self, task: Dict, error: str):
+        """标记任务失败（同一窗口内重新运行时会重试）"""
+        with self._lock, self._conn:
+            self._conn.execute('''
+                UPDATE crawl_tasks SET status = ?, error = ?, updated_at = ?
+                WHERE run_id = ? AND task_key = ?
+            ''', (STATUS_FAILED, error[:200], datetime.now().strftime(TIME_FORMAT), self.run_id, task_key(task)))
+
+    def finish(self) -> bool:
+        """所有任务完成时结束本次运行，返回是否已结束（仍有失败任务时保持续跑状态）"""
+        with self._lock, self._conn:
+            remaining = self._conn.execute('SELECT COUNT(*) FROM crawl_tasks WHERE run_id = ? AND status != ?',
+                                           (self.run_id, STATUS_DONE)).fetchone()[0]
+            if remaining:
+                return False
+            self._conn.execute('UPDATE crawl_runs SET status = ?, finished_at = ? WHERE run_id = ?',
+                               ('finished', datetime.now().strftime(TIME_FORMAT), self.run_id))
+            return True
+
+    def progress(self, run_id: Optional[int] = None) -> Optional[Dict]:
+        """查询运行进度（默认最近一次运行）"""
+        with self._lock:
+            if run_id is None:
+                row = self._conn.execute('SELECT MAX(run_id) FROM crawl_runs').fetchone()
+                run_id = row[0] if row else None
+            if run_id is None:
+                return None
+            run = self._conn.execute('SELECT run_id, started_at, finished_at, status FROM crawl_runs WHERE run_id = ?',
+                                     (run_id,)).fetchone()
+            counts = dict(self._conn.execute('''
+                SELECT status, COUNT(*) FROM crawl_tasks WHERE run_id = ? GROUP BY status
+            ''', (run_id,)).fetchall())
+            jobs = self._conn.execute('SELECT COALESCE(SUM(jobs), 0) FROM crawl_tasks WHERE run_id = ?',
+                                      (run_id,)).fetchone()[0]
+            failed = self._conn.execute('''
+                SELECT config_index, keyword, city, attempts, error FROM crawl_tasks
+                WHERE run_id = ? AND status = ? ORDER BY config_index LIMIT 10
+            ''', (run_id, STATUS_FAILED)).fetchall()
+        return {
+            'run_id': run[0],
+            'started_at': run[1],
+            'finished_at': run[2],
+            'status': run[3],
+            'counts': counts,
+            'total': sum(counts.values()),
+            'jobs': jobs,
+            'failed_tasks': failed,
+        }
+
+    def format_progress(self, run_id: Optional[int] = None) -> str:
+        """格式化运行进度"""
+        p = self.progress(run_id)
+        if not p:
+            return "暂无抓取记录"
+        counts = p['counts']
+        done = counts.get(STATUS_DONE, 0)
+        lines = [
+            "=" * 60,
+            f"抓取进度（运行 #{p['run_id']}，{p['status']}）",
+            "=" * 60,
+            f"  开始时间: {p['started_at']}" + (f"，结束时间: {p['finished_at']}" if p['finished_at'] else ""),
+            f"  任务: {done}/{p['total']} 完成"
+            + (f" ({done / p['total']:.0%})" if p['total'] else ""),
+            f"  待执行 {counts.get(STATUS_PENDING, 0)}，执行中 {counts.get(STATUS_RUNNING, 0)}，"
+            f"失败 {counts.get(STATUS_FAILED, 0)}",
+            f"  新增岗位: {p['jobs']}",
+        ]
+        if p['failed_tasks']:
+            lines.append("  失败任务:")
+            for config_index, keyword, city, attempts, error in p['failed_tasks']:
+                lines.append(f"    [配置{config_index}] {keyword} | {city}（尝试 {attempts} 次）: {(error or '')[:50]}")
+        lines.append("=" * 60)
+        return "\n".join(lines)
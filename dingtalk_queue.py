@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+钉钉机器人消息发送队列
+后台线程异步发送，调用方只需入队，不再阻塞抓取线程
+
+功能：
+    - 令牌桶限速：每个机器人（webhook）每分钟最多 DINGTALK_RATE_PER_MINUTE 条，令牌状态保存在发送队列
+      数据库中，多个进程共用发送队列时共享同一限额
+    - 连接复用：所有消息共用一个 requests.Session
+    - 失败重试：限流错误码、HTTP 5xx、网络异常按指数退避重试；其他错误码直接判定失败
+    - 长消息拆分：Markdown 超过 MAX_MARKDOWN_BYTES 时按行拆分为多条，标题追加（1/n）
+    - 持久化：消息先写入 SQLite 发送队列，进程重启后继续发送未送达的消息
+    - 多进程安全：发送前用条件 UPDATE 认领消息（pending → sending），多个进程共用发送队列时
+      同一条消息只会被一个进程发送；认领后进程退出的消息在 CLAIM_TIMEOUT_SECONDS 后可被重新认领
+
+使用方法：
+    from dingtalk_queue import enqueue_markdown
+    enqueue_markdown(webhook, "标题", "Markdown内容")
+
+    python dingtalk_queue.py --status     # 查看发送队列状态
+    python dingtalk_queue.py --flush      # 发送队列中未送达的消息
+"""
+
+import json
+import time
+import atexit
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional
+
+import requests
+
+# ==================== 配置区域 ====================
+
+# 发送队列数据库
+SPOOL_FILE = "dingtalk_spool.db"
+
+# 每个机器人每分钟最多发送的消息数（钉钉限制为20条/分钟）
+DINGTALK_RATE_PER_MINUTE = 20
+
+# 单条 Markdown 消息最大字节数（钉钉限制约20000字节，留出标题和分页标记的余量）
+MAX_MARKDOWN_BYTES = 18000
+
+# 限流错误码（发送过快）
+RATE_LIMIT_ERRCODES = {130101, 410100}
+
+# 最大重试次数
+MAX_ATTEMPTS = 6
+
+# 重试退避：第 n 次失败后等待 min(RETRY_BASE_SECONDS * 2^(n-1), RETRY_MAX_SECONDS) 秒
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 300
+
+# 触发限流后暂停该机器人发送的秒数
+RATE_LIMIT_PAUSE_SECONDS = 60
+
+# 请求超时（秒）
+REQUEST_TIMEOUT = 10
+
+# 认领消息后多久未完成视为发送进程已退出，消息可被重新认领（秒，需远大于 REQUEST_TIMEOUT）
+CLAIM_TIMEOUT_SECONDS = 120
+
+# 进程退出前最多等待多少秒把队列发完（未发完的留在发送队列中，下次启动继续）
+FLUSH_TIMEOUT_ON_EXIT = 120
+
+# 消息状态
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+
+
+def split_markdown(title: str, text: str, max_bytes: int = MAX_MARKDOWN_BYTES) -> List[Dict]:
+    """按行拆分过长的 Markdown，返回 [{'title', 'text'}]"""
+    if len(text.encode('utf-8')) <= max_bytes:
+        return [{'title': title, 'text': text}]
+
+    chunks = []
+    current = []
+    current_bytes = 0
+    for line in text.splitlines(keepends=True):
+        line_bytes = len(line.encode('utf-8'))
+        # 单行超长时按字符硬拆分
+        while line_bytes > max_bytes:
+            cut = len(line)
+            while len(line[:cut].encode('utf-8')) > max_bytes:
+                cut = cut * max_bytes // len(line[:cut].encode('utf-8')) or 1
+            if current:
+                chunks.append(''.join(current))
+                current, current_bytes = [], 0
+            chunks.append(line[:cut])
+            line = line[cut:]
+            line_bytes = len(line.encode('utf-8'))
+        if current_bytes + line_bytes > max_bytes and current:
+            chunks.append(''.join(current))
+            current, current_bytes = [], 0
+        current.append(line)
+        current_bytes += line_bytes
+    if current:
+        chunks.append(''.join(current))
+
+    total = len(chunks)
+    return [{'title': f"{title}（{i}/{total}）", 'text': chunk if i == 1 else f"**（续 {i}/{total}）**\n\n{chunk}"}
+            for i, chunk in enumerate(chunks, 1)]
+
+
+class TokenBucket:
+    """令牌桶（容量与每分钟速率相同）
+
+    令牌状态保存在发送队列数据库的 dingtalk_rate 表中（每个机器人一行），共用发送队列的多个进程
+    共享同一个令牌桶，同一机器人的总发送速率不会超过限制；时间使用 time.time()，各进程之间可比较
+    """
+
+    def __init__(self, conn: sqlite3.Connection, webhook: str, rate_per_minute: int):
+        self._conn = conn
+        self.webhook = webhook
+        self.capacity = rate_per_minute
+        self.rate = rate_per_minute / 60.0
+        with self._conn:
+            self._conn.execute('''
+                INSERT OR IGNORE INTO dingtalk_rate (webhook, tokens, updated, paused_until) VALUES (?, ?, ?, 0)
+            ''', (webhook, float(rate_per_minute), time.time()))
+
+    def wait_time(self) -> float:
+        """距离下一个可用令牌的秒数（0 表示可以立即发送）"""
+        now = time.time()
+        tokens, updated, paused_until = self._conn.execute(
+            'SELECT tokens, updated, paused_until FROM dingtalk_rate WHERE webhook = ?', (self.webhook,)).fetchone()
+        if now < paused_until:
+            return paused_until - now
+        tokens = min(self.capacity, tokens + max(now - updated, 0.0) * self.rate)
+        if tokens >= 1:
+            return 0.0
+        return (1 - tokens) / self.rate
+
+    def try_consume(self) -> bool:
+        """有可用令牌时消耗一个，返回是否成功（补充和扣减在一条 UPDATE 中完成，多进程并发时不会超发）"""
+        now = time.time()
+        refilled = 'MIN(:capacity, tokens + MAX(:now - updated, 0) * :rate)'
+        with self._conn:
+            cursor = self._conn.execute(f'''
+                UPDATE dingtalk_rate SET tokens = {refilled} - 1, updated = :now
+                WHERE webhook = :webhook AND paused_until <= :now AND {refilled} >= 1
+            ''', {'capacity': self.capacity, 'now': now, 'rate': self.rate, 'webhook': self.webhook})
+        return cursor.rowcount == 1
+
+    def pause(self, seconds: float):
+        """触发限流后暂停发送并清空令牌"""
+        now = time.time()
+        with self._conn:
+            self._conn.execute('UPDATE dingtalk_rate SET tokens = 0, updated = ?, paused_until = ? WHERE webhook = ?',
+                               (now, now + seconds, self.webhook))
+
+
+class DingTalkQueue:
+    """钉钉消息发送队列（后台线程发送）"""
+
+    def __init__(self, spool_file: str = SPOOL_FILE, rate_per_minute: int = DINGTALK_RATE_PER_MINUTE):
+        """初始化发送队列
+
+        Args:
+            spool_file: 发送队列数据库路径
+            rate_per_minute: 每个机器人每分钟最多发送的消息数
+        """
+        self.rate_per_minute = rate_per_minute
+        self.session = requests.Session()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._conn = sqlite3.connect(spool_file, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS dingtalk_spool (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    webhook TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER DEFAULT 0,
+                    next_attempt_at REAL DEFAULT 0,
+                    last_error TEXT,
+                    created_at TIMESTAMP,
+                    sent_at TIMESTAMP
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS dingtalk_rate (
+                    webhook TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    paused_until REAL DEFAULT 0
+                )
+            ''')
+
+    # ---------- 入队 ----------
+
+    def enqueue_payload(self, webhook: str, payload: Dict) -> int:
+        """将任意消息体加入发送队列，返回消息ID"""
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute('''
+                    INSERT INTO dingtalk_spool (webhook, payload, status, created_at) VALUES (?, ?, ?, ?)
+                ''', (webhook, json.dumps(payload, ensure_ascii=False), STATUS_PENDING,
+                      datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            self._wakeup.notify()
+        self.start()
+        return cursor.lastrowid
+
+    def enqueue_markdown(self, webhook: str, title: str, text: str) -> List[int]:
+        """将 Markdown 消息加入发送队列（过长时自动拆分），返回消息ID列表"""
+        return [self.enqueue_payload(webhook, {'msgtype': 'markdown', 'markdown': part})
+                for part in split_markdown(title, text)]
+
+    # ---------- 发送 ----------
+
+    def _bucket(self, webhook: str) -> TokenBucket:
+        if webhook not in self._buckets:
+            self._buckets[webhook] = TokenBucket(self._conn, webhook, self.rate_per_minute)
+        return self._buckets[webhook]
+
+    def _next_message(self):
+        """取出下一条可发送的消息，返回 (消息, 需要等待的秒数)；队列为空时返回 (None, None)
+
+        发送中（sending）的消息的 next_attempt_at 为认领到期时间，到期前同一机器人的后续消息不发送
+        """
+        now = time.time()
+        rows = self._conn.execute('''
+            SELECT id, webhook, payload, attempts, next_attempt_at, status FROM dingtalk_spool
+            WHERE status IN (?, ?) ORDER BY id
+        ''', (STATUS_PENDING, STATUS_SENDING)).fetchall()
+        if not rows:
+            return None, None
+        min_wait = None
+        seen_webhooks = set()
+        for row in rows:
+            # 同一机器人的消息按入队顺序发送（拆分后的多条消息不会乱序）
+            if row[1] in seen_webhooks:
+                continue
+            seen_webhooks.add(row[1])
+            if row[5] == STATUS_SENDING:
+                wait = row[4] - now
+            else:
+                wait = max(row[4] - now, self._bucket(row[1]).wait_time())
+            if wait <= 0:
+                return row[:5], 0.0
+            min_wait = wait if min_wait is None else min(min_wait, wait)
+        return None, min_wait
+
+    def _claim(self, msg_id: int) -> bool:
+        """认领消息（pending 或认领已到期的 sending → sending），返回是否认领成功
+
+        多个进程共用发送队列时，同一条消息只有一个进程认领成功
+        """
+        now = time.time()
+        with self._conn:
+            cursor = self._conn.execute('''
+                UPDATE dingtalk_spool SET status = ?, next_attempt_at = ?
+                WHERE id = ? AND (status = ? OR (status = ? AND next_attempt_at <= ?))
+            ''', (STATUS_SENDING, now + CLAIM_TIMEOUT_SECONDS, msg_id, STATUS_PENDING, STATUS_SENDING, now))
+        return cursor.rowcount == 1
+
+    def _post(self, webhook: str, payload: str) -> Dict:
+        """发送一条消息，返回 {'ok', 'retry', 'rate_limited', 'error'}"""
+        try:
+            response = self.session.post(webhook, data=payload.encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'}, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            return {'ok': False, 'retry': True, 'rate_limited': False, 'error': str(e)[:200]}
+        if response.status_code != 200:
+            return {'ok': False, 'retry': response.status_code >= 500 or response.status_code == 429,
+                    'rate_limited': response.status_code == 429, 'error': f"HTTP {response.status_code}"}
+        try:
+            result = response.json()
+        except ValueError:
+            return {'ok': False, 'retry': True, 'rate_limited': False, 'error': '响应不是JSON'}
+        errcode = result.get('errcode')
+        if errcode == 0:
+            return {'ok': True, 'retry': False, 'rate_limited': False, 'error': None}
+        rate_limited = errcode in RATE_LIMIT_ERRCODES
+        return {'ok': False, 'retry': rate_limited, 'rate_limited': rate_limited,
+                'error': f"{errcode}: {result.get('errmsg')}"}
+
+    def _deliver(self, row):
+        """发送一条消息并更新队列状态"""
+        msg_id, webhook, payload, attempts, _ = row
+        result = self._post(webhook, payload)
+        attempts += 1
+
+        with self._lock, self._conn:
+            if result['ok']:
+                self._conn.execute('UPDATE dingtalk_spool SET status = ?, attempts = ?, sent_at = ? WHERE id = ?',
+                                   (STATUS_SENT, attempts, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), msg_id))
+                print(f"✓ 钉钉消息发送成功（#{msg_id}）")
+                return
+
+            if result['rate_limited']:
+                self._bucket(webhook).pause(RATE_LIMIT_PAUSE_SECONDS)
+            if result['retry'] and attempts < MAX_ATTEMPTS:
+                delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+                self._conn.execute('''
+                    UPDATE dingtalk_spool SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+                    WHERE id = ?
+                ''', (STATUS_PENDING, attempts, time.time() + delay, result['error'], msg_id))
+                print(f"⚠ 钉钉消息发送失败（#{msg_id}，{result['error']}），{delay} 秒后重试")
+            else:
+                self._conn.execute('UPDATE dingtalk_spool SET status = ?, attempts = ?, last_error = ? WHERE id = ?',
+                                   (STATUS_FAILED, attempts, result['error'], msg_id))
+                print(f"✗ 钉钉消息发送失败（#{msg_id}）: {result['error']}")
+
+    def _run(self):
+        """后台发送线程"""
+        while True:
+            with self._lock:
+                row, wait = self._next_message()
+                if row is None:
+                    if self._stopping:
+                        return
+                    # 队列为空时等待新消息，有待重试消息时等到可发送时间
+                    self._wakeup.wait(timeout=wait if wait is not None else None)
+                    continue
+                # 令牌已被其他进程用掉、或消息已被其他进程认领时重新选取（先取令牌，认领失败时令牌作废，不会超发）
+                if not self._bucket(row[1]).try_consume() or not self._claim(row[0]):
+                    continue
+            try:
+                self._deliver(row)
+            except Exception as e:
+                print(f"✗ 发送队列出错: {str(e)[:100]}")
+                time.sleep(1)
+
+    def start(self):
+        """启动后台发送线程（会继续发送上次未送达的消息）"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='dingtalk-sender', daemon=True)
+            self._thread.start()
+
+    def pending_count(self) -> int:
+        """待发送（含发送中）的消息数"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM dingtalk_spool WHERE status IN (?, ?)',
+                                      (STATUS_PENDING, STATUS_SENDING)).fetchone()[0]
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待队列发送完毕，返回是否全部发送（超时后剩余消息保留在发送队列中）"""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending_count():
+            if deadline is not None and time.monotonic() >= deadline:
+                print(f"⚠ 仍有 {self.pending_count()} 条钉钉消息未发送，已保存，下次启动时继续发送")
+                return False
+            with self._lock:
+                self._wakeup.notify()
+            time.sleep(0.5)
+        return True
+
+    def status(self) -> Dict[str, int]:
+        """各状态的消息数"""
+        with self._lock:
+            return dict(self._conn.execute('SELECT status, COUNT(*) FROM dingtalk_spool GROUP BY status').fetchall())
+
+
+_queue: Optional[DingTalkQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> DingTalkQueue:
+    """进程内共享的发送队列（令牌桶保存在发送队列数据库中，跨进程共享）"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = DingTalkQueue()
+            atexit.register(_queue.flush, FLUSH_TIMEOUT_ON_EXIT)
+        return _queue
+
+
+def enqueue_markdown(webhook: str, title: str, text: str) -> List[int]:
+    """将 Markdown 消息加入进程共享的发送队列"""
+    return get_queue().enqueue_markdown(webhook, title, text)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='钉钉消息发送队列')
+    parser.add_argument('--status', action='store_true', help='查看发送队列状态')
+    parser.add_argument('--flush', action='store_true', help='发送队列中未送达的消息')
+    args = parser.parse_args()
+
+    queue = DingTalkQueue()
+    if args.flush:
+        print(f"待发送 {queue.pending_count()} 条消息...")
+        queue.flush()
+    status = queue.status()
+    print(f"发送队列: 待发送 {status.get(STATUS_PENDING, 0)}，发送中 {status.get(STATUS_SENDING, 0)}，"
+          f"已发送 {status.get(STATUS_SENT, 0)}，"
+          f"失败 {status.get(STATUS_FAILED, 0)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+岗位数据流式导出Excel
+从 SQLite 分批读取 posted_jobs，逐行写入 openpyxl write_only 工作簿，内存占用与历史数据量无关
+
+导出模式：
+    - full:   全量导出（按 created_at 倒序，与 pandas 导出的内容一致）
+    - delta:  增量导出，只导出上次导出之后新增的岗位
+              水位线（已导出的最大 created_at）持久化在 jobs.db 的 export_state 表中
+              created_at 只精确到秒，因此按 created_at >= 水位线 读取，并跳过水位线那一秒内
+              已导出过的URL（boundary_urls），避免同一秒内导出后才提交的岗位被永久漏掉
+
+使用方法：
+    python excel_export.py                   # 全量导出
+    python excel_export.py --mode delta      # 增量导出
+"""
+
+import json
+import time
+import sqlite3
+import itertools
+import argparse
+from datetime import datetime
+from typing import Optional, Dict, Iterator, Iterable, Set, Tuple
+
+from openpyxl import Workbook
+
+# ==================== 配置区域 ====================
+
+DB_FILE = "jobs.db"
+
+# 每次从数据库读取的行数
+EXPORT_CHUNK_SIZE = 5000
+
+# 导出字段：(数据库字段, Excel表头)，与 Scheduler.export_to_excel 的9个字段一致
+EXPORT_COLUMNS = [
+    ('company_name', '公司名称'),
+    ('company_type', '公司类型'),
+    ('work_location', '工作地点'),
+    ('recruit_type', '招聘类型'),
+    ('recruit_target', '招聘对象'),
+    ('job_title', '岗位(大都不限专业)'),
+    ('update_time', '更新时间'),
+    ('deadline', '投递截止'),
+    ('url', '相关链接'),
+]
+
+# 默认水位线名称（不同导出任务可使用各自的水位线）
+DEFAULT_WATERMARK = 'scheduler_excel'
+
+
+def ensure_state_table(conn: sqlite3.Connection):
+    """创建导出水位线表"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS export_state (
+            name TEXT PRIMARY KEY,
+            watermark TEXT,
+            updated_at TIMESTAMP
+        )
+    ''')
+    # 旧版本的表没有 boundary_urls 字段，尝试补充
+    try:
+        conn.execute('ALTER TABLE export_state ADD COLUMN boundary_urls TEXT')
+    except sqlite3.OperationalError:
+        pass
+    conn.commit()
+
+
+def get_watermark(conn: sqlite3.Connection, name: str = DEFAULT_WATERMARK) -> Optional[str]:
+    """读取水位线（从未导出过时返回 None）"""
+    ensure_state_table(conn)
+    return get_export_state(conn, name)[0]
+
+
+def get_export_state(conn: sqlite3.Connection,
+                     name: str = DEFAULT_WATERMARK) -> Tuple[Optional[str], Set[str]]:
+    """读取水位线及水位线那一秒内已导出的URL（从未导出过时返回 (None, 空集合)）"""
+    ensure_state_table(conn)
+    row = conn.execute('SELECT watermark, boundary_urls FROM export_state WHERE name = ?',
+                       (name,)).fetchone()
+    if not row:
+        return None, set()
+    return row[0], set(json.loads(row[1])) if row[1] else set()
+
+
+def set_watermark(conn: sqlite3.Connection, watermark: str, name: str = DEFAULT_WATERMARK,
+                  boundary_urls: Optional[Iterable[str]] = None):
+    """保存水位线
+
+    Args:
+        conn: 数据库连接
+        watermark: 已导出的最大 created_at
+        name: 水位线名称
+        boundary_urls: created_at 等于水位线、且已导出的URL
+    """
+    ensure_state_table(conn)
+    conn.execute('INSERT OR REPLACE INTO export_state (name, watermark, updated_at, boundary_urls) '
+                 'VALUES (?, ?, ?, ?)',
+                 (name, watermark, datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                  json.dumps(sorted(boundary_urls or []), ensure_ascii=False)))
+    conn.commit()
+
+
+def iter_job_rows(conn: sqlite3.Connection, since: Optional[str] = None,
+                  chunk_size: int = EXPORT_CHUNK_SIZE,
+                  skip_urls: Optional[Set[str]] = None) -> Iterator[tuple]:
+    """分批读取岗位（按 created_at 倒序）
+
+    Args:
+        conn: 数据库连接
+        since: 只读取 created_at 大于等于该值的岗位（None 表示全部）
+        chunk_size: 每批读取的行数
+        skip_urls: 需要跳过的URL（水位线那一秒内已导出过的岗位）
+
+    Yields:
+        (EXPORT_COLUMNS 各字段..., created_at)
+    """
+    columns = ', '.join(col for col, _ in EXPORT_COLUMNS)
+    sql = f'SELECT {columns}, created_at FROM posted_jobs'
+    params = ()
+    if since is not None:
+        sql += ' WHERE created_at >= ?'
+        params = (since,)
+    sql += ' ORDER BY created_at DESC'
+
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for row in rows:
+            if skip_urls and row[-2] in skip_urls:
+                continue
+            yield row
+
+
+def export_jobs(db_file: str = DB_FILE, excel_file: Optional[str] = None, mode: str = 'full',
+                watermark_name: str = DEFAULT_WATERMARK, chunk_size: int = EXPORT_CHUNK_SIZE) -> Dict:
+    """流式导出岗位到Excel
+
+    Args:
+        db_file: 数据库文件路径
+        excel_file: 输出文件名（默认按日期/时间生成）
+        mode: 'full' 全量导出，'delta' 只导出水位线之后的新岗位
+        watermark_name: 水位线名称
+        chunk_size: 每批读取的行数
+
+    Returns:
+        {'file': 文件名（无数据时为 None）, 'rows': 行数, 'seconds': 耗时, 'watermark': 新水位线}
+    """
+    if mode not in ('full', 'delta'):
+        raise ValueError(f"不支持的导出模式: {mode}")
+
+    start_time = time.perf_counter()
+    conn = sqlite3.connect(db_file, timeout=30)
+    try:
+        since, boundary_urls = get_export_state(conn, watermark_name) if mode == 'delta' else (None, set())
+
+        if excel_file is None:
+            if mode == 'delta':
+                excel_file = f"job_hunting_results_delta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            else:
+                excel_file = f"job_hunting_results_{datetime.now().strftime('%Y%m%d')}.xlsx"
+
+        rows = iter_job_rows(conn, since, chunk_size, skip_urls=boundary_urls)
+        first_row = next(rows, None)
+        if first_row is None:
+            # 没有需要导出的数据时不创建工作簿，也不生成文件
+            return {'file': None, 'rows': 0, 'seconds': time.perf_counter() - start_time, 'watermark': since}
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Sheet1')
+        sheet.append([header for _, header in EXPORT_COLUMNS])
+
+        row_count = 0
+        max_created_at = since
+        # 水位线不变时，之前记录的同一秒URL仍然有效
+        max_urls = set(boundary_urls)
+        for row in itertools.chain([first_row], rows):
+            sheet.append(row[:-1])
+            row_count += 1
+            created_at = row[-1]
+            if created_at is None:
+                continue
+            created_at = str(created_at)
+            if max_created_at is None or created_at > max_created_at:
+                max_created_at = created_at
+                max_urls = {row[-2]}
+            elif created_at == max_created_at:
+                max_urls.add(row[-2])
+
+        workbook.save(excel_file)
+
+        # 文件保存成功后才推进水位线，导出失败时下次会重新导出这些岗位
+        if max_created_at is not None:
+            set_watermark(conn, max_created_at, watermark_name, max_urls)
+
+        return {'file': excel_file, 'rows': row_count, 'seconds': time.perf_counter() - start_time,
+                'watermark': max_created_at}
+    finally:
+        conn.close()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='流式导出岗位到Excel')
+    parser.add_argument('--db', default=DB_FILE, help='数据库文件路径')
+    parser.add_argument('--mode', choices=['full', 'delta'], default='full', help='导出模式')
+    parser.add_argument('--output', default=None, help='输出文件名')
+    args = parser.parse_args()
+
+    print("正在导出岗位到Excel...")
+    try:
+        result = export_jobs(args.db, args.output, args.mode)
+    except Exception as e:
+        print(f"✗ 导出失败: {str(e)}")
+        return
+
+    if result['file']:
+        print(f"✓ 导出成功！")
+        print(f"📁 文件: {result['file']}")
+        print(f"📊 共 {result['rows']} 个岗位，耗时 {result['seconds']:.1f} 秒")
+    else:
+        print("⚠ 没有需要导出的岗位")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+定时任务调度引擎
+在同一台机器上统一调度应届生求职网、AceOffer、内推码、市场雷达等抓取任务
+
+功能：
+    - 每个任务独立的触发器：cron 表达式（分 时 日 月 周）或固定间隔
+    - 随机抖动：实际执行时间在计划时间后随机推迟 0~jitter 秒
+    - 并发控制：最多同时运行 MAX_CONCURRENCY 个任务，使用浏览器的任务共享 BROWSER_SLOTS 个名额
+    - 浏览器复用：使用浏览器的任务固定在 BROWSER_SLOTS 个常驻线程中运行，
+      线程内的浏览器池（Playwright 对象只能在创建它的线程中使用）跨多次运行保留，引擎退出时关闭
+    - 锁文件：引擎锁防止启动多个调度进程，任务锁防止同一任务重叠运行（包括手动运行）
+    - 错过处理（misfire）：停机期间错过的多次执行合并为一次；
+      超过 misfire_grace 秒的错过直接跳过，等待下一次计划时间
+    - 状态持久化：下次执行时间、最近结果、运行历史保存在 jobs.db 中，重启后继续
+
+使用方法：
+    python job_scheduler.py                   # 启动调度引擎
+    python job_scheduler.py --list            # 查看任务状态与下次执行时间
+    python job_scheduler.py --run aceoffer    # 立即运行一个任务（同样受任务锁保护）
+"""
+
+import os
+import time
+import random
+import sqlite3
+import argparse
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Callable, Set
+
+from browser_pool import shutdown_browser_pool
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ==================== 配置区域 ====================
+
+# 调度状态数据库（与抓取数据共用）
+DB_FILE = "jobs.db"
+
+# 锁文件目录
+LOCK_DIR = ".locks"
+
+# 最多同时运行的任务数
+MAX_CONCURRENCY = 2
+
+# 同时使用浏览器的任务数（Playwright/DrissionPage 共用一台机器的内存和CPU）
+BROWSER_SLOTS = 1
+
+# 调度循环检查间隔（秒）
+TICK_SECONDS = 30
+
+# 时间格式（与 posted_jobs.created_at 一致）
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# ==================== 任务函数 ====================
+
+def run_yingjiesheng_job():
+    """应届生求职网抓取 + 钉钉推送（scheduler.Scheduler.run_once）"""
+    from scheduler import DBManager, DingTalkSender, Scheduler
+    db_manager = DBManager()
+    try:
+        Scheduler(db_manager, DingTalkSender()).run_once()
+    finally:
+        db_manager.close()
+
+
+def run_aceoffer_job():
+    """AceOffer 当天更新岗位抓取（覆盖更新Excel）"""
+    import asyncio
+    import aceoffer_scraper
+    aceoffer_scraper.ONLY_TODAY_UPDATED = True
+    aceoffer_scraper.MAX_PAGES = 20
+    asyncio.run(aceoffer_scraper.AceOfferRecruitScraper().run(overwrite=True))
+
+
+def run_referral_job():
+    """校招内推码抓取"""
+    from referral_crawler import run_crawler
+    run_crawler()
+
+
+def run_radar_job():
+    """市场雷达日报（需要浏览器已保持登录状态）"""
+    from market_radar_qwen import MarketRadarQwen
+    MarketRadarQwen().run(skip_login=True)
+
+
+# 任务配置
+#   id:            任务名称
+#   target:        任务函数
+#   cron/interval: 触发方式二选一（cron 为 "分 时 日 月 周"，interval 为秒数）
+#   jitter:        随机推迟上限（秒）
+#   misfire_grace: 错过计划时间多久以内仍补跑（秒，None 表示总是补跑一次）
+#   browser:       是否占用浏览器名额
+#   run_on_start:  首次调度时是否立即执行（仅对没有历史状态的任务生效）
+JOBS = [
+    {'id': 'yingjiesheng', 'target': run_yingjiesheng_job, 'interval': 10800, 'jitter': 300,
+     'misfire_grace': 3600, 'browser': True, 'run_on_start': True},
+    {'id': 'aceoffer', 'target': run_aceoffer_job, 'cron': '0 8,18 * * *', 'jitter': 120,
+     'misfire_grace': 2 * 3600, 'browser': True},
+    {'id': 'referral', 'target': run_referral_job, 'cron': '0 9 * * *', 'jitter': 300,
+     'misfire_grace': 6 * 3600, 'browser': False},
+    {'id': 'radar', 'target': run_radar_job, 'cron': '30 9 * * *', 'jitter': 300,
+     'misfire_grace': 3 * 3600, 'browser': True},
+]
+
+
+# ==================== 触发器 ====================
+
+class IntervalTrigger:
+    """固定间隔触发器"""
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+
+    def next_after(self, dt: datetime) -> datetime:
+        """dt 之后的下一次触发时间"""
+        return dt + timedelta(seconds=self.seconds)
+
+    def describe(self) -> str:
+        if self.seconds % 3600 == 0:
+            return f"每 {self.seconds // 3600} 小时"
+        return f"每 {self.seconds} 秒"
+
+
+class CronTrigger:
+    """cron 表达式触发器（分 时 日 月 周，周日为0或7）
+
+    支持 *、*/n、a-b、a-b/n 和逗号分隔的列表；日和周同时指定时满足其一即可（与 cron 一致）
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    # 最多向后查找的天数
+    MAX_SEARCH_DAYS = 366 * 5
+
+    def __init__(self, expr: str):
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron 表达式需要5个字段: {expr}")
+        self.expr = expr
+        fields = [self._parse_field(p, lo, hi) for p, (lo, hi) in zip(parts, self.FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = fields
+        self.weekdays = {d % 7 for d in weekdays}
+        self.day_restricted = parts[2] != '*'
+        self.weekday_restricted = parts[4] != '*'
+
+    @staticmethod
+    def _parse_field(text: str, lo: int, hi: int) -> Set[int]:
+        """解析单个字段"""
+        values = set()
+        for item in text.split(','):
+            step = 1
+            if '/' in item:
+                item, step_text = item.split('/', 1)
+                step = int(step_text)
+            if item == '*':
+                start, end = lo, hi
+            elif '-' in item:
+                start, end = (int(x) for x in item.split('-', 1))
+            else:
+                start = end = int(item)
+            if start < lo or end > hi or start > end or step < 1:
+                raise ValueError(f"cron 字段超出范围: {text}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        """dt 之后的下一次触发时间（精确到分钟）"""
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=self.MAX_SEARCH_DAYS)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"cron 表达式没有可触发的时间: {self.expr}")
+
+    def describe(self) -> str:
+        return f"cron({self.expr})"
+
+
+# ==================== 锁文件 ====================
+
+class FileLock:
+    """非阻塞文件锁（Unix 使用 flock，进程退出时自动释放；其他平台使用独占创建）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    def acquire(self) -> bool:
+        """尝试加锁，已被占用时返回 False"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if fcntl:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+        else:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                return False
+            os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        """释放锁"""
+        if self._fd is None:
+            return
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        else:
+            os.close(self._fd)
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self._fd = None
+
+
+# ==================== 状态存储 ====================
+
+class SchedulerStore:
+    """调度状态（SQLite，线程安全）"""
+
+    def __init__(self, db_file: str = DB_FILE):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS scheduler_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    next_run_at TIMESTAMP,
+                    last_run_at TIMESTAMP,
+                    last_status TEXT,
+                    last_duration REAL,
+                    last_error TEXT,
+                    run_count INTEGER DEFAULT 0,
+                    fail_count INTEGER DEFAULT 0
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS scheduler_runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    scheduled_at TIMESTAMP,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP,
+                    status TEXT,
+                    duration REAL,
+                    error TEXT
+                )
+            ''')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_next_run(self, job_id: str) -> Optional[datetime]:
+        """读取任务的下次执行时间（没有记录时返回 None）"""
+        with self._lock:
+            row = self._conn.execute('SELECT next_run_at FROM scheduler_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if not row or not row[0]:
+            return None
+        return datetime.strptime(row[0], TIME_FORMAT)
+
+    def set_next_run(self, job_id: str, next_run: datetime):
+        """保存任务的下次执行时间"""
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR IGNORE INTO scheduler_jobs (job_id) VALUES (?)', (job_id,))
+            self._conn.execute('UPDATE scheduler_jobs SET next_run_at = ? WHERE job_id = ?',
+                               (next_run.strftime(TIME_FORMAT), job_id))
+
+    def record_run(self, job_id: str, scheduled_at: datetime, started_at: datetime, status: str,
+                   duration: float = 0.0, error: Optional[str] = None):
+        """记录一次运行结果（status: success/failed/misfired/locked）"""
+        finished_at = datetime.now().strftime(TIME_FORMAT)
+        with self._lock, self._conn:
+            self._conn.execute('''
+                INSERT INTO scheduler_runs (job_id, scheduled_at, started_at, finished_at, status, duration, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (job_id, scheduled_at.strftime(TIME_FORMAT), started_at.strftime(TIME_FORMAT), finished_at,
+                  status, duration, error))
+            self._conn.execute('INSERT OR IGNORE INTO scheduler_jobs (job_id) VALUES (?)', (job_id,))
+            if status in ('success', 'failed'):
+                self._conn.execute('''
+                    UPDATE scheduler_jobs
+                    SET last_run_at = ?, last_status = ?, last_duration = ?, last_error = ?,
+                        run_count = run_count + 1, fail_count = fail_count + ?
+                    WHERE job_id = ?
+                ''', (started_at.strftime(TIME_FORMAT), status, duration, error,
+                      1 if status == 'failed' else 0, job_id))
+            else:
+                self._conn.execute('UPDATE scheduler_jobs SET last_status = ? WHERE job_id = ?', (status, job_id))
+
+    def job_rows(self) -> Dict[str, tuple]:
+        """所有任务的状态"""
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT job_id, next_run_at, last_run_at, last_status, last_duration, run_count, fail_count
+                FROM scheduler_jobs
+            ''').fetchall()
+        return {r[0]: r[1:] for r in rows}
+
+
+# ==================== 调度引擎 ====================
+
+class ScheduledJob:
+    """调度任务"""
+
+    def __init__(self, job_id: str, target: Callable, trigger, jitter: int = 0,
+                 misfire_grace: Optional[int] = None, browser: bool = False, run_on_start: bool = False):
+        self.id = job_id
+        self.target = target
+        self.trigger = trigger
+        self.jitter = jitter
+        self.misfire_grace = misfire_grace
+        self.browser = browser
+        self.run_on_start = run_on_start
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'ScheduledJob':
+        """根据 JOBS 中的配置创建任务"""
+        if 'cron' in config:
+            trigger = CronTrigger(config['cron'])
+        else:
+            trigger = IntervalTrigger(config['interval'])
+        return cls(config['id'], config['target'], trigger, config.get('jitter', 0),
+                   config.get('misfire_grace'), config.get('browser', False), config.get('run_on_start', False))
+
+    def next_run_after(self, dt: datetime) -> datetime:
+        """计算下次执行时间（含随机抖动）"""
+        return self.trigger.next_after(dt) + timedelta(seconds=random.uniform(0, self.jitter))
+
+
+class SchedulerEngine:
+    """定时任务调度引擎"""
+
+    def __init__(self, jobs: List[ScheduledJob], db_file: str = DB_FILE, max_concurrency: int = MAX_CONCURRENCY,
+                 browser_slots: int = BROWSER_SLOTS, lock_dir: str = LOCK_DIR):
+        self.jobs = {job.id: job for job in jobs}
+        self.store = SchedulerStore(db_file)
+        self.max_concurrency = max(1, max_concurrency)
+        self.browser_slots = max(1, browser_slots)
+        self.lock_dir = lock_dir
+        self._browser_slots = threading.Semaphore(self.browser_slots)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='job')
+        # 浏览器任务的常驻线程：每次运行复用线程内的浏览器池，免去每轮冷启动
+        self._browser_executor = ThreadPoolExecutor(max_workers=self.browser_slots, thread_name_prefix='browser-job')
+        self._running: Set[str] = set()
+        self._running_lock = threading.Lock()
+        self._engine_lock = FileLock(os.path.join(lock_dir, 'scheduler_engine.lock'))
+
+    def _job_lock(self, job_id: str) -> FileLock:
+        return FileLock(os.path.join(self.lock_dir, f"job_{job_id}.lock"))
+
+    def _init_schedule(self):
+        """为没有历史状态的任务计算首次执行时间"""
+        now = datetime.now()
+        for job in self.jobs.values():
+            if self.store.get_next_run(job.id) is None:
+                next_run = now if job.run_on_start else job.next_run_after(now)
+                self.store.set_next_run(job.id, next_run)
+
+    def run_job(self, job: ScheduledJob, scheduled_at: datetime) -> str:
+        """执行一次任务（任务锁 + 浏览器名额），返回运行状态"""
+        started_at = datetime.now()
+        lock = self._job_lock(job.id)
+        if not lock.acquire():
+            print(f"⚠ [{job.id}] 上一次运行尚未结束（任务锁被占用），本次跳过")
+            self.store.record_run(job.id, scheduled_at, started_at, 'locked')
+            return 'locked'
+
+        try:
+            if job.browser:
+                wait_start = time.perf_counter()
+                self._browser_slots.acquire()
+                waited = time.perf_counter() - wait_start
+                if waited > 1:
+                    print(f"  [{job.id}] 等待浏览器名额 {waited:.0f} 秒")
+            try:
+                print(f"\n▶ [{job.id}] 开始运行（计划时间 {scheduled_at.strftime(TIME_FORMAT)}）")
+                run_start = time.perf_counter()
+                try:
+                    job.target()
+                    status, error = 'success', None
+                except Exception as e:
+                    status, error = 'failed', str(e)[:500]
+                    print(f"✗ [{job.id}] 运行出错: {str(e)[:100]}")
+                duration = time.perf_counter() - run_start
+            finally:
+                if job.browser:
+                    self._browser_slots.release()
+            self.store.record_run(job.id, scheduled_at, started_at, status, duration, error)
+            print(f"{'✓' if status == 'success' else '✗'} [{job.id}] 运行结束，耗时 {duration:.0f} 秒")
+            return status
+        finally:
+            lock.release()
+
+    def _run_and_reschedule(self, job: ScheduledJob, scheduled_at: datetime):
+        """线程池中执行任务，结束后计算下次执行时间"""
+        try:
+            self.run_job(job, scheduled_at)
+        finally:
+            next_run = job.next_run_after(datetime.now())
+            self.store.set_next_run(job.id, next_run)
+            print(f"  [{job.id}] 下次运行: {next_run.strftime(TIME_FORMAT)}")
+            with self._running_lock:
+                self._running.discard(job.id)
+
+    def tick(self):
+        """检查并提交到期的任务"""
+        now = datetime.now()
+        for job in self.jobs.values():
+            with self._running_lock:
+                if job.id in self._running:
+                    continue
+            next_run = self.store.get_next_run(job.id)
+            if next_run is None or next_run > now:
+                continue
+
+            # 错过处理：停机期间错过的多次执行只补跑一次；错过太久则跳过
+            lateness = (now - next_run).total_seconds()
+            if job.misfire_grace is not None and lateness > job.misfire_grace:
+                new_next = job.next_run_after(now)
+                print(f"⚠ [{job.id}] 错过计划时间 {next_run.strftime(TIME_FORMAT)}（已晚 {lateness / 60:.0f} 分钟），"
+                      f"跳过，下次运行: {new_next.strftime(TIME_FORMAT)}")
+                self.store.record_run(job.id, next_run, now, 'misfired')
+                self.store.set_next_run(job.id, new_next)
+                continue
+
+            # 达到最大并发时留到下一轮检查
+            with self._running_lock:
+                if len(self._running) >= self.max_concurrency:
+                    continue
+                self._running.add(job.id)
+            executor = self._browser_executor if job.browser else self._executor
+            executor.submit(self._run_and_reschedule, job, next_run)
+
+    def print_jobs(self):
+        """打印任务状态"""
+        rows = self.store.job_rows()
+        print("=" * 80)
+        print("调度任务")
+        print("=" * 80)
+        for job in self.jobs.values():
+            next_run, last_run, last_status, last_duration, run_count, fail_count = rows.get(
+                job.id, (None, None, None, None, 0, 0))
+            print(f"  {job.id:<14} {job.trigger.describe():<22} 下次: {next_run or '-'}")
+            print(f"  {'':<14} 最近: {last_run or '-'} {last_status or ''}"
+                  + (f"（{last_duration:.0f} 秒）" if last_duration else "")
+                  + f"，累计 {run_count or 0} 次，失败 {fail_count or 0} 次"
+                  + ("，占用浏览器" if job.browser else ""))
+        print("=" * 80)
+
+    def _shutdown_browser_threads(self):
+        """在每个浏览器任务线程中关闭该线程的浏览器池，然后结束线程"""
+        # 每个关闭任务等待屏障，保证 browser_slots 个任务分别落在不同线程上
+        barrier = threading.Barrier(self.browser_slots)
+
+        def shutdown():
+            shutdown_browser_pool()
+            try:
+                barrier.wait(timeout=60)
+            except threading.BrokenBarrierError:
+                pass
+
+        for _ in range(self.browser_slots):
+            self._browser_executor.submit(shutdown)
+        self._browser_executor.shutdown(wait=True)
+
+    def run_forever(self):
+        """启动调度循环（引擎锁保证只有一个调度进程）"""
+        if not self._engine_lock.acquire():
+            print(f"✗ 调度引擎已在运行（锁文件: {self._engine_lock.path}）")
+            return
+        try:
+            self._init_schedule()
+            print(f"\n调度引擎已启动：{len(self.jobs)} 个任务，最大并发 {self.max_concurrency}，"
+                  f"浏览器名额 {self.browser_slots}")
+            self.print_jobs()
+            print("\n提示: 按 Ctrl+C 可停止服务\n")
+            while True:
+                self.tick()
+                time.sleep(TICK_SECONDS)
+        finally:
+            self._executor.shutdown(wait=True)
+            self._shutdown_browser_threads()
+            self._engine_lock.release()
+            self.store.close()
+
+
+def build_jobs(job_ids: Optional[List[str]] = None) -> List[ScheduledJob]:
+    """根据 JOBS 配置创建任务（可只选择部分任务）"""
+    return [ScheduledJob.from_config(c) for c in JOBS if job_ids is None or c['id'] in job_ids]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='定时任务调度引擎')
+    parser.add_argument('--list', action='store_true', help='查看任务状态与下次执行时间')
+    parser.add_argument('--run', metavar='JOB_ID', help='立即运行指定任务')
+    parser.add_argument('--jobs', nargs='+', help='只调度指定的任务')
+    args = parser.parse_args()
+
+    engine = SchedulerEngine(build_jobs(args.jobs))
+    if args.list or args.run:
+        try:
+            if args.list:
+                engine.print_jobs()
+            elif args.run not in engine.jobs:
+                print(f"✗ 未知任务: {args.run}（可选: {', '.join(engine.jobs)}）")
+            else:
+                engine.run_job(engine.jobs[args.run], datetime.now())
+        finally:
+            engine.store.close()
+        return
+
+    try:
+        engine.run_forever()
+    except KeyboardInterrupt:
+        print("\n\n调度引擎已停止")
+
+
+if __name__ == '__main__':
+    main()
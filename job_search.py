@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+岗位库索引升级与全文检索
+posted_jobs 原本只有 url 主键，按时间排序或按公司/岗位/地点查询都要全表扫描。
+本模块按版本号（PRAGMA user_version）依次升级 jobs.db：
+
+    版本1: created_at、company_name、(company_type, created_at) 索引
+    版本2: FTS5 全文索引 posted_jobs_fts（job_title、company_name、work_location），
+           由 INSERT/UPDATE/DELETE 触发器与 posted_jobs 保持同步，升级时回填已有数据
+    版本3: url → FTS rowid 映射表 posted_jobs_fts_docid，UPDATE/DELETE 触发器按 rowid 删除全文索引行
+           （url 是 FTS 的 UNINDEXED 列，按 url 删除每行都要全表扫描）
+
+DBManager.init_database 启动时自动升级，也可以单独运行 --upgrade。
+
+中文没有空格分词，FTS5 使用 trigram 分词器（任意子串匹配）：
+    - 3个字及以上的词走全文索引
+    - 1~2个字的词（如"上海"、"腾讯"）trigram 无法索引，在候选结果上做子串过滤
+    - 默认按入库顺序返回最新的 top-k（索引倒序扫描，命中 k 条即停止），--rank 按相关度（bm25）排序
+
+使用方法：
+    python job_search.py 产品经理                          # 全文检索
+    python job_search.py 数据分析 --location 上海 --limit 50
+    python job_search.py --company 字节跳动 --type 大厂
+    python job_search.py --upgrade                         # 只执行升级
+    python job_search.py --info                            # 查看版本与索引
+"""
+
+import time
+import sqlite3
+import argparse
+from typing import List, Dict, Optional, Tuple
+
+# ==================== 配置区域 ====================
+
+# 数据库文件路径
+DB_FILE = "jobs.db"
+
+# 默认返回条数
+DEFAULT_LIMIT = 20
+
+# trigram 分词器可索引的最短词长
+MIN_FTS_TERM_LENGTH = 3
+
+# 全文检索的字段
+FTS_COLUMNS = ['job_title', 'company_name', 'work_location']
+
+# 查询结果字段
+RESULT_COLUMNS = ['url', 'job_title', 'company_name', 'company_type', 'work_location', 'recruit_type',
+                  'recruit_target', 'update_time', 'deadline', 'created_at']
+
+# 版本升级语句（按版本号依次执行，每个版本一个事务）
+MIGRATIONS = {
+    1: [
+        'CREATE INDEX IF NOT EXISTS idx_posted_jobs_created_at ON posted_jobs(created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_posted_jobs_company_name ON posted_jobs(company_name)',
+        'CREATE INDEX IF NOT EXISTS idx_posted_jobs_company_type ON posted_jobs(company_type, created_at)',
+    ],
+    2: [
+        # url 不参与分词，用于关联回 posted_jobs；rowid 由 FTS 自增，即入库顺序
+        # （posted_jobs 是文本主键，VACUUM 可能重排其 rowid，因此不复用）
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS posted_jobs_fts USING fts5(
+               url UNINDEXED, job_title, company_name, work_location, tokenize = 'trigram'
+           )''',
+        '''CREATE TRIGGER IF NOT EXISTS posted_jobs_fts_insert AFTER INSERT ON posted_jobs BEGIN
+               INSERT INTO posted_jobs_fts (url, job_title, company_name, work_location)
+               VALUES (new.url, new.job_title, new.company_name, new.work_location);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS posted_jobs_fts_delete AFTER DELETE ON posted_jobs BEGIN
+               DELETE FROM posted_jobs_fts WHERE url = old.url;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS posted_jobs_fts_update AFTER UPDATE ON posted_jobs BEGIN
+               DELETE FROM posted_jobs_fts WHERE url = old.url;
+               INSERT INTO posted_jobs_fts (url, job_title, company_name, work_location)
+               VALUES (new.url, new.job_title, new.company_name, new.work_location);
+           END''',
+        # 回填已有数据
+        '''INSERT INTO posted_jobs_fts (url, job_title, company_name, work_location)
+           SELECT url, job_title, company_name, work_location FROM posted_jobs ORDER BY created_at, rowid''',
+    ],
+    3: [
+        # 显式 INTEGER PRIMARY KEY 在 VACUUM 后保持不变，作为 FTS 行的 rowid
+        '''CREATE TABLE IF NOT EXISTS posted_jobs_fts_docid (
+               id INTEGER PRIMARY KEY,
+               url TEXT NOT NULL UNIQUE
+           )''',
+        # 沿用已有 FTS 行的 rowid，入库顺序不变，无需重建全文索引
+        '''INSERT OR IGNORE INTO posted_jobs_fts_docid (id, url)
+           SELECT rowid, url FROM posted_jobs_fts ORDER BY rowid''',
+        'DROP TRIGGER IF EXISTS posted_jobs_fts_insert',
+        'DROP TRIGGER IF EXISTS posted_jobs_fts_delete',
+        'DROP TRIGGER IF EXISTS posted_jobs_fts_update',
+        '''CREATE TRIGGER posted_jobs_fts_insert AFTER INSERT ON posted_jobs BEGIN
+               INSERT INTO posted_jobs_fts_docid (url) VALUES (new.url);
+               INSERT INTO posted_jobs_fts (rowid, url, job_title, company_name, work_location)
+               VALUES ((SELECT id FROM posted_jobs_fts_docid WHERE url = new.url),
+                       new.url, new.job_title, new.company_name, new.work_location);
+           END''',
+        '''CREATE TRIGGER posted_jobs_fts_delete AFTER DELETE ON posted_jobs BEGIN
+               DELETE FROM posted_jobs_fts WHERE rowid = (SELECT id FROM posted_jobs_fts_docid WHERE url = old.url);
+               DELETE FROM posted_jobs_fts_docid WHERE url = old.url;
+           END''',
+        '''CREATE TRIGGER posted_jobs_fts_update AFTER UPDATE ON posted_jobs BEGIN
+               DELETE FROM posted_jobs_fts WHERE rowid = (SELECT id FROM posted_jobs_fts_docid WHERE url = old.url);
+               DELETE FROM posted_jobs_fts_docid WHERE url = old.url;
+               INSERT INTO posted_jobs_fts_docid (url) VALUES (new.url);
+               INSERT INTO posted_jobs_fts (rowid, url, job_title, company_name, work_location)
+               VALUES ((SELECT id FROM posted_jobs_fts_docid WHERE url = new.url),
+                       new.url, new.job_title, new.company_name, new.work_location);
+           END''',
+    ],
+}
+
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """当前数据库版本"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def upgrade_schema(conn: sqlite3.Connection, verbose: bool = True) -> int:
+    """将数据库升级到最新版本，返回升级后的版本号
+
+    某个版本执行失败时回滚该版本并停止（例如 SQLite 未编译 FTS5），检索会退回全表子串扫描。
+    """
+    version = get_schema_version(conn)
+    for target in sorted(v for v in MIGRATIONS if v > version):
+        start = time.perf_counter()
+        # 手动控制事务，保证建表、建触发器、回填和版本号在同一事务内
+        isolation_level = conn.isolation_level
+        conn.isolation_level = None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            # 其他进程可能已完成升级
+            if get_schema_version(conn) >= target:
+                conn.execute('COMMIT')
+                version = target
+                continue
+            for statement in MIGRATIONS[target]:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {target}')
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            conn.execute('ROLLBACK')
+            print(f"⚠ 数据库升级到版本 {target} 失败，保持版本 {version}: {str(e)[:100]}")
+            break
+        finally:
+            conn.isolation_level = isolation_level
+        version = target
+        if verbose:
+            print(f"✓ 数据库已升级到版本 {target}（{time.perf_counter() - start:.2f} 秒）")
+    return version
+
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    """是否已建立全文索引"""
+    return get_schema_version(conn) >= 2
+
+
+def _phrase(term: str) -> str:
+    """FTS5 短语（转义双引号）"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _build_filters(query: str, fields: Dict[str, Optional[str]], use_fts: bool,
+                   alias: str) -> Tuple[List[str], List[str], list]:
+    """拆分检索条件，返回 (FTS MATCH 子句, 子串过滤条件, 过滤参数)"""
+    match_parts, like_parts, like_params = [], [], []
+    groups = [(None, query)] + [(column, value) for column, value in fields.items()]
+    for column, text in groups:
+        for term in (text or '').split():
+            if use_fts and len(term) >= MIN_FTS_TERM_LENGTH:
+                match_parts.append(f"{column} : {_phrase(term)}" if column else _phrase(term))
+                continue
+            # 短词用 instr 子串匹配（trigram 表上少于3个字的 LIKE 模式不返回结果）
+            if column:
+                like_parts.append(f"instr({alias}.{column}, ?) > 0")
+                like_params.append(term)
+            else:
+                like_parts.append('(' + ' OR '.join(f"instr({alias}.{c}, ?) > 0" for c in FTS_COLUMNS) + ')')
+                like_params.extend([term] * len(FTS_COLUMNS))
+    return match_parts, like_parts, like_params
+
+
+def search_jobs(conn: sqlite3.Connection, query: str = '', title: Optional[str] = None,
+                company: Optional[str] = None, location: Optional[str] = None,
+                company_type: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+                order: str = 'recent') -> List[Dict]:
+    """检索岗位
+
+    Args:
+        query: 关键词（空格分隔，全部匹配；在岗位、公司、地点中任一字段出现即可）
+        title / company / location: 限定字段的关键词
+        company_type: 公司类型（精确匹配）
+        limit: 返回条数
+        order: 'recent' 按入库时间倒序，'rank' 按相关度
+
+    Returns:
+        岗位列表（字段见 RESULT_COLUMNS）
+    """
+    fields = {'job_title': title, 'company_name': company, 'work_location': location}
+    has_text = any((text or '').strip() for text in [query] + list(fields.values()))
+    columns = ', '.join(f"p.{c}" for c in RESULT_COLUMNS)
+    use_fts = has_text and has_fts(conn)
+
+    if use_fts:
+        match_parts, like_parts, params = _build_filters(query, fields, True, 'f')
+        where = []
+        if match_parts:
+            where.append('posted_jobs_fts MATCH ?')
+            params.insert(0, ' AND '.join(match_parts))
+        where.extend(like_parts)
+        if company_type:
+            where.append('p.company_type = ?')
+            params.append(company_type)
+        order_by = 'f.rank' if order == 'rank' and match_parts else 'f.rowid DESC'
+        sql = (f"SELECT {columns} FROM posted_jobs_fts f JOIN posted_jobs p ON p.url = f.url "
+               f"WHERE {' AND '.join(where)} ORDER BY {order_by} LIMIT ?")
+    else:
+        # 无检索词（只按公司类型/时间浏览），或尚未建立全文索引
+        _, like_parts, params = _build_filters(query, fields, False, 'p')
+        where = list(like_parts)
+        if company_type:
+            where.append('p.company_type = ?')
+            params.append(company_type)
+        sql = (f"SELECT {columns} FROM posted_jobs p"
+               + (f" WHERE {' AND '.join(where)}" if where else '')
+               + " ORDER BY p.created_at DESC LIMIT ?")
+    params.append(limit)
+
+    cursor = conn.execute(sql, params)
+    return [dict(zip(RESULT_COLUMNS, row)) for row in cursor.fetchall()]
+
+
+def format_info(conn: sqlite3.Connection) -> str:
+    """数据库版本与索引信息"""
+    version = get_schema_version(conn)
+    total = conn.execute('SELECT COUNT(*) FROM posted_jobs').fetchone()[0]
+    indexes = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'posted_jobs' AND sql IS NOT NULL")]
+    lines = [
+        f"数据库版本: {version}/{SCHEMA_VERSION}",
+        f"岗位数: {total}",
+        f"索引: {', '.join(indexes) or '无'}",
+    ]
+    if has_fts(conn):
+        fts_total = conn.execute('SELECT COUNT(*) FROM posted_jobs_fts').fetchone()[0]
+        lines.append(f"全文索引: {fts_total} 条" + ('' if fts_total == total else '（与岗位数不一致）'))
+    else:
+        lines.append("全文索引: 未建立")
+    return "\n".join(lines)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='岗位库全文检索')
+    parser.add_argument('query', nargs='*', help='关键词（空格分隔，全部匹配）')
+    parser.add_argument('--title', help='岗位名称包含')
+    parser.add_argument('--company', help='公司名称包含')
+    parser.add_argument('--location', help='工作地点包含')
+    parser.add_argument('--type', dest='company_type', help='公司类型')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help='返回条数')
+    parser.add_argument('--rank', action='store_true', help='按相关度排序（默认按入库时间倒序）')
+    parser.add_argument('--db', default=DB_FILE, help='数据库文件')
+    parser.add_argument('--upgrade', action='store_true', help='只执行数据库升级')
+    parser.add_argument('--info', action='store_true', help='查看数据库版本与索引')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        upgrade_schema(conn)
+        if args.upgrade or args.info:
+            print(format_info(conn))
+            return
+
+        start = time.perf_counter()
+        jobs = search_jobs(conn, ' '.join(args.query), title=args.title, company=args.company,
+                           location=args.location, company_type=args.company_type, limit=args.limit,
+                           order='rank' if args.rank else 'recent')
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        for job in jobs:
+            print(f"[{job['created_at']}] {job['job_title']} | {job['company_name']} | "
+                  f"{job['work_location']} | {job['company_type']}\n    {job['url']}")
+        print(f"\n共 {len(jobs)} 条（{elapsed_ms:.1f} 毫秒）")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
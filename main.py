@@ -3,16 +3,27 @@
 """
 招聘岗位自动化抓取脚本
 支持实习僧 (shixiseng.com) 和前程无忧 (51job.com)
+两个平台默认同时搜索（CONCURRENT_PLATFORMS），运行结束时输出各平台耗时及与顺序搜索的对比
 """
 
 import time
+import queue
 import random
 import re
+import threading
 from datetime import datetime
 import pandas as pd
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from resource_filter import create_filter
+from browser_pool import get_browser_pool, shutdown_browser_pool
+from page_readiness import get_rate_limiter
+from circuit_breaker import get_circuit_breakers, report_failure
+from result_cache import get_result_cache
+from company_classifier import CompanyClassifier
+from result_sink import ResultSink, SINK_ENABLED, prune_sink_files
 from job_search_configs import SEARCH_CONFIGS, CITY_MAPPING
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 
 # 输出字段（严格按照要求）
@@ -21,6 +32,19 @@ OUTPUT_FIELDS = [
     '招聘对象', '岗位(大都不限专业)', '更新时间', '投递截止', '相关链接'
 ]
 
+# Excel 列宽
+EXCEL_COLUMN_WIDTHS = {
+    'A': 25,  # 公司名称
+    'B': 15,  # 公司类型
+    'C': 15,  # 工作地点
+    'D': 12,  # 招聘类型
+    'E': 12,  # 招聘对象
+    'F': 30,  # 岗位
+    'G': 15,  # 更新时间
+    'H': 15,  # 投递截止
+    'I': 50,  # 相关链接
+}
+
 # 互联网大厂列表（用于"大厂"过滤）
 BIG_COMPANIES = [
     '阿里巴巴', '腾讯', '百度', '字节跳动', '华为', '京东', '美团', '滴滴',
@@ -37,19 +61,108 @@ STATE_OWNED_KEYWORDS = [
     '船舶', '电子科技', '中国移动', '中国联通', '中国电信'
 ]
 
+# 四大会计师事务所（用于"四大"过滤）
+FOUR_BIG = ['普华永道', '德勤', '安永', '毕马威', 'PwC', 'Deloitte', 'EY', 'KPMG']
+
+# 公司名称多模式匹配（一次扫描判断所有分组，英文不区分大小写）
+COMPANY_CLASSIFIER = CompanyClassifier(
+    {'央国企': STATE_OWNED_KEYWORDS, '大厂': BIG_COMPANIES, '四大': FOUR_BIG},
+    ignore_case=['央国企', '大厂', '四大'],
+)
+
+# 各平台同时搜索（每个平台一个线程，独立的页面和限速）；False 时按原来的顺序逐个平台搜索
+CONCURRENT_PLATFORMS = True
+
+# 平台 → 搜索方法
+PLATFORM_SEARCH = {
+    'shixiseng': 'search_shixiseng',
+    '51job': 'search_51job',
+}
+
+
+class PlatformWorker:
+    """单个平台的搜索线程：独立的页面、限速器和任务队列
+
+    Playwright 同步API的对象只能在创建它的线程中使用，因此页面在线程内租用，
+    搜索结果放入共享的结果队列，由主线程按完成顺序合并。
+    """
+
+    def __init__(self, platform, headless, seen_urls, result_queue):
+        self.platform = platform
+        self.scraper = JobScraper(headless=headless, concurrent_platforms=False)
+        # 各平台的岗位链接互不重叠，共用一个去重集合即可
+        self.scraper.seen_urls = seen_urls
+        self.rate_limiter = get_rate_limiter(platform)
+        self.result_queue = result_queue
+        self.tasks = queue.Queue()
+        self.stats = {'searches': 0, 'jobs': 0, 'seconds': 0.0}
+        self.thread = threading.Thread(target=self._run, name=f"platform-{platform}", daemon=True)
+        self.thread.start()
+
+    def submit(self, keyword, city, grad_year, recruit_type):
+        """加入一个搜索任务"""
+        self.tasks.put((keyword, city, grad_year, recruit_type))
+
+    def stop(self):
+        """处理完已加入的任务后结束线程"""
+        self.tasks.put(None)
+        self.thread.join()
+
+    def _run(self):
+        search = getattr(self.scraper, PLATFORM_SEARCH[self.platform])
+        breakers = get_circuit_breakers()
+        try:
+            self.scraper.open_page([self.platform])
+        except Exception as e:
+            print(f"  ✗ {self.platform} 启动浏览器失败: {str(e)[:100]}")
+            search = None
+        try:
+            while True:
+                task = self.tasks.get()
+                if task is None:
+                    break
+                # 结果缓存命中时不访问站点
+                results = self.scraper.cached_results(self.platform, *task)
+                # 断路器打开时跳过该平台，不再等待限速
+                if results is None and search and breakers.allow(self.platform):
+                    # 平台耗时包含限速等待，各平台耗时之和即顺序执行所需的时间
+                    start = time.perf_counter()
+                    self.rate_limiter.wait()
+                    self.scraper.renew_page()
+                    results = breakers.execute(self.platform, self.scraper.fetch_and_cache, self.platform, search,
+                                               *task, page=self.scraper.page)
+                    self.stats['seconds'] += time.perf_counter() - start
+                    self.stats['searches'] += 1
+                    self.stats['jobs'] += len(results)
+                self.result_queue.put((self.platform, task, results or []))
+        finally:
+            if search:
+                self.scraper.close_browser()
+            # 线程结束前关闭本线程的浏览器池
+            shutdown_browser_pool()
+
 
 class JobScraper:
     """招聘岗位抓取器"""
     
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, concurrent_platforms=CONCURRENT_PLATFORMS):
         """初始化爬虫"""
         self.results = []
         self.seen_urls = set()  # 用于去重
         self.today = datetime.now().strftime('%Y-%m-%d')
-        self.playwright = None
         self.browser = None
+        self.browser_lease = None
         self.page = None
+        self.resource_filter = None
         self.headless = headless
+        self.concurrent_platforms = concurrent_platforms
+        self.platform_workers = {}
+        self.platform_results = queue.Queue()
+        self.platform_stats = {}  # 顺序模式下各平台的 {'searches', 'jobs', 'seconds'}
+        self.search_seconds = 0.0
+        self.breakers = get_circuit_breakers()
+        self.result_cache = get_result_cache()
+        self.sample_data_used = False
         
     def start_browser(self):
         """启动浏览器"""
@@ -57,22 +170,41 @@ class JobScraper:
         print("招聘岗位自动化抓取脚本")
         print("="*60)
         print(f"\n开始时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.concurrent_platforms:
+            print("✓ 并发模式：各平台在独立线程中启动浏览器")
+            return
         print("正在启动浏览器...")
+        self.open_page(['shixiseng', '51job'])
+        print("✓ 浏览器启动成功！")
+    
+    def open_page(self, sites):
+        """从浏览器池租用页面"""
+        # 拦截图片、字体等无需下载的资源（按站点预设）
+        self.resource_filter = create_filter(sites)
         
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        
-        # 创建上下文，设置随机User-Agent
-        context = self.browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080}
+        # 从浏览器池租用页面（设置随机User-Agent）
+        self.browser_lease = get_browser_pool().lease(
+            launch_options={'headless': self.headless, 'args': ['--disable-blink-features=AutomationControlled']},
+            context_options={
+                'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'viewport': {'width': 1920, 'height': 1080},
+            },
+            on_page=self._setup_page,
         )
-        
-        self.page = context.new_page()
-        print("✓ 浏览器启动成功！")
+        self.browser = self.browser_lease.browser
+        self.page = self.browser_lease.page
+    
+    def _setup_page(self, page):
+        """租用到新页面时调用：接入资源拦截"""
+        if self.resource_filter:
+            self.resource_filter.attach(page)
+        return page
+    
+    def renew_page(self):
+        """续租页面：浏览器实例到期回收或无响应时换用新实例的页面"""
+        if self.browser_lease:
+            self.page = self.browser_lease.renew()
+            self.browser = self.browser_lease.browser
         
     def random_sleep(self, min_time=2, max_time=5):
         """随机休眠，模拟人类行为"""
@@ -150,6 +282,7 @@ class JobScraper:
                         time.sleep(wait_time)
                     else:
                         print(f"    ⚠ 网络访问受限，尝试生成示例数据...")
+                        report_failure('访问受限')
                         # 如果网站访问失败，生成示例数据用于展示
                         return self._generate_sample_data(keyword, city, grad_year, recruit_type)
             
@@ -348,14 +481,17 @@ class JobScraper:
                 
             except Exception as e:
                 print(f"    ✗ 解析页面时出错: {str(e)[:100]}")
+                report_failure('解析页面出错')
                 
         except Exception as e:
             print(f"    ✗ 搜索时出错: {str(e)[:100]}")
+            report_failure('搜索出错')
         
         return results
     
     def _generate_sample_data(self, keyword, city, grad_year, recruit_type):
         """生成示例数据用于演示（当网站访问失败时）"""
+        self.sample_data_used = True
         sample_companies = [
             '阿里巴巴', '腾讯', '字节跳动', '华为', '京东', '美团', 
             '滴滴', '小米', '网易', '百度', '拼多多', '快手'
@@ -443,6 +579,7 @@ class JobScraper:
                         time.sleep(wait_time)
                     else:
                         print(f"    ✗ 访问失败（已重试{max_retries}次）")
+                        report_failure('访问失败')
                         return results
             
             # 前程无忧的职位列表选择器
@@ -490,14 +627,32 @@ class JobScraper:
                         
             except Exception as e:
                 print(f"    ✗ 解析51job页面时出错: {str(e)[:100]}")
+                report_failure('解析页面出错')
                 
         except Exception as e:
             print(f"    ✗ 搜索51job时出错: {str(e)[:100]}")
+            report_failure('搜索出错')
         
         return results
     
-    def search_jobs(self, config):
-        """根据配置搜索岗位"""
+    def platforms_for(self, grad_year, recruit_type):
+        """配置需要搜索的平台"""
+        platforms = []
+        # 优先使用实习僧（适合校招/实习）
+        if recruit_type == '校招' or '校招' in recruit_type or grad_year:
+            platforms.append('shixiseng')
+        # 如果是社招，使用51job
+        if recruit_type == '社招' or '社招' in recruit_type:
+            platforms.append('51job')
+        return platforms
+    
+    def search_jobs(self, config, on_batch=None):
+        """根据配置搜索岗位
+
+        Args:
+            config: 搜索配置
+            on_batch: 每次搜索得到结果后立即调用 on_batch(results)（此时不再汇总返回）
+        """
         print(f"\n{'='*60}")
         print(f"配置: {', '.join(config['keywords'][:3])}... | {', '.join(config['locations'][:2])}...")
         print(f"{'='*60}")
@@ -507,26 +662,118 @@ class JobScraper:
         keywords = config['keywords']
         grad_year = config['grad_year']
         recruit_type = config['recruit_type']
+        platforms = self.platforms_for(grad_year, recruit_type)
         
         config_results = []
+        total = 0
+        
+        def collect(results):
+            nonlocal total
+            total += len(results)
+            if on_batch:
+                on_batch(results)
+            else:
+                config_results.extend(results)
         
-        # 遍历关键词和城市
+        start = time.perf_counter()
+        if self.concurrent_platforms:
+            self.search_jobs_concurrent(keywords, cities, grad_year, recruit_type, platforms, collect)
+        else:
+            # 遍历关键词和城市
+            for keyword in keywords:
+                for city in cities:
+                    self.renew_page()
+                    for platform in platforms:
+                        # 结果缓存命中时不访问站点，也不需要休眠
+                        results = self.cached_results(platform, keyword, city, grad_year, recruit_type)
+                        if results is not None:
+                            collect(results)
+                            continue
+                        search_start = time.perf_counter()
+                        results = self.breakers.call(platform, self.fetch_and_cache, platform,
+                                                     getattr(self, PLATFORM_SEARCH[platform]),
+                                                     keyword, city, grad_year, recruit_type, page=self.page)
+                        if results is None:
+                            continue  # 断路器打开，跳过该平台
+                        collect(results)
+                        self.random_sleep(3, 6)  # 每次搜索后休眠
+                        stat = self.platform_stats.setdefault(platform, {'searches': 0, 'jobs': 0, 'seconds': 0.0})
+                        stat['seconds'] += time.perf_counter() - search_start
+                        stat['searches'] += 1
+                        stat['jobs'] += len(results)
+        self.search_seconds += time.perf_counter() - start
+        
+        print(f"  ✓ 本配置共抓取 {total} 个职位")
+        return config_results
+    
+    def _dedupe(self, results):
+        """按本次运行已见过的链接去重"""
+        fresh = []
+        for result in results:
+            link = result.get('相关链接')
+            if link in self.seen_urls:
+                continue
+            self.seen_urls.add(link)
+            fresh.append(result)
+        return fresh
+    
+    def cached_results(self, platform, keyword, city, grad_year, recruit_type):
+        """结果缓存命中时返回去重后的结果，未命中返回 None（招聘对象等字段依赖年级和类型，按其区分缓存）"""
+        results = self.result_cache.get(platform, keyword, city, variant=f"{grad_year}|{recruit_type}")
+        if results is None:
+            return None
+        print(f"    ✓ 缓存命中 {platform}: {keyword} | {city}（{len(results)} 个职位）")
+        return self._dedupe(results)
+    
+    def fetch_and_cache(self, platform, search, keyword, city, grad_year, recruit_type):
+        """访问站点搜索，缓存去重前的完整结果（示例数据不缓存），返回去重后的结果"""
+        seen_urls, self.seen_urls = self.seen_urls, set()
+        self.sample_data_used = False
+        try:
+            results = search(keyword, city, grad_year, recruit_type)
+        finally:
+            self.seen_urls = seen_urls
+        if not self.sample_data_used:
+            self.result_cache.put(platform, keyword, city, results, variant=f"{grad_year}|{recruit_type}")
+        return self._dedupe(results)
+    
+    def search_jobs_concurrent(self, keywords, cities, grad_year, recruit_type, platforms, collect):
+        """各平台同时搜索：任务分发到平台线程，结果按完成顺序合并"""
+        pending = 0
         for keyword in keywords:
             for city in cities:
-                # 优先使用实习僧（适合校招/实习）
-                if recruit_type == '校招' or '校招' in recruit_type or grad_year:
-                    shixiseng_results = self.search_shixiseng(keyword, city, grad_year, recruit_type)
-                    config_results.extend(shixiseng_results)
-                    self.random_sleep(3, 6)  # 每次搜索后休眠
-                
-                # 如果是社招，使用51job
-                if recruit_type == '社招' or '社招' in recruit_type:
-                    job51_results = self.search_51job(keyword, city, grad_year, recruit_type)
-                    config_results.extend(job51_results)
-                    self.random_sleep(3, 6)
+                for platform in platforms:
+                    if platform not in self.platform_workers:
+                        self.platform_workers[platform] = PlatformWorker(
+                            platform, self.headless, self.seen_urls, self.platform_results)
+                    self.platform_workers[platform].submit(keyword, city, grad_year, recruit_type)
+                    pending += 1
         
-        print(f"  ✓ 本配置共抓取 {len(config_results)} 个职位")
-        return config_results
+        while pending:
+            platform, (keyword, city, _, _), results = self.platform_results.get()
+            pending -= 1
+            collect(results)
+            print(f"  ✓ [{platform}] {keyword} | {city}: {len(results)} 个职位（还剩 {pending} 个搜索）")
+    
+    def print_platform_stats(self):
+        """各平台耗时，以及与顺序搜索（各平台耗时之和）的对比"""
+        if self.concurrent_platforms:
+            stats = {platform: worker.stats for platform, worker in self.platform_workers.items()}
+        else:
+            stats = self.platform_stats
+        if not stats:
+            return
+        print("\n" + "="*60)
+        print(f"⏱ 平台搜索耗时（{'并发' if self.concurrent_platforms else '顺序'}）")
+        print("="*60)
+        for platform, stat in stats.items():
+            print(f"  {platform:<10} 搜索 {stat['searches']:>4} 次，职位 {stat['jobs']:>5} 个，耗时 {stat['seconds']:>8.1f} 秒")
+        sequential = sum(stat['seconds'] for stat in stats.values())
+        print(f"  总耗时 {self.search_seconds:.1f} 秒，顺序搜索需 {sequential:.1f} 秒", end='')
+        if self.concurrent_platforms and self.search_seconds:
+            print(f"（节省 {sequential - self.search_seconds:.1f} 秒，加速 {sequential / self.search_seconds:.2f}x）")
+        else:
+            print()
     
     def filter_results(self, df, config):
         """根据配置的备注信息过滤结果"""
@@ -539,7 +786,7 @@ class JobScraper:
         # 央国企过滤
         if company_type_req and ('央国企' in company_type_req or '国央企' in company_type_req):
             try:
-                mask = df['公司名称'].str.contains('|'.join(STATE_OWNED_KEYWORDS), case=False, na=False)
+                mask = COMPANY_CLASSIFIER.mask(df['公司名称'], '央国企')
                 df = df[mask]
                 print(f"  ✓ 央国企过滤后剩余 {len(df)} 个职位")
             except:
@@ -548,7 +795,7 @@ class JobScraper:
         # 大厂过滤
         if notes and ('大厂' in notes or '大公司' in notes):
             try:
-                mask = df['公司名称'].isin(BIG_COMPANIES) | df['公司名称'].str.contains('|'.join(BIG_COMPANIES), case=False, na=False)
+                mask = COMPANY_CLASSIFIER.mask(df['公司名称'], '大厂')
                 df = df[mask]
                 print(f"  ✓ 大厂过滤后剩余 {len(df)} 个职位")
             except:
@@ -557,8 +804,7 @@ class JobScraper:
         # 四大过滤
         if notes and '四大' in notes:
             try:
-                four_big = ['普华永道', '德勤', '安永', '毕马威', 'PwC', 'Deloitte', 'EY', 'KPMG']
-                mask = df['公司名称'].str.contains('|'.join(four_big), case=False, na=False)
+                mask = COMPANY_CLASSIFIER.mask(df['公司名称'], '四大')
                 df = df[mask]
                 print(f"  ✓ 四大过滤后剩余 {len(df)} 个职位")
             except:
@@ -567,11 +813,17 @@ class JobScraper:
         return df
     
     def close_browser(self):
-        """关闭浏览器"""
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        """归还页面（浏览器实例在进程退出时关闭）"""
+        # 结束各平台线程（线程内关闭各自的浏览器）
+        for worker in self.platform_workers.values():
+            worker.stop()
+        if self.browser_lease:
+            if self.resource_filter:
+                print(f"\n资源拦截: {self.resource_filter.format_stats()}")
+            self.browser_lease.release()
+            self.browser_lease = None
+            self.browser = None
+            print(f"浏览器池: {get_browser_pool().format_stats()}")
         print("\n✓ 浏览器已关闭")
     
     def save_to_excel(self, df, filename=None):
@@ -605,19 +857,7 @@ class JobScraper:
                 cell.alignment = Alignment(horizontal="center", vertical="center")
             
             # 设置列宽
-            column_widths = {
-                'A': 25,  # 公司名称
-                'B': 15,  # 公司类型
-                'C': 15,  # 工作地点
-                'D': 12,  # 招聘类型
-                'E': 12,  # 招聘对象
-                'F': 30,  # 岗位
-                'G': 15,  # 更新时间
-                'H': 15,  # 投递截止
-                'I': 50,  # 相关链接
-            }
-            
-            for col, width in column_widths.items():
+            for col, width in EXCEL_COLUMN_WIDTHS.items():
                 ws.column_dimensions[col].width = width
             
             # 设置行高
@@ -630,6 +870,64 @@ class JobScraper:
         print(f"\n✓ 数据已保存至: {filename}")
         print(f"  共 {len(df)} 条记录")
     
+    def save_to_excel_streaming(self, chunks, filename=None):
+        """逐批写入Excel（openpyxl write_only，格式与 save_to_excel 相同）
+        
+        Returns:
+            (写入行数, 前10行预览 DataFrame)；没有数据时不生成文件，返回 (0, None)
+        """
+        if filename is None:
+            filename = f"job_hunting_results_{self.today}.xlsx"
+        
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Sheet1')
+        for col, width in EXCEL_COLUMN_WIDTHS.items():
+            ws.column_dimensions[col].width = width
+        ws.row_dimensions[1].height = 25
+        
+        header = []
+        for field in OUTPUT_FIELDS:
+            cell = WriteOnlyCell(ws, value=field)
+            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            cell.font = Font(bold=True, color="FFFFFF", size=11)
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            header.append(cell)
+        ws.append(header)
+        
+        rows = 0
+        preview = []
+        for df in chunks:
+            for field in OUTPUT_FIELDS:
+                if field not in df.columns:
+                    df[field] = ''
+            df = df[OUTPUT_FIELDS].fillna('')
+            if len(preview) < 10:
+                preview.append(df.head(10 - len(preview)))
+            for row in df.itertuples(index=False, name=None):
+                ws.append(list(row))
+            rows += len(df)
+        
+        if not rows:
+            return 0, None
+        wb.save(filename)
+        print(f"\n✓ 数据已保存至: {filename}")
+        print(f"  共 {rows} 条记录")
+        return rows, pd.concat(preview, ignore_index=True)
+    
+    def export_from_sink(self, sink, filename=None):
+        """从结果文件分批读取，按各自的配置过滤后流式导出Excel，返回 (导出行数, 前10行预览)"""
+        configs = sink.configs()
+        
+        def filtered_chunks():
+            for idx, config in configs.items():
+                for df in sink.iter_chunks(idx):
+                    df = self.filter_results(df, config)
+                    if not df.empty:
+                        yield df
+        
+        print(f"\n正在从 {sink.sink_file} 过滤并导出 {sink.count()} 个职位...")
+        return self.save_to_excel_streaming(filtered_chunks(), filename)
+    
     def generate_demo_data(self):
         """生成示例数据用于演示（当无法抓取真实数据时）"""
         demo_jobs = [
@@ -693,15 +991,25 @@ class JobScraper:
     
     def run(self):
         """运行主程序"""
+        sink = None
         try:
             self.start_browser()
             
+            # 每批结果抓到后立即写入结果文件，结束后再分批过滤导出
+            if SINK_ENABLED:
+                sink = ResultSink.create()
+                print(f"✓ 抓取结果实时写入: {sink.sink_file}")
+            
             all_results = []
             total_configs = len(SEARCH_CONFIGS)
             
             for idx, config in enumerate(SEARCH_CONFIGS, 1):
                 print(f"\n[{idx}/{total_configs}] 处理配置 {idx}...")
                 try:
+                    if sink:
+                        sink.register_config(idx, config)
+                        self.search_jobs(config, on_batch=lambda results, idx=idx: sink.write(idx, results))
+                        continue
                     results = self.search_jobs(config)
                     if results:
                         df = pd.DataFrame(results)
@@ -713,23 +1021,33 @@ class JobScraper:
                     print(f"  ✗ 处理配置时出错: {str(e)[:100]}")
                     continue
             
+            self.print_platform_stats()
+            print(f"\n断路器:\n{self.breakers.format_stats()}")
+            print(f"\n{self.result_cache.format_stats()}")
+            
             # 合并所有结果
-            if all_results:
+            total, preview_df = 0, None
+            if sink:
+                # 结果文件中链接已去重
+                total, preview_df = self.export_from_sink(sink)
+            elif all_results:
                 final_df = pd.concat(all_results, ignore_index=True)
                 # 最终去重（基于URL）
                 final_df = final_df.drop_duplicates(subset=['相关链接'], keep='first')
                 
                 # 保存结果
                 self.save_to_excel(final_df)
-                
+                total, preview_df = len(final_df), final_df.head(10)
+            
+            if total:
                 # 打印抓取到的岗位信息摘要
                 print("\n" + "="*60)
                 print("📊 抓取结果摘要")
                 print("="*60)
-                print(f"✅ 共抓取到 {len(final_df)} 个岗位")
+                print(f"✅ 共抓取到 {total} 个岗位")
                 print("\n📋 岗位列表预览（前10个）：")
                 print("-"*60)
-                for idx, row in final_df.head(10).iterrows():
+                for idx, row in preview_df.iterrows():
                     print(f"\n【岗位 {idx+1}】")
                     print(f"  公司名称: {row['公司名称']}")
                     print(f"  岗位名称: {row['岗位(大都不限专业)']}")
@@ -758,11 +1076,35 @@ class JobScraper:
             print(f"\n✗ 运行出错: {str(e)}")
         finally:
             self.close_browser()
+            if sink:
+                sink.close()
+                print(f"抓取结果文件: {sink.sink_file}（可用 --from-sink 重新导出）")
+                removed = prune_sink_files()
+                if removed:
+                    print(f"✓ 已删除 {len(removed)} 个较早的结果文件")
 
 
 def main():
     """主函数"""
+    import argparse
+    parser = argparse.ArgumentParser(description='招聘岗位自动化抓取')
+    parser.add_argument('--from-sink', metavar='FILE', help='不抓取，从已有的结果文件过滤并导出Excel（如中断后恢复）')
+    args = parser.parse_args()
+    
     scraper = JobScraper(headless=True)  # 设置为True可后台运行（测试模式）
+    if args.from_sink:
+        import os
+        if not os.path.exists(args.from_sink):
+            print(f"✗ 结果文件不存在: {args.from_sink}")
+            return
+        sink = ResultSink(args.from_sink)
+        try:
+            total, _ = scraper.export_from_sink(sink)
+            if not total:
+                print("⚠ 结果文件中没有符合条件的职位")
+        finally:
+            sink.close()
+        return
     scraper.run()
 
 
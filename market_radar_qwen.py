@@ -1678,7 +1678,7 @@ class MarketRadarQwen:
             report_content: 报告内容（Markdown格式）
         """
         try:
-            import requests
+            from dingtalk_queue import enqueue_markdown
             
             # 钉钉Webhook地址
             DINGTALK_WEBHOOK = "https://oapi.dingtalk.com/robot/send?access_token=ac8d1c6332c8a047b8786a930ab08d7f6db490843edca2de1bb65c68301c3113"
@@ -1710,29 +1710,15 @@ class MarketRadarQwen:
             except Exception as e:
                 logger.warning(f"补充链接信息失败: {str(e)}")
             
-            # 发送到钉钉
-            payload = {
-                "msgtype": "markdown",
-                "markdown": {
-                    "title": "海马职加·市场雷达日报",
-                    "text": report_content
-                }
-            }
-            
+            # 发送到钉钉（后台发送队列：限速、失败重试、过长自动拆分）
             logger.info("正在发送报告到钉钉群...")
-            response = requests.post(DINGTALK_WEBHOOK, json=payload, timeout=10)
-            result = response.json()
-            
-            if result.get('errcode') == 0:
-                logger.info("✓ 钉钉消息发送成功")
-                print("✓ 报告已发送到钉钉群")
-            else:
-                logger.warning(f"✗ 钉钉消息发送失败: {result.get('errmsg')}")
-                print(f"✗ 钉钉消息发送失败: {result.get('errmsg')}")
+            message_ids = enqueue_markdown(DINGTALK_WEBHOOK, "海马职加·市场雷达日报", report_content)
+            logger.info(f"✓ 钉钉消息已加入发送队列（{len(message_ids)} 条）")
+            print(f"✓ 报告已加入钉钉发送队列（{len(message_ids)} 条），将在后台限速发送")
                 
-        except ImportError:
-            logger.warning("requests 库未安装，跳过钉钉推送")
-            print("⚠  requests 库未安装，跳过钉钉推送")
+        except ImportError as e:
+            logger.warning(f"钉钉发送队列不可用（dingtalk_queue 或其依赖 requests 无法导入: {e}），跳过钉钉推送")
+            print(f"⚠  钉钉发送队列不可用（{e}），跳过钉钉推送")
         except Exception as e:
             logger.error(f"发送钉钉消息失败: {str(e)}")
             print(f"✗ 发送钉钉消息失败: {str(e)}")
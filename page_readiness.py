@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面就绪检测与请求限速
+用事件驱动的"结果已就绪"条件代替 networkidle + 固定休眠：
+    - 选择器数量稳定：结果列表元素数量达到下限并在一段时间内不再变化
+    - 指定XHR完成：导航时等待URL匹配的接口响应返回
+    - 超时兜底：条件一直不满足时在 timeout_ms 后继续解析
+
+礼貌性延迟（两次请求之间的间隔）与页面就绪无关，单独由 RateLimiter 控制。
+同一进程内同一站点的所有页面、线程共用一个限速器（get_rate_limiter），并发数不会放大请求频率；
+多进程抓取时每个子进程调用 share_rate_limits(进程数)，各进程按站点速率的 1/进程数 限速。
+每次等待的实际耗时都会记录，与旧的固定休眠对比即可得到节省的空闲时间。
+"""
+
+import time
+import random
+import asyncio
+import threading
+from typing import Dict, Optional
+
+# ==================== 配置区域 ====================
+
+# 各站点的就绪条件
+#   selectors:        结果列表选择器（取匹配数量最多的一个）
+#   item_link:        只统计包含该链接（或自身匹配）的元素，避免先渲染的导航栏/侧栏元素被当作结果
+#                     （None 表示不限制）
+#   min_count:        认为结果已出现的最少元素数
+#   stable_ms:        元素数量保持不变多久视为加载完成
+#   empty_stable_ms:  页面加载完成但元素数不足时，保持多久视为"无结果"
+#   response_pattern: 需要等待的XHR接口URL片段（None 表示不等待）
+#   timeout_ms:       就绪等待超时
+READINESS_PRESETS = {
+    'yingjiesheng': {
+        'selectors': ['.job-list-item', '.job-item', '.job-info', '.list-item', 'tr a[href*="/job-"]'],
+        'item_link': 'a[href*="/job-"]',
+        'min_count': 2,
+        'stable_ms': 300,
+        'empty_stable_ms': 1000,
+        'response_pattern': None,
+        'timeout_ms': 10000,
+    },
+}
+
+# 就绪条件的轮询间隔（毫秒）
+POLL_INTERVAL_MS = 100
+
+# 导航超时（毫秒）
+NAVIGATION_TIMEOUT_MS = 20000
+
+# 各站点请求限速：(两次请求的最小间隔秒数, 额外随机抖动秒数)
+RATE_LIMITS = {
+    'yingjiesheng': (1.0, 1.0),
+    'shixiseng': (3.0, 3.0),    # 与 main.py 原来每次搜索后的 random_sleep(3, 6) 相同
+    '51job': (3.0, 3.0),
+}
+DEFAULT_RATE_LIMIT = (1.0, 1.0)
+
+# 旧流程每次搜索的固定等待（networkidle 之后的 2~3 + 0.5~1.5 + 0.5~1 秒休眠，取均值）
+LEGACY_FIXED_WAIT_SECONDS = 4.25
+
+# 在页面中判断就绪的脚本：记录上次数量变化的时间，数量稳定足够久即返回 true
+_READY_SCRIPT = """
+([selectors, minCount, stableMs, emptyStableMs, itemLink]) => {
+    let count = 0;
+    for (const s of selectors) {
+        let elements = Array.from(document.querySelectorAll(s));
+        if (itemLink) {
+            elements = elements.filter(el => el.matches(itemLink) || el.querySelector(itemLink));
+        }
+        const n = elements.length;
+        if (n > count) count = n;
+    }
+    const now = performance.now();
+    const state = window.__resultsReadyState || (window.__resultsReadyState = {count: -1, since: now});
+    if (count !== state.count) {
+        state.count = count;
+        state.since = now;
+        return false;
+    }
+    const stableFor = now - state.since;
+    if (count >= minCount) return stableFor >= stableMs;
+    return document.readyState === 'complete' && stableFor >= emptyStableMs;
+}
+"""
+
+
+class PageLoadError(Exception):
+    """页面导航失败（调用方据此将任务记为失败，以便重试）"""
+
+
+class RateLimiter:
+    """请求限速器：保证两次请求之间至少间隔 min_interval + 随机抖动"""
+
+    def __init__(self, min_interval: float, jitter: float = 0.0):
+        """初始化限速器
+
+        Args:
+            min_interval: 两次请求的最小间隔（秒）
+            jitter: 额外随机延迟上限（秒）
+        """
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    @classmethod
+    def for_site(cls, site: str, limits: Optional[tuple] = None) -> 'RateLimiter':
+        """按站点配置创建限速器（多进程抓取时间隔乘以进程数）"""
+        min_interval, jitter = limits or RATE_LIMITS.get(site, DEFAULT_RATE_LIMIT)
+        return cls(min_interval * _process_share, jitter)
+
+    def _reserve(self) -> float:
+        """预约下一次请求时间，返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.min_interval + random.uniform(0, self.jitter)
+            delay = start - now
+            self.waits += 1
+            self.waited_seconds += delay
+            return delay
+
+    def wait(self):
+        """等待到允许发出下一次请求（同步）"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self):
+        """等待到允许发出下一次请求（异步）"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+_process_share = 1
+
+
+def get_rate_limiter(site: str, limits: Optional[tuple] = None) -> RateLimiter:
+    """进程内按站点共享的限速器
+
+    Args:
+        site: 站点
+        limits: (最小间隔秒数, 随机抖动秒数)，只在首次创建时使用（None 时按 RATE_LIMITS）
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(site)
+        if limiter is None:
+            limiter = _limiters[site] = RateLimiter.for_site(site, limits)
+        return limiter
+
+
+def share_rate_limits(processes: int):
+    """多进程抓取的子进程启动时调用：之后创建的限速器间隔乘以进程数，各进程合计不超过站点速率"""
+    global _process_share
+    with _limiters_lock:
+        _process_share = max(1, processes)
+        _limiters.clear()
+
+
+class ReadinessStats:
+    """就绪等待耗时统计"""
+
+    def __init__(self):
+        self.pages = 0
+        self.navigation_seconds = 0.0
+        self.ready_seconds = 0.0
+        self.max_ready_seconds = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record(self, result: Dict):
+        """记录一次页面的等待结果"""
+        with self._lock:
+            self.pages += 1
+            self.navigation_seconds += result['navigation_seconds']
+            self.ready_seconds += result['ready_seconds']
+            self.max_ready_seconds = max(self.max_ready_seconds, result['ready_seconds'])
+            if result['reason'] == 'timeout':
+                self.timeouts += 1
+
+    def to_dict(self) -> Dict:
+        """导出统计（用于从子进程传回主进程）"""
+        with self._lock:
+            return {'pages': self.pages, 'navigation_seconds': self.navigation_seconds,
+                    'ready_seconds': self.ready_seconds, 'max_ready_seconds': self.max_ready_seconds,
+                    'timeouts': self.timeouts}
+
+    def merge(self, other: Dict):
+        """合并其他进程的统计（to_dict 的结果）"""
+        with self._lock:
+            self.pages += other['pages']
+            self.navigation_seconds += other['navigation_seconds']
+            self.ready_seconds += other['ready_seconds']
+            self.max_ready_seconds = max(self.max_ready_seconds, other['max_ready_seconds'])
+            self.timeouts += other['timeouts']
+
+    def format_stats(self) -> str:
+        """格式化统计信息（与旧的固定休眠对比）"""
+        if not self.pages:
+            return "无页面"
+        avg_ready = self.ready_seconds / self.pages
+        saved = self.pages * LEGACY_FIXED_WAIT_SECONDS - self.ready_seconds
+        return (f"{self.pages} 个页面，平均导航 {self.navigation_seconds / self.pages:.2f} 秒，"
+                f"平均就绪等待 {avg_ready:.2f} 秒（最长 {self.max_ready_seconds:.2f} 秒，超时 {self.timeouts} 次），"
+                f"相比固定休眠约节省 {saved:.0f} 秒")
+
+
+def _ready_args(preset: Dict) -> list:
+    return [preset['selectors'], preset['min_count'], preset['stable_ms'], preset['empty_stable_ms'],
+            preset.get('item_link')]
+
+
+def _response_matcher(pattern: str):
+    return lambda response: pattern in response.url
+
+
+def navigate_and_wait(page, url: str, site: str, stats: Optional[ReadinessStats] = None) -> Dict:
+    """导航到页面并等待结果就绪（同步API）
+
+    导航异常会抛出；就绪条件超时不抛出，返回 reason='timeout'。
+
+    Returns:
+        {'navigation_seconds': 导航耗时, 'ready_seconds': 就绪等待耗时, 'reason': 'ready'/'timeout'}
+    """
+    preset = READINESS_PRESETS[site]
+    start = time.perf_counter()
+    reason = 'ready'
+    if preset['response_pattern']:
+        navigated_ok = False
+        try:
+            with page.expect_response(_response_matcher(preset['response_pattern']), timeout=preset['timeout_ms']):
+                page.goto(url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+                navigated_ok = True
+        except Exception:
+            # 导航本身失败时抛出；只是接口未返回时继续按选择器判断
+            if not navigated_ok:
+                raise
+            reason = 'timeout'
+    else:
+        page.goto(url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+    navigated = time.perf_counter()
+
+    try:
+        page.wait_for_function(_READY_SCRIPT, arg=_ready_args(preset),
+                               polling=POLL_INTERVAL_MS, timeout=preset['timeout_ms'])
+    except Exception:
+        reason = 'timeout'
+
+    result = {
+        'navigation_seconds': navigated - start,
+        'ready_seconds': time.perf_counter() - navigated,
+        'reason': reason,
+    }
+    print(f"    页面就绪: 导航 {result['navigation_seconds']:.2f} 秒，等待结果 {result['ready_seconds']:.2f} 秒"
+          f"{'（超时）' if reason == 'timeout' else ''}")
+    if stats is not None:
+        stats.record(result)
+    return result
+
+
+async def navigate_and_wait_async(page, url: str, site: str, stats: Optional[ReadinessStats] = None) -> Dict:
+    """导航到页面并等待结果就绪（异步API，行为同 navigate_and_wait）"""
+    preset = READINESS_PRESETS[site]
+    start = time.perf_counter()
+    reason = 'ready'
+    if preset['response_pattern']:
+        navigated_ok = False
+        try:
+            async with page.expect_response(_response_matcher(preset['response_pattern']),
+                                            timeout=preset['timeout_ms']):
+                await page.goto(url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+                navigated_ok = True
+        except Exception:
+            if not navigated_ok:
+                raise
+            reason = 'timeout'
+    else:
+        await page.goto(url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+    navigated = time.perf_counter()
+
+    try:
+        await page.wait_for_function(_READY_SCRIPT, arg=_ready_args(preset),
+                                     polling=POLL_INTERVAL_MS, timeout=preset['timeout_ms'])
+    except Exception:
+        reason = 'timeout'
+
+    result = {
+        'navigation_seconds': navigated - start,
+        'ready_seconds': time.perf_counter() - navigated,
+        'reason': reason,
+    }
+    print(f"    页面就绪: 导航 {result['navigation_seconds']:.2f} 秒，等待结果 {result['ready_seconds']:.2f} 秒"
+          f"{'（超时）' if reason == 'timeout' else ''}")
+    if stats is not None:
+        stats.record(result)
+    return result
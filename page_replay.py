@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线页面录制与回放
+用于在不访问真实网站的情况下测量各抓取脚本的解析性能（见 benchmark_scrapers.py）。
+
+录制：抓取脚本打开搜索页、等待结果加载后，保存渲染后的DOM快照（去掉<script>，回放时页面不会再执行脚本或发请求），
+      以原始URL为键写入 REPLAY_DIR/<站点>/，索引文件 REPLAY_DIR/index.json 同时记录调用参数（关键词、城市等），
+      回放时用相同参数调用抓取方法即可命中同一页面。
+回放：ReplayServer 在本地启动HTTP服务，按原始URL返回快照；
+      attach_replay 拦截浏览器的页面请求并用本地服务的响应填充，其余资源请求直接中止。
+      抓取脚本的代码和URL拼接无需任何改动。
+
+使用方法：
+    python page_replay.py --list                 # 查看已录制的页面
+    python page_replay.py --serve --port 8765    # 启动回放服务（浏览器打开 http://127.0.0.1:8765/ 查看页面列表）
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Optional
+
+# ==================== 配置区域 ====================
+
+# 录制页面保存目录
+REPLAY_DIR = "replay_pages"
+
+# 回放服务默认端口（0 表示自动分配）
+REPLAY_PORT = 0
+
+# 去掉快照中的脚本（回放时保持静态，避免再次发起请求）
+_SCRIPT_RE = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def snapshot_html(html: str) -> str:
+    """将渲染后的页面处理为静态快照"""
+    return _SCRIPT_RE.sub('', html)
+
+
+class ReplayStore:
+    """录制页面存储（URL → 快照文件 + 调用参数）"""
+
+    def __init__(self, root: str = REPLAY_DIR):
+        """初始化存储
+
+        Args:
+            root: 保存目录
+        """
+        self.root = root
+        self.index_file = os.path.join(root, 'index.json')
+        self._lock = threading.Lock()
+        self.index: Dict[str, Dict] = {}
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def save(self, site: str, url: str, html: str, meta: Optional[Dict] = None) -> str:
+        """保存一个页面快照，返回快照文件路径"""
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + '.html'
+        path = os.path.join(self.root, site, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(snapshot_html(html))
+        with self._lock:
+            self.index[url] = {
+                'site': site,
+                'file': os.path.relpath(path, self.root),
+                'meta': meta or {},
+                'recorded_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            tmp_file = self.index_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.index_file)
+        return path
+
+    def get(self, url: str) -> Optional[bytes]:
+        """按原始URL读取快照（未录制时返回 None）"""
+        entry = self.index.get(url)
+        if not entry:
+            return None
+        with open(os.path.join(self.root, entry['file']), 'rb') as f:
+            return f.read()
+
+    def entries(self, site: Optional[str] = None) -> List[Dict]:
+        """已录制页面列表（可按站点过滤）"""
+        return [dict(e, url=url) for url, e in self.index.items() if site is None or e['site'] == site]
+
+
+# ==================== 录制 ====================
+
+class RecordingPage:
+    """录制代理：转发所有调用到真实页面，goto 之后第一次查询DOM时保存快照
+
+    抓取脚本开始查询元素时即认为页面已就绪（脚本自己的等待逻辑已执行完），此时的DOM就是解析的输入。
+    """
+
+    _DOM_METHODS = {'query_selector', 'query_selector_all', 'inner_text', 'content', 'evaluate', 'title'}
+
+    def __init__(self, page, store: ReplayStore, site: str, meta: Optional[Dict] = None):
+        self._page = page
+        self._store = store
+        self._site = site
+        self.meta = meta or {}
+        self._pending_url: Optional[str] = None
+        self.recorded: List[str] = []
+
+    def goto(self, url, *args, **kwargs):
+        response = self._page.goto(url, *args, **kwargs)
+        self._pending_url = url
+        return response
+
+    def _snapshot(self):
+        if self._pending_url:
+            url, self._pending_url = self._pending_url, None
+            self._store.save(self._site, url, self._page.content(), self.meta)
+            self.recorded.append(url)
+            print(f"    ✓ 已录制: {url[:80]}")
+
+    def __getattr__(self, name):
+        attr = getattr(self._page, name)
+        if name in self._DOM_METHODS and callable(attr):
+            def wrapper(*args, **kwargs):
+                self._snapshot()
+                return attr(*args, **kwargs)
+            return wrapper
+        return attr
+
+
+# ==================== 回放 ====================
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """回放服务请求处理：/?url=<原始URL> 返回快照，/ 返回页面列表"""
+
+    store: ReplayStore = None
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        if 'url' in query:
+            body = self.store.get(query['url'][0])
+            if body is None:
+                self.send_error(404, 'not recorded')
+                return
+        else:
+            items = ''.join(
+                f'<li>[{e["site"]}] <a href="/?url={urllib.parse.quote(e["url"], safe="")}">{e["url"]}</a></li>'
+                for e in self.store.entries())
+            body = f'<html><meta charset="utf-8"><body><ul>{items}</ul></body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """本地回放HTTP服务（后台线程运行）"""
+
+    def __init__(self, store: ReplayStore, port: int = REPLAY_PORT):
+        handler = type('ReplayHandler', (_ReplayHandler,), {'store': store})
+        self.store = store
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.port = self.httpd.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+        self.served = 0
+        self.missed = 0
+
+    def start(self) -> 'ReplayServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url_for(self, original_url: str) -> str:
+        """原始URL对应的本地回放地址"""
+        return f"http://127.0.0.1:{self.port}/?url={urllib.parse.quote(original_url, safe='')}"
+
+    def fetch(self, original_url: str) -> Optional[bytes]:
+        """从本地服务取回快照（未录制或回放服务出错时返回 None，调用方中止该请求）"""
+        try:
+            with urllib.request.urlopen(self.url_for(original_url), timeout=10) as response:
+                body = response.read()
+        except urllib.error.HTTPError:
+            self.missed += 1
+            return None
+        except (urllib.error.URLError, OSError) as e:
+            # 连接失败、超时、连接被重置等不能抛到浏览器的路由回调里，按未命中处理
+            print(f"  ⚠ 回放服务请求失败: {str(e)[:100]}")
+            self.missed += 1
+            return None
+        self.served += 1
+        return body
+
+
+def attach_replay(target, server: ReplayServer):
+    """拦截页面/上下文的所有请求：已录制的页面由回放服务返回，其余请求中止（同步API）"""
+    def handle(route):
+        body = server.fetch(route.request.url) if route.request.resource_type == 'document' else None
+        if body is None:
+            route.abort()
+        else:
+            route.fulfill(status=200, body=body, content_type='text/html; charset=utf-8')
+    target.route('**/*', handle)
+
+
+async def attach_replay_async(target, server: ReplayServer):
+    """同 attach_replay（异步API）"""
+    import asyncio
+
+    async def handle(route):
+        body = None
+        if route.request.resource_type == 'document':
+            body = await asyncio.get_running_loop().run_in_executor(None, server.fetch, route.request.url)
+        if body is None:
+            await route.abort()
+        else:
+            await route.fulfill(status=200, body=body, content_type='text/html; charset=utf-8')
+    await target.route('**/*', handle)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='离线页面录制与回放')
+    parser.add_argument('--dir', default=REPLAY_DIR, help='录制页面目录')
+    parser.add_argument('--list', action='store_true', help='查看已录制的页面')
+    parser.add_argument('--serve', action='store_true', help='启动回放服务')
+    parser.add_argument('--port', type=int, default=8765, help='回放服务端口')
+    args = parser.parse_args()
+
+    store = ReplayStore(args.dir)
+    if args.serve:
+        server = ReplayServer(store, args.port)
+        print(f"✓ 回放服务已启动: http://127.0.0.1:{server.port}/（{len(store.index)} 个页面，Ctrl+C 退出）")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.httpd.server_close()
+        return
+
+    counts: Dict[str, int] = {}
+    for entry in store.entries():
+        counts[entry['site']] = counts.get(entry['site'], 0) + 1
+        if args.list:
+            print(f"[{entry['site']}] {entry['recorded_at']} {entry['url']}")
+    print(f"已录制 {len(store.index)} 个页面: " + (', '.join(f"{k} {v}" for k, v in sorted(counts.items())) or '无'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Playwright 请求拦截资源过滤器
+抓取脚本只读取页面DOM文本，图片、字体、视频、统计脚本等资源无需下载。
+通过 page.route / context.route 拦截请求，按资源类型和域名的允许/拒绝列表决定放行或中止，
+并统计拦截的请求数和节省的字节数（被拦截的请求没有响应，字节数按 EST_BYTES_BY_TYPE 估算，并非实测）。
+
+判断顺序：
+    1. 域名在允许列表中 → 放行
+    2. 域名在拒绝列表中 → 拦截
+    3. 资源类型在允许列表中 → 放行
+    4. 资源类型在拒绝列表中 → 拦截
+    5. 其他 → 放行
+
+注意：inner_text 和按可见性提取的字段会受CSS影响，默认预设都不拦截 stylesheet；
+如需为某站点拦截样式，先在真实页面上确认拦截前后提取的行完全一致（回放快照不加载样式，无法验证）。
+
+使用方法（测量拦截前后的页面加载耗时与流量）：
+    python resource_filter.py --site yingjiesheng --url "https://www.yingjiesheng.com/job/?keyword=产品经理&city=上海"
+    python resource_filter.py --site 51job --url "..." --runs 5
+"""
+
+import time
+import argparse
+from urllib.parse import urlparse
+from typing import List, Dict, Optional, Iterable
+
+# ==================== 配置区域 ====================
+
+# 是否启用资源拦截（各抓取脚本的 start_browser 读取此开关）
+RESOURCE_FILTER_ENABLED = True
+
+# 常见统计/广告域名（拦截）
+TRACKER_DOMAINS = [
+    'hm.baidu.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'cnzz.com',
+    '51.la',
+    'growingio.com',
+    'sensorsdata.cn',
+    'zhugeio.com',
+    'mediav.com',
+]
+
+# 被拦截资源的预估大小（字节），拦截后无法得知真实大小，用于估算节省的流量
+EST_BYTES_BY_TYPE = {
+    'image': 30 * 1024,
+    'media': 500 * 1024,
+    'font': 60 * 1024,
+    'stylesheet': 40 * 1024,
+    'script': 50 * 1024,
+}
+EST_BYTES_DEFAULT = 5 * 1024
+
+# 默认规则
+DEFAULT_RULES = {
+    'block_types': ['image', 'media', 'font'],
+    'allow_types': ['document', 'xhr', 'fetch'],
+    'block_domains': TRACKER_DOMAINS,
+    'allow_domains': [],
+}
+
+# 各站点预设（未列出的字段使用默认规则）
+# 只拦截不影响DOM文本的图片/字体/视频；boss直聘、猎聘的安全验证页面还依赖样式和脚本
+SITE_PRESETS = {
+    'yingjiesheng': {'block_types': ['image', 'media', 'font']},
+    'shixiseng': {'block_types': ['image', 'media', 'font']},
+    '51job': {'block_types': ['image', 'media', 'font']},
+    'guopin': {'block_types': ['image', 'media', 'font']},
+    'boss': {'block_types': ['image', 'media', 'font']},
+    'liepin': {'block_types': ['image', 'media', 'font']},
+    'aceoffer': {'block_types': ['image', 'media', 'font']},
+}
+
+
+def _domain_matches(host: str, domains: Iterable[str]) -> bool:
+    """判断host是否属于域名列表（支持子域名）"""
+    for domain in domains:
+        if host == domain or host.endswith('.' + domain):
+            return True
+    return False
+
+
+class ResourceFilter:
+    """请求拦截资源过滤器"""
+
+    def __init__(self, block_types: Optional[List[str]] = None, allow_types: Optional[List[str]] = None,
+                 block_domains: Optional[List[str]] = None, allow_domains: Optional[List[str]] = None,
+                 name: str = 'default'):
+        """初始化过滤器
+
+        Args:
+            block_types: 拦截的资源类型（Playwright resource_type）
+            allow_types: 始终放行的资源类型
+            block_domains: 拦截的域名
+            allow_domains: 始终放行的域名
+            name: 过滤器名称（用于日志）
+        """
+        self.name = name
+        self.block_types = set(DEFAULT_RULES['block_types'] if block_types is None else block_types)
+        self.allow_types = set(DEFAULT_RULES['allow_types'] if allow_types is None else allow_types)
+        self.block_domains = list(DEFAULT_RULES['block_domains'] if block_domains is None else block_domains)
+        self.allow_domains = list(DEFAULT_RULES['allow_domains'] if allow_domains is None else allow_domains)
+
+        self.allowed_requests = 0
+        self.blocked_requests = 0
+        self.blocked_by_type: Dict[str, int] = {}
+        self.est_bytes_saved = 0
+
+    @classmethod
+    def from_sites(cls, sites: List[str]) -> 'ResourceFilter':
+        """根据站点预设创建过滤器
+
+        同一页面访问多个站点时取最保守的组合：拦截类型取交集，允许/拦截域名取并集
+        """
+        block_types = None
+        allow_types = set()
+        block_domains = set()
+        allow_domains = set()
+        for site in sites:
+            rules = dict(DEFAULT_RULES, **SITE_PRESETS.get(site, {}))
+            site_block = set(rules['block_types'])
+            block_types = site_block if block_types is None else block_types & site_block
+            allow_types.update(rules['allow_types'])
+            block_domains.update(rules['block_domains'])
+            allow_domains.update(rules['allow_domains'])
+        return cls(block_types=sorted(block_types or []), allow_types=sorted(allow_types),
+                   block_domains=sorted(block_domains), allow_domains=sorted(allow_domains),
+                   name='+'.join(sites))
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """判断请求是否应被拦截"""
+        host = urlparse(url).hostname or ''
+        if _domain_matches(host, self.allow_domains):
+            return False
+        if _domain_matches(host, self.block_domains):
+            return True
+        if resource_type in self.allow_types:
+            return False
+        return resource_type in self.block_types
+
+    def _check(self, request) -> bool:
+        """判断并记录统计，返回是否拦截"""
+        resource_type = request.resource_type
+        if self.should_block(resource_type, request.url):
+            self.blocked_requests += 1
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            self.est_bytes_saved += EST_BYTES_BY_TYPE.get(resource_type, EST_BYTES_DEFAULT)
+            return True
+        self.allowed_requests += 1
+        return False
+
+    def _handle_route(self, route):
+        """路由处理（同步API）"""
+        try:
+            if self._check(route.request):
+                route.abort()
+            else:
+                route.continue_()
+        except Exception:
+            # 页面已关闭等情况，忽略
+            pass
+
+    async def _handle_route_async(self, route):
+        """路由处理（异步API）"""
+        try:
+            if self._check(route.request):
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            pass
+
+    def attach(self, target):
+        """挂载到页面或浏览器上下文（同步API）"""
+        target.route('**/*', self._handle_route)
+
+    async def attach_async(self, target):
+        """挂载到页面或浏览器上下文（异步API）"""
+        await target.route('**/*', self._handle_route_async)
+
+    def stats(self) -> Dict:
+        """拦截统计"""
+        total = self.allowed_requests + self.blocked_requests
+        return {
+            'name': self.name,
+            'total_requests': total,
+            'allowed_requests': self.allowed_requests,
+            'blocked_requests': self.blocked_requests,
+            'blocked_ratio': self.blocked_requests / total if total else 0,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'est_bytes_saved': self.est_bytes_saved,
+        }
+
+    def format_stats(self) -> str:
+        """格式化统计信息（用于日志输出）"""
+        s = self.stats()
+        by_type = ', '.join(f"{k} {v}" for k, v in sorted(s['blocked_by_type'].items(), key=lambda x: -x[1]))
+        return (f"[{s['name']}] 拦截 {s['blocked_requests']}/{s['total_requests']} 个请求 "
+                f"({s['blocked_ratio']:.0%})" + (f"（{by_type}）" if by_type else "")
+                + f"，估算节省流量约 {s['est_bytes_saved'] / (1024 * 1024):.1f}MB（按资源类型估算，非实测）")
+
+
+def create_filter(sites: List[str]) -> Optional[ResourceFilter]:
+    """按站点创建过滤器（RESOURCE_FILTER_ENABLED 关闭时返回 None）"""
+    if not RESOURCE_FILTER_ENABLED:
+        return None
+    return ResourceFilter.from_sites(sites)
+
+
+# ==================== 测量工具 ====================
+
+def measure_page_load(url: str, sites: List[str], runs: int = 3, headless: bool = True) -> Dict:
+    """分别在不拦截和拦截模式下加载页面，统计加载耗时、请求数和传输字节数"""
+    from playwright.sync_api import sync_playwright
+
+    results = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, args=['--disable-blink-features=AutomationControlled'])
+        for mode in ('off', 'on'):
+            load_times = []
+            request_counts = []
+            byte_counts = []
+            resource_filter = ResourceFilter.from_sites(sites) if mode == 'on' else None
+            for _ in range(runs):
+                # 每次使用新的上下文，避免缓存影响
+                context = browser.new_context(
+                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                    viewport={'width': 1920, 'height': 1080}
+                )
+                page = context.new_page()
+                if resource_filter:
+                    resource_filter.attach(page)
+
+                counters = {'requests': 0, 'bytes': 0}
+
+                def on_response(response):
+                    counters['requests'] += 1
+                    try:
+                        counters['bytes'] += int(response.headers.get('content-length', 0))
+                    except ValueError:
+                        pass
+
+                page.on('response', on_response)
+                start = time.perf_counter()
+                try:
+                    page.goto(url, wait_until='load', timeout=60000)
+                    load_times.append(time.perf_counter() - start)
+                except Exception as e:
+                    print(f"  ⚠ 加载失败: {str(e)[:50]}")
+                request_counts.append(counters['requests'])
+                byte_counts.append(counters['bytes'])
+                context.close()
+
+            results[mode] = {
+                'avg_load_seconds': sum(load_times) / len(load_times) if load_times else 0,
+                'avg_requests': sum(request_counts) / len(request_counts),
+                'avg_bytes': sum(byte_counts) / len(byte_counts),
+                'filter': resource_filter.stats() if resource_filter else None,
+            }
+        browser.close()
+    return results
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='测量资源拦截前后的页面加载耗时与流量')
+    parser.add_argument('--url', required=True, help='测试页面URL')
+    parser.add_argument('--site', nargs='+', default=['yingjiesheng'], choices=sorted(SITE_PRESETS.keys()),
+                        help='使用的站点预设')
+    parser.add_argument('--runs', type=int, default=3, help='每种模式加载次数')
+    parser.add_argument('--headed', action='store_true', help='显示浏览器窗口')
+    args = parser.parse_args()
+
+    results = measure_page_load(args.url, args.site, args.runs, headless=not args.headed)
+
+    print("\n" + "="*60)
+    print(f"资源拦截效果（站点预设: {'+'.join(args.site)}，每种模式 {args.runs} 次）")
+    print("="*60)
+    print(f"{'模式':>6} {'加载耗时(秒)':>14} {'响应数':>8} {'传输(KB)':>10}")
+    for mode, label in (('off', '不拦截'), ('on', '拦截')):
+        r = results[mode]
+        print(f"{label:>6} {r['avg_load_seconds']:>14.2f} {r['avg_requests']:>8.0f} {r['avg_bytes'] / 1024:>10.0f}")
+    if results['on']['filter']:
+        f = results['on']['filter']
+        print(f"  拦截请求（{args.runs} 次合计）: {f['blocked_requests']}/{f['total_requests']}，"
+              f"按类型: {f['blocked_by_type']}")
+    print("="*60)
+
+
+if __name__ == '__main__':
+    main()
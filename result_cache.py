@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索结果缓存
+main.py、specific_requirements_scraper.py 和 scheduler.py 相隔几个小时的两次运行会重复同样的搜索，
+拿到的结果大部分相同。本模块把解析后的搜索结果保存在 SQLite 中，先读缓存，未命中或过期才访问站点：
+
+    - 键：(平台, 关键词, 城市, 页码, 变体)；变体用于区分同一搜索在不同配置下的结果
+      （如招聘对象、公司类型依赖配置的年级和类型要求），不依赖配置时为空
+    - 值：解析后的结果列表（JSON）和抓取时间；过期时间按平台配置（CACHE_TTLS）
+    - 缓存的是本次运行去重之前的完整结果，命中后由调用方按本次运行的去重集合 / 数据库再过滤
+    - 空结果和示例数据不写入缓存（可能是访问失败）
+
+每次运行输出各平台的命中率和节省的页面加载数（一次搜索的页面加载数见 PAGE_LOADS_PER_SEARCH）。
+
+使用方法：
+    cache = get_result_cache()
+    rows = cache.get('51job', keyword, city)
+    if rows is None:
+        rows = 访问站点搜索(...)
+        cache.put('51job', keyword, city, rows)
+    print(cache.format_stats())
+
+    python result_cache.py              # 查看缓存条目
+    python result_cache.py --purge      # 删除过期条目
+    python result_cache.py --clear      # 清空缓存
+"""
+
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from typing import List, Dict, Optional
+
+# ==================== 配置区域 ====================
+
+# 是否启用结果缓存
+RESULT_CACHE_ENABLED = True
+
+# 缓存文件
+RESULT_CACHE_FILE = "result_cache.db"
+
+# 各平台缓存有效期（秒）。scheduler.py 每 3 小时运行一次（SCRAPE_INTERVAL），
+# 有效期 6 小时时每隔一次运行才实际访问应届生求职网，新岗位最多延迟一个周期发现
+CACHE_TTLS = {
+    'yingjiesheng': 6 * 3600,
+    'shixiseng': 6 * 3600,
+    '51job': 4 * 3600,
+    'boss': 4 * 3600,
+    'guopin': 12 * 3600,
+    'liepin': 6 * 3600,
+}
+DEFAULT_CACHE_TTL = 4 * 3600
+
+# 一次搜索的页面加载数（实习僧先访问首页再访问搜索页）
+PAGE_LOADS_PER_SEARCH = {
+    'shixiseng': 2,
+}
+
+
+class ResultCache:
+    """搜索结果缓存（线程安全，同一进程共用一个实例）"""
+
+    def __init__(self, cache_file: str = RESULT_CACHE_FILE, enabled: bool = RESULT_CACHE_ENABLED):
+        self.cache_file = cache_file
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict] = {}
+        self.conn = None
+        if enabled:
+            self.conn = sqlite3.connect(cache_file, timeout=30, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    platform TEXT NOT NULL,
+                    keyword TEXT NOT NULL,
+                    city TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    variant TEXT NOT NULL DEFAULT '',
+                    results TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (platform, keyword, city, page, variant)
+                )
+            ''')
+            self.conn.commit()
+
+    def _stat(self, platform: str) -> Dict:
+        stat = self.stats.get(platform)
+        if stat is None:
+            stat = self.stats[platform] = {'hits': 0, 'misses': 0, 'expired': 0, 'stored': 0}
+        return stat
+
+    def get(self, platform: str, keyword: str, city: str, page: int = 1,
+            variant: str = '') -> Optional[List[Dict]]:
+        """读取未过期的结果，未命中或已过期返回 None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT results, fetched_at FROM search_cache '
+                'WHERE platform = ? AND keyword = ? AND city = ? AND page = ? AND variant = ?',
+                (platform, keyword, city, page, variant)).fetchone()
+            stat = self._stat(platform)
+            if row is None:
+                stat['misses'] += 1
+                return None
+            if time.time() - row[1] > CACHE_TTLS.get(platform, DEFAULT_CACHE_TTL):
+                stat['misses'] += 1
+                stat['expired'] += 1
+                return None
+            stat['hits'] += 1
+        return json.loads(row[0])
+
+    def put(self, platform: str, keyword: str, city: str, results: List[Dict], page: int = 1,
+            variant: str = ''):
+        """写入结果（空结果不写入）"""
+        if not self.enabled or not results:
+            return
+        data = json.dumps(results, ensure_ascii=False, default=str)
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO search_cache (platform, keyword, city, page, variant, results, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (platform, keyword, city, page, variant, data, time.time()))
+            self.conn.commit()
+            self._stat(platform)['stored'] += 1
+
+    def merge(self, stats: Dict[str, Dict]):
+        """合并其他进程的命中统计（多进程抓取时由主进程汇总）"""
+        with self._lock:
+            for platform, other in stats.items():
+                stat = self._stat(platform)
+                for key, value in other.items():
+                    stat[key] = stat.get(key, 0) + value
+
+    def purge_expired(self) -> int:
+        """删除所有过期条目，返回删除条数"""
+        if not self.enabled:
+            return 0
+        now = time.time()
+        with self._lock:
+            before = self.conn.total_changes
+            for platform, in self.conn.execute('SELECT DISTINCT platform FROM search_cache').fetchall():
+                ttl = CACHE_TTLS.get(platform, DEFAULT_CACHE_TTL)
+                self.conn.execute('DELETE FROM search_cache WHERE platform = ? AND fetched_at < ?',
+                                  (platform, now - ttl))
+            self.conn.commit()
+            return self.conn.total_changes - before
+
+    def clear(self):
+        """清空缓存"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.conn.execute('DELETE FROM search_cache')
+            self.conn.commit()
+
+    def format_stats(self) -> str:
+        """本次运行各平台的命中率和节省的页面加载数"""
+        if not self.enabled:
+            return "结果缓存: 未启用"
+        with self._lock:
+            stats = {platform: dict(s) for platform, s in self.stats.items()}
+        if not stats:
+            return "结果缓存: 无数据"
+        lines = [f"{'平台':<14} {'命中':>5} {'未命中':>6} {'过期':>5} {'命中率':>7} {'节省页面加载':>12}"]
+        total_hits = total_lookups = total_saved = 0
+        for platform, s in stats.items():
+            lookups = s['hits'] + s['misses']
+            saved = s['hits'] * PAGE_LOADS_PER_SEARCH.get(platform, 1)
+            total_hits += s['hits']
+            total_lookups += lookups
+            total_saved += saved
+            lines.append(f"{platform:<14} {s['hits']:>5} {s['misses']:>6} {s['expired']:>5} "
+                         f"{s['hits'] / lookups if lookups else 0:>7.0%} {saved:>12}")
+        lines.append(f"结果缓存: 命中率 {total_hits / total_lookups if total_lookups else 0:.0%}，"
+                     f"节省 {total_saved} 次页面加载")
+        return "\n".join(lines)
+
+    def format_entries(self) -> str:
+        """缓存条目汇总（按平台）"""
+        if not self.enabled:
+            return "结果缓存: 未启用"
+        now = time.time()
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT platform, fetched_at FROM search_cache ORDER BY platform').fetchall()
+        if not rows:
+            return "没有缓存条目"
+        summary: Dict[str, Dict] = {}
+        for platform, fetched_at in rows:
+            s = summary.setdefault(platform, {'entries': 0, 'expired': 0, 'newest': 0.0})
+            s['entries'] += 1
+            if now - fetched_at > CACHE_TTLS.get(platform, DEFAULT_CACHE_TTL):
+                s['expired'] += 1
+            s['newest'] = max(s['newest'], fetched_at)
+        lines = [f"{'平台':<14} {'条目':>6} {'已过期':>6} {'有效期(小时)':>12} {'最近写入':>20}"]
+        for platform, s in summary.items():
+            ttl_hours = CACHE_TTLS.get(platform, DEFAULT_CACHE_TTL) / 3600
+            newest = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(s['newest']))
+            lines.append(f"{platform:<14} {s['entries']:>6} {s['expired']:>6} {ttl_hours:>12.1f} {newest:>20}")
+        return "\n".join(lines)
+
+    def close(self):
+        """关闭缓存文件"""
+        with self._lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
+                self.enabled = False
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """进程内共享的结果缓存"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='搜索结果缓存')
+    parser.add_argument('--purge', action='store_true', help='删除过期条目')
+    parser.add_argument('--clear', action='store_true', help='清空缓存')
+    args = parser.parse_args()
+
+    cache = ResultCache(enabled=True)
+    if args.clear:
+        cache.clear()
+        print("✓ 结果缓存已清空")
+    elif args.purge:
+        print(f"✓ 已删除 {cache.purge_expired()} 个过期条目")
+    else:
+        print(cache.format_entries())
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
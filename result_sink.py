@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抓取结果流式落盘
+main.JobScraper.run 原来把所有结果保存在内存中，全部抓完后才合并成 DataFrame、过滤并导出，
+中途出错会丢失全部结果，内存随配置数增长。本模块把每批结果抓到后立即追加写入 SQLite 文件：
+
+    - 每次运行一个文件（SINK_FILE_TEMPLATE），results 表只追加，相关链接相同的结果只保留第一条
+    - 同时记录每个配置的内容（configs 表），过滤和导出不依赖运行时的 SEARCH_CONFIGS
+    - 过滤和导出时按 (配置, 自增id) 分批读取为 DataFrame，内存只与 SINK_CHUNK_SIZE 有关
+
+运行中断后，已抓取的结果仍在文件中，可以直接重新过滤导出：
+    python main.py --from-sink job_hunting_sink_20261018_093000.db
+
+每次运行结束后只保留最近 SINK_KEEP_FILES 个结果文件，更早的自动删除。
+
+使用方法：
+    sink = ResultSink.create()
+    sink.register_config(1, config)
+    sink.write(1, results)                       # 每批结果抓到后立即写入
+    for df in sink.iter_chunks(1):               # 分批读取某个配置的结果
+        ...
+    prune_sink_files()                           # 删除较早的结果文件
+"""
+
+import os
+import glob
+import json
+import sqlite3
+from datetime import datetime
+from typing import List, Dict, Iterator, Optional
+
+# ==================== 配置区域 ====================
+
+# 是否启用流式落盘（关闭时 main.py 按原来的方式在内存中合并）
+SINK_ENABLED = True
+
+# 落盘文件名（每次运行一个文件，运行结束后保留，便于重新导出）
+SINK_FILE_TEMPLATE = "job_hunting_sink_{timestamp}.db"
+
+# 保留最近多少个结果文件（按文件名中的时间排序，更早的连同 -wal/-shm 文件一起删除；0 表示不删除）
+SINK_KEEP_FILES = 5
+
+# 每次读取的行数
+SINK_CHUNK_SIZE = 2000
+
+
+class ResultSink:
+    """只追加的结果文件（单线程写入：并发搜索时结果也由主线程合并后写入）"""
+
+    def __init__(self, sink_file: str):
+        self.sink_file = sink_file
+        self.conn = sqlite3.connect(sink_file, timeout=30)
+        # 每批结果单独提交；WAL 下 NORMAL 即可保证中断后已提交的批次完整
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                config_index INTEGER NOT NULL,
+                link TEXT UNIQUE,
+                data TEXT NOT NULL,
+                created_at TIMESTAMP
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_results_config ON results (config_index, id)')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS configs (
+                config_index INTEGER PRIMARY KEY,
+                config TEXT NOT NULL
+            )
+        ''')
+        self.conn.commit()
+        self.written = 0
+        self.duplicates = 0
+
+    @classmethod
+    def create(cls) -> 'ResultSink':
+        """按当前时间新建本次运行的结果文件"""
+        return cls(SINK_FILE_TEMPLATE.format(timestamp=datetime.now().strftime('%Y%m%d_%H%M%S')))
+
+    def register_config(self, config_index: int, config: Dict):
+        """记录配置内容（过滤时使用）"""
+        self.conn.execute('INSERT OR REPLACE INTO configs (config_index, config) VALUES (?, ?)',
+                          (config_index, json.dumps(config, ensure_ascii=False, default=str)))
+        self.conn.commit()
+
+    def configs(self) -> Dict[int, Dict]:
+        """已记录的配置（按序号）"""
+        rows = self.conn.execute('SELECT config_index, config FROM configs ORDER BY config_index').fetchall()
+        return {index: json.loads(config) for index, config in rows}
+
+    def write(self, config_index: int, batch: List[Dict]) -> int:
+        """追加一批结果并立即提交，返回实际写入的条数（链接重复的不写入）"""
+        if not batch:
+            return 0
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        before = self.conn.total_changes
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO results (config_index, link, data, created_at) VALUES (?, ?, ?, ?)',
+            [(config_index, row.get('相关链接'), json.dumps(row, ensure_ascii=False, default=str), created_at)
+             for row in batch])
+        self.conn.commit()
+        inserted = self.conn.total_changes - before
+        self.written += inserted
+        self.duplicates += len(batch) - inserted
+        return inserted
+
+    def count(self, config_index: Optional[int] = None) -> int:
+        """结果条数"""
+        if config_index is None:
+            return self.conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        return self.conn.execute('SELECT COUNT(*) FROM results WHERE config_index = ?',
+                                 (config_index,)).fetchone()[0]
+
+    def iter_chunks(self, config_index: int, chunk_size: int = SINK_CHUNK_SIZE) -> Iterator:
+        """按写入顺序分批读取某个配置的结果（每批一个 DataFrame）"""
+        import pandas as pd
+
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                'SELECT id, data FROM results WHERE config_index = ? AND id > ? ORDER BY id LIMIT ?',
+                (config_index, last_id, chunk_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            yield pd.DataFrame([json.loads(data) for _, data in rows])
+
+    def close(self):
+        """关闭文件"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+def prune_sink_files(keep: int = SINK_KEEP_FILES, directory: str = '.') -> List[str]:
+    """删除较早的结果文件，只保留最近 keep 个，返回删除的文件列表"""
+    if keep <= 0:
+        return []
+    pattern = os.path.join(directory, SINK_FILE_TEMPLATE.format(timestamp='*'))
+    # 时间戳格式固定（%Y%m%d_%H%M%S），按文件名排序即按时间排序
+    stale = sorted(glob.glob(pattern))[:-keep]
+    removed = []
+    for sink_file in stale:
+        for path in (sink_file, sink_file + '-wal', sink_file + '-shm'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print(f"⚠ 删除结果文件失败: {path}（{e}）")
+                continue
+            removed.append(path)
+    return removed
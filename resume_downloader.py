@@ -10,7 +10,8 @@ import time
 import re
 from pathlib import Path
 from datetime import datetime
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from browser_pool import get_browser_pool
 import urllib.parse
 
 
@@ -31,7 +32,7 @@ class ResumeDownloader:
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
         self.headless = headless
-        self.playwright = None
+        self.browser_lease = None
         self.browser = None
         self.page = None
         self.context = None
@@ -45,18 +46,21 @@ class ResumeDownloader:
         print(f"下载目录: {self.download_dir}")
         print("正在启动浏览器...")
         
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            slow_mo=500  # 减慢操作速度，便于观察
+        # 从浏览器池租用页面（不续租，保持登录状态）
+        self.browser_lease = get_browser_pool().lease(
+            launch_options={
+                'headless': self.headless,
+                'slow_mo': 500,  # 减慢操作速度，便于观察
+            },
+            # 配置下载路径
+            context_options={
+                'accept_downloads': True,
+                'viewport': {'width': 1920, 'height': 1080},
+            },
         )
-        
-        # 配置下载路径
-        self.context = self.browser.new_context(
-            accept_downloads=True,
-            viewport={'width': 1920, 'height': 1080}
-        )
-        self.page = self.context.new_page()
+        self.browser = self.browser_lease.browser
+        self.context = self.browser_lease.context
+        self.page = self.browser_lease.page
         
         print("浏览器启动成功！")
         
@@ -578,14 +582,10 @@ class ResumeDownloader:
     
     def close(self):
         """关闭浏览器"""
-        if self.page:
-            self.page.close()
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        # 归还页面（浏览器实例在进程退出时关闭）
+        if self.browser_lease:
+            self.browser_lease.release()
+            self.browser_lease = None
         print("\n浏览器已关闭")
 
 
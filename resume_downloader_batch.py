@@ -12,7 +12,7 @@ import time
 import re
 from pathlib import Path
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from browser_pool import get_browser_pool
 import urllib.parse
 
 
@@ -27,7 +27,7 @@ class BatchResumeDownloader:
         self.temp_dir = self.download_dir / 'temp'
         self.temp_dir.mkdir(exist_ok=True)
         
-        self.playwright = None
+        self.browser_lease = None
         self.browser = None
         self.page = None
         self.context = None
@@ -42,10 +42,14 @@ class BatchResumeDownloader:
         print("="*60)
         print(f"下载目录: {self.download_dir}\n")
         
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=False, slow_mo=50)
-        self.context = self.browser.new_context(accept_downloads=True)
-        self.page = self.context.new_page()
+        # 从浏览器池租用页面（不续租，保持登录状态）
+        self.browser_lease = get_browser_pool().lease(
+            launch_options={'headless': False, 'slow_mo': 50},
+            context_options={'accept_downloads': True},
+        )
+        self.browser = self.browser_lease.browser
+        self.context = self.browser_lease.context
+        self.page = self.browser_lease.page
         
     def login_once(self):
         """一次性登录"""
@@ -313,14 +317,10 @@ class BatchResumeDownloader:
     
     def close(self):
         """关闭"""
-        if self.page:
-            self.page.close()
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        # 归还页面（浏览器实例在进程退出时关闭）
+        if self.browser_lease:
+            self.browser_lease.release()
+            self.browser_lease = None
 
 
 if __name__ == '__main__':
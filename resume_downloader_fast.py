@@ -9,7 +9,7 @@ import time
 import re
 from pathlib import Path
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from browser_pool import get_browser_pool
 import urllib.parse
 
 
@@ -21,7 +21,7 @@ class FastResumeDownloader:
             download_dir = os.path.join(os.path.dirname(__file__), 'resumes')
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
-        self.playwright = None
+        self.browser_lease = None
         self.browser = None
         self.page = None
         self.context = None
@@ -33,10 +33,14 @@ class FastResumeDownloader:
         print("="*60)
         print(f"下载目录: {self.download_dir}\n")
         
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=False, slow_mo=100)
-        self.context = self.browser.new_context(accept_downloads=True)
-        self.page = self.context.new_page()
+        # 从浏览器池租用页面（不续租，保持登录状态）
+        self.browser_lease = get_browser_pool().lease(
+            launch_options={'headless': False, 'slow_mo': 100},
+            context_options={'accept_downloads': True},
+        )
+        self.browser = self.browser_lease.browser
+        self.context = self.browser_lease.context
+        self.page = self.browser_lease.page
         
     def login(self):
         """快速登录"""
@@ -187,14 +191,10 @@ class FastResumeDownloader:
     
     def close(self):
         """关闭"""
-        if self.page:
-            self.page.close()
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        # 归还页面（浏览器实例在进程退出时关闭）
+        if self.browser_lease:
+            self.browser_lease.release()
+            self.browser_lease = None
 
 
 if __name__ == '__main__':
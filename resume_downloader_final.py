@@ -9,14 +9,14 @@ import time
 import re
 from pathlib import Path
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from browser_pool import get_browser_pool
 
 
 class ResumeDownloader:
     def __init__(self):
         self.download_dir = Path(__file__).parent / 'resumes'
         self.download_dir.mkdir(parents=True, exist_ok=True)
-        self.playwright = None
+        self.browser_lease = None
         self.browser = None
         self.page = None
         
@@ -26,9 +26,13 @@ class ResumeDownloader:
         print("="*60)
         print(f"下载目录: {self.download_dir}\n")
         
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=False, slow_mo=100)
-        self.page = self.browser.new_page(accept_downloads=True)
+        # 从浏览器池租用页面（不续租，保持登录状态）
+        self.browser_lease = get_browser_pool().lease(
+            launch_options={'headless': False, 'slow_mo': 100},
+            context_options={'accept_downloads': True},
+        )
+        self.browser = self.browser_lease.browser
+        self.page = self.browser_lease.page
         
     def login(self):
         print("正在登录...")
@@ -253,12 +257,10 @@ class ResumeDownloader:
     
     def close(self):
         time.sleep(2)
-        if self.page:
-            self.page.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        # 归还页面（浏览器实例在进程退出时关闭）
+        if self.browser_lease:
+            self.browser_lease.release()
+            self.browser_lease = None
 
 
 if __name__ == '__main__':
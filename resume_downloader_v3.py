@@ -9,7 +9,8 @@ import os
 import re
 import time
 from pathlib import Path
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from browser_pool import get_browser_pool
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -23,7 +24,7 @@ class ResumeDownloaderV3:
         self.download_dir = Path(__file__).parent / 'resumes_download'
         self.download_dir.mkdir(parents=True, exist_ok=True)
         
-        self.playwright = None
+        self.browser_lease = None
         self.browser = None
         self.page = None
         self.context = None
@@ -35,18 +36,19 @@ class ResumeDownloaderV3:
         print("="*60)
         print(f"下载目录: {self.download_dir.absolute()}\n")
         
-        # 启动 Playwright
-        self.playwright = sync_playwright().start()
-        
-        # 启动 Chromium 浏览器（非无头模式，可以看到界面）
-        self.browser = self.playwright.chromium.launch(
-            headless=False,
-            slow_mo=100  # 减慢操作速度，便于观察
+        # 从浏览器池租用页面（不续租，保持登录状态）
+        self.browser_lease = get_browser_pool().lease(
+            # Chromium 非无头模式，可以看到界面
+            launch_options={
+                'headless': False,
+                'slow_mo': 100,  # 减慢操作速度，便于观察
+            },
+            # 浏览器上下文启用下载功能
+            context_options={'accept_downloads': True},
         )
-        
-        # 创建浏览器上下文，启用下载功能
-        self.context = self.browser.new_context(accept_downloads=True)
-        self.page = self.context.new_page()
+        self.browser = self.browser_lease.browser
+        self.context = self.browser_lease.context
+        self.page = self.browser_lease.page
         
         print("✓ 浏览器已启动\n")
     
@@ -518,26 +520,13 @@ class ResumeDownloaderV3:
     
     def close(self):
         """关闭浏览器"""
-        if self.page:
-            try:
-                self.page.close()
-            except:
-                pass
-        if self.context:
-            try:
-                self.context.close()
-            except:
-                pass
-        if self.browser:
-            try:
-                self.browser.close()
-            except:
-                pass
-        if self.playwright:
+        # 归还页面（浏览器实例在进程退出时关闭）
+        if self.browser_lease:
             try:
-                self.playwright.stop()
+                self.browser_lease.release()
             except:
                 pass
+            self.browser_lease = None
         print("\n浏览器已关闭")
 
 
@@ -13,27 +13,71 @@
     playwright install chromium
 
 使用方法：
-    python job_scraper_scheduler.py
+    python job_scraper_scheduler.py                    # 同步引擎，顺序抓取
+    python job_scraper_scheduler.py --concurrency 4    # 同步引擎，4个浏览器并发抓取
+    python job_scraper_scheduler.py --processes 4      # 同步引擎，4个子进程各自启动浏览器抓取
+    python job_scraper_scheduler.py --async            # 异步引擎，单线程多页面并发抓取
+    python job_scraper_scheduler.py --plan             # 只打印去重后的搜索计划（dry-run）
+    python job_scraper_scheduler.py --progress         # 查看当前抓取进度（断点续跑）
 """
 
 import time
 import random
+import asyncio
+import argparse
+import queue
 import sqlite3
+import multiprocessing
+import threading
 import requests
 import urllib.parse
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from typing import List, Dict, Optional, Callable
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from url_index import SeenUrlIndex
+from search_planner import SearchPlan, build_search_plan, recruit_fields
+from resource_filter import create_filter
+from page_readiness import ReadinessStats, PageLoadError, navigate_and_wait, get_rate_limiter, share_rate_limits
+from selector_cache import get_selector_cache
+from stage_metrics import get_metrics, timed, instrument_page
+from job_search import upgrade_schema
+from crawl_checkpoint import CrawlCheckpoint, task_key
+from browser_pool import get_browser_pool, shutdown_browser_pool
+from result_cache import ResultCache, get_result_cache
 
 # ==================== 配置区域 ====================
 
 # 钉钉Webhook地址（请替换为你的实际Token）
 DINGTALK_WEBHOOK = "https://oapi.dingtalk.com/robot/send?access_token=c5b4858e08eb2b4cbf4e1678368b3ed64d82eb0b3083dd8c77964126f4ac7994"
 
+# 钉钉消息走后台发送队列（限速20条/分钟、失败重试、重启后继续发送，见 dingtalk_queue.py）
+DINGTALK_QUEUE_ENABLED = True
+
 # 数据库文件路径
 DB_FILE = "jobs.db"
 
+# 数据库长连接模式（单连接 + WAL，批量去重、批量写入）
+# 设置为 False 则退回到每次操作单独打开连接的旧模式
+DB_POOLED = True
+
+# 启动时将 posted_jobs.url 预加载到内存索引，去重判断不再访问数据库
+URL_INDEX_ENABLED = True
+
+# 批量去重时每条 IN 查询的最大URL数（SQLite 默认参数上限为999）
+SQL_IN_CHUNK_SIZE = 500
+
+# 岗位插入语句（包含所有9个字段）
+INSERT_JOB_SQL = '''
+    INSERT OR IGNORE INTO posted_jobs (
+        url, company_name, company_type, work_location,
+        recruit_type, recruit_target, job_title,
+        update_time, deadline, created_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
 # 抓取间隔（秒）- 3小时 = 10800秒
 SCRAPE_INTERVAL = 10800  # 3小时
 
@@ -42,6 +86,37 @@ SCRAPE_INTERVAL = 10800  # 3小时
 RANDOM_WAIT_MIN = 1
 RANDOM_WAIT_MAX = 3
 
+# 并发抓取的浏览器数量（1 表示按配置顺序单页抓取）
+# 每个并发worker在独立线程中启动自己的浏览器，建议不超过CPU核数
+# 注意：并发时多个搜索词抓到同一岗位，由先写入数据库的任务获得该岗位（config_keywords 归属），
+# 归属取决于任务完成的先后，不保证与顺序模式一致；抓到的岗位集合本身不受影响
+CRAWL_CONCURRENCY = 1
+
+# 多进程抓取的进程数（1 表示不启用）
+# 搜索任务分发到多个子进程，每个进程独立启动浏览器，DOM提取和解析不再受单进程GIL限制；
+# 各进程直接查询/写入 jobs.db 去重（WAL + INSERT OR IGNORE），新岗位由主进程按任务顺序汇总
+CRAWL_PROCESSES = 1
+
+# 是否使用异步抓取引擎（playwright.async_api，单进程单线程内多页面并发）
+ASYNC_ENGINE = False
+
+# 异步引擎同时打开的页面数
+ASYNC_CONCURRENCY = 4
+
+# 断点续跑：记录每个搜索任务的进度，进程中途退出后在同一抓取窗口内重新运行时跳过已完成的任务
+CHECKPOINT_ENABLED = True
+
+# Excel导出模式
+# pandas: 一次性读取全表后写入（旧方式）
+# stream: 分批读取并流式写入 openpyxl write_only 工作簿（全量）
+# delta:  流式写入，只导出上次导出之后新增的岗位（水位线保存在 export_state 表）
+EXCEL_EXPORT_MODE = 'stream'
+
+# 应届生求职网列表字段的提取方式
+# evaluate: 一次 page.evaluate 在页面内提取整页所有行的字段（一次浏览器往返），脚本出错时退回 handles
+# handles:  逐个元素 query_selector / inner_text / get_attribute（每次调用一次往返，旧方式）
+YINGJIESHENG_EXTRACT_MODE = 'evaluate'
+
 # 城市映射配置（用于将模糊地区转换为具体城市）
 CITY_MAPPING = {
     '非偏远地区': [
@@ -520,116 +595,214 @@ SEARCH_CONFIGS = [
 class DBManager:
     """数据库管理器 - 用于记录已推送的岗位"""
     
-    def __init__(self, db_file: str = DB_FILE):
-        """初始化数据库连接"""
+    def __init__(self, db_file: str = DB_FILE, pooled: bool = DB_POOLED,
+                 use_url_index: bool = URL_INDEX_ENABLED):
+        """初始化数据库连接
+        
+        Args:
+            db_file: 数据库文件路径
+            pooled: 是否使用长连接模式（单连接 + WAL，支持批量去重和批量写入）
+            use_url_index: 是否预加载已抓取URL的内存索引
+        """
         self.db_file = db_file
+        self.pooled = pooled
+        self.url_index: Optional[SeenUrlIndex] = None
+        self._conn = None
+        self._lock = threading.RLock()
+        if pooled:
+            self._conn = self._open_connection()
         self.init_database()
+        if use_url_index:
+            self.load_url_index()
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """打开长连接并启用WAL模式"""
+        conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        # WAL模式下NORMAL已能保证数据库一致性，且避免每次提交都fsync
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        """获取数据库连接（长连接模式复用同一连接，否则每次新建）"""
+        if self.pooled:
+            with self._lock:
+                yield self._conn
+        else:
+            conn = sqlite3.connect(self.db_file)
+            try:
+                yield conn
+            finally:
+                conn.close()
+    
+    def close(self):
+        """关闭长连接"""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
     
     def init_database(self):
         """初始化数据库表结构（包含所有9个字段）"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        # 创建表：posted_jobs（包含所有必需字段）
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS posted_jobs (
-                url TEXT PRIMARY KEY,
-                company_name TEXT,
-                company_type TEXT,
-                work_location TEXT,
-                recruit_type TEXT,
-                recruit_target TEXT,
-                job_title TEXT NOT NULL,
-                update_time TEXT,
-                deadline TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # 如果表已存在但字段不完整，尝试添加新字段
-        try:
-            cursor.execute('ALTER TABLE posted_jobs ADD COLUMN company_type TEXT')
-        except:
-            pass
-        try:
-            cursor.execute('ALTER TABLE posted_jobs ADD COLUMN work_location TEXT')
-        except:
-            pass
-        try:
-            cursor.execute('ALTER TABLE posted_jobs ADD COLUMN recruit_type TEXT')
-        except:
-            pass
-        try:
-            cursor.execute('ALTER TABLE posted_jobs ADD COLUMN recruit_target TEXT')
-        except:
-            pass
-        try:
-            cursor.execute('ALTER TABLE posted_jobs ADD COLUMN update_time TEXT')
-        except:
-            pass
-        try:
-            cursor.execute('ALTER TABLE posted_jobs ADD COLUMN deadline TEXT')
-        except:
-            pass
-        
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # 创建表：posted_jobs（包含所有必需字段）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS posted_jobs (
+                    url TEXT PRIMARY KEY,
+                    company_name TEXT,
+                    company_type TEXT,
+                    work_location TEXT,
+                    recruit_type TEXT,
+                    recruit_target TEXT,
+                    job_title TEXT NOT NULL,
+                    update_time TEXT,
+                    deadline TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 如果表已存在但字段不完整，尝试添加新字段
+            try:
+                cursor.execute('ALTER TABLE posted_jobs ADD COLUMN company_type TEXT')
+            except:
+                pass
+            try:
+                cursor.execute('ALTER TABLE posted_jobs ADD COLUMN work_location TEXT')
+            except:
+                pass
+            try:
+                cursor.execute('ALTER TABLE posted_jobs ADD COLUMN recruit_type TEXT')
+            except:
+                pass
+            try:
+                cursor.execute('ALTER TABLE posted_jobs ADD COLUMN recruit_target TEXT')
+            except:
+                pass
+            try:
+                cursor.execute('ALTER TABLE posted_jobs ADD COLUMN update_time TEXT')
+            except:
+                pass
+            try:
+                cursor.execute('ALTER TABLE posted_jobs ADD COLUMN deadline TEXT')
+            except:
+                pass
+            
+            conn.commit()
+            
+            # 版本升级：索引与全文检索（见 job_search.py）
+            upgrade_schema(conn)
         print(f"✓ 数据库初始化完成: {self.db_file}")
     
+    def load_url_index(self):
+        """从数据库加载已抓取URL到内存索引"""
+        start = time.perf_counter()
+        self.url_index = SeenUrlIndex.from_database(self.db_file)
+        elapsed = time.perf_counter() - start
+        print(f"✓ URL索引加载完成（{elapsed:.2f}秒）: {self.url_index.format_stats()}")
+    
     def is_job_exists(self, url: str) -> bool:
         """判断岗位是否已存在"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        if self.url_index is not None:
+            return url in self.url_index
         
-        cursor.execute('SELECT 1 FROM posted_jobs WHERE url = ?', (url,))
-        exists = cursor.fetchone() is not None
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1 FROM posted_jobs WHERE url = ?', (url,))
+            return cursor.fetchone() is not None
+    
+    def filter_new_urls(self, urls: List[str]) -> List[str]:
+        """批量去重：返回数据库中不存在的URL（保持原顺序，同批内重复只保留一次）"""
+        unique_urls = list(dict.fromkeys(u for u in urls if u))
+        if not unique_urls:
+            return []
+        
+        if self.url_index is not None:
+            return [u for u in unique_urls if u not in self.url_index]
         
-        conn.close()
-        return exists
+        existing = set()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            # 分块查询，避免超过SQLite的参数数量上限
+            for i in range(0, len(unique_urls), SQL_IN_CHUNK_SIZE):
+                chunk = unique_urls[i:i + SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'SELECT url FROM posted_jobs WHERE url IN ({placeholders})', chunk)
+                existing.update(row[0] for row in cursor.fetchall())
+        
+        return [u for u in unique_urls if u not in existing]
+    
+    def load_jobs(self, urls: List[str]) -> List[Dict]:
+        """按URL读取已入库的岗位（保持传入顺序，不存在的URL跳过）"""
+        columns = ['url', 'company_name', 'company_type', 'work_location', 'recruit_type',
+                   'recruit_target', 'job_title', 'update_time', 'deadline']
+        found = {}
+        with self._connection() as conn:
+            for i in range(0, len(urls), SQL_IN_CHUNK_SIZE):
+                chunk = urls[i:i + SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor = conn.execute(f"SELECT {', '.join(columns)} FROM posted_jobs WHERE url IN ({placeholders})",
+                                      chunk)
+                for row in cursor.fetchall():
+                    found[row[0]] = dict(zip(columns, row))
+        return [found[u] for u in urls if u in found]
+    
+    def _job_row(self, data: Dict, created_at: str) -> tuple:
+        """将岗位数据转换为插入用的元组"""
+        return (
+            data.get('url', ''),
+            data.get('company_name', '未知'),
+            data.get('company_type', '未知'),
+            data.get('work_location', ''),
+            data.get('recruit_type', ''),
+            data.get('recruit_target', ''),
+            data.get('job_title', ''),
+            data.get('update_time', '未知'),
+            data.get('deadline', '详见链接'),
+            created_at,
+        )
     
     def save_job(self, data: Dict):
         """保存新岗位到数据库（包含所有9个字段）"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            try:
+                conn.execute(INSERT_JOB_SQL, self._job_row(data, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                conn.commit()
+                if self.url_index is not None:
+                    self.url_index.add(data.get('url', ''))
+                return True
+            except Exception as e:
+                conn.rollback()
+                print(f"⚠ 保存岗位到数据库时出错: {str(e)}")
+                return False
+    
+    def save_jobs(self, batch: List[Dict]) -> int:
+        """批量保存岗位（单个事务内executemany），返回实际新增条数"""
+        if not batch:
+            return 0
         
-        try:
-            cursor.execute('''
-                INSERT OR IGNORE INTO posted_jobs (
-                    url, company_name, company_type, work_location,
-                    recruit_type, recruit_target, job_title,
-                    update_time, deadline, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                data.get('url', ''),
-                data.get('company_name', '未知'),
-                data.get('company_type', '未知'),
-                data.get('work_location', ''),
-                data.get('recruit_type', ''),
-                data.get('recruit_target', ''),
-                data.get('job_title', ''),
-                data.get('update_time', '未知'),
-                data.get('deadline', '详见链接'),
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            ))
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"⚠ 保存岗位到数据库时出错: {str(e)}")
-            return False
-        finally:
-            conn.close()
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = [self._job_row(data, created_at) for data in batch]
+        with self._connection() as conn:
+            try:
+                # rowcount 不含触发器（全文索引同步）产生的写入
+                with conn:
+                    cursor = conn.executemany(INSERT_JOB_SQL, rows)
+                if self.url_index is not None:
+                    self.url_index.add_many(data.get('url', '') for data in batch)
+                return cursor.rowcount
+            except Exception as e:
+                print(f"⚠ 批量保存岗位到数据库时出错: {str(e)}")
+                return 0
     
     def get_total_count(self) -> int:
         """获取数据库中总岗位数"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT COUNT(*) FROM posted_jobs')
-        count = cursor.fetchone()[0]
-        
-        conn.close()
-        return count
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM posted_jobs')
+            return cursor.fetchone()[0]
 
 
 # ==================== 钉钉通知模块 ====================
@@ -643,6 +816,7 @@ class DingTalkSender:
         if "YOUR_TOKEN" in webhook:
             print("⚠ 警告: 请先配置钉钉Webhook地址！")
     
+    @timed('scheduler', 'dingtalk')
     def send_file(self, file_path: str, file_name: str = None) -> bool:
         """发送文件到钉钉群（通过文件上传API）"""
         if "YOUR_TOKEN" in self.webhook:
@@ -800,12 +974,26 @@ class DingTalkSender:
             print(f"✗ 发送文件信息消息时出错: {str(e)}")
             return False
     
+    @timed('scheduler', 'dingtalk')
     def send_markdown(self, title: str, content: str) -> bool:
-        """发送Markdown格式消息"""
+        """发送Markdown格式消息（DINGTALK_QUEUE_ENABLED 时加入后台发送队列，限速、重试、过长自动拆分）
+
+        Returns:
+            启用发送队列时表示是否已入队（不代表已送达），否则表示是否发送成功
+        """
         if "YOUR_TOKEN" in self.webhook:
             print("⚠ 钉钉Webhook未配置，跳过推送")
             return False
         
+        if DINGTALK_QUEUE_ENABLED:
+            try:
+                from dingtalk_queue import enqueue_markdown
+                message_ids = enqueue_markdown(self.webhook, title, content)
+                print(f"✓ 钉钉消息已加入发送队列（{len(message_ids)} 条）")
+                return True
+            except Exception as e:
+                print(f"⚠ 加入发送队列失败，改为直接发送: {str(e)[:100]}")
+        
         payload = {
             "msgtype": "markdown",
             "markdown": {
@@ -831,25 +1019,47 @@ class DingTalkSender:
             print(f"✗ 发送钉钉消息时出错: {str(e)}")
             return False
     
-    def format_jobs_message(self, new_jobs: List[Dict], total_count: int, excel_file: Optional[str] = None) -> tuple:
-        """格式化岗位消息为Markdown格式（优化版：只显示最新50个，逻辑清晰）"""
+    def format_jobs_message(self, new_jobs: List[Dict], total_count: int, excel_file: Optional[str] = None,
+                            config_results: Optional[Dict[int, List[Dict]]] = None) -> tuple:
+        """格式化岗位消息为Markdown格式（优化版：只显示最新50个，逻辑清晰）
+        
+        config_results 为搜索计划分发后的 {配置序号: 岗位列表} 时按配置分组：
+        多个配置共享的岗位在每个配置下各显示一次，招聘类型和招聘对象按该配置计算
+        """
         if not new_jobs:
             return None, None
         
         # 只取最新50个岗位
         display_jobs = new_jobs[:50] if len(new_jobs) > 50 else new_jobs
-        remaining_count = len(new_jobs) - len(display_jobs)
         
         # 标题
         title = f"📢 招聘雷达 | 新增岗位 {len(new_jobs)} 个"
         
         # 按需求分类分组（按配置关键词分组）
         grouped_jobs = {}
-        for job in display_jobs:
-            group_key = job.get('config_keywords', '其他')
-            if group_key not in grouped_jobs:
-                grouped_jobs[group_key] = []
-            grouped_jobs[group_key].append(job)
+        if config_results:
+            shown = 0
+            for config_index in sorted(config_results):
+                group = grouped_jobs.setdefault(config_results[config_index][0].get('config_keywords', '其他'), [])
+                group_urls = {job['url'] for job in group}
+                for job in config_results[config_index]:
+                    if shown >= 50:
+                        break
+                    if job['url'] in group_urls:
+                        continue
+                    group_urls.add(job['url'])
+                    group.append(job)
+                    shown += 1
+            grouped_jobs = {key: jobs for key, jobs in grouped_jobs.items() if jobs}
+            shown_urls = {job['url'] for jobs in grouped_jobs.values() for job in jobs}
+            remaining_count = len({job['url'] for job in new_jobs} - shown_urls)
+        else:
+            for job in display_jobs:
+                group_key = job.get('config_keywords', '其他')
+                if group_key not in grouped_jobs:
+                    grouped_jobs[group_key] = []
+                grouped_jobs[group_key].append(job)
+            remaining_count = len(new_jobs) - len(display_jobs)
         
         # 构建Markdown内容（逻辑清晰，展示清晰）
         content_parts = []
@@ -920,39 +1130,148 @@ class DingTalkSender:
 
 # ==================== 爬虫模块 ====================
 
+# 在页面内提取应届生求职网列表行的字段（与 JobScraper._extract_title_link / _extract_details 的回退顺序一致）
+# 参数 {elements: 行元素数组, city: 搜索城市}，返回与 elements 一一对应的数组，无法解析的行为 null
+YINGJIESHENG_ROWS_SCRIPT = """
+({elements, city}) => {
+    const text = el => (el.innerText || '').trim();
+    const first = (root, selectors) => {
+        for (const sel of selectors) {
+            const el = root.querySelector(sel);
+            if (el) return el;
+        }
+        return null;
+    };
+    // 依次尝试候选选择器，遇到文本非空的元素即停止；一个都没找到时返回 null
+    const firstText = (root, selectors) => {
+        let value = null;
+        for (const sel of selectors) {
+            const el = root.querySelector(sel);
+            if (el) {
+                value = text(el);
+                if (value) break;
+            }
+        }
+        return value;
+    };
+    return elements.map(row => {
+        try {
+            let title = null, href = null;
+            const link = first(row, ['td:first-child a', 'a[href*="/job-"]', 'a[href*="job"]', 'a']);
+            if (link) {
+                title = text(link);
+                href = link.getAttribute('href');
+            }
+            if (!title) {
+                const td = row.querySelector('td:first-child');
+                if (td) {
+                    title = text(td);
+                    const a = td.querySelector('a');
+                    if (a && !href) href = a.getAttribute('href');
+                }
+                if (!title) {
+                    const el = first(row, ['.job-name', '.job-title', '.title']);
+                    if (el) title = text(el);
+                }
+            }
+
+            let company = '未知';
+            const companyTd = row.querySelector('td:nth-child(2)');
+            if (companyTd) company = text(companyTd);
+            if (company === '未知' || !company) {
+                const value = firstText(row, ['.company-name', '.company', '[class*="company"]']);
+                if (value !== null) company = value;
+            }
+
+            let location = city;
+            const locationTd = row.querySelector('td:nth-child(3)');
+            if (locationTd) location = text(locationTd);
+            if (!location || location === city) {
+                const value = firstText(row, ['.city', '.location', '[class*="city"]']);
+                if (value !== null) location = value;
+            }
+
+            let updateTime = '未知';
+            const timeTd = row.querySelector('td:nth-child(4)');
+            if (timeTd) updateTime = text(timeTd);
+            if (!updateTime || updateTime === '未知') {
+                const value = firstText(row, ['.update-time', '.time', '.publish-time']);
+                if (value !== null) updateTime = value;
+            }
+
+            return {title, href, company, location, update_time: updateTime};
+        } catch (e) {
+            return null;
+        }
+    });
+}
+"""
+
 class JobScraper:
     """岗位抓取器"""
     
     def __init__(self, db_manager: DBManager):
         """初始化爬虫"""
         self.db = db_manager
-        self.playwright = None
         self.browser = None
+        self.browser_lease = None
         self.page = None
+        self.headless = True
+        self.resource_filter = None
+        # 同一进程的所有抓取器（并发模式的每个线程）共用站点限速器
+        self.rate_limiter = get_rate_limiter('yingjiesheng')
+        self.readiness_stats = ReadinessStats()
+        self.selector_cache = get_selector_cache()
+        self.metrics = get_metrics('scheduler')
+        self.result_cache = get_result_cache()
+        self.checkpoint: Optional[CrawlCheckpoint] = None
+        self.resumed_results: Dict[int, List[Dict]] = {}  # 续跑前已完成任务的新岗位
+        self.run_stats: Dict = {}
+        self.config_results: Dict[int, List[Dict]] = {}  # 配置序号 -> 分发到的新岗位
     
     def start_browser(self, headless: bool = True):
-        """启动浏览器"""
+        """从浏览器池租用页面（池中没有可用实例时启动浏览器）"""
         print("正在启动浏览器...")
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=headless,
-            args=['--disable-blink-features=AutomationControlled']
-        )
+        self.headless = headless
         
-        context = self.browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080}
+        # 拦截图片、字体、样式等无需下载的资源
+        self.resource_filter = create_filter(['yingjiesheng'])
+        self.browser_lease = get_browser_pool().lease(
+            launch_options={'headless': headless, 'args': ['--disable-blink-features=AutomationControlled']},
+            context_options={
+                'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'viewport': {'width': 1920, 'height': 1080},
+            },
+            on_page=self._setup_page,
         )
-        
-        self.page = context.new_page()
+        self.browser = self.browser_lease.browser
+        self.page = self.browser_lease.page
         print("✓ 浏览器启动成功")
     
+    def _setup_page(self, page):
+        """租用到新页面时调用：接入分阶段统计和资源拦截"""
+        # 页面导航、等待和选择器查询的耗时计入分阶段统计
+        page = instrument_page(page, self.metrics)
+        if self.resource_filter:
+            self.resource_filter.attach(page)
+        return page
+    
+    def renew_page(self):
+        """续租页面：浏览器实例到期回收或无响应时换用新实例的页面"""
+        if self.browser_lease:
+            self.page = self.browser_lease.renew()
+            self.browser = self.browser_lease.browser
+    
     def close_browser(self):
-        """关闭浏览器"""
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        """归还页面（浏览器实例留在池中）"""
+        if self.browser_lease:
+            if self.resource_filter:
+                print(f"  资源拦截: {self.resource_filter.format_stats()}")
+            self.browser_lease.release()
+            self.browser_lease = None
+            self.browser = None
+            print(f"  浏览器池: {get_browser_pool().format_stats()}")
+        self.selector_cache.save()
         print("✓ 浏览器已关闭")
     
     def random_sleep(self, min_time: int = RANDOM_WAIT_MIN, max_time: int = RANDOM_WAIT_MAX):
@@ -977,9 +1296,146 @@ class JobScraper:
                 result.append(city)
         return result
     
+    @staticmethod
+    def _absolute_url(href: Optional[str]) -> Optional[str]:
+        """将应届生求职网的相对链接补全为绝对地址"""
+        if not href:
+            return None
+        if href.startswith('http'):
+            return href
+        if href.startswith('/'):
+            return f"https://www.yingjiesheng.com{href}"
+        return f"https://www.yingjiesheng.com/{href}"
+    
+    def _extract_rows_in_page(self, job_elements: list, city: str) -> Optional[List[Optional[Dict]]]:
+        """一次 page.evaluate 提取所有行的字段，失败时返回 None（调用方退回逐元素提取）"""
+        try:
+            rows = self.page.evaluate(YINGJIESHENG_ROWS_SCRIPT, {'elements': job_elements, 'city': city})
+        except Exception as e:
+            print(f"    ⚠ 页内提取失败，改为逐元素提取: {str(e)[:50]}")
+            return None
+        if not isinstance(rows, list) or len(rows) != len(job_elements):
+            print(f"    ⚠ 页内提取结果异常，改为逐元素提取")
+            return None
+        return rows
+    
+    def _extract_title_link(self, job_elem) -> tuple:
+        """逐元素提取职位名称和链接，返回 (job_title, job_link)"""
+        job_title = None
+        job_link = None
+        
+        # 优先尝试链接元素（应届生求职网的链接格式）
+        try:
+            # 应届生求职网通常是表格形式，链接在第一列
+            link_elem = (job_elem.query_selector('td:first-child a') or 
+                        job_elem.query_selector('a[href*="/job-"]') or 
+                        job_elem.query_selector('a[href*="job"]') or 
+                        job_elem.query_selector('a'))
+            if link_elem:
+                job_title = link_elem.inner_text().strip()
+                job_link = self._absolute_url(link_elem.get_attribute('href'))
+        except:
+            pass
+        
+        # 如果上面没找到，再尝试其他选择器
+        if not job_title:
+            # 尝试从表格单元格获取
+            try:
+                first_td = job_elem.query_selector('td:first-child')
+                if first_td:
+                    job_title = first_td.inner_text().strip()
+                    link = first_td.query_selector('a')
+                    if link and not job_link:
+                        job_link = self._absolute_url(link.get_attribute('href'))
+            except:
+                pass
+            
+            # 如果还是没找到，尝试其他选择器
+            if not job_title:
+                title_selectors = ['.job-name', '.job-title', '.title', 'h3', 'h4', '[class*="job-name"]', '[class*="title"]']
+                for sel in title_selectors[:3]:
+                    try:
+                        elem = job_elem.query_selector(sel)
+                        if elem:
+                            job_title = elem.inner_text().strip()
+                            break
+                    except:
+                        continue
+        
+        return job_title, job_link
+    
+    def _extract_details(self, job_elem, city: str) -> tuple:
+        """逐元素提取公司名称、工作地点和更新时间，返回 (company_name, work_location, update_time)"""
+        # 提取公司名称（应届生求职网通常是表格，公司名在第二列）
+        company_name = '未知'
+        try:
+            # 优先尝试表格第二列
+            company_td = job_elem.query_selector('td:nth-child(2)')
+            if company_td:
+                company_name = company_td.inner_text().strip()
+        except:
+            pass
+        
+        if company_name == '未知' or not company_name:
+            company_selectors = ['.company-name', '.company', '[class*="company"]', '.firm-name', '.employer']
+            for sel in company_selectors[:3]:
+                try:
+                    elem = job_elem.query_selector(sel)
+                    if elem:
+                        company_name = elem.inner_text().strip()
+                        if company_name:
+                            break
+                except:
+                    continue
+        
+        # 提取工作地点（应届生求职网通常是表格，地点在第三列）
+        work_location = city  # 默认使用搜索的城市
+        try:
+            location_td = job_elem.query_selector('td:nth-child(3)')
+            if location_td:
+                work_location = location_td.inner_text().strip()
+        except:
+            pass
+        
+        if not work_location or work_location == city:
+            location_selectors = ['.city', '.location', '[class*="city"]', '[class*="location"]', '.work-place']
+            for sel in location_selectors[:3]:
+                try:
+                    elem = job_elem.query_selector(sel)
+                    if elem:
+                        work_location = elem.inner_text().strip()
+                        if work_location:
+                            break
+                except:
+                    continue
+        
+        # 提取更新时间（应届生求职网通常是表格，时间在第四列）
+        update_time = '未知'
+        try:
+            time_td = job_elem.query_selector('td:nth-child(4)')
+            if time_td:
+                update_time = time_td.inner_text().strip()
+        except:
+            pass
+        
+        if not update_time or update_time == '未知':
+            time_selectors = ['.update-time', '.time', '.publish-time', '[class*="time"]', '[class*="update"]']
+            for sel in time_selectors[:3]:
+                try:
+                    elem = job_elem.query_selector(sel)
+                    if elem:
+                        update_time = elem.inner_text().strip()
+                        if update_time:
+                            break
+                except:
+                    continue
+        
+        return company_name, work_location, update_time
+    
     def search_yingjiesheng(self, keyword: str, city: str, grad_year: Optional[int], 
-                           recruit_type: str, config_keywords: str) -> List[Dict]:
-        """在应届生求职网搜索岗位"""
+                           recruit_type: str, config_keywords: str,
+                           cache: Optional[ResultCache] = None) -> List[Dict]:
+        """在应届生求职网搜索岗位（传入 cache 时先读结果缓存，命中则不访问页面）"""
         results = []
         
         try:
@@ -988,223 +1444,138 @@ class JobScraper:
             
             # 应届生求职网的搜索URL格式
             # 实际URL格式：https://www.yingjiesheng.com/job/?keyword=关键词&city=城市
-            if recruit_type == '校招' or '校招' in recruit_type or recruit_type == '实习' or grad_year:
+            # 任务的招聘类型可能合并自多个配置（如 '实习/社招'），按包含判断
+            if '校招' in recruit_type or '实习' in recruit_type or grad_year:
                 # 应届生求职网主要针对校招，使用标准搜索URL
                 url = f"https://www.yingjiesheng.com/job/?keyword={keyword_encoded}&city={city_encoded}"
             else:
                 return results
             
             print(f"    搜索应届生求职网: {keyword} | {city}")
-            print(f"    URL: {url}")
-            try:
-                self.page.goto(url, wait_until="networkidle", timeout=20000)
-                self.random_sleep(2, 3)  # 等待页面加载
-            except Exception as e:
-                print(f"    ⚠ 访问页面失败: {str(e)[:50]}")
-                return results
-            self.random_sleep(0.5, 1.5)  # 快速模式：减少等待时间
+            # 结果缓存：保存第一遍提取的整页岗位（数据库去重之前），命中时直接进入去重和入库
+            cached_rows = cache.get('yingjiesheng', keyword, city) if cache else None
+            if cached_rows is None:
+                print(f"    URL: {url}")
+                # 礼貌性延迟由限速器控制，页面加载改为等待结果列表就绪
+                with self.metrics.stage('rate_limit'):
+                    self.rate_limiter.wait()
+                try:
+                    navigate_and_wait(self.page, url, 'yingjiesheng', self.readiness_stats)
+                except Exception as e:
+                    print(f"    ⚠ 访问页面失败: {str(e)[:50]}")
+                    raise PageLoadError(str(e)) from e
+            else:
+                print(f"    ✓ 缓存命中: {len(cached_rows)} 个职位（跳过页面加载）")
             
-            # 等待页面加载
             try:
-                self.page.wait_for_load_state("domcontentloaded", timeout=5000)
-                self.random_sleep(0.5, 1)  # 快速模式：减少等待时间
-                
-                # 尝试多种选择器（应届生求职网的常见选择器）
-                selectors = [
-                    '.job-list-item',
-                    '.job-item',
-                    '.job-info',
-                    '[class*="job"]',
-                    '.list-item',
-                    'tr',  # 可能是表格形式
-                ]
+                if cached_rows is not None:
+                    candidates = [(None, row, row['title'], row['url']) for row in cached_rows]
+                else:
+                    # 尝试多种选择器（应届生求职网的常见选择器）
+                    selectors = [
+                        '.job-list-item',
+                        '.job-item',
+                        '.job-info',
+                        '[class*="job"]',
+                        '.list-item',
+                        'tr',  # 可能是表格形式
+                    ]
                 
-                job_elements = None
-                for selector in selectors:
-                    try:
-                        elements = self.page.query_selector_all(selector)
-                        if elements and len(elements) > 1:  # 至少2个（排除表头）
-                            # 过滤掉表头行
-                            if selector == 'tr':
-                                filtered = [e for e in elements if e.query_selector('a[href*="job"]') or e.query_selector('a[href*="/job-"]')]
-                                if filtered:
-                                    job_elements = filtered
+                    job_elements = None
+                    matched_selector = None
+                    # 上次成功的选择器优先尝试
+                    for selector in self.selector_cache.ordered('yingjiesheng', 'search', 'job_list', selectors):
+                        try:
+                            elements = self.page.query_selector_all(selector)
+                            if elements and len(elements) > 1:  # 至少2个（排除表头）
+                                # 过滤掉表头行
+                                if selector == 'tr':
+                                    filtered = [e for e in elements if e.query_selector('a[href*="job"]') or e.query_selector('a[href*="/job-"]')]
+                                    if filtered:
+                                        job_elements = filtered
+                                        matched_selector = selector
+                                        print(f"    ✓ 找到 {len(job_elements)} 个职位元素（选择器: {selector}）")
+                                        break
+                                else:
+                                    job_elements = elements
+                                    matched_selector = selector
                                     print(f"    ✓ 找到 {len(job_elements)} 个职位元素（选择器: {selector}）")
                                     break
-                            else:
-                                job_elements = elements
-                                print(f"    ✓ 找到 {len(job_elements)} 个职位元素（选择器: {selector}）")
-                                break
-                    except:
-                        continue
-                
-                if not job_elements:
-                    print(f"    ⚠ 未找到职位列表，尝试其他方法...")
-                    # 尝试获取页面标题确认是否加载成功
-                    try:
-                        title = self.page.title()
-                        print(f"    页面标题: {title[:50]}")
-                        # 尝试获取页面文本，看看是否有"职位"、"招聘"等关键词
-                        page_text = self.page.inner_text('body')[:200]
-                        if '职位' in page_text or '招聘' in page_text or '岗位' in page_text:
-                            print(f"    ℹ 页面似乎已加载，但选择器不匹配")
-                            # 尝试更通用的选择器
-                            all_links = self.page.query_selector_all('a[href*="job"], a[href*="/job-"]')
-                            if all_links:
-                                print(f"    ✓ 找到 {len(all_links)} 个职位链接，尝试提取...")
-                                job_elements = all_links[:20]  # 限制数量
-                    except Exception as e:
-                        print(f"    ⚠ 检查页面时出错: {str(e)[:30]}")
-                    
-                    if not job_elements:
-                        return results
-                
-                # 提取职位信息
-                for job_elem in job_elements[:15]:  # 限制每页15个
-                    try:
-                        # 提取职位名称和链接（优化：优先使用最常见的选择器）
-                        job_title = None
-                        job_link = None
-                        
-                        # 优先尝试链接元素（应届生求职网的链接格式）
-                        try:
-                            # 应届生求职网通常是表格形式，链接在第一列
-                            link_elem = (job_elem.query_selector('td:first-child a') or 
-                                        job_elem.query_selector('a[href*="/job-"]') or 
-                                        job_elem.query_selector('a[href*="job"]') or 
-                                        job_elem.query_selector('a'))
-                            if link_elem:
-                                job_title = link_elem.inner_text().strip()
-                                href = link_elem.get_attribute('href')
-                                if href:
-                                    if href.startswith('http'):
-                                        job_link = href
-                                    elif href.startswith('/'):
-                                        job_link = f"https://www.yingjiesheng.com{href}"
-                                    else:
-                                        job_link = f"https://www.yingjiesheng.com/{href}"
                         except:
-                            pass
-                        
-                        # 如果上面没找到，再尝试其他选择器
-                        if not job_title:
-                            # 尝试从表格单元格获取
-                            try:
-                                first_td = job_elem.query_selector('td:first-child')
-                                if first_td:
-                                    job_title = first_td.inner_text().strip()
-                                    link = first_td.query_selector('a')
-                                    if link and not job_link:
-                                        href = link.get_attribute('href')
-                                        if href:
-                                            if href.startswith('http'):
-                                                job_link = href
-                                            elif href.startswith('/'):
-                                                job_link = f"https://www.yingjiesheng.com{href}"
-                                            else:
-                                                job_link = f"https://www.yingjiesheng.com/{href}"
-                            except:
-                                pass
-                            
-                            # 如果还是没找到，尝试其他选择器
-                            if not job_title:
-                                title_selectors = ['.job-name', '.job-title', '.title', 'h3', 'h4', '[class*="job-name"]', '[class*="title"]']
-                                for sel in title_selectors[:3]:
-                                    try:
-                                        elem = job_elem.query_selector(sel)
-                                        if elem:
-                                            job_title = elem.inner_text().strip()
-                                            break
-                                    except:
-                                        continue
-                        
-                        if not job_title or not job_link:
-                            continue
-                        
-                        # 检查是否已存在
-                        if self.db.is_job_exists(job_link):
                             continue
-                        
-                        # 提取公司名称（应届生求职网通常是表格，公司名在第二列）
-                        company_name = '未知'
-                        try:
-                            # 优先尝试表格第二列
-                            company_td = job_elem.query_selector('td:nth-child(2)')
-                            if company_td:
-                                company_name = company_td.inner_text().strip()
-                        except:
-                            pass
-                        
-                        if company_name == '未知' or not company_name:
-                            company_selectors = ['.company-name', '.company', '[class*="company"]', '.firm-name', '.employer']
-                            for sel in company_selectors[:3]:
-                                try:
-                                    elem = job_elem.query_selector(sel)
-                                    if elem:
-                                        company_name = elem.inner_text().strip()
-                                        if company_name:
-                                            break
-                                except:
-                                    continue
-                        
-                        # 提取工作地点（应届生求职网通常是表格，地点在第三列）
-                        work_location = city  # 默认使用搜索的城市
-                        try:
-                            location_td = job_elem.query_selector('td:nth-child(3)')
-                            if location_td:
-                                work_location = location_td.inner_text().strip()
-                        except:
-                            pass
-                        
-                        if not work_location or work_location == city:
-                            location_selectors = ['.city', '.location', '[class*="city"]', '[class*="location"]', '.work-place']
-                            for sel in location_selectors[:3]:
-                                try:
-                                    elem = job_elem.query_selector(sel)
-                                    if elem:
-                                        work_location = elem.inner_text().strip()
-                                        if work_location:
-                                            break
-                                except:
-                                    continue
-                        
-                        # 提取更新时间（应届生求职网通常是表格，时间在第四列）
-                        update_time = '未知'
+                    self.selector_cache.record('yingjiesheng', 'search', 'job_list', selectors, matched_selector)
+                
+                    if not job_elements:
+                        print(f"    ⚠ 未找到职位列表，尝试其他方法...")
+                        # 尝试获取页面标题确认是否加载成功
                         try:
-                            time_td = job_elem.query_selector('td:nth-child(4)')
-                            if time_td:
-                                update_time = time_td.inner_text().strip()
-                        except:
-                            pass
-                        
-                        if not update_time or update_time == '未知':
-                            time_selectors = ['.update-time', '.time', '.publish-time', '[class*="time"]', '[class*="update"]']
-                            for sel in time_selectors[:3]:
-                                try:
-                                    elem = job_elem.query_selector(sel)
-                                    if elem:
-                                        update_time = elem.inner_text().strip()
-                                        if update_time:
-                                            break
-                                except:
+                            title = self.page.title()
+                            print(f"    页面标题: {title[:50]}")
+                            # 尝试获取页面文本，看看是否有"职位"、"招聘"等关键词
+                            page_text = self.page.inner_text('body')[:200]
+                            if '职位' in page_text or '招聘' in page_text or '岗位' in page_text:
+                                print(f"    ℹ 页面似乎已加载，但选择器不匹配")
+                                # 尝试更通用的选择器
+                                all_links = self.page.query_selector_all('a[href*="job"], a[href*="/job-"]')
+                                if all_links:
+                                    print(f"    ✓ 找到 {len(all_links)} 个职位链接，尝试提取...")
+                                    job_elements = all_links[:20]  # 限制数量
+                        except Exception as e:
+                            print(f"    ⚠ 检查页面时出错: {str(e)[:30]}")
+                    
+                        if not job_elements:
+                            return results
+                
+                    # 第一遍：只提取职位名称和链接，用于批量去重
+                    job_elements = job_elements[:15]  # 限制每页15个
+                    rows = None
+                    if YINGJIESHENG_EXTRACT_MODE == 'evaluate':
+                        # 一次往返在页面内提取整页所有字段，失败时退回逐元素提取
+                        rows = self._extract_rows_in_page(job_elements, city)
+                    candidates = []
+                    with self.metrics.stage('extract'):
+                        for index, job_elem in enumerate(job_elements):
+                            if rows is not None:
+                                row = rows[index]
+                                if not row:
                                     continue
+                                job_title, job_link = row['title'], self._absolute_url(row['href'])
+                            else:
+                                row = None
+                                job_title, job_link = self._extract_title_link(job_elem)
                         
-                        # 判断招聘类型
-                        if '实习' in job_title or '实习' in company_name:
-                            recruit_type_str = '实习'
-                        elif recruit_type == '社招':
-                            recruit_type_str = '社招'
-                        else:
-                            recruit_type_str = '校招'
+                            if not job_title or not job_link:
+                                continue
                         
-                        # 招聘对象
-                        if grad_year:
-                            if isinstance(grad_year, list):
-                                recruit_target = f"{'/'.join(map(str, grad_year))}届"
+                            candidates.append((job_elem, row, job_title, job_link))
+                
+                    # 只缓存页内提取的结果（逐元素提取时第一遍没有完整字段）
+                    if cache and rows is not None:
+                        cache.put('yingjiesheng', keyword, city, [
+                            {'title': job_title, 'url': job_link, 'company': row['company'],
+                             'location': row['location'], 'update_time': row['update_time']}
+                            for _, row, job_title, job_link in candidates])
+                
+                # 批量检查是否已存在（整页一次查询）
+                with self.metrics.stage('db_dedup'):
+                    new_urls = set(self.db.filter_new_urls([c[3] for c in candidates]))
+                
+                # 第二遍：只对新岗位提取完整信息
+                for job_elem, row, job_title, job_link in candidates:
+                    if job_link not in new_urls:
+                        continue
+                    new_urls.discard(job_link)  # 同一页重复出现的链接只处理一次
+                    try:
+                        with self.metrics.stage('extract'):
+                            if row is not None:
+                                company_name, work_location, update_time = (
+                                    row['company'], row['location'], row['update_time'])
                             else:
-                                recruit_target = f"{grad_year}届"
-                        else:
-                            recruit_target = '不限'
+                                company_name, work_location, update_time = self._extract_details(job_elem, city)
+                        
+                        # 招聘类型和招聘对象（按任务合并后的届别和类型，分发时按各配置重新计算）
+                        recruit_type_str, recruit_target = recruit_fields(
+                            job_title, company_name, grad_year, recruit_type)
                         
                         # 公司类型（列表页通常没有，设为未知，后续可进入详情页获取）
                         company_type = '未知'
@@ -1226,66 +1597,471 @@ class JobScraper:
                             'config_keywords': config_keywords,  # 用于消息分组
                         }
                         
-                        # 保存到数据库（包含所有字段）
-                        self.db.save_job({
-                            'url': job_link,
-                            'company_name': company_name,
-                            'company_type': company_type,
-                            'work_location': work_location,
-                            'recruit_type': recruit_type_str,
-                            'recruit_target': recruit_target,
-                            'job_title': job_title,
-                            'update_time': update_time,
-                            'deadline': deadline,
-                        })
-                        
                         results.append(job_data)
                         
                     except Exception as e:
                         continue
                 
+                # 批量保存到数据库（单个事务）
+                with self.metrics.stage('db_write'):
+                    self.db.save_jobs(results)
+                
             except Exception as e:
                 print(f"    ⚠ 解析页面时出错: {str(e)[:50]}")
         
+        except PageLoadError:
+            # 页面加载失败交给调用方处理（断点续跑时记为失败任务）
+            raise
         except Exception as e:
             print(f"    ✗ 搜索时出错: {str(e)[:50]}")
         
         return results
     
-    def scrape_all_configs(self) -> List[Dict]:
+    def should_search_yingjiesheng(self, config: Dict) -> bool:
+        """判断配置是否使用应届生求职网抓取"""
+        recruit_type = config['recruit_type']
+        grad_year = config['grad_year']
+        return bool(recruit_type == '校招' or '校招' in recruit_type or grad_year or recruit_type == '实习')
+    
+    def build_search_plan(self) -> SearchPlan:
+        """将所有配置编译为去重后的搜索计划（每个 关键词 × 城市 只搜索一次）"""
+        return build_search_plan(SEARCH_CONFIGS, self.expand_city_list, self.should_search_yingjiesheng)
+    
+    def build_search_tasks(self) -> List[Dict]:
+        """去重后的搜索任务列表（按首次出现的配置顺序）"""
+        return self.build_search_plan().tasks
+    
+    def resume_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """登记断点并返回仍需执行的任务（CHECKPOINT_ENABLED 关闭时原样返回）"""
+        if not CHECKPOINT_ENABLED or self.db is None:
+            return tasks
+        self.checkpoint = CrawlCheckpoint(self.db.db_file)
+        run_id, resumed = self.checkpoint.start_or_resume(SCRAPE_INTERVAL)
+        pending = self.checkpoint.register_tasks(tasks)
+        self.resumed_results = {}
+        if resumed:
+            print(f"\n↻ 续跑运行 #{run_id}：跳过 {len(tasks) - len(pending)} 个已完成任务，剩余 {len(pending)} 个")
+            # 已完成任务的新岗位在退出前已入库，去重不会再返回，从断点记录中取回
+            completed = self.checkpoint.completed_urls()
+            for task in tasks:
+                urls = completed.get(task_key(task))
+                if urls:
+                    self.resumed_results[task['task_id']] = [
+                        dict(job, config_keywords=task['config_keywords']) for job in self.db.load_jobs(urls)]
+        return pending
+    
+    def merge_resumed_results(self, results_by_task: Dict[int, List[Dict]],
+                              new_jobs: List[Dict]) -> List[Dict]:
+        """将续跑前已完成任务的新岗位并入本次结果（用于通知和按配置分发），返回合并后的新岗位列表"""
+        if not self.resumed_results:
+            return new_jobs
+        seen_urls = {job['url'] for job in new_jobs}
+        resumed_jobs = []
+        for task_id, jobs in self.resumed_results.items():
+            results_by_task.setdefault(task_id, jobs)
+            for job in jobs:
+                if job['url'] not in seen_urls:
+                    seen_urls.add(job['url'])
+                    resumed_jobs.append(job)
+        print(f"  ↻ 并入续跑前已完成任务的 {len(resumed_jobs)} 个新岗位")
+        self.resumed_results = {}
+        return resumed_jobs + new_jobs
+    
+    def finish_checkpoint(self):
+        """结束断点记录（仍有失败任务时保留，下次运行在窗口内重试）"""
+        if not self.checkpoint:
+            return
+        if not self.checkpoint.finish():
+            print(f"  ⚠ 部分任务失败，{SCRAPE_INTERVAL // 3600} 小时内重新运行将只重试这些任务"
+                  f"（python scheduler.py --progress 查看）")
+        self.checkpoint.close()
+        self.checkpoint = None
+    
+    def run_search_task(self, task: Dict, checkpoint: Optional[CrawlCheckpoint] = None) -> List[Dict]:
+        """执行单个搜索任务并记录进度（出错时返回空列表）"""
+        if checkpoint:
+            checkpoint.mark_running(task)
+        try:
+            self.renew_page()
+            jobs = self.search_yingjiesheng(task['keyword'], task['city'], task['grad_year'],
+                                            task['recruit_type'], task['config_keywords'],
+                                            cache=self.result_cache)
+        except Exception as e:
+            print(f"  ✗ 处理搜索任务时出错: {str(e)[:100]}")
+            if checkpoint:
+                checkpoint.mark_failed(task, str(e))
+            return []
+        if checkpoint:
+            checkpoint.mark_done(task, len(jobs), [job['url'] for job in jobs])
+        return jobs
+    
+    def scrape_all_configs(self, concurrency: int = CRAWL_CONCURRENCY,
+                           processes: int = CRAWL_PROCESSES) -> List[Dict]:
         """抓取所有配置的岗位"""
+        if processes > 1:
+            return self.scrape_all_configs_multiprocess(processes)
+        if concurrency > 1:
+            return self.scrape_all_configs_concurrent(concurrency)
+        
+        plan = self.build_search_plan()
+        tasks = self.resume_tasks(plan.tasks)
         all_new_jobs = []
+        results_by_task: Dict[int, List[Dict]] = {}
+        busy_seconds = 0.0
+        start_time = time.perf_counter()
         
         total_configs = len(SEARCH_CONFIGS)
-        print(f"\n开始抓取，共 {total_configs} 个配置...")
+        print(f"\n开始抓取，共 {total_configs} 个配置，{plan.unique_count} 个搜索任务"
+              f"（去重节省 {plan.saved_count} 个）...")
         
-        for idx, config in enumerate(SEARCH_CONFIGS, 1):
+        current_config = None
+        for task in tasks:
+            if task['config_index'] != current_config:
+                current_config = task['config_index']
+                config = SEARCH_CONFIGS[current_config - 1]
+                print(f"\n[{current_config}/{total_configs}] 处理配置: {', '.join(config['keywords'][:2])}...")
+            # 与并发模式一样按任务计时，任务之间的配置切换和日志输出不计入忙碌时间
+            task_start = time.perf_counter()
+            jobs = self.run_search_task(task, self.checkpoint)
+            busy_seconds += time.perf_counter() - task_start
+            results_by_task[task['task_id']] = jobs
+            all_new_jobs.extend(jobs)
+        
+        self.finish_checkpoint()
+        wall_seconds = time.perf_counter() - start_time
+        task_count = len(results_by_task)
+        job_count = len(all_new_jobs)
+        all_new_jobs = self.merge_resumed_results(results_by_task, all_new_jobs)
+        self.config_results = plan.fan_out(results_by_task)
+        self.run_stats = {
+            'mode': '顺序',
+            'tasks': len(tasks),
+            'skipped_tasks': plan.unique_count - len(tasks),
+            'naive_tasks': plan.naive_count,
+            'completed': task_count,
+            'wall_seconds': wall_seconds,
+            'tasks_per_minute': task_count / wall_seconds * 60 if wall_seconds else 0,
+            'configs_with_jobs': len(self.config_results),
+            'readiness': self.readiness_stats.format_stats(),
+            'selectors': self.selector_cache.format_stats(),
+            'cache': self.result_cache.format_stats(),
+            'workers': [{
+                'worker_id': 1,
+                'tasks': task_count,
+                'busy_seconds': busy_seconds,
+                'utilisation': busy_seconds / wall_seconds if wall_seconds else 0,
+                'jobs': job_count,
+            }],
+        }
+        self.print_run_stats()
+        return all_new_jobs
+    
+    def scrape_all_configs_concurrent(self, concurrency: int) -> List[Dict]:
+        """并发抓取所有配置的岗位（每个worker在独立线程中使用自己的浏览器）"""
+        plan = self.build_search_plan()
+        tasks = self.resume_tasks(plan.tasks)
+        print(f"\n开始并发抓取，共 {len(tasks)} 个搜索任务（去重节省 {plan.saved_count} 个），并发数 {concurrency}...")
+        
+        task_queue = queue.Queue()
+        for task in tasks:
+            task_queue.put(task)
+        
+        results_by_task: Dict[int, List[Dict]] = {}
+        worker_stats: List[Dict] = []
+        stats_lock = threading.Lock()
+        
+        def worker(worker_id: int):
+            """从任务队列中取任务并抓取，直到队列为空"""
+            stat = {'worker_id': worker_id, 'tasks': 0, 'busy_seconds': 0.0, 'jobs': 0}
+            # Playwright 同步API的对象只能在创建它的线程中使用，因此每个worker独立启动浏览器
+            scraper = JobScraper(self.db)
+            scraper.readiness_stats = self.readiness_stats  # 汇总所有worker的等待耗时
             try:
-                print(f"\n[{idx}/{total_configs}] 处理配置: {', '.join(config['keywords'][:2])}...")
-                
-                # 展开城市列表
-                cities = self.expand_city_list(config['locations'])
-                keywords = config['keywords']
-                grad_year = config['grad_year']
-                recruit_type = config['recruit_type']
-                config_keywords = ', '.join(keywords[:3])
-                
-                # 遍历关键词和城市
-                for keyword in keywords:
-                    for city in cities:
-                        if recruit_type == '校招' or '校招' in recruit_type or grad_year or recruit_type == '实习':
-                            # 使用应届生求职网抓取
-                            jobs = self.search_yingjiesheng(keyword, city, grad_year, recruit_type, config_keywords)
-                            all_new_jobs.extend(jobs)
-                            self.random_sleep(0.5, 1.5)  # 快速模式：减少等待时间
-                
-                print(f"  ✓ 本配置新增 {len([j for j in all_new_jobs if j.get('config_keywords') == config_keywords])} 个岗位")
-                
+                scraper.start_browser(headless=self.headless)
             except Exception as e:
-                print(f"  ✗ 处理配置时出错: {str(e)[:100]}")
+                print(f"  ✗ worker {worker_id} 启动浏览器失败: {str(e)[:100]}")
+                with stats_lock:
+                    worker_stats.append(stat)
+                return
+            
+            try:
+                while True:
+                    try:
+                        task = task_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    
+                    task_start = time.perf_counter()
+                    jobs = scraper.run_search_task(task, self.checkpoint)
+                    stat['busy_seconds'] += time.perf_counter() - task_start
+                    stat['tasks'] += 1
+                    stat['jobs'] += len(jobs)
+                    
+                    with stats_lock:
+                        results_by_task[task['task_id']] = jobs
+            finally:
+                scraper.close_browser()
+                # 线程结束前关闭本线程的浏览器池
+                shutdown_browser_pool()
+                with stats_lock:
+                    worker_stats.append(stat)
+        
+        start_time = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(i,), name=f"crawler-{i}", daemon=True)
+                   for i in range(1, concurrency + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.finish_checkpoint()
+        wall_seconds = time.perf_counter() - start_time
+        
+        # 按任务顺序合并结果，保证输出顺序稳定。各worker在写入前已按数据库去重，
+        # 同一岗位只会出现在最先写入它的任务中，因此归属取决于完成先后，不一定与顺序模式一致
+        all_new_jobs = []
+        seen_urls = set()
+        for task in tasks:
+            for job in results_by_task.get(task['task_id'], []):
+                if job['url'] in seen_urls:
+                    continue
+                seen_urls.add(job['url'])
+                all_new_jobs.append(job)
+        
+        for stat in worker_stats:
+            stat['utilisation'] = stat['busy_seconds'] / wall_seconds if wall_seconds else 0
+        
+        completed = len(results_by_task)
+        all_new_jobs = self.merge_resumed_results(results_by_task, all_new_jobs)
+        self.config_results = plan.fan_out(results_by_task)
+        self.run_stats = {
+            'mode': '并发',
+            'tasks': len(tasks),
+            'skipped_tasks': plan.unique_count - len(tasks),
+            'naive_tasks': plan.naive_count,
+            'completed': completed,
+            'wall_seconds': wall_seconds,
+            'tasks_per_minute': completed / wall_seconds * 60 if wall_seconds else 0,
+            'configs_with_jobs': len(self.config_results),
+            'readiness': self.readiness_stats.format_stats(),
+            'selectors': self.selector_cache.format_stats(),
+            'cache': self.result_cache.format_stats(),
+            'workers': sorted(worker_stats, key=lambda x: x['worker_id']),
+        }
+        self.print_run_stats()
+        return all_new_jobs
+    
+    def scrape_all_configs_multiprocess(self, processes: int,
+                                        worker_setup: Optional[Callable] = None) -> List[Dict]:
+        """多进程抓取所有配置的岗位（每个子进程独立的浏览器和数据库连接，主进程汇总结果和断点进度）
+        
+        Args:
+            processes: 子进程数
+            worker_setup: 子进程启动浏览器后调用 worker_setup(scraper)（需可被pickle，性能测试用于替换页面来源）
+        """
+        plan = self.build_search_plan()
+        tasks = self.resume_tasks(plan.tasks)
+        processes = max(1, min(processes, len(tasks)))
+        print(f"\n开始多进程抓取，共 {len(tasks)} 个搜索任务（去重节省 {plan.saved_count} 个），进程数 {processes}...")
+        
+        # spawn 启动：子进程不继承主进程的线程和 Playwright 状态
+        ctx = multiprocessing.get_context('spawn')
+        task_queue = ctx.Queue()
+        result_queue = ctx.Queue()
+        for task in tasks:
+            task_queue.put(task)
+        for _ in range(processes):
+            task_queue.put(None)  # 结束标记
+        
+        start_time = time.perf_counter()
+        workers = [ctx.Process(target=_process_worker, name=f"crawler-{i}",
+                               args=(i, self.db.db_file, self.headless, task_queue, result_queue, worker_setup,
+                                     processes))
+                   for i in range(1, processes + 1)]
+        for worker in workers:
+            worker.start()
+        
+        results_by_task: Dict[int, List[Dict]] = {}
+        worker_stats: List[Dict] = []
+        tasks_by_id = {task['task_id']: task for task in tasks}
+        while len(worker_stats) < processes:
+            try:
+                message = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    # 子进程异常退出，没有发回结束消息
+                    print("  ⚠ 部分子进程异常退出，未完成的任务记为未完成")
+                    break
                 continue
+            kind = message[0]
+            if kind == 'result':
+                _, _, task_id, jobs = message
+                results_by_task[task_id] = jobs
+            elif kind in ('running', 'done', 'failed') and self.checkpoint:
+                # 断点进度由主进程统一写入
+                _, _, task_id, detail = message
+                task = tasks_by_id[task_id]
+                if kind == 'running':
+                    self.checkpoint.mark_running(task)
+                elif kind == 'done':
+                    self.checkpoint.mark_done(task, *detail)
+                else:
+                    self.checkpoint.mark_failed(task, detail)
+            elif kind == 'exit':
+                _, _, stat, extra = message
+                worker_stats.append(stat)
+                if extra:
+                    self.readiness_stats.merge(extra['readiness'])
+                    self.metrics.merge(extra['metrics'])
+                    self.result_cache.merge(extra['cache'])
+        for worker in workers:
+            worker.join()
+        self.finish_checkpoint()
+        wall_seconds = time.perf_counter() - start_time
+        
+        # 按任务顺序合并结果：多个进程抓到同一岗位时（都在对方写入前判断为新岗位）只保留顺序最靠前的；
+        # 其余情况下岗位归属于最先写入它的任务，取决于完成先后
+        all_new_jobs = []
+        seen_urls = set()
+        duplicates = 0
+        for task in tasks:
+            for job in results_by_task.get(task['task_id'], []):
+                if job['url'] in seen_urls:
+                    duplicates += 1
+                    continue
+                seen_urls.add(job['url'])
+                all_new_jobs.append(job)
+        # 子进程直接写入数据库，主进程的URL索引需要补上这些岗位
+        if self.db.url_index is not None:
+            self.db.url_index.add_many(seen_urls)
+        
+        for stat in worker_stats:
+            stat['utilisation'] = stat['busy_seconds'] / wall_seconds if wall_seconds else 0
         
+        completed = len(results_by_task)
+        busy_seconds = sum(stat['busy_seconds'] for stat in worker_stats)
+        all_new_jobs = self.merge_resumed_results(results_by_task, all_new_jobs)
+        self.config_results = plan.fan_out(results_by_task)
+        self.run_stats = {
+            'mode': '多进程',
+            'tasks': len(tasks),
+            'skipped_tasks': plan.unique_count - len(tasks),
+            'naive_tasks': plan.naive_count,
+            'completed': completed,
+            'wall_seconds': wall_seconds,
+            'tasks_per_minute': completed / wall_seconds * 60 if wall_seconds else 0,
+            'configs_with_jobs': len(self.config_results),
+            'readiness': self.readiness_stats.format_stats(),
+            'cache': self.result_cache.format_stats(),
+            'scaling': {
+                'processes': processes,
+                # 单个进程实际抓取时的吞吐量（不含启动浏览器和空闲时间）
+                'worker_tasks_per_minute': completed / busy_seconds * 60 if busy_seconds else 0,
+                'duplicates': duplicates,
+            },
+            'workers': sorted(worker_stats, key=lambda x: x['worker_id']),
+        }
+        self.print_run_stats()
         return all_new_jobs
+    
+    def print_run_stats(self):
+        """打印本次抓取的运行统计"""
+        print_crawl_stats(self.run_stats)
+
+
+def print_crawl_stats(stats: Dict):
+    """打印抓取运行统计（耗时、吞吐量、各worker利用率）"""
+    if not stats:
+        return
+    print(f"\n{'='*60}")
+    print(f"抓取统计（{stats['mode']}模式）")
+    print(f"{'='*60}")
+    print(f"  搜索任务: {stats['completed']}/{stats['tasks']} 完成")
+    if stats.get('skipped_tasks'):
+        print(f"  断点续跑: 跳过 {stats['skipped_tasks']} 个已完成任务")
+    if 'naive_tasks' in stats:
+        unique_tasks = stats['tasks'] + stats.get('skipped_tasks', 0)
+        print(f"  任务去重: 朴素循环 {stats['naive_tasks']} 个，节省 {stats['naive_tasks'] - unique_tasks} 个")
+    if 'configs_with_jobs' in stats:
+        print(f"  结果分发: {stats['configs_with_jobs']} 个配置获得新岗位")
+    if 'readiness' in stats:
+        print(f"  页面就绪: {stats['readiness']}")
+    if 'selectors' in stats:
+        print("  " + stats['selectors'].replace("\n", "\n  "))
+    if 'cache' in stats:
+        print("  " + stats['cache'].replace("\n", "\n  "))
+    print(f"  总耗时: {stats['wall_seconds']:.1f} 秒")
+    print(f"  吞吐量: {stats['tasks_per_minute']:.1f} 任务/分钟")
+    if 'scaling' in stats:
+        scaling = stats['scaling']
+        ideal = scaling['worker_tasks_per_minute'] * scaling['processes']
+        print(f"  扩展性: {scaling['processes']} 个进程，单进程 {scaling['worker_tasks_per_minute']:.1f} 任务/分钟，"
+              f"理想 {ideal:.1f} 任务/分钟，实际达到 {stats['tasks_per_minute'] / ideal if ideal else 0:.0%}；"
+              f"跨进程重复岗位 {scaling['duplicates']} 个")
+    for stat in stats['workers']:
+        print(f"  worker {stat['worker_id']}: {stat['tasks']} 个任务, "
+              f"新增 {stat['jobs']} 个岗位, 忙碌 {stat['busy_seconds']:.1f} 秒, "
+              f"利用率 {stat.get('utilisation', 0):.0%}")
+    print(f"{'='*60}")
+
+
+# ==================== 多进程抓取 ====================
+
+class _QueuedCheckpoint:
+    """子进程中的断点记录：进度通过结果队列交给主进程写入"""
+    
+    def __init__(self, worker_id: int, result_queue):
+        self.worker_id = worker_id
+        self.result_queue = result_queue
+    
+    def mark_running(self, task: Dict):
+        self.result_queue.put(('running', self.worker_id, task['task_id'], None))
+    
+    def mark_done(self, task: Dict, jobs: int, urls: Optional[List[str]] = None):
+        self.result_queue.put(('done', self.worker_id, task['task_id'], (jobs, urls)))
+    
+    def mark_failed(self, task: Dict, error: str):
+        self.result_queue.put(('failed', self.worker_id, task['task_id'], error))
+
+
+def _process_worker(worker_id: int, db_file: str, headless: bool, task_queue, result_queue,
+                    worker_setup: Optional[Callable] = None, processes: int = 1):
+    """多进程抓取的子进程：从任务队列取任务直到收到结束标记，结果和进度发回主进程"""
+    stat = {'worker_id': worker_id, 'tasks': 0, 'busy_seconds': 0.0, 'jobs': 0}
+    extra = None
+    db = None
+    scraper = None
+    try:
+        # 各进程分摊站点速率，合计与单进程相同
+        share_rate_limits(processes)
+        # 不加载URL内存索引：去重直接查询 jobs.db，能看到其他进程刚写入的岗位
+        db = DBManager(db_file, use_url_index=False)
+        scraper = JobScraper(db)
+        scraper.start_browser(headless=headless)
+        if worker_setup:
+            worker_setup(scraper)
+        
+        checkpoint = _QueuedCheckpoint(worker_id, result_queue)
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            task_start = time.perf_counter()
+            jobs = scraper.run_search_task(task, checkpoint)
+            stat['busy_seconds'] += time.perf_counter() - task_start
+            stat['tasks'] += 1
+            stat['jobs'] += len(jobs)
+            result_queue.put(('result', worker_id, task['task_id'], jobs))
+    except Exception as e:
+        print(f"  ✗ 进程 {worker_id} 出错: {str(e)[:100]}")
+    finally:
+        if scraper:
+            scraper.close_browser()
+            shutdown_browser_pool()
+            extra = {'readiness': scraper.readiness_stats.to_dict(), 'metrics': scraper.metrics.summary(),
+                     'cache': scraper.result_cache.stats}
+        if db:
+            db.close()
+        result_queue.put(('exit', worker_id, stat, extra))
 
 
 # ==================== 调度模块 ====================
@@ -1293,14 +2069,29 @@ class JobScraper:
 class Scheduler:
     """定时调度器"""
     
-    def __init__(self, db_manager: DBManager, dingtalk_sender: DingTalkSender):
-        """初始化调度器"""
+    def __init__(self, db_manager: DBManager, dingtalk_sender: DingTalkSender,
+                 use_async: bool = ASYNC_ENGINE, concurrency: Optional[int] = None,
+                 processes: Optional[int] = None):
+        """初始化调度器
+        
+        Args:
+            use_async: 是否使用异步抓取引擎
+            concurrency: 并发数（为空时按引擎使用 CRAWL_CONCURRENCY 或 ASYNC_CONCURRENCY）
+            processes: 多进程抓取的进程数（为空时使用 CRAWL_PROCESSES，仅同步引擎）
+        """
         self.db = db_manager
         self.dingtalk = dingtalk_sender
         self.scraper = None
+        self.use_async = use_async
+        self.concurrency = concurrency
+        self.processes = processes
     
+    @timed('scheduler', 'excel_export')
     def export_to_excel(self) -> Optional[str]:
-        """导出所有岗位到Excel文件（包含所有9个字段）"""
+        """导出岗位到Excel文件（包含所有9个字段，导出方式见 EXCEL_EXPORT_MODE）"""
+        if EXCEL_EXPORT_MODE in ('stream', 'delta'):
+            return self.export_to_excel_streaming('delta' if EXCEL_EXPORT_MODE == 'delta' else 'full')
+        
         try:
             conn = sqlite3.connect(DB_FILE)
             df = pd.read_sql_query("""
@@ -1335,27 +2126,57 @@ class Scheduler:
             traceback.print_exc()
             return None
     
+    def export_to_excel_streaming(self, mode: str = 'full') -> Optional[str]:
+        """流式导出岗位到Excel（分批读取数据库，内存占用与数据量无关）"""
+        from excel_export import export_jobs
+        try:
+            result = export_jobs(self.db.db_file, mode=mode)
+            if result['file']:
+                print(f"  导出 {result['rows']} 个岗位（{'增量' if mode == 'delta' else '全量'}），"
+                      f"耗时 {result['seconds']:.1f} 秒")
+            return result['file']
+        except Exception as e:
+            print(f"⚠ 导出Excel时出错: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
     def run_once(self):
         """执行一次抓取任务"""
         print("\n" + "="*60)
         print(f"开始执行抓取任务 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60)
+        metrics = get_metrics('scheduler')
+        metrics.start_run()
         
         try:
-            # 初始化爬虫
-            self.scraper = JobScraper(self.db)
-            self.scraper.start_browser(headless=True)
-            
-            # 抓取所有配置
-            new_jobs = self.scraper.scrape_all_configs()
-            
-            # 关闭浏览器
-            self.scraper.close_browser()
+            if self.use_async:
+                # 异步引擎：单线程内多个页面并发抓取（延迟导入，避免循环依赖）
+                from scheduler_async import AsyncJobScraper
+                async_scraper = AsyncJobScraper(self.db, concurrency=self.concurrency or ASYNC_CONCURRENCY)
+                new_jobs = asyncio.run(async_scraper.run(headless=True))
+            else:
+                # 初始化爬虫
+                concurrency = self.concurrency or CRAWL_CONCURRENCY
+                processes = self.processes or CRAWL_PROCESSES
+                self.scraper = JobScraper(self.db)
+                if concurrency > 1 or processes > 1:
+                    # 并发/多进程模式下每个worker自行启动浏览器
+                    self.scraper.headless = True
+                else:
+                    self.scraper.start_browser(headless=True)
+                
+                # 抓取所有配置（浏览器在 finally 中关闭）
+                new_jobs = self.scraper.scrape_all_configs(concurrency, processes)
             
             # 统计信息
             total_count = self.db.get_total_count()
             
             print(f"\n✓ 抓取完成: 新增 {len(new_jobs)} 个岗位，数据库总计 {total_count} 个")
+            if self.db.url_index is not None:
+                index_stats = self.db.url_index.stats()
+                print(f"  URL索引: {self.db.url_index.format_stats()}，"
+                      f"累计查询 {index_stats['lookups']} 次，命中 {index_stats['hits']} 次")
             
             # 导出Excel文件（包含所有岗位）
             excel_file = self.export_to_excel()
@@ -1364,7 +2185,10 @@ class Scheduler:
             
             # 发送钉钉通知（只发送消息卡片，Excel文件信息不发送）
             if new_jobs:
-                title, content = self.dingtalk.format_jobs_message(new_jobs, total_count, excel_file)
+                # 按搜索计划分发后的各配置结果分组（共享搜索的岗位在每个订阅配置下都显示）
+                scraper = async_scraper if self.use_async else self.scraper
+                title, content = self.dingtalk.format_jobs_message(new_jobs, total_count, excel_file,
+                                                                   scraper.config_results)
                 if title and content:
                     # 只发送消息卡片
                     self.dingtalk.send_markdown(title, content)
@@ -1380,45 +2204,62 @@ class Scheduler:
         finally:
             if self.scraper:
                 self.scraper.close_browser()
+            # 浏览器池跨运行保留（按页面数和内存回收实例），下一轮不用冷启动浏览器；
+            # run_forever 由调度引擎退出时关闭，单次运行时主线程的池在进程退出时关闭
+            # 各阶段耗时写入指标表 / Prometheus 文本文件
+            metrics.finish_run()
     
     def run_forever(self):
-        """持续运行调度器"""
+        """持续运行调度器（由 job_scheduler 调度引擎驱动：锁文件防重叠、错过补跑、状态持久化）"""
+        from job_scheduler import SchedulerEngine, ScheduledJob, IntervalTrigger
+        
         print("\n" + "="*60)
         print("招聘岗位定时抓取服务已启动")
         print("="*60)
         print(f"抓取间隔: {SCRAPE_INTERVAL // 3600} 小时")
-        print(f"下次运行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60)
-        print("\n提示: 按 Ctrl+C 可停止服务\n")
-        
-        # 立即执行一次
-        self.run_once()
         
-        # 定时执行
-        while True:
-            try:
-                # 等待指定时间
-                print(f"\n等待 {SCRAPE_INTERVAL // 3600} 小时后执行下一次抓取...")
-                time.sleep(SCRAPE_INTERVAL)
-                
-                # 执行任务
-                self.run_once()
-                
-            except KeyboardInterrupt:
-                print("\n\n收到停止信号，正在退出...")
-                break
-            except Exception as e:
-                print(f"\n✗ 调度器出错: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                print(f"\n等待 {SCRAPE_INTERVAL // 3600} 小时后重试...")
-                time.sleep(SCRAPE_INTERVAL)
+        # 与 job_scheduler.py 中的 yingjiesheng 任务共用任务锁和状态，两者不会重叠运行
+        job = ScheduledJob('yingjiesheng', self.run_once, IntervalTrigger(SCRAPE_INTERVAL),
+                           misfire_grace=3600, browser=True, run_on_start=True)
+        engine = SchedulerEngine([job], db_file=self.db.db_file)
+        try:
+            engine.run_forever()
+        except KeyboardInterrupt:
+            print("\n\n收到停止信号，正在退出...")
 
 
 # ==================== 主程序 ====================
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='招聘岗位定时抓取与钉钉推送脚本')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='使用异步抓取引擎（playwright.async_api）')
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='并发数（同步引擎为浏览器数，异步引擎为页面数）')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='多进程抓取的进程数（同步引擎，每个进程独立浏览器）')
+    parser.add_argument('--plan', action='store_true',
+                        help='只打印去重后的搜索计划（任务数、预估耗时、节省量），不抓取')
+    parser.add_argument('--progress', action='store_true',
+                        help='查看最近一次抓取的断点进度，不抓取')
+    args = parser.parse_args()
+    
+    if args.progress:
+        checkpoint = CrawlCheckpoint(DB_FILE)
+        print(checkpoint.format_progress())
+        checkpoint.close()
+        return
+    
+    if args.plan:
+        concurrency = args.processes or args.concurrency or (
+            ASYNC_CONCURRENCY if args.use_async or ASYNC_ENGINE else max(CRAWL_CONCURRENCY, CRAWL_PROCESSES))
+        # 规划只依赖配置，不需要数据库和浏览器
+        plan = JobScraper(None).build_search_plan()
+        print(plan.format_plan(concurrency))
+        return
+    
     print("\n" + "="*60)
     print("招聘岗位定时抓取与钉钉推送脚本")
     print("="*60)
@@ -1432,7 +2273,9 @@ def main():
     # 初始化组件
     db_manager = DBManager()
     dingtalk_sender = DingTalkSender()
-    scheduler = Scheduler(db_manager, dingtalk_sender)
+    scheduler = Scheduler(db_manager, dingtalk_sender,
+                          use_async=args.use_async or ASYNC_ENGINE, concurrency=args.concurrency,
+                          processes=args.processes)
     
     # 启动调度器
     try:
@@ -1443,6 +2286,8 @@ def main():
         print(f"\n程序异常退出: {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        db_manager.close()
 
 
 if __name__ == '__main__':
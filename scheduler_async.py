@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+招聘岗位异步抓取引擎
+功能：基于 playwright.async_api，在单个进程、单个线程内同时驱动多个页面抓取应届生求职网
+
+与同步引擎（scheduler.JobScraper）的区别：
+    - 多个页面共享一个浏览器上下文，由 asyncio 调度，等待页面加载时不阻塞其他页面
+    - 数据库写入交给独立的写入协程批量完成，页面导航、解析与写库相互重叠
+    - 不需要额外的操作系统线程
+
+使用方法：
+    python scheduler.py --async                   # 默认并发页面数见 ASYNC_CONCURRENCY
+    python scheduler.py --async --concurrency 8
+"""
+
+import asyncio
+import random
+import time
+import urllib.parse
+from typing import List, Dict, Optional, Tuple
+
+from playwright.async_api import async_playwright
+
+from resource_filter import create_filter
+from page_readiness import ReadinessStats, PageLoadError, navigate_and_wait_async, get_rate_limiter
+from selector_cache import get_selector_cache
+from search_planner import recruit_fields
+
+from scheduler import (
+    DBManager, JobScraper, RANDOM_WAIT_MIN, RANDOM_WAIT_MAX, ASYNC_CONCURRENCY,
+    YINGJIESHENG_EXTRACT_MODE, YINGJIESHENG_ROWS_SCRIPT, print_crawl_stats,
+)
+
+# ==================== 配置区域 ====================
+
+# 应届生求职网域名（用于补全相对链接）
+YINGJIESHENG_BASE_URL = "https://www.yingjiesheng.com"
+
+# 数据库批量写入：攒够多少条写入一次
+WRITE_BATCH_SIZE = 50
+
+# 数据库批量写入：最长等待多少秒写入一次
+WRITE_FLUSH_INTERVAL = 1.0
+
+# 职位列表选择器（与同步引擎一致）
+JOB_LIST_SELECTORS = [
+    '.job-list-item',
+    '.job-item',
+    '.job-info',
+    '[class*="job"]',
+    '.list-item',
+    'tr',  # 可能是表格形式
+]
+
+# 职位链接选择器（按优先级）
+JOB_LINK_SELECTORS = ['td:first-child a', 'a[href*="/job-"]', 'a[href*="job"]', 'a']
+
+# 字段回退选择器（只尝试前3个，与同步引擎一致）
+TITLE_SELECTORS = ['.job-name', '.job-title', '.title']
+COMPANY_SELECTORS = ['.company-name', '.company', '[class*="company"]']
+LOCATION_SELECTORS = ['.city', '.location', '[class*="city"]']
+TIME_SELECTORS = ['.update-time', '.time', '.publish-time']
+
+# 写入队列结束标记
+_STOP = object()
+
+
+class _TaskDone:
+    """写入队列中的任务完成标记：排在该任务的岗位之后，写入协程保存这些岗位后才标记任务完成"""
+
+    def __init__(self, task: Dict, urls: List[str]):
+        self.task = task
+        self.urls = urls
+
+
+# ==================== 异步爬虫 ====================
+
+class AsyncJobScraper:
+    """异步岗位抓取器"""
+
+    def __init__(self, db_manager: DBManager, concurrency: int = ASYNC_CONCURRENCY):
+        """初始化爬虫
+
+        Args:
+            db_manager: 数据库管理器
+            concurrency: 同时打开的页面数
+        """
+        self.db = db_manager
+        self.concurrency = max(1, concurrency)
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.resource_filter = None
+        self.readiness_stats = ReadinessStats()
+        self.selector_cache = get_selector_cache()
+        self.run_stats: Dict = {}
+        self.config_results: Dict[int, List[Dict]] = {}  # 配置序号 -> 分发到的新岗位
+        self.saved_count = 0
+        self._write_queue: Optional[asyncio.Queue] = None
+
+    async def start_browser(self, headless: bool = True):
+        """启动浏览器（所有页面共享同一个上下文）"""
+        print("正在启动浏览器（异步引擎）...")
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
+            headless=headless,
+            args=['--disable-blink-features=AutomationControlled']
+        )
+        self.context = await self.browser.new_context(
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            viewport={'width': 1920, 'height': 1080}
+        )
+        # 拦截图片、字体、样式等无需下载的资源（挂载在上下文上，对所有页面生效）
+        self.resource_filter = create_filter(['yingjiesheng'])
+        if self.resource_filter:
+            await self.resource_filter.attach_async(self.context)
+        print("✓ 浏览器启动成功")
+
+    async def close_browser(self):
+        """关闭浏览器"""
+        if self.browser:
+            if self.resource_filter:
+                print(f"  资源拦截: {self.resource_filter.format_stats()}")
+            await self.browser.close()
+            self.browser = None
+        self.selector_cache.save()
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        print("✓ 浏览器已关闭")
+
+    async def random_sleep(self, min_time: float = RANDOM_WAIT_MIN, max_time: float = RANDOM_WAIT_MAX):
+        """随机休眠（不阻塞其他页面）"""
+        await asyncio.sleep(random.uniform(min_time, max_time))
+
+    def _absolute_link(self, href: Optional[str]) -> Optional[str]:
+        """将相对链接补全为绝对链接"""
+        if not href:
+            return None
+        if href.startswith('http'):
+            return href
+        if href.startswith('/'):
+            return f"{YINGJIESHENG_BASE_URL}{href}"
+        return f"{YINGJIESHENG_BASE_URL}/{href}"
+
+    async def _first_text(self, element, selectors: List[str]) -> str:
+        """依次尝试选择器，返回第一个非空文本"""
+        for selector in selectors:
+            try:
+                sub_element = await element.query_selector(selector)
+                if sub_element:
+                    text = (await sub_element.inner_text()).strip()
+                    if text:
+                        return text
+            except Exception:
+                continue
+        return ''
+
+    async def _find_job_elements(self, page) -> list:
+        """查找职位列表元素（上次成功的选择器优先尝试）"""
+        cache = self.selector_cache
+        for selector in cache.ordered('yingjiesheng', 'search', 'job_list', JOB_LIST_SELECTORS):
+            try:
+                elements = await page.query_selector_all(selector)
+                if elements and len(elements) > 1:  # 至少2个（排除表头）
+                    if selector == 'tr':
+                        # 过滤掉表头行
+                        filtered = []
+                        for e in elements:
+                            if await e.query_selector('a[href*="job"]') or await e.query_selector('a[href*="/job-"]'):
+                                filtered.append(e)
+                        if filtered:
+                            print(f"    ✓ 找到 {len(filtered)} 个职位元素（选择器: {selector}）")
+                            cache.record('yingjiesheng', 'search', 'job_list', JOB_LIST_SELECTORS, selector)
+                            return filtered
+                    else:
+                        print(f"    ✓ 找到 {len(elements)} 个职位元素（选择器: {selector}）")
+                        cache.record('yingjiesheng', 'search', 'job_list', JOB_LIST_SELECTORS, selector)
+                        return elements
+            except Exception:
+                continue
+        cache.record('yingjiesheng', 'search', 'job_list', JOB_LIST_SELECTORS, None)
+
+        # 尝试更通用的选择器
+        try:
+            page_text = (await page.inner_text('body'))[:200]
+            if '职位' in page_text or '招聘' in page_text or '岗位' in page_text:
+                all_links = await page.query_selector_all('a[href*="job"], a[href*="/job-"]')
+                if all_links:
+                    print(f"    ✓ 找到 {len(all_links)} 个职位链接，尝试提取...")
+                    return all_links[:20]  # 限制数量
+        except Exception as e:
+            print(f"    ⚠ 检查页面时出错: {str(e)[:30]}")
+        return []
+
+    async def _extract_title_and_link(self, job_elem) -> Tuple[Optional[str], Optional[str]]:
+        """提取职位名称和链接"""
+        job_title = None
+        job_link = None
+
+        for selector in JOB_LINK_SELECTORS:
+            try:
+                link_elem = await job_elem.query_selector(selector)
+                if link_elem:
+                    job_title = (await link_elem.inner_text()).strip()
+                    job_link = self._absolute_link(await link_elem.get_attribute('href'))
+                    break
+            except Exception:
+                continue
+
+        if not job_title:
+            try:
+                first_td = await job_elem.query_selector('td:first-child')
+                if first_td:
+                    job_title = (await first_td.inner_text()).strip()
+                    link = await first_td.query_selector('a')
+                    if link and not job_link:
+                        job_link = self._absolute_link(await link.get_attribute('href'))
+            except Exception:
+                pass
+            if not job_title:
+                job_title = await self._first_text(job_elem, TITLE_SELECTORS)
+
+        return job_title, job_link
+
+    async def _extract_rows_in_page(self, page, job_elements: list, city: str) -> Optional[List[Optional[Dict]]]:
+        """一次 page.evaluate 提取所有行的字段，失败时返回 None（调用方退回逐元素提取）"""
+        try:
+            rows = await page.evaluate(YINGJIESHENG_ROWS_SCRIPT, {'elements': job_elements, 'city': city})
+        except Exception as e:
+            print(f"    ⚠ 页内提取失败，改为逐元素提取: {str(e)[:50]}")
+            return None
+        if not isinstance(rows, list) or len(rows) != len(job_elements):
+            print(f"    ⚠ 页内提取结果异常，改为逐元素提取")
+            return None
+        return rows
+
+    async def search_yingjiesheng(self, page, keyword: str, city: str, grad_year,
+                                  recruit_type: str, config_keywords: str) -> List[Dict]:
+        """在应届生求职网搜索岗位（使用传入的页面）"""
+        results = []
+
+        if not ('校招' in recruit_type or '实习' in recruit_type or grad_year):
+            return results
+
+        url = (f"{YINGJIESHENG_BASE_URL}/job/?keyword={urllib.parse.quote(keyword)}"
+               f"&city={urllib.parse.quote(city)}")
+        print(f"    搜索应届生求职网: {keyword} | {city}")
+
+        try:
+            await navigate_and_wait_async(page, url, 'yingjiesheng', self.readiness_stats)
+        except Exception as e:
+            print(f"    ⚠ 访问页面失败: {str(e)[:50]}")
+            raise PageLoadError(str(e)) from e
+
+        try:
+            job_elements = await self._find_job_elements(page)
+            if not job_elements:
+                return results
+
+            # 第一遍：只提取职位名称和链接，用于批量去重
+            job_elements = job_elements[:15]  # 限制每页15个
+            rows = None
+            if YINGJIESHENG_EXTRACT_MODE == 'evaluate':
+                # 一次往返在页面内提取整页所有字段，失败时退回逐元素提取
+                rows = await self._extract_rows_in_page(page, job_elements, city)
+            candidates = []
+            for index, job_elem in enumerate(job_elements):
+                try:
+                    if rows is not None:
+                        row = rows[index]
+                        if not row:
+                            continue
+                        job_title, job_link = row['title'], self._absolute_link(row['href'])
+                    else:
+                        row = None
+                        job_title, job_link = await self._extract_title_and_link(job_elem)
+                    if job_title and job_link:
+                        candidates.append((job_elem, row, job_title, job_link))
+                except Exception:
+                    continue
+
+            # sqlite 查询在线程池中执行，不阻塞其他页面的协程
+            new_urls = set(await asyncio.to_thread(self.db.filter_new_urls, [c[3] for c in candidates]))
+
+            # 第二遍：只对新岗位提取完整信息
+            for job_elem, row, job_title, job_link in candidates:
+                if job_link not in new_urls:
+                    continue
+                new_urls.discard(job_link)
+                if row is not None:
+                    results.append(self._build_job_data(
+                        job_link, job_title, row['company'] or '未知', row['location'] or city,
+                        row['update_time'] or '未知', grad_year, recruit_type, config_keywords))
+                    continue
+                try:
+                    company_name = (await self._first_text(job_elem, ['td:nth-child(2)'])
+                                    or await self._first_text(job_elem, COMPANY_SELECTORS)
+                                    or '未知')
+
+                    work_location = await self._first_text(job_elem, ['td:nth-child(3)'])
+                    if not work_location or work_location == city:
+                        work_location = await self._first_text(job_elem, LOCATION_SELECTORS) or city
+
+                    update_time = (await self._first_text(job_elem, ['td:nth-child(4)'])
+                                   or await self._first_text(job_elem, TIME_SELECTORS)
+                                   or '未知')
+
+                    results.append(self._build_job_data(job_link, job_title, company_name, work_location,
+                                                        update_time, grad_year, recruit_type, config_keywords))
+                except Exception:
+                    continue
+
+        except Exception as e:
+            print(f"    ⚠ 解析页面时出错: {str(e)[:50]}")
+
+        # 交给写入协程批量保存，不等待写库完成
+        for job in results:
+            self._write_queue.put_nowait(job)
+
+        return results
+
+    def _build_job_data(self, job_link: str, job_title: str, company_name: str, work_location: str,
+                        update_time: str, grad_year, recruit_type: str, config_keywords: str) -> Dict:
+        """构建完整的岗位数据（字段与同步引擎一致）"""
+        recruit_type_str, recruit_target = recruit_fields(job_title, company_name, grad_year, recruit_type)
+
+        return {
+            'url': job_link,
+            'company_name': company_name,
+            'company_type': '未知',
+            'work_location': work_location,
+            'recruit_type': recruit_type_str,
+            'recruit_target': recruit_target,
+            'job_title': job_title,
+            'update_time': update_time,
+            'deadline': '详见链接',
+            'config_keywords': config_keywords,  # 用于消息分组
+        }
+
+    async def _db_writer(self, checkpoint=None):
+        """写入协程：从队列中收集岗位，攒批后一次性写入数据库
+
+        任务完成标记在该任务的岗位写入数据库之后才记入断点，写入前进程退出时续跑会重试该任务
+        """
+        batch = []
+        done_tasks: List[_TaskDone] = []
+        last_flush = time.perf_counter()
+        while True:
+            try:
+                item = await asyncio.wait_for(self._write_queue.get(), timeout=WRITE_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                item = None
+
+            if isinstance(item, _TaskDone):
+                done_tasks.append(item)
+            elif item is not None and item is not _STOP:
+                batch.append(item)
+
+            due = time.perf_counter() - last_flush >= WRITE_FLUSH_INTERVAL
+            if batch and (len(batch) >= WRITE_BATCH_SIZE or due or item is _STOP):
+                # 批量写入在线程池中执行，写入期间其他页面继续抓取
+                self.saved_count += await asyncio.to_thread(self.db.save_jobs, batch)
+                batch = []
+                last_flush = time.perf_counter()
+            if done_tasks and not batch:
+                # 标记之前的岗位都已写入
+                for done in done_tasks:
+                    if checkpoint:
+                        await asyncio.to_thread(checkpoint.mark_done, done.task, len(done.urls), done.urls)
+                done_tasks = []
+
+            if item is _STOP:
+                break
+
+    async def _worker(self, worker_id: int, task_queue: asyncio.Queue,
+                      results_by_task: Dict[int, List[Dict]], stat: Dict, checkpoint=None):
+        """页面worker：从任务队列中取任务并抓取，直到队列为空"""
+        page = await self.context.new_page()
+        # 所有页面共用站点限速器，并发页数不放大请求频率
+        rate_limiter = get_rate_limiter('yingjiesheng')
+        try:
+            while True:
+                try:
+                    task = task_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                # 礼貌性延迟：所有页面合计按站点速率限速
+                await rate_limiter.wait_async()
+                task_start = time.perf_counter()
+                # 断点记录是同步的 sqlite 写入，在线程池中执行
+                if checkpoint:
+                    await asyncio.to_thread(checkpoint.mark_running, task)
+                try:
+                    jobs = await self.search_yingjiesheng(page, task['keyword'], task['city'], task['grad_year'],
+                                                          task['recruit_type'], task['config_keywords'])
+                    # 排在本任务的岗位之后，由写入协程在岗位入库后标记完成
+                    self._write_queue.put_nowait(_TaskDone(task, [job['url'] for job in jobs]))
+                except Exception as e:
+                    print(f"  ✗ 页面 {worker_id} 处理任务时出错: {str(e)[:100]}")
+                    if checkpoint:
+                        await asyncio.to_thread(checkpoint.mark_failed, task, str(e))
+                    jobs = []
+                stat['busy_seconds'] += time.perf_counter() - task_start
+                stat['tasks'] += 1
+                stat['jobs'] += len(jobs)
+                results_by_task[task['task_id']] = jobs
+        finally:
+            await page.close()
+
+    async def scrape_all_configs(self) -> List[Dict]:
+        """并发抓取所有配置的岗位"""
+        # 任务规划与断点续跑复用同步引擎的实现
+        planner = JobScraper(self.db)
+        plan = planner.build_search_plan()
+        tasks = planner.resume_tasks(plan.tasks)
+        print(f"\n开始异步抓取，共 {len(tasks)} 个搜索任务（去重节省 {plan.saved_count} 个），"
+              f"并发页面数 {self.concurrency}...")
+
+        task_queue: asyncio.Queue = asyncio.Queue()
+        for task in tasks:
+            task_queue.put_nowait(task)
+
+        self._write_queue = asyncio.Queue()
+        writer = asyncio.create_task(self._db_writer(planner.checkpoint))
+
+        results_by_task: Dict[int, List[Dict]] = {}
+        worker_stats = [{'worker_id': i, 'tasks': 0, 'busy_seconds': 0.0, 'jobs': 0}
+                        for i in range(1, self.concurrency + 1)]
+
+        start_time = time.perf_counter()
+        try:
+            await asyncio.gather(*[
+                self._worker(stat['worker_id'], task_queue, results_by_task, stat, planner.checkpoint)
+                for stat in worker_stats
+            ])
+        finally:
+            # 等待剩余岗位写入数据库
+            self._write_queue.put_nowait(_STOP)
+            await writer
+        planner.finish_checkpoint()
+        wall_seconds = time.perf_counter() - start_time
+
+        # 按任务顺序合并结果，同一岗位只保留顺序最靠前的；
+        # 页面并发时岗位归属于最先写入它的任务（与同步并发模式相同，不保证与顺序模式一致）
+        all_new_jobs = []
+        seen_urls = set()
+        for task in tasks:
+            for job in results_by_task.get(task['task_id'], []):
+                if job['url'] in seen_urls:
+                    continue
+                seen_urls.add(job['url'])
+                all_new_jobs.append(job)
+
+        for stat in worker_stats:
+            stat['utilisation'] = stat['busy_seconds'] / wall_seconds if wall_seconds else 0
+
+        completed = len(results_by_task)
+        all_new_jobs = planner.merge_resumed_results(results_by_task, all_new_jobs)
+        self.config_results = plan.fan_out(results_by_task)
+        self.run_stats = {
+            'mode': '异步',
+            'tasks': len(tasks),
+            'skipped_tasks': plan.unique_count - len(tasks),
+            'naive_tasks': plan.naive_count,
+            'completed': completed,
+            'wall_seconds': wall_seconds,
+            'tasks_per_minute': completed / wall_seconds * 60 if wall_seconds else 0,
+            'configs_with_jobs': len(self.config_results),
+            'readiness': self.readiness_stats.format_stats(),
+            'selectors': self.selector_cache.format_stats(),
+            'workers': worker_stats,
+        }
+        print_crawl_stats(self.run_stats)
+        return all_new_jobs
+
+    async def run(self, headless: bool = True) -> List[Dict]:
+        """启动浏览器、抓取所有配置并关闭浏览器"""
+        try:
+            await self.start_browser(headless=headless)
+            return await self.scrape_all_configs()
+        finally:
+            await self.close_browser()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+搜索任务规划器
+将 SEARCH_CONFIGS 编译为去重后的 (关键词, 城市) 搜索任务
+
+多个配置共享关键词，且 '非偏远地区'、'南方城市'、'一线城市' 等城市组展开后互相重叠，
+朴素的 配置 × 关键词 × 城市 循环会把同一个搜索执行多次。规划器保证每个搜索只执行一次，
+并记录请求它的所有配置（subscribers），抓取结果再分发给这些配置。
+
+任务的 grad_year / recruit_type 合并自所有订阅配置（届别取并集，招聘类型用 '/' 连接），
+数据库中的岗位按合并后的值记录；fan_out 分发时按每个配置自己的值重新计算招聘类型和招聘对象。
+
+使用方法：
+    python scheduler.py --plan                    # 只打印搜索计划（dry-run），不抓取
+    python scheduler.py --plan --concurrency 4    # 按并发数估算耗时
+"""
+
+from typing import List, Dict, Callable, Tuple
+
+# 单个搜索任务的预估耗时（秒）：页面加载 + 解析 + 随机等待
+EST_SECONDS_PER_TASK = 10.0
+
+# dry-run 时列出重复次数最多的搜索数量
+TOP_DUPLICATES = 5
+
+
+class SearchPlan:
+    """去重后的搜索计划"""
+
+    def __init__(self, tasks: List[Dict], naive_count: int, config_count: int, searched_config_count: int):
+        """初始化搜索计划
+
+        Args:
+            tasks: 去重后的搜索任务（按首次出现的配置顺序）
+            naive_count: 朴素循环下的搜索次数
+            config_count: 配置总数
+            searched_config_count: 参与搜索的配置数
+        """
+        self.tasks = tasks
+        self.naive_count = naive_count
+        self.config_count = config_count
+        self.searched_config_count = searched_config_count
+
+    @property
+    def unique_count(self) -> int:
+        """去重后的搜索次数"""
+        return len(self.tasks)
+
+    @property
+    def saved_count(self) -> int:
+        """去重节省的搜索次数"""
+        return self.naive_count - self.unique_count
+
+    def saved_ratio(self) -> float:
+        """去重节省的比例"""
+        return self.saved_count / self.naive_count if self.naive_count else 0
+
+    def estimate_seconds(self, task_count: int, concurrency: int = 1,
+                         seconds_per_task: float = EST_SECONDS_PER_TASK) -> float:
+        """估算执行指定数量搜索任务的耗时"""
+        return task_count * seconds_per_task / max(1, concurrency)
+
+    def fan_out(self, results_by_task: Dict[int, List[Dict]]) -> Dict[int, List[Dict]]:
+        """将每个搜索任务的结果分发给所有请求它的配置
+
+        Returns:
+            {配置序号: 岗位列表}，岗位的 config_keywords、recruit_type、recruit_target 改为对应配置的值
+        """
+        config_results: Dict[int, List[Dict]] = {}
+        seen: Dict[int, set] = {}
+        for task in self.tasks:
+            jobs = results_by_task.get(task['task_id'], [])
+            if not jobs:
+                continue
+            for sub in task['subscribers']:
+                config_jobs = config_results.setdefault(sub['config_index'], [])
+                config_seen = seen.setdefault(sub['config_index'], set())
+                for job in jobs:
+                    if job['url'] in config_seen:
+                        continue
+                    config_seen.add(job['url'])
+                    recruit_type, recruit_target = recruit_fields(
+                        job.get('job_title', ''), job.get('company_name', ''), sub['grad_year'], sub['recruit_type'])
+                    config_jobs.append(dict(job, config_keywords=sub['config_keywords'],
+                                            recruit_type=recruit_type, recruit_target=recruit_target))
+        return config_results
+
+    def top_duplicates(self, limit: int = TOP_DUPLICATES) -> List[Tuple[str, str, int]]:
+        """重复次数最多的搜索：[(关键词, 城市, 配置数)]"""
+        shared = [(t['keyword'], t['city'], len(t['subscribers'])) for t in self.tasks if len(t['subscribers']) > 1]
+        shared.sort(key=lambda x: -x[2])
+        return shared[:limit]
+
+    def format_plan(self, concurrency: int = 1) -> str:
+        """格式化搜索计划（dry-run 输出）"""
+        naive_seconds = self.estimate_seconds(self.naive_count, concurrency)
+        plan_seconds = self.estimate_seconds(self.unique_count, concurrency)
+        lines = [
+            "=" * 60,
+            "搜索计划（dry-run）",
+            "=" * 60,
+            f"  配置数: {self.config_count}（参与搜索 {self.searched_config_count} 个）",
+            f"  朴素循环搜索次数: {self.naive_count}",
+            f"  去重后搜索次数: {self.unique_count}",
+            f"  节省: {self.saved_count} 次（{self.saved_ratio():.0%}）",
+            f"  预估耗时（并发数 {concurrency}，每次约 {EST_SECONDS_PER_TASK:.0f} 秒）: "
+            f"{naive_seconds / 60:.1f} 分钟 → {plan_seconds / 60:.1f} 分钟",
+        ]
+        duplicates = self.top_duplicates()
+        if duplicates:
+            lines.append("  重复最多的搜索:")
+            for keyword, city, count in duplicates:
+                lines.append(f"    {keyword} | {city}: {count} 个配置")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+def recruit_fields(job_title: str, company_name: str, grad_year, recruit_type: str) -> Tuple[str, str]:
+    """按配置的届别和招聘类型计算岗位的 (招聘类型, 招聘对象)"""
+    if '实习' in job_title or '实习' in company_name:
+        recruit_type_str = '实习'
+    elif recruit_type == '社招':
+        recruit_type_str = '社招'
+    else:
+        recruit_type_str = '校招'
+
+    if grad_year:
+        if isinstance(grad_year, list):
+            recruit_target = f"{'/'.join(map(str, grad_year))}届"
+        else:
+            recruit_target = f"{grad_year}届"
+    else:
+        recruit_target = '不限'
+    return recruit_type_str, recruit_target
+
+
+def _merge_subscriber(task: Dict, subscriber: Dict):
+    """把订阅配置的届别和招聘类型合并到任务（届别取并集，招聘类型去重后用 '/' 连接）"""
+    years = []
+    for value in (task['grad_year'], subscriber['grad_year']):
+        for year in (value if isinstance(value, list) else [value]):
+            if year and year not in years:
+                years.append(year)
+    years.sort()
+    task['grad_year'] = years if len(years) > 1 else (years[0] if years else None)
+
+    types = task['recruit_type'].split('/')
+    for recruit_type in subscriber['recruit_type'].split('/'):
+        if recruit_type not in types:
+            types.append(recruit_type)
+    task['recruit_type'] = '/'.join(types)
+
+
+def build_search_plan(configs: List[Dict], expand_city_list: Callable[[List[str]], List[str]],
+                      should_search: Callable[[Dict], bool]) -> SearchPlan:
+    """将配置列表编译为去重后的搜索计划
+
+    Args:
+        configs: 搜索配置列表（SEARCH_CONFIGS）
+        expand_city_list: 城市组展开函数
+        should_search: 判断配置是否参与搜索
+
+    Returns:
+        SearchPlan，每个 (关键词, 城市) 只对应一个任务；任务的 config_keywords 取自首个请求它的配置，
+        grad_year / recruit_type 合并自所有请求它的配置
+    """
+    tasks: List[Dict] = []
+    task_by_key: Dict[Tuple[str, str], Dict] = {}
+    naive_count = 0
+    searched_config_count = 0
+
+    for idx, config in enumerate(configs, 1):
+        if not should_search(config):
+            continue
+        searched_config_count += 1
+        cities = expand_city_list(config['locations'])
+        config_keywords = ', '.join(config['keywords'][:3])
+        subscriber = {
+            'config_index': idx,
+            'grad_year': config['grad_year'],
+            'recruit_type': config['recruit_type'],
+            'config_keywords': config_keywords,
+        }
+        for keyword in config['keywords']:
+            for city in cities:
+                naive_count += 1
+                key = (keyword, city)
+                task = task_by_key.get(key)
+                if task is None:
+                    task = {
+                        'task_id': len(tasks),
+                        'keyword': keyword,
+                        'city': city,
+                        'subscribers': [],
+                    }
+                    task.update(subscriber)
+                    task_by_key[key] = task
+                    tasks.append(task)
+                # 同一配置内关键词重复时只记录一次
+                if task['subscribers'] and task['subscribers'][-1]['config_index'] == idx:
+                    continue
+                if task['subscribers']:
+                    _merge_subscriber(task, subscriber)
+                task['subscribers'].append(subscriber)
+
+    return SearchPlan(tasks, naive_count, len(configs), searched_config_count)
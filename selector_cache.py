@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+选择器策略缓存
+抓取脚本对同一字段会按顺序尝试多个候选选择器，每次未命中都是一次浏览器往返。
+本模块按 (站点, 页面类型, 字段) 记录上次成功的选择器，下次优先尝试它。
+
+    - 命中：缓存的选择器直接成功，跳过排在它前面的候选选择器
+    - 未命中：缓存的选择器失败、其他选择器成功 → 改记新的选择器
+    - 无结果：所有候选选择器都失败（如卡片本身没有地点），不计入命中率
+    - 失效：最近 HIT_RATE_WINDOW 次查询命中率低于 MIN_HIT_RATE，或超过 ENTRY_TTL_DAYS 未使用 → 删除该条目重新学习
+
+缓存保存在 SELECTOR_CACHE_FILE（JSON），进程退出前调用 save() 写盘。
+
+使用方法：
+    cache = get_selector_cache()
+    for selector in cache.ordered('yingjiesheng', 'search', 'job_list', selectors):
+        ...成功时 cache.record('yingjiesheng', 'search', 'job_list', selectors, selector)
+    cache.record(..., None)  # 全部失败
+
+    python selector_cache.py            # 查看缓存内容与命中统计
+    python selector_cache.py --clear    # 清空缓存
+"""
+
+import os
+import json
+import time
+import argparse
+import threading
+from typing import List, Dict, Optional
+
+# ==================== 配置区域 ====================
+
+# 是否启用选择器缓存
+SELECTOR_CACHE_ENABLED = True
+
+# 缓存文件
+SELECTOR_CACHE_FILE = "selector_cache.json"
+
+# 命中率统计窗口（最近N次查询）
+HIT_RATE_WINDOW = 20
+
+# 窗口内至少有多少次查询才判断命中率
+MIN_SAMPLES = 10
+
+# 命中率低于此值时缓存失效
+MIN_HIT_RATE = 0.6
+
+# 条目超过多少天未使用即失效
+ENTRY_TTL_DAYS = 14
+
+
+def _key(site: str, page_type: str, field: str) -> str:
+    return f"{site}|{page_type}|{field}"
+
+
+class SelectorCache:
+    """选择器策略缓存（线程安全，同一进程的抓取线程共用一个实例）"""
+
+    def __init__(self, cache_file: str = SELECTOR_CACHE_FILE):
+        """初始化缓存
+
+        Args:
+            cache_file: 缓存文件路径
+        """
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict] = {}
+        # 本次运行的统计：{key: {'hits', 'misses', 'empty', 'saved_probes', 'expired'}}
+        self.run_stats: Dict[str, Dict] = {}
+        self.load()
+
+    # ---------- 持久化 ----------
+
+    def load(self):
+        """从磁盘加载缓存（文件损坏时忽略）"""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ 选择器缓存读取失败，将重新学习: {str(e)[:50]}")
+            self.entries = {}
+        # 清理过期条目
+        cutoff = time.time() - ENTRY_TTL_DAYS * 86400
+        for key in [k for k, e in self.entries.items() if e.get('last_used', 0) < cutoff]:
+            del self.entries[key]
+            self._dirty = True
+
+    def save(self):
+        """写入磁盘（先写临时文件再替换，避免写到一半损坏）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_file = self.cache_file + '.tmp'
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_file, self.cache_file)
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠ 选择器缓存保存失败: {str(e)[:50]}")
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self.entries = {}
+            self._dirty = True
+        self.save()
+
+    # ---------- 查询与记录 ----------
+
+    def ordered(self, site: str, page_type: str, field: str, selectors: List[str]) -> List[str]:
+        """返回尝试顺序：缓存的选择器排在最前，其余保持原顺序"""
+        if not SELECTOR_CACHE_ENABLED:
+            return list(selectors)
+        with self._lock:
+            entry = self.entries.get(_key(site, page_type, field))
+            cached = entry['selector'] if entry else None
+        if cached not in selectors:
+            return list(selectors)
+        return [cached] + [s for s in selectors if s != cached]
+
+    def record(self, site: str, page_type: str, field: str, selectors: List[str], winner: Optional[str]):
+        """记录本次查询结果
+
+        Args:
+            selectors: 原始候选选择器（用于计算节省的查询次数）
+            winner: 成功的选择器，全部失败时为 None
+        """
+        if not SELECTOR_CACHE_ENABLED:
+            return
+        key = _key(site, page_type, field)
+        with self._lock:
+            stats = self.run_stats.setdefault(key, {'hits': 0, 'misses': 0, 'empty': 0,
+                                                    'saved_probes': 0, 'expired': 0})
+            if winner is None:
+                stats['empty'] += 1
+                return
+
+            entry = self.entries.get(key)
+            hit = entry is not None and entry['selector'] == winner
+            if hit:
+                stats['hits'] += 1
+                # 不使用缓存时会先依次尝试排在它前面的选择器
+                stats['saved_probes'] += selectors.index(winner) if winner in selectors else 0
+            else:
+                stats['misses'] += 1
+
+            if entry is None:
+                entry = {'selector': winner, 'hits': 0, 'misses': 0, 'recent': []}
+                self.entries[key] = entry
+            entry['selector'] = winner
+            entry['hits' if hit else 'misses'] += 1
+            entry['recent'] = (entry['recent'] + [1 if hit else 0])[-HIT_RATE_WINDOW:]
+            entry['last_used'] = time.time()
+            self._dirty = True
+
+            recent = entry['recent']
+            if len(recent) >= MIN_SAMPLES and sum(recent) / len(recent) < MIN_HIT_RATE:
+                # 页面结构频繁变化，缓存不再可靠，删除后重新学习
+                del self.entries[key]
+                stats['expired'] += 1
+                print(f"    ⚠ 选择器缓存失效: {key}（最近命中率 {sum(recent) / len(recent):.0%}）")
+
+    # ---------- 统计 ----------
+
+    def format_stats(self) -> str:
+        """格式化本次运行的命中统计"""
+        with self._lock:
+            if not self.run_stats:
+                return "选择器缓存: 本次未使用"
+            lines = ["选择器缓存:"]
+            total_hits = total_lookups = total_saved = 0
+            for key, s in sorted(self.run_stats.items()):
+                lookups = s['hits'] + s['misses']
+                total_hits += s['hits']
+                total_lookups += lookups
+                total_saved += s['saved_probes']
+                entry = self.entries.get(key)
+                lines.append(f"  {key}: 命中 {s['hits']}/{lookups}"
+                             + (f" ({s['hits'] / lookups:.0%})" if lookups else "")
+                             + f"，无结果 {s['empty']}，节省查询 {s['saved_probes']} 次"
+                             + (f"，失效 {s['expired']} 次" if s['expired'] else "")
+                             + (f"，当前: {entry['selector']}" if entry else ""))
+            lines.append(f"  合计: 命中 {total_hits}/{total_lookups}"
+                         + (f" ({total_hits / total_lookups:.0%})" if total_lookups else "")
+                         + f"，节省查询 {total_saved} 次")
+            return "\n".join(lines)
+
+    def format_entries(self) -> str:
+        """格式化缓存内容（累计统计）"""
+        with self._lock:
+            if not self.entries:
+                return "选择器缓存为空"
+            lines = [f"{'站点|页面|字段':<40} {'选择器':<30} {'命中':>6} {'未命中':>6} {'近期命中率':>10}"]
+            for key, e in sorted(self.entries.items()):
+                recent = e.get('recent') or []
+                rate = f"{sum(recent) / len(recent):.0%}" if recent else '-'
+                lines.append(f"{key:<40} {e['selector']:<30} {e['hits']:>6} {e['misses']:>6} {rate:>10}")
+            return "\n".join(lines)
+
+
+_cache: Optional[SelectorCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_selector_cache() -> SelectorCache:
+    """进程内共享的选择器缓存"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SelectorCache()
+        return _cache
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='选择器策略缓存')
+    parser.add_argument('--clear', action='store_true', help='清空缓存')
+    args = parser.parse_args()
+
+    cache = SelectorCache()
+    if args.clear:
+        cache.clear()
+        print("✓ 选择器缓存已清空")
+        return
+    print(cache.format_entries())
+
+
+if __name__ == '__main__':
+    main()
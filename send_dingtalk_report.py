@@ -4,10 +4,10 @@
 发送市场雷达日报到钉钉群
 """
 
-import requests
 import json
 import os
 from datetime import datetime
+from dingtalk_queue import enqueue_markdown
 
 # 钉钉Webhook地址
 DINGTALK_WEBHOOK = "https://oapi.dingtalk.com/robot/send?access_token=ac8d1c6332c8a047b8786a930ab08d7f6db490843edca2de1bb65c68301c3113"
@@ -18,27 +18,16 @@ def send_to_dingtalk(markdown_content: str):
     
     Args:
         markdown_content: Markdown格式的消息内容
-    """
-    payload = {
-        "msgtype": "markdown",
-        "markdown": {
-            "title": "海马职加·市场雷达日报",
-            "text": markdown_content
-        }
-    }
     
+    Returns:
+        是否已加入发送队列（True 只表示已入队，实际发送结果见后台发送日志或 dingtalk_queue.py --status）
+    """
     try:
-        response = requests.post(DINGTALK_WEBHOOK, json=payload, timeout=10)
-        result = response.json()
-        
-        if result.get('errcode') == 0:
-            print("✓ 钉钉消息发送成功")
-            return True
-        else:
-            print(f"✗ 钉钉消息发送失败: {result.get('errmsg')}")
-            return False
+        message_ids = enqueue_markdown(DINGTALK_WEBHOOK, "海马职加·市场雷达日报", markdown_content)
+        print(f"✓ 钉钉消息已加入发送队列（{len(message_ids)} 条），将在后台限速发送")
+        return True
     except Exception as e:
-        print(f"✗ 钉钉请求失败: {str(e)}")
+        print(f"✗ 钉钉消息入队失败: {str(e)}")
         return False
 
 def format_report_for_dingtalk(report_file: str) -> str:
@@ -573,3 +573,6 @@ FOUR_BIG = ['普华永道', '德勤', '安永', '毕马威', 'PwC', 'Deloitte',
 
 # 八大会计师事务所
 EIGHT_BIG = ['普华永道', '德勤', '安永', '毕马威', '立信', '天健', '致同', '大华', '天职国际', '信永中和']
+
+# 外企关键词（命中时不判为央国企）
+FOREIGN_KEYWORDS = ['投资有限公司', '（中国）', '(中国)', '外资', '外企', '丹尼斯克', '联合利华', '宝洁']
@@ -3,19 +3,27 @@
 """
 特定需求岗位抓取脚本
 从多个招聘网站抓取符合特定需求的岗位信息
+默认只搜索51job；开启 PLATFORM_WORKERS 后 WORKER_PLATFORMS 中的每个平台一个worker并行搜索，
+运行结束时输出各平台的岗位数和搜索耗时
 """
 
 import time
+import queue
 import random
 import re
+import threading
 from datetime import datetime
 import pandas as pd
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from resource_filter import create_filter
+from browser_pool import get_browser_pool, shutdown_browser_pool
+from page_readiness import get_rate_limiter
+from circuit_breaker import get_circuit_breakers, report_failure
+from result_cache import get_result_cache
+from stage_metrics import get_metrics, timed, instrument_page
 import urllib.parse
-from specific_requirements_config import (
-    SPECIFIC_REQUIREMENTS, CITY_MAPPING, BIG_COMPANIES, 
-    STATE_OWNED_KEYWORDS, FOUR_BIG, EIGHT_BIG
-)
+from specific_requirements_config import SPECIFIC_REQUIREMENTS, CITY_MAPPING
+from company_classifier import get_company_classifier
 from openpyxl import load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 
@@ -26,19 +34,149 @@ OUTPUT_FIELDS = [
     '岗位详情链接', '投递链接'
 ]
 
+# 按平台并行搜索（每个平台一个worker线程，独立的页面、任务队列和限速）；
+# False 时按原来的方式逐个关键词和城市只搜索51job
+PLATFORM_WORKERS = False
+
+# 并行模式搜索的平台（PLATFORM_SEARCH 中的键）。每增加一个平台，每个 关键词 × 城市 就多访问一次该站点；
+# BOSS直聘和猎聘最容易触发验证码，加入前确认断路器和限速设置
+WORKER_PLATFORMS = ['51job']
+
+# 平台 → 搜索方法
+PLATFORM_SEARCH = {
+    'boss': 'search_boss_zhipin',
+    'guopin': 'search_guopin',
+    '51job': 'search_51job',
+    'liepin': 'search_liepin',
+}
+
+# 各平台请求限速：(两次搜索的最小间隔秒数, 额外随机抖动秒数)
+PLATFORM_RATE_LIMITS = {
+    'boss': (3.0, 2.0),
+    'guopin': (2.0, 1.0),
+    '51job': (1.0, 1.0),
+    'liepin': (3.0, 2.0),
+}
+
+
+# 等待worker结果时每隔多少秒检查一次worker线程是否仍在运行
+WORKER_POLL_SECONDS = 5
+
+
+def _new_platform_stats():
+    return {'searches': 0, 'skipped': 0, 'jobs': 0, 'seconds': 0.0, 'max_seconds': 0.0}
+
+
+class PlatformWorker:
+    """单个平台的搜索线程：独立的页面、任务队列和限速器
+
+    Playwright 同步API的对象只能在创建它的线程中使用，因此页面在线程内租用。
+    每个任务带有所属配置的取消标记和结果队列：配置已收集够岗位（取消）或整个运行已达到目标数（stop_event）后，
+    排队中的任务直接跳过，不再访问页面。
+    """
+
+    def __init__(self, platform, headless, stats, stop_event):
+        self.platform = platform
+        # 返回去重前的结果，由收集线程按本次运行的去重集合过滤（已取消的结果不会标记为已见过）
+        self.scraper = SpecificRequirementsScraper(headless=headless, platform_workers=False)
+        self.rate_limiter = get_rate_limiter(platform, PLATFORM_RATE_LIMITS[platform])
+        self.stats = stats
+        self.stop_event = stop_event
+        self.tasks = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name=f"platform-{platform}", daemon=True)
+        self.thread.start()
+
+    def submit(self, keyword, city, config, cancel, results_queue):
+        """加入一个搜索任务，结果放入 results_queue"""
+        self.tasks.put((keyword, city, config, cancel, results_queue))
+
+    def stop(self, wait=True):
+        """排队中的任务处理（跳过）完后结束线程"""
+        self.tasks.put(None)
+        if wait:
+            self.thread.join()
+
+    def _cancelled(self, cancel):
+        return cancel.is_set() or self.stop_event.is_set()
+
+    def _run(self):
+        search = getattr(self.scraper, PLATFORM_SEARCH[self.platform])
+        breakers = get_circuit_breakers()
+        try:
+            self.scraper.open_page([self.platform])
+        except Exception as e:
+            print(f"  ✗ {self.platform} 启动浏览器失败: {str(e)[:100]}")
+            search = None
+        try:
+            while True:
+                task = self.tasks.get()
+                if task is None:
+                    break
+                keyword, city, config, cancel, results_queue = task
+                results = None
+                allowed = False
+                try:
+                    if not self._cancelled(cancel):
+                        # 结果缓存命中时不访问站点
+                        results = self.scraper.cached_results(self.platform, keyword, city, config)
+                    # 断路器打开时跳过该平台，不再等待限速
+                    allowed = (results is None and search and not self._cancelled(cancel)
+                               and breakers.allow(self.platform))
+                    if allowed:
+                        self.rate_limiter.wait()
+                        if self._cancelled(cancel):
+                            breakers.release(self.platform)
+                            allowed = False
+                    if allowed:
+                        start = time.perf_counter()
+                        self.scraper.renew_page()
+                        # 交给断路器后由其记录结果，出错时不再释放探测名额
+                        allowed = False
+                        results = breakers.execute(self.platform, self.scraper.fetch_and_cache, self.platform,
+                                                   search, keyword, city, config, page=self.scraper.page)
+                        elapsed = time.perf_counter() - start
+                        self.stats['searches'] += 1
+                        self.stats['jobs'] += len(results)
+                        self.stats['seconds'] += elapsed
+                        self.stats['max_seconds'] = max(self.stats['max_seconds'], elapsed)
+                    elif results is None:
+                        self.stats['skipped'] += 1
+                except Exception as e:
+                    print(f"  ✗ {self.platform} 搜索出错（{keyword} | {city}）: {str(e)[:100]}")
+                    if allowed:
+                        breakers.release(self.platform)
+                    results = None
+                finally:
+                    # 无论成功与否都放回结果，收集线程按任务数等待
+                    results_queue.put((self.platform, keyword, city, results or []))
+        finally:
+            if search:
+                self.scraper.close_browser()
+            # 线程结束前关闭本线程的浏览器池
+            shutdown_browser_pool()
+
 
 class SpecificRequirementsScraper:
     """特定需求岗位抓取器"""
     
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, platform_workers=PLATFORM_WORKERS):
         """初始化爬虫"""
         self.results = []
         self.seen_urls = set()  # 用于去重
         self.today = datetime.now().strftime('%Y-%m-%d')
-        self.playwright = None
         self.browser = None
+        self.browser_lease = None
         self.page = None
+        self.resource_filter = None
         self.headless = headless
+        self.metrics = get_metrics('specific_requirements')
+        self.company_classifier = get_company_classifier()
+        self.use_platform_workers = platform_workers
+        self.workers = {}
+        self.platform_stats = {}  # 平台 → {'searches', 'skipped', 'jobs', 'seconds', 'max_seconds'}
+        self.stop_event = threading.Event()
+        self.breakers = get_circuit_breakers()
+        self.result_cache = get_result_cache()
         
     def start_browser(self):
         """启动浏览器"""
@@ -46,23 +184,45 @@ class SpecificRequirementsScraper:
         print("特定需求岗位抓取脚本")
         print("="*60)
         print(f"\n开始时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.use_platform_workers:
+            print("✓ 并行模式：各平台worker在独立线程中启动浏览器")
+            return
         print("正在启动浏览器...")
+        self.open_page(['boss', 'guopin', '51job', 'liepin'])
+        print("✓ 浏览器启动成功！")
+    
+    def open_page(self, sites):
+        """从浏览器池租用页面"""
+        # 拦截图片、字体等无需下载的资源（按站点预设）
+        self.resource_filter = create_filter(sites)
         
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        
-        # 创建上下文，设置随机User-Agent
-        context = self.browser.new_context(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080}
+        # 从浏览器池租用页面（设置随机User-Agent）
+        self.browser_lease = get_browser_pool().lease(
+            launch_options={'headless': self.headless, 'args': ['--disable-blink-features=AutomationControlled']},
+            context_options={
+                'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'viewport': {'width': 1920, 'height': 1080},
+            },
+            on_page=self._setup_page,
         )
+        self.browser = self.browser_lease.browser
+        self.page = self.browser_lease.page
+    
+    def _setup_page(self, page):
+        """租用到新页面时调用：接入分阶段统计和资源拦截"""
+        # 页面导航、等待和选择器查询的耗时计入分阶段统计
+        page = instrument_page(page, self.metrics)
+        if self.resource_filter:
+            self.resource_filter.attach(page)
+        return page
+    
+    def renew_page(self):
+        """续租页面：浏览器实例到期回收或无响应时换用新实例的页面"""
+        if self.browser_lease:
+            self.page = self.browser_lease.renew()
+            self.browser = self.browser_lease.browser
         
-        self.page = context.new_page()
-        print("✓ 浏览器启动成功！")
-        
+    @timed('specific_requirements', 'sleep')
     def random_sleep(self, min_time=0.5, max_time=1.5):
         """随机休眠，模拟人类行为（优化速度）"""
         sleep_time = random.uniform(min_time, max_time)
@@ -85,6 +245,7 @@ class SpecificRequirementsScraper:
                 result.append(city)
         return result
     
+    @timed('specific_requirements', 'extract_boss')
     def search_boss_zhipin(self, keyword, city, config):
         """在BOSS直聘搜索岗位"""
         results = []
@@ -112,6 +273,7 @@ class SpecificRequirementsScraper:
                         time.sleep(wait_time)
                     else:
                         print(f"    ⚠ BOSS直聘访问受限，跳过...")
+                        report_failure('访问受限')
                         return results
             
             # 等待页面加载
@@ -212,12 +374,15 @@ class SpecificRequirementsScraper:
                         
             except Exception as e:
                 print(f"    ✗ 解析BOSS直聘页面时出错: {str(e)[:100]}")
+                report_failure('解析页面出错')
                 
         except Exception as e:
             print(f"    ✗ 搜索BOSS直聘时出错: {str(e)[:100]}")
+            report_failure('搜索出错')
         
         return results
     
+    @timed('specific_requirements', 'extract_guopin')
     def search_guopin(self, keyword, city, config):
         """在国聘网搜索岗位"""
         results = []
@@ -245,6 +410,7 @@ class SpecificRequirementsScraper:
                         time.sleep(wait_time)
                     else:
                         print(f"    ⚠ 国聘网访问受限，跳过...")
+                        report_failure('访问受限')
                         return results
             
             try:
@@ -345,12 +511,15 @@ class SpecificRequirementsScraper:
                         
             except Exception as e:
                 print(f"    ✗ 解析国聘网页面时出错: {str(e)[:100]}")
+                report_failure('解析页面出错')
                 
         except Exception as e:
             print(f"    ✗ 搜索国聘网时出错: {str(e)[:100]}")
+            report_failure('搜索出错')
         
         return results
     
+    @timed('specific_requirements', 'extract_51job')
     def search_51job(self, keyword, city, config):
         """在前程无忧搜索岗位"""
         results = []
@@ -388,6 +557,7 @@ class SpecificRequirementsScraper:
                         time.sleep(wait_time)
                     else:
                         print(f"    ⚠ 前程无忧访问受限，跳过...")
+                        report_failure('访问受限')
                         return results
             
             try:
@@ -572,12 +742,15 @@ class SpecificRequirementsScraper:
                         
             except Exception as e:
                 print(f"    ✗ 解析前程无忧页面时出错: {str(e)[:100]}")
+                report_failure('解析页面出错')
                 
         except Exception as e:
             print(f"    ✗ 搜索前程无忧时出错: {str(e)[:100]}")
+            report_failure('搜索出错')
         
         return results
     
+    @timed('specific_requirements', 'extract_liepin')
     def search_liepin(self, keyword, city, config):
         """在猎聘搜索岗位"""
         results = []
@@ -604,6 +777,7 @@ class SpecificRequirementsScraper:
                         time.sleep(wait_time)
                     else:
                         print(f"    ⚠ 猎聘访问受限，跳过...")
+                        report_failure('访问受限')
                         return results
             
             try:
@@ -690,9 +864,11 @@ class SpecificRequirementsScraper:
                         
             except Exception as e:
                 print(f"    ✗ 解析猎聘页面时出错: {str(e)[:100]}")
+                report_failure('解析页面出错')
                 
         except Exception as e:
             print(f"    ✗ 搜索猎聘时出错: {str(e)[:100]}")
+            report_failure('搜索出错')
         
         return results
     
@@ -701,32 +877,13 @@ class SpecificRequirementsScraper:
         if not company_name or company_name == '未知':
             return '未知'
         
-        company_name_lower = company_name.lower()
+        # 一次扫描公司名称：按四大、八大、大厂、央国企（排除外企）的优先级判断
+        company_type = self.company_classifier.company_type(company_name)
+        if company_type:
+            return company_type
         
         # 排除明显不是央国企的公司（外企关键词）
-        foreign_keywords = ['投资有限公司', '（中国）', '(中国)', '外资', '外企', '丹尼斯克', '联合利华', '宝洁']
-        is_foreign = any(kw in company_name for kw in foreign_keywords)
-        
-        # 检测四大（优先级高）
-        for keyword in FOUR_BIG:
-            if keyword.lower() in company_name_lower:
-                return '四大'
-        
-        # 检测八大
-        for keyword in EIGHT_BIG:
-            if keyword in company_name:
-                return '八大'
-        
-        # 检测大厂
-        for company in BIG_COMPANIES:
-            if company in company_name:
-                return '大厂'
-        
-        # 检测央国企（排除外企）
-        if not is_foreign:
-            for keyword in STATE_OWNED_KEYWORDS:
-                if keyword in company_name:
-                    return '央国企'
+        is_foreign = self.company_classifier.has(company_name, '外企')
         
         # 根据配置判断
         company_type_req = config.get('company_type', '')
@@ -743,6 +900,7 @@ class SpecificRequirementsScraper:
         
         return '未知'
     
+    @timed('specific_requirements', 'filter')
     def filter_results(self, results, config):
         """根据配置过滤结果"""
         filtered = []
@@ -754,17 +912,17 @@ class SpecificRequirementsScraper:
             
             # 央国企过滤
             if company_type_req and ('央国企' in company_type_req or '国央企' in company_type_req):
-                if not any(keyword in company_name for keyword in STATE_OWNED_KEYWORDS):
+                if not self.company_classifier.has(company_name, '央国企'):
                     continue
             
             # 大厂过滤
             if notes and ('大厂' in notes or '大公司' in notes):
-                if not any(company in company_name for company in BIG_COMPANIES):
+                if not self.company_classifier.has(company_name, '大厂'):
                     continue
             
             # 四大过滤
             if notes and '四大' in notes:
-                if not any(keyword in company_name for keyword in FOUR_BIG):
+                if not self.company_classifier.has(company_name, '四大'):
                     continue
             
             filtered.append(result)
@@ -781,28 +939,11 @@ class SpecificRequirementsScraper:
         cities = self.expand_city_list(config['locations'])
         keywords = config['keywords']
         
-        config_results = []
-        
-        # 遍历关键词和城市 - 增加搜索范围以获取更多岗位
-        for keyword in keywords[:3]:  # 搜索前3个关键词
-            for city in cities[:3]:  # 搜索前3个城市
-                # 只使用51job，速度最快
-                job51_results = self.search_51job(keyword, city, config)
-                config_results.extend(job51_results)
-                
-                # 如果已经收集到足够的岗位，立即停止搜索
-                if len(config_results) >= max_jobs:
-                    break
-            
-            if len(config_results) >= max_jobs:
-                break
-                
-                # 如果已经收集到足够的岗位，停止搜索
-                if len(config_results) >= max_jobs:
-                    break
-            
-            if len(config_results) >= max_jobs:
-                break
+        # 搜索前3个关键词、前3个城市
+        if self.use_platform_workers:
+            config_results = self.search_with_workers(keywords[:3], cities[:3], config, max_jobs)
+        else:
+            config_results = self.search_sequential(keywords[:3], cities[:3], config, max_jobs)
         
         # 应用过滤
         config_results = self.filter_results(config_results, config)
@@ -813,6 +954,132 @@ class SpecificRequirementsScraper:
         print(f"  ✓ 本配置共抓取 {len(config_results)} 个职位")
         return config_results
     
+    def _record_search(self, platform, seconds, jobs):
+        """记录一次搜索的耗时和岗位数（顺序模式）"""
+        stats = self.platform_stats.setdefault(platform, _new_platform_stats())
+        stats['searches'] += 1
+        stats['jobs'] += jobs
+        stats['seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+    
+    def search_sequential(self, keywords, cities, config, max_jobs):
+        """逐个关键词和城市搜索，收集到 max_jobs 个岗位后停止"""
+        config_results = []
+        
+        # 遍历关键词和城市
+        for keyword in keywords:
+            for city in cities:
+                self.renew_page()
+                
+                # 只使用51job，速度最快（结果缓存命中时不访问站点，断路器打开时跳过）
+                job51_results = self.cached_results('51job', keyword, city, config)
+                if job51_results is None:
+                    start = time.perf_counter()
+                    job51_results = self.breakers.call('51job', self.fetch_and_cache, '51job', self.search_51job,
+                                                       keyword, city, config, page=self.page)
+                    if job51_results is None:
+                        continue
+                    self._record_search('51job', time.perf_counter() - start, len(job51_results))
+                config_results.extend(self._dedupe(job51_results))
+                
+                # 如果已经收集到足够的岗位，立即停止搜索
+                if len(config_results) >= max_jobs:
+                    return config_results
+        return config_results
+    
+    def _dedupe(self, results):
+        """按本次运行已见过的链接去重"""
+        fresh = []
+        for result in results:
+            link = result.get('投递链接')
+            if link in self.seen_urls:
+                continue
+            self.seen_urls.add(link)
+            fresh.append(result)
+        return fresh
+    
+    @staticmethod
+    def _cache_variant(config):
+        """公司类型和招聘对象依赖配置的类型要求和年级，按其区分缓存"""
+        return f"{config.get('company_type', '')}|{config.get('grad_years', '')}"
+    
+    def cached_results(self, platform, keyword, city, config):
+        """结果缓存命中时返回去重前的结果（由调用方 _dedupe），未命中返回 None"""
+        results = self.result_cache.get(platform, keyword, city, variant=self._cache_variant(config))
+        if results is None:
+            return None
+        print(f"    ✓ 缓存命中 {platform}: {keyword} | {city}（{len(results)} 个职位）")
+        return results
+    
+    def fetch_and_cache(self, platform, search, keyword, city, config):
+        """访问站点搜索，缓存并返回去重前的完整结果（由调用方 _dedupe）"""
+        seen_urls, self.seen_urls = self.seen_urls, set()
+        try:
+            results = search(keyword, city, config)
+        finally:
+            self.seen_urls = seen_urls
+        self.result_cache.put(platform, keyword, city, results, variant=self._cache_variant(config))
+        return results
+    
+    def search_with_workers(self, keywords, cities, config, max_jobs):
+        """各平台worker并行搜索，收集到 max_jobs 个岗位后取消本配置剩余的搜索"""
+        cancel = threading.Event()
+        results_queue = queue.Queue()
+        pending = {}  # 平台 → 未返回的搜索数
+        for keyword in keywords:
+            for city in cities:
+                for platform in WORKER_PLATFORMS:
+                    if platform not in self.workers:
+                        self.workers[platform] = PlatformWorker(
+                            platform, self.headless,
+                            self.platform_stats.setdefault(platform, _new_platform_stats()), self.stop_event)
+                    self.workers[platform].submit(keyword, city, config, cancel, results_queue)
+                    pending[platform] = pending.get(platform, 0) + 1
+        
+        config_results = []
+        while sum(pending.values()):
+            try:
+                platform, keyword, city, results = results_queue.get(timeout=WORKER_POLL_SECONDS)
+            except queue.Empty:
+                # worker线程意外退出时不再等待其剩余的任务
+                for platform, count in pending.items():
+                    if count and not self.workers[platform].thread.is_alive():
+                        print(f"  ✗ {platform} worker已退出，放弃其剩余的 {count} 个搜索")
+                        pending[platform] = 0
+                continue
+            pending[platform] -= 1
+            # 在收集线程中去重：取消后才返回的结果不读取，其链接仍可被后续配置收集
+            config_results.extend(self._dedupe(results))
+            if len(config_results) >= max_jobs:
+                # 不等待其他平台正在进行的搜索（其结果不再计入本配置）
+                cancel.set()
+                print(f"  ⏹ 已收集 {len(config_results)} 个职位，取消本配置剩余的 {sum(pending.values())} 个搜索")
+                break
+        return config_results
+    
+    def stop_workers(self, wait=True):
+        """停止所有平台worker（排队中的任务不再执行）"""
+        self.stop_event.set()
+        for worker in self.workers.values():
+            worker.stop(wait=False)
+        if wait:
+            for worker in self.workers.values():
+                worker.thread.join()
+            self.workers = {}
+    
+    def print_platform_stats(self):
+        """各平台的搜索次数、岗位数和搜索耗时"""
+        if not self.platform_stats:
+            return
+        print("\n" + "="*60)
+        print(f"⏱ 各平台搜索（{'并行worker' if self.use_platform_workers else '顺序'}）")
+        print("="*60)
+        print(f"  {'平台':<8} {'搜索':>6} {'跳过':>6} {'岗位':>6} {'平均耗时':>10} {'最长耗时':>10}")
+        for platform, stats in self.platform_stats.items():
+            avg = stats['seconds'] / stats['searches'] if stats['searches'] else 0
+            print(f"  {platform:<8} {stats['searches']:>6} {stats['skipped']:>6} {stats['jobs']:>6} "
+                  f"{avg:>9.1f}s {stats['max_seconds']:>9.1f}s")
+    
     def generate_sample_data(self, config, count=3, start_index=0):
         """生成示例数据（当无法抓取真实数据时）"""
         sample_companies = {
@@ -887,13 +1154,19 @@ class SpecificRequirementsScraper:
         return results
     
     def close_browser(self):
-        """关闭浏览器"""
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        """归还页面（浏览器实例在进程退出时关闭）"""
+        # 结束各平台worker（线程内关闭各自的浏览器）
+        self.stop_workers()
+        if self.browser_lease:
+            if self.resource_filter:
+                print(f"\n资源拦截: {self.resource_filter.format_stats()}")
+            self.browser_lease.release()
+            self.browser_lease = None
+            self.browser = None
+            print(f"浏览器池: {get_browser_pool().format_stats()}")
         print("\n✓ 浏览器已关闭")
     
+    @timed('specific_requirements', 'excel_export')
     def save_to_excel(self, df, filename="特定需求岗位.xlsx"):
         """保存结果到Excel"""
         if df.empty:
@@ -972,6 +1245,8 @@ class SpecificRequirementsScraper:
     
     def run(self, max_jobs_per_config=5, use_sample_data=False, target_count=20):
         """运行主程序"""
+        self.metrics.start_run()
+        self.stop_event.clear()
         try:
             if not use_sample_data:
                 self.start_browser()
@@ -1002,14 +1277,20 @@ class SpecificRequirementsScraper:
                     if results:
                         all_results.extend(results)
                         
-                        # 如果已经收集到足够的岗位，停止
+                        # 如果已经收集到足够的岗位，停止（各平台worker不再开始新的搜索）
                         if len(all_results) >= target_count:
+                            self.stop_workers(wait=False)
+                            print(f"  ⏹ 已达到目标 {target_count} 个岗位，停止所有平台的搜索")
                             break
                             
                 except Exception as e:
                     print(f"  ✗ 处理配置时出错: {str(e)[:100]}")
                     continue
             
+            self.print_platform_stats()
+            print(f"\n断路器:\n{self.breakers.format_stats()}")
+            print(f"\n{self.result_cache.format_stats()}")
+            
             # 合并所有结果
             if all_results:
                 final_df = pd.DataFrame(all_results)
@@ -1062,6 +1343,8 @@ class SpecificRequirementsScraper:
         finally:
             if not use_sample_data:
                 self.close_browser()
+            # 各阶段耗时写入指标表 / Prometheus 文本文件
+            self.metrics.finish_run()
 
 
 def main():
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抓取流程分阶段耗时统计
+记录每个阶段（页面导航、等待、选择器查询、字段提取、数据库写入、Excel导出、钉钉推送……）的调用次数和耗时，
+每次运行结束后写入 SQLite 指标表和/或 Prometheus 文本文件，用于定位瓶颈和跟踪性能回退。
+
+    metrics = get_metrics('scheduler')
+    metrics.start_run()
+    with metrics.stage('db_write'):
+        ...
+    @timed('aceoffer', 'extract')          # 同步、异步函数均可
+    async def extract_job_info_from_card(...): ...
+    page = instrument_page(page, metrics)  # 自动统计 goto / wait_* / 选择器查询
+    metrics.finish_run()                   # 打印汇总并写入
+
+阶段可以嵌套，记录的是"自身耗时"（扣除内层阶段），各阶段之和不超过实际耗时；
+并发worker的阶段耗时会累加，可能超过运行的墙钟时间。
+
+使用方法：
+    python stage_metrics.py                         # 最近10次运行的各阶段耗时
+    python stage_metrics.py --scraper aceoffer --runs 20
+"""
+
+import os
+import time
+import sqlite3
+import argparse
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# ==================== 配置区域 ====================
+
+# 是否启用耗时统计
+METRICS_ENABLED = True
+
+# 输出方式：'sqlite' / 'prometheus' / 'both'
+METRICS_OUTPUT = 'both'
+
+# 指标数据库
+METRICS_DB_FILE = "metrics.db"
+
+# Prometheus 文本文件目录（可配置 node_exporter 的 textfile collector 读取）
+METRICS_PROM_DIR = "metrics"
+
+# instrument_page 统计的页面方法 → 阶段名
+PAGE_STAGES = {
+    'goto': 'goto',
+    'reload': 'goto',
+    'go_back': 'goto',
+    'wait_for_load_state': 'wait',
+    'wait_for_selector': 'wait',
+    'wait_for_function': 'wait',
+    'wait_for_timeout': 'wait',
+    'query_selector': 'selector',
+    'query_selector_all': 'selector',
+    'inner_text': 'extract',
+    'content': 'extract',
+    'evaluate': 'evaluate',
+}
+
+# 当前正在执行的阶段栈（按线程/协程任务隔离）
+_stage_stack: contextvars.ContextVar = contextvars.ContextVar('stage_stack', default=())
+
+
+class _Frame:
+    __slots__ = ('name', 'child_seconds')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.child_seconds = 0.0
+
+
+class StageMetrics:
+    """单个抓取脚本的分阶段耗时（线程安全）"""
+
+    def __init__(self, scraper: str):
+        """初始化
+
+        Args:
+            scraper: 抓取脚本名称（指标标签）
+        """
+        self.scraper = scraper
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict] = {}
+        self.started_at: Optional[str] = None
+        self._start_time = time.perf_counter()
+
+    def start_run(self):
+        """开始新一次运行（清空上次的统计）"""
+        with self._lock:
+            self.stages = {}
+            self.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self._start_time = time.perf_counter()
+
+    def record(self, name: str, seconds: float, count: int = 1):
+        """记录一次阶段耗时"""
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            s = self.stages.get(name)
+            if s is None:
+                s = self.stages[name] = {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0}
+            s['count'] += count
+            s['seconds'] += seconds
+            s['max_seconds'] = max(s['max_seconds'], seconds)
+
+    def merge(self, rows: List[Dict]):
+        """合并其他进程的统计（summary 的结果）"""
+        with self._lock:
+            for r in rows:
+                s = self.stages.get(r['stage'])
+                if s is None:
+                    s = self.stages[r['stage']] = {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0}
+                s['count'] += r['count']
+                s['seconds'] += r['seconds']
+                s['max_seconds'] = max(s['max_seconds'], r['max_seconds'])
+
+    def _enter(self, name: str):
+        frame = _Frame(name)
+        token = _stage_stack.set(_stage_stack.get() + (frame,))
+        return frame, token, time.perf_counter()
+
+    def _exit(self, frame: _Frame, token, start: float):
+        elapsed = time.perf_counter() - start
+        _stage_stack.reset(token)
+        stack = _stage_stack.get()
+        if stack:
+            stack[-1].child_seconds += elapsed
+        self.record(frame.name, max(0.0, elapsed - frame.child_seconds))
+
+    @contextmanager
+    def stage(self, name: str):
+        """统计一个代码块的耗时"""
+        if not METRICS_ENABLED:
+            yield
+            return
+        frame, token, start = self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit(frame, token, start)
+
+    # ---------- 汇总与输出 ----------
+
+    def summary(self) -> List[Dict]:
+        """各阶段统计（按耗时倒序）"""
+        with self._lock:
+            rows = [dict(stage=name, **s) for name, s in self.stages.items()]
+        return sorted(rows, key=lambda r: -r['seconds'])
+
+    def format_summary(self) -> str:
+        """格式化汇总（占比按运行墙钟时间计算）"""
+        rows = self.summary()
+        if not rows:
+            return "阶段耗时: 无数据"
+        wall = time.perf_counter() - self._start_time
+        lines = [f"阶段耗时（{self.scraper}，运行 {wall:.1f} 秒）:",
+                 f"  {'阶段':<16} {'次数':>8} {'总耗时(秒)':>12} {'平均(毫秒)':>12} {'最长(秒)':>10} {'占比':>6}"]
+        for r in rows:
+            lines.append(f"  {r['stage']:<16} {r['count']:>8} {r['seconds']:>12.2f} "
+                         f"{r['seconds'] / r['count'] * 1000:>12.1f} {r['max_seconds']:>10.2f} "
+                         f"{r['seconds'] / wall if wall else 0:>6.0%}")
+        return "\n".join(lines)
+
+    def write_sqlite(self, db_file: str = METRICS_DB_FILE):
+        """写入指标表（每次运行每个阶段一行）"""
+        finished_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        wall = time.perf_counter() - self._start_time
+        conn = sqlite3.connect(db_file, timeout=30)
+        try:
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS stage_metrics (
+                        scraper TEXT NOT NULL,
+                        started_at TIMESTAMP NOT NULL,
+                        finished_at TIMESTAMP,
+                        wall_seconds REAL,
+                        stage TEXT NOT NULL,
+                        count INTEGER,
+                        seconds REAL,
+                        max_seconds REAL,
+                        PRIMARY KEY (scraper, started_at, stage)
+                    )
+                ''')
+                conn.executemany('''
+                    INSERT OR REPLACE INTO stage_metrics
+                    (scraper, started_at, finished_at, wall_seconds, stage, count, seconds, max_seconds)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(self.scraper, self.started_at or finished_at, finished_at, wall, r['stage'], r['count'],
+                       r['seconds'], r['max_seconds']) for r in self.summary()])
+        finally:
+            conn.close()
+
+    def write_prometheus(self, prom_dir: str = METRICS_PROM_DIR) -> str:
+        """写入 Prometheus 文本文件（先写临时文件再替换），返回文件路径"""
+        os.makedirs(prom_dir, exist_ok=True)
+        path = os.path.join(prom_dir, f"scraper_{self.scraper}.prom")
+        label = f'scraper="{self.scraper}"'
+        lines = [
+            '# HELP scraper_stage_seconds Time spent in each scraping stage during the last run.',
+            '# TYPE scraper_stage_seconds gauge',
+        ]
+        rows = self.summary()
+        lines += [f'scraper_stage_seconds{{{label},stage="{r["stage"]}"}} {r["seconds"]:.6f}' for r in rows]
+        lines += ['# HELP scraper_stage_calls Number of calls of each scraping stage during the last run.',
+                  '# TYPE scraper_stage_calls gauge']
+        lines += [f'scraper_stage_calls{{{label},stage="{r["stage"]}"}} {r["count"]}' for r in rows]
+        lines += ['# HELP scraper_stage_max_seconds Longest single call of each stage during the last run.',
+                  '# TYPE scraper_stage_max_seconds gauge']
+        lines += [f'scraper_stage_max_seconds{{{label},stage="{r["stage"]}"}} {r["max_seconds"]:.6f}' for r in rows]
+        lines += ['# HELP scraper_run_seconds Wall time of the last run.',
+                  '# TYPE scraper_run_seconds gauge',
+                  f'scraper_run_seconds{{{label}}} {time.perf_counter() - self._start_time:.6f}',
+                  '# HELP scraper_run_finished_timestamp Unix time the last run finished.',
+                  '# TYPE scraper_run_finished_timestamp gauge',
+                  f'scraper_run_finished_timestamp{{{label}}} {time.time():.0f}']
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_file, path)
+        return path
+
+    def finish_run(self, verbose: bool = True):
+        """结束运行：打印汇总并按 METRICS_OUTPUT 写入"""
+        if not METRICS_ENABLED or not self.stages:
+            return
+        if verbose:
+            print(self.format_summary())
+        try:
+            if METRICS_OUTPUT in ('sqlite', 'both'):
+                self.write_sqlite()
+            if METRICS_OUTPUT in ('prometheus', 'both'):
+                self.write_prometheus()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠ 写入耗时指标失败: {str(e)[:100]}")
+
+
+_registry: Dict[str, StageMetrics] = {}
+_registry_lock = threading.Lock()
+
+
+def get_metrics(scraper: str) -> StageMetrics:
+    """进程内共享的统计对象（同名脚本共用）"""
+    with _registry_lock:
+        if scraper not in _registry:
+            _registry[scraper] = StageMetrics(scraper)
+        return _registry[scraper]
+
+
+def timed(scraper: str, stage: str):
+    """装饰器：统计函数耗时（支持同步和异步函数）"""
+    def decorator(func):
+        import asyncio
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with get_metrics(scraper).stage(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_metrics(scraper).stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class InstrumentedPage:
+    """页面代理：按 PAGE_STAGES 统计页面方法的耗时，其余属性直接转发"""
+
+    def __init__(self, page, metrics: StageMetrics):
+        self._page = page
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        attr = getattr(self._page, name)
+        stage = PAGE_STAGES.get(name)
+        if stage is None or not callable(attr):
+            return attr
+        import asyncio
+        if asyncio.iscoroutinefunction(attr):
+            async def async_wrapper(*args, **kwargs):
+                with self._metrics.stage(stage):
+                    return await attr(*args, **kwargs)
+            return async_wrapper
+
+        def wrapper(*args, **kwargs):
+            with self._metrics.stage(stage):
+                return attr(*args, **kwargs)
+        return wrapper
+
+
+def instrument_page(page, metrics: StageMetrics):
+    """包装页面对象（METRICS_ENABLED 关闭时原样返回）"""
+    if not METRICS_ENABLED or page is None or isinstance(page, InstrumentedPage):
+        return page
+    return InstrumentedPage(page, metrics)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='查看抓取流程分阶段耗时')
+    parser.add_argument('--scraper', help='只看某个抓取脚本')
+    parser.add_argument('--runs', type=int, default=10, help='最近N次运行')
+    parser.add_argument('--db', default=METRICS_DB_FILE, help='指标数据库')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"暂无耗时记录（{args.db} 不存在）")
+        return
+    conn = sqlite3.connect(args.db)
+    try:
+        where = 'WHERE scraper = ?' if args.scraper else ''
+        params = [args.scraper] if args.scraper else []
+        runs = conn.execute(f'''
+            SELECT DISTINCT scraper, started_at, wall_seconds FROM stage_metrics {where}
+            ORDER BY started_at DESC LIMIT ?
+        ''', params + [args.runs]).fetchall()
+        for scraper, started_at, wall_seconds in runs:
+            print(f"\n[{scraper}] {started_at}（{wall_seconds:.1f} 秒）")
+            rows = conn.execute('''
+                SELECT stage, count, seconds, max_seconds FROM stage_metrics
+                WHERE scraper = ? AND started_at = ? ORDER BY seconds DESC
+            ''', (scraper, started_at)).fetchall()
+            for stage, count, seconds, max_seconds in rows:
+                share = seconds / wall_seconds if wall_seconds else 0
+                print(f"  {stage:<16} {count:>8} 次 {seconds:>10.2f} 秒 {share:>6.0%}  最长 {max_seconds:.2f} 秒")
+        if not runs:
+            print("暂无耗时记录")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
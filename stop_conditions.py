@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻页提前终止判断
+列表按更新时间大致倒序排列时，翻到已经抓过或已过期的岗位后，后面的页面基本都是旧数据，
+继续翻页只是重复提取。本模块按 (站点, 关键词, 城市) 数据流判断何时停止翻页：
+
+    - 已知：岗位链接已在数据库 / 上次的结果文件中
+    - 过期：更新日期早于新鲜度窗口（freshness_days），或早于该数据流的水位线
+      （上次完整运行时见到的最新更新日期；同一天的岗位可能是上次运行后新发布的，不算过期）。
+      水位线只在列表按更新时间排序（sorted_by_date）时使用：按其他方式排序的列表中，
+      早于水位线的岗位也可能从未抓取过（设置了新鲜度窗口也一样，此时只按窗口判断过期）
+    - 连续 KNOWN_RUN_THRESHOLD 条已知或过期 → 立即停止（当前页剩余岗位也不再处理）
+    - 一页中已知或过期的比例不低于 KNOWN_RATIO_THRESHOLD 记为"无新数据页"，
+      连续 EXHAUSTED_PAGES_THRESHOLD 页无新数据 → 停止翻页
+
+水位线保存在 WATERMARK_FILE（JSON），只在数据流完整结束时前进：由本模块判断停止，
+或已翻到最后一页（finish(exhausted=True)）。因数量或页数上限截断的运行不更新水位线，
+否则下次运行会把上限之后未抓取的岗位当作过期。
+每个数据流结束时输出停止原因和避免抓取的页数（最大页数减去实际翻页数）。
+
+使用方法：
+    stop = StopCondition('aceoffer', max_pages=MAX_PAGES, freshness_days=2)
+    for 每一页:
+        for 每条岗位:
+            if stop.observe(update_time, known=url in known_urls):
+                break                      # 连续已知/过期，停止
+        if stop.stopped or stop.end_page():
+            break
+    stop.finish(exhausted=已翻到最后一页)
+
+    python stop_conditions.py            # 查看各数据流的水位线
+    python stop_conditions.py --clear    # 清空水位线
+"""
+
+import os
+import re
+import json
+import argparse
+import threading
+from datetime import datetime, date, timedelta
+from typing import Dict, Optional
+
+# ==================== 配置区域 ====================
+
+# 是否启用提前终止
+STOP_ENABLED = True
+
+# 连续多少条已知或过期的岗位后停止
+KNOWN_RUN_THRESHOLD = 15
+
+# 一页中已知或过期岗位的比例不低于此值时，记为无新数据页
+KNOWN_RATIO_THRESHOLD = 0.9
+
+# 连续多少页无新数据后停止翻页
+EXHAUSTED_PAGES_THRESHOLD = 2
+
+# 水位线文件
+WATERMARK_FILE = "stop_watermarks.json"
+
+# 日期格式：年月日（2026-10-18、2026/10/18、2026年10月18日），
+# 或只有月日（10-18、10/18、10月18日，按今年处理，晚于今天的按去年处理）
+FULL_DATE_PATTERN = re.compile(r'(\d{4})[-/.年](\d{1,2})[-/.月](\d{1,2})')
+MONTH_DAY_PATTERN = re.compile(r'(\d{1,2})[-/月](\d{1,2})')
+
+STOP_REASONS = {
+    'known_run': '连续已知/过期',
+    'exhausted_pages': '连续无新数据页',
+}
+
+
+def parse_date(text: str) -> Optional[date]:
+    """解析更新日期，无法解析时返回 None"""
+    text = (text or '').strip()
+    today = datetime.now().date()
+    try:
+        match = FULL_DATE_PATTERN.search(text)
+        if match:
+            return date(*map(int, match.groups()))
+        match = MONTH_DAY_PATTERN.search(text)
+        if match:
+            parsed = date(today.year, *map(int, match.groups()))
+            return parsed.replace(year=today.year - 1) if parsed > today else parsed
+    except ValueError:
+        pass
+    return None
+
+
+def _key(site: str, keyword: str, city: str) -> str:
+    return f"{site}|{keyword}|{city}"
+
+
+class WatermarkStore:
+    """各数据流的更新日期水位线（线程安全，同一进程共用一个实例）"""
+
+    def __init__(self, watermark_file: str = WATERMARK_FILE):
+        self.watermark_file = watermark_file
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """从磁盘加载（文件损坏时忽略）"""
+        if not os.path.exists(self.watermark_file):
+            return
+        try:
+            with open(self.watermark_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ 水位线文件读取失败，将重新记录: {str(e)[:50]}")
+            self.entries = {}
+
+    def save(self):
+        """写入磁盘（先写临时文件再替换）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_file = self.watermark_file + '.tmp'
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_file, self.watermark_file)
+                self._dirty = False
+            except OSError as e:
+                print(f"⚠ 水位线保存失败: {str(e)[:50]}")
+
+    def clear(self):
+        """清空水位线"""
+        with self._lock:
+            self.entries = {}
+            self._dirty = True
+        self.save()
+
+    def get(self, site: str, keyword: str = '', city: str = '') -> Optional[date]:
+        """数据流的水位线（上次见到的最新更新日期）"""
+        with self._lock:
+            entry = self.entries.get(_key(site, keyword, city))
+        return date.fromisoformat(entry['watermark']) if entry and entry.get('watermark') else None
+
+    def update(self, site: str, keyword: str, city: str, newest: Optional[date], run: Dict):
+        """记录一次运行：水位线只前进不后退"""
+        with self._lock:
+            entry = self.entries.setdefault(_key(site, keyword, city), {'watermark': None})
+            if newest and (not entry['watermark'] or newest.isoformat() > entry['watermark']):
+                entry['watermark'] = newest.isoformat()
+            entry['last_run'] = run
+            self._dirty = True
+
+    def format_entries(self) -> str:
+        """水位线列表"""
+        with self._lock:
+            if not self.entries:
+                return "没有水位线记录"
+            lines = [f"{'站点|关键词|城市':<40} {'水位线':<12} {'上次翻页':>8} {'避免翻页':>8} {'停止原因':<12}"]
+            for key, e in sorted(self.entries.items()):
+                run = e.get('last_run') or {}
+                avoided = run.get('pages_avoided')
+                lines.append(f"{key:<40} {e.get('watermark') or '-':<12} {run.get('pages', 0):>8} "
+                             f"{'-' if avoided is None else avoided:>8} "
+                             f"{STOP_REASONS.get(run.get('reason'), '未提前停止'):<12}")
+            return "\n".join(lines)
+
+
+_store: Optional[WatermarkStore] = None
+_store_lock = threading.Lock()
+
+
+def get_watermark_store() -> WatermarkStore:
+    """进程内共享的水位线"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = WatermarkStore()
+        return _store
+
+
+class StopCondition:
+    """单个数据流的提前终止判断"""
+
+    def __init__(self, site: str, keyword: str = '', city: str = '', max_pages: Optional[int] = None,
+                 freshness_days: Optional[int] = None, known_run: int = KNOWN_RUN_THRESHOLD,
+                 known_ratio: float = KNOWN_RATIO_THRESHOLD,
+                 exhausted_pages: int = EXHAUSTED_PAGES_THRESHOLD,
+                 sorted_by_date: bool = False, store: Optional[WatermarkStore] = None):
+        """
+        Args:
+            site / keyword / city: 数据流
+            max_pages: 最大翻页数（用于计算避免的页数，None 表示不限）
+            freshness_days: 只要最近N天更新的岗位（None 表示不按天数判断过期）
+            known_run: 连续多少条已知或过期后停止
+            known_ratio: 已知或过期比例不低于此值的页面记为无新数据页
+            exhausted_pages: 连续多少页无新数据后停止
+            sorted_by_date: 列表是否按更新时间倒序排列（否则不使用水位线，只按 freshness_days 判断过期）
+        """
+        self.site, self.keyword, self.city = site, keyword, city
+        self.max_pages = max_pages
+        self.known_run = known_run
+        self.known_ratio = known_ratio
+        self.exhausted_pages = exhausted_pages
+        self.store = store or get_watermark_store()
+        self.use_watermark = sorted_by_date
+        self.watermark = self.store.get(site, keyword, city) if self.use_watermark else None
+        self.cutoff = (datetime.now().date() - timedelta(days=freshness_days - 1)) if freshness_days else None
+
+        self.pages = 0
+        self.stopped = False
+        self.reason: Optional[str] = None
+        self.newest: Optional[date] = None
+        self.stats = {'rows': 0, 'known': 0, 'stale': 0}
+        self._run = 0
+        self._page_rows = 0
+        self._page_old = 0
+        self._exhausted = 0
+
+    def is_stale(self, update_time: str) -> bool:
+        """更新日期早于新鲜度窗口或水位线（无日期不算过期）"""
+        parsed = parse_date(update_time)
+        if parsed is None:
+            return False
+        return bool((self.cutoff and parsed < self.cutoff) or (self.watermark and parsed < self.watermark))
+
+    def observe(self, update_time: str = '', known: bool = False, stale: Optional[bool] = None) -> bool:
+        """记录一条岗位，返回是否应立即停止
+
+        Args:
+            update_time: 更新日期文本
+            known: 是否已在数据库 / 上次结果中
+            stale: 是否过期（None 时按 update_time 判断）
+        """
+        parsed = parse_date(update_time)
+        if parsed and (self.newest is None or parsed > self.newest):
+            self.newest = parsed
+        if stale is None:
+            stale = self.is_stale(update_time)
+
+        self.stats['rows'] += 1
+        self._page_rows += 1
+        if known:
+            self.stats['known'] += 1
+        elif stale:
+            self.stats['stale'] += 1
+        if known or stale:
+            self._page_old += 1
+            self._run += 1
+        else:
+            self._run = 0
+
+        if STOP_ENABLED and self.known_run and self._run >= self.known_run and not self.stopped:
+            self.stopped = True
+            self.reason = 'known_run'
+            print(f"  ⏹ 连续 {self._run} 条岗位已抓取过或已过期，停止翻页")
+        return self.stopped
+
+    def end_page(self) -> bool:
+        """当前页处理完毕，返回是否停止翻页"""
+        self.pages += 1
+        rows, old = self._page_rows, self._page_old
+        self._page_rows = self._page_old = 0
+        if self.stopped:
+            return True
+        if rows == 0 or old / rows >= self.known_ratio:
+            self._exhausted += 1
+            print(f"  当前页没有新岗位（已知/过期 {old}/{rows}，连续 {self._exhausted} 页）")
+        else:
+            self._exhausted = 0
+        if STOP_ENABLED and self.exhausted_pages and self._exhausted >= self.exhausted_pages:
+            self.stopped = True
+            self.reason = 'exhausted_pages'
+            print(f"  ⏹ 连续 {self._exhausted} 页没有新岗位，停止翻页")
+        return self.stopped
+
+    @property
+    def pages_avoided(self) -> Optional[int]:
+        """提前停止避免抓取的页数（未设置最大页数时为 None）"""
+        if not self.stopped:
+            return 0
+        if not self.max_pages:
+            return None
+        return max(self.max_pages - self.pages, 0)
+
+    def finish(self, exhausted: bool = False, save: bool = True) -> Dict:
+        """数据流结束：记录本次统计，完整结束时更新水位线
+
+        Args:
+            exhausted: 是否已翻到最后一页（由本模块判断停止时也视为完整结束）
+        """
+        complete = self.stopped or exhausted
+        run = {
+            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'pages': self.pages,
+            'pages_avoided': self.pages_avoided,
+            'reason': self.reason,
+            'complete': complete,
+            **self.stats,
+        }
+        self.store.update(self.site, self.keyword, self.city, self.newest if complete else None, run)
+        if save:
+            self.store.save()
+        return run
+
+    def format_stats(self) -> str:
+        """统计摘要"""
+        s = self.stats
+        text = f"翻页 {self.pages} 页，岗位 {s['rows']} 条（已知 {s['known']}，过期 {s['stale']}）"
+        if self.stopped:
+            avoided = self.pages_avoided
+            text += (f"，提前停止（{STOP_REASONS[self.reason]}），"
+                     f"避免翻页 {'未知' if avoided is None else avoided} 页")
+        if self.watermark:
+            text += f"，水位线 {self.watermark.isoformat()}"
+        return text
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='翻页提前终止水位线')
+    parser.add_argument('--clear', action='store_true', help='清空水位线')
+    args = parser.parse_args()
+
+    store = WatermarkStore()
+    if args.clear:
+        store.clear()
+        print("✓ 水位线已清空")
+        return
+    print(store.format_entries())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""circuit_breaker 失败记录测试"""
+
+import circuit_breaker
+from circuit_breaker import CircuitBreakers, report_failure
+
+
+def _swallowing_search(keyword):
+    """模拟捕获错误后返回空结果的搜索函数"""
+    report_failure('访问受限，跳过')
+    return []
+
+
+def test_reported_failures_open_the_breaker(tmp_path):
+    breakers = CircuitBreakers(str(tmp_path / 'circuit_breakers.json'))
+    for _ in range(circuit_breaker.FAILURE_THRESHOLD):
+        assert breakers.call('boss', _swallowing_search, '产品经理') == []
+
+    breaker = breakers.breakers['boss']
+    assert breaker.stats['failures'] == circuit_breaker.FAILURE_THRESHOLD
+    assert breaker.last_reason == 'failed'
+    assert breaker.state == 'open'
+    assert breakers.call('boss', _swallowing_search, '产品经理') is None
+
+
+def test_successful_search_is_not_a_failure(tmp_path):
+    breakers = CircuitBreakers(str(tmp_path / 'circuit_breakers.json'))
+    assert breakers.call('51job', lambda keyword: [keyword], '运营') == ['运营']
+    assert breakers.breakers['51job'].stats['failures'] == 0
+
+
+def test_report_failure_outside_breaker_is_ignored(tmp_path):
+    assert _swallowing_search('产品经理') == []
+    breakers = CircuitBreakers(str(tmp_path / 'circuit_breakers.json'))
+    breakers.call('liepin', lambda keyword: [], '运营')
+    assert breakers.breakers['liepin'].stats['failures'] == 0
+
+
+def test_empty_results_do_not_open_the_breaker(tmp_path):
+    breakers = CircuitBreakers(str(tmp_path / 'circuit_breakers.json'))
+    for _ in range(circuit_breaker.FAILURE_THRESHOLD + 2):
+        assert breakers.call('51job', lambda keyword: [], '冷门岗位') == []
+    assert breakers.breakers['51job'].state == 'closed'
+    assert breakers.breakers['51job'].stats['failures'] == 0
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""company_classifier 的自动机和分类器测试"""
+
+import pandas as pd
+
+from company_classifier import AhoCorasick, CompanyClassifier, build_default_groups, get_company_classifier
+
+
+def _automaton(*patterns):
+    return AhoCorasick(patterns)
+
+
+def test_overlapping_patterns_report_all_groups():
+    automaton = _automaton(('建设', 1, False), ('设银行', 2, False), ('建设银行', 4, False), ('工商', 8, False))
+    assert automaton.search('中国建设银行') == 1 | 2 | 4
+    assert automaton.search('中国工商银行') == 8
+    assert automaton.search('招商局') == 0
+
+
+def test_shorter_pattern_found_through_failure_links():
+    automaton = _automaton(('中国银行', 1, False), ('银行', 2, False))
+    assert automaton.search('招商银行') == 2
+    assert automaton.search('中国银行上海分行') == 1 | 2
+
+
+def test_case_sensitive_and_ignore_case_patterns():
+    automaton = _automaton(('PwC', 1, False), ('KPMG', 2, True))
+    assert automaton.search('PwC中国') == 1
+    assert automaton.search('pwc中国') == 0
+    assert automaton.search('kpmg华振') == 2
+
+
+def test_english_keywords_match_on_word_boundaries():
+    automaton = _automaton(('EY', 1, True), ('SAP中国', 2, False))
+    for name in ('Disney', 'Keystone', 'Honeywell霍尼韦尔', 'EY2'):
+        assert automaton.search(name) == 0, name
+    for name in ('安永EY', 'EY Consulting', 'ey', '(EY)'):
+        assert automaton.search(name) == 1, name
+    assert automaton.search('SAP中国研究院') == 2
+    assert automaton.search('XSAP中国') == 0
+
+
+def test_empty_text_and_empty_pattern():
+    automaton = _automaton(('', 1, False), ('a', 2, False))
+    assert automaton.search('') == 0
+    assert automaton.search('a') == 2
+
+
+def test_company_type_priority_and_foreign_exclusion():
+    classifier = CompanyClassifier(build_default_groups(), ignore_case=['四大'])
+    assert classifier.company_type('普华永道中天会计师事务所') == '四大'
+    assert classifier.company_type('立信会计师事务所') == '八大'
+    assert classifier.company_type('Honeywell霍尼韦尔') is None
+    assert classifier.company_type(None) is None
+    assert classifier.company_type('') is None
+
+
+def test_default_classifier_four_big():
+    classifier = get_company_classifier()
+    assert not classifier.has('Honeywell霍尼韦尔', '四大')
+    assert classifier.has('安永华明会计师事务所', '四大')
+
+
+def test_series_helpers_match_single_name_results():
+    classifier = CompanyClassifier(build_default_groups(), ignore_case=['四大'])
+    names = pd.Series(['德勤华永', None, 'Disney', '德勤华永', '天健会计师事务所'], index=[10, 11, 12, 13, 14])
+    mask = classifier.mask(names, '四大')
+    assert list(mask.index) == [10, 11, 12, 13, 14]
+    assert list(mask) == [True, False, False, True, False]
+    types = classifier.classify_series(names, default='其他')
+    assert list(types) == ['四大', '其他', '其他', '四大', '八大']
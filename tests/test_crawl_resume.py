@@ -0,0 +1,53 @@
+"""断点续跑测试：中途退出后续跑，退出前已入库的新岗位仍出现在结果中"""
+
+import pytest
+
+import scheduler
+from scheduler import DBManager, JobScraper
+
+
+class Crash(BaseException):
+    """模拟进程中途退出（run_search_task 不会捕获）"""
+
+
+CONFIGS = [
+    {'keywords': ['产品经理', '运营'], 'locations': ['上海'], 'grad_year': 2026, 'recruit_type': '校招'},
+]
+
+
+def _fake_search(crash_on=None):
+    def search(self, keyword, city, grad_year, recruit_type, config_keywords, cache=None):
+        if keyword == crash_on:
+            raise Crash()
+        jobs = [{'url': f"https://example.com/{keyword}-{city}", 'company_name': '测试公司',
+                 'company_type': '未知', 'work_location': city, 'recruit_type': '校招',
+                 'recruit_target': '2026届', 'job_title': keyword, 'update_time': '今天',
+                 'deadline': '详见链接', 'config_keywords': config_keywords}]
+        new_urls = set(self.db.filter_new_urls([job['url'] for job in jobs]))
+        jobs = [job for job in jobs if job['url'] in new_urls]
+        self.db.save_jobs(jobs)
+        return jobs
+    return search
+
+
+def test_resumed_run_reports_jobs_saved_before_crash(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scheduler, 'SEARCH_CONFIGS', CONFIGS)
+    db = DBManager(str(tmp_path / 'jobs.db'), pooled=False, use_url_index=False)
+
+    monkeypatch.setattr(JobScraper, 'search_yingjiesheng', _fake_search(crash_on='运营'))
+    with pytest.raises(Crash):
+        JobScraper(db).scrape_all_configs(concurrency=1, processes=1)
+    assert db.get_total_count() == 1
+
+    monkeypatch.setattr(JobScraper, 'search_yingjiesheng', _fake_search())
+    scraper = JobScraper(db)
+    new_jobs = scraper.scrape_all_configs(concurrency=1, processes=1)
+
+    urls = {job['url'] for job in new_jobs}
+    assert urls == {'https://example.com/产品经理-上海', 'https://example.com/运营-上海'}
+    assert {job['url'] for job in scraper.config_results[1]} == urls
+    assert scraper.run_stats['completed'] == 1
+    worker = scraper.run_stats['workers'][0]
+    assert 0 < worker['busy_seconds'] <= scraper.run_stats['wall_seconds']
+    assert worker['utilisation'] == worker['busy_seconds'] / scraper.run_stats['wall_seconds']
@@ -0,0 +1,90 @@
+"""dingtalk_queue 发送队列认领测试"""
+
+import collections
+import threading
+import time
+
+import dingtalk_queue
+from dingtalk_queue import DingTalkQueue, STATUS_PENDING, STATUS_SENDING
+
+
+def _insert(queue, status=STATUS_PENDING, next_attempt_at=0.0):
+    with queue._conn:
+        cursor = queue._conn.execute(
+            'INSERT INTO dingtalk_spool (webhook, payload, status, next_attempt_at) VALUES (?, ?, ?, ?)',
+            ('https://example.com/robot', '{}', status, next_attempt_at))
+    return cursor.lastrowid
+
+
+def test_only_one_queue_claims_a_message(tmp_path):
+    spool_file = str(tmp_path / 'dingtalk_spool.db')
+    first, second = DingTalkQueue(spool_file), DingTalkQueue(spool_file)
+    msg_id = _insert(first)
+
+    assert first._claim(msg_id)
+    assert not second._claim(msg_id)
+    assert first.status() == {STATUS_SENDING: 1}
+
+
+def test_expired_claim_can_be_taken_over(tmp_path):
+    queue = DingTalkQueue(str(tmp_path / 'dingtalk_spool.db'))
+    expired = _insert(queue, STATUS_SENDING, time.time() - 1)
+    active = _insert(queue, STATUS_SENDING, time.time() + 60)
+
+    assert queue._claim(expired)
+    assert not queue._claim(active)
+
+
+def test_two_senders_deliver_each_message_once(tmp_path, monkeypatch):
+    sent = collections.Counter()
+    sent_lock = threading.Lock()
+
+    def fake_post(self, webhook, payload):
+        time.sleep(0.005)
+        with sent_lock:
+            sent[payload] += 1
+        return {'ok': True, 'retry': False, 'rate_limited': False, 'error': None}
+
+    monkeypatch.setattr(DingTalkQueue, '_post', fake_post)
+    spool_file = str(tmp_path / 'dingtalk_spool.db')
+    first = DingTalkQueue(spool_file, rate_per_minute=100000)
+    second = DingTalkQueue(spool_file, rate_per_minute=100000)
+    for i in range(20):
+        first.enqueue_payload(f'https://example.com/robot{i % 3}', {'i': i})
+    second.start()
+
+    flushers = [threading.Thread(target=queue.flush, args=(20,)) for queue in (first, second)]
+    for thread in flushers:
+        thread.start()
+    for thread in flushers:
+        thread.join()
+
+    assert len(sent) == 20
+    assert max(sent.values()) == 1
+    assert first.status() == {dingtalk_queue.STATUS_SENT: 20}
+
+
+def test_rate_limit_is_shared_between_queues(tmp_path, monkeypatch):
+    sent = []
+
+    def fake_post(self, webhook, payload):
+        sent.append(payload)
+        return {'ok': True, 'retry': False, 'rate_limited': False, 'error': None}
+
+    monkeypatch.setattr(DingTalkQueue, '_post', fake_post)
+    spool_file = str(tmp_path / 'dingtalk_spool.db')
+    first = DingTalkQueue(spool_file, rate_per_minute=3)
+    second = DingTalkQueue(spool_file, rate_per_minute=3)
+    for i in range(10):
+        first.enqueue_payload('https://example.com/robot', {'i': i})
+    second.start()
+
+    flushers = [threading.Thread(target=queue.flush, args=(1.5,)) for queue in (first, second)]
+    for thread in flushers:
+        thread.start()
+    for thread in flushers:
+        thread.join()
+
+    # 两个队列共用同一机器人的令牌桶，合计不超过每分钟限额
+    assert len(sent) == 3
+    assert first.status()[STATUS_PENDING] == 7
@@ -0,0 +1,42 @@
+"""excel_export 增量导出水位线测试"""
+
+import sqlite3
+
+from scheduler import DBManager, INSERT_JOB_SQL
+from excel_export import export_jobs, get_export_state
+
+
+def _insert(db_file, url, created_at):
+    conn = sqlite3.connect(db_file)
+    with conn:
+        conn.execute(INSERT_JOB_SQL, (url, '测试公司', '未知', '上海', '校招', '2026届',
+                                      '测试岗位', '2025-12-01', '详见链接', created_at))
+    conn.close()
+
+
+def _delta(db_file, tmp_path, name):
+    return export_jobs(db_file, str(tmp_path / name), mode='delta')['rows']
+
+
+def test_delta_keeps_rows_committed_in_watermark_second(tmp_path):
+    db_file = str(tmp_path / 'jobs.db')
+    DBManager(db_file, pooled=False, use_url_index=False)
+    _insert(db_file, 'https://example.com/a', '2025-01-01 10:00:00')
+    _insert(db_file, 'https://example.com/b', '2025-01-01 10:00:05')
+    assert _delta(db_file, tmp_path, 'd1.xlsx') == 2
+
+    # 与水位线同一秒、但在上次导出之后才提交的岗位
+    _insert(db_file, 'https://example.com/c', '2025-01-01 10:00:05')
+    assert _delta(db_file, tmp_path, 'd2.xlsx') == 1
+
+    conn = sqlite3.connect(db_file)
+    watermark, boundary_urls = get_export_state(conn)
+    conn.close()
+    assert watermark == '2025-01-01 10:00:05'
+    assert boundary_urls == {'https://example.com/b', 'https://example.com/c'}
+
+    # 没有新岗位时不重复导出
+    assert _delta(db_file, tmp_path, 'd3.xlsx') == 0
+
+    _insert(db_file, 'https://example.com/d', '2025-01-01 10:00:06')
+    assert _delta(db_file, tmp_path, 'd4.xlsx') == 1
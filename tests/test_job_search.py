@@ -0,0 +1,49 @@
+"""job_search 全文索引同步测试"""
+
+import sqlite3
+
+import pytest
+
+from scheduler import DBManager, INSERT_JOB_SQL
+import job_search
+
+
+@pytest.fixture
+def conn(tmp_path):
+    db_file = str(tmp_path / 'jobs.db')
+    DBManager(db_file, pooled=False, use_url_index=False)
+    conn = sqlite3.connect(db_file)
+    if job_search.get_schema_version(conn) < job_search.SCHEMA_VERSION:
+        pytest.skip('SQLite 未编译 FTS5')
+    with conn:
+        conn.executemany(INSERT_JOB_SQL, [
+            (f"https://example.com/{i}", f"测试公司{i}", '未知', '上海', '校招', '2026届',
+             f"数据分析岗位{i}", '', '', '2025-01-01 00:00:00')
+            for i in range(5)
+        ])
+    yield conn
+    conn.close()
+
+
+def _urls(conn, query):
+    return [job['url'] for job in job_search.search_jobs(conn, query)]
+
+
+def test_delete_and_update_keep_fts_in_sync(conn):
+    with conn:
+        conn.execute("DELETE FROM posted_jobs WHERE url = 'https://example.com/1'")
+        conn.execute("UPDATE posted_jobs SET job_title = '产品经理' WHERE url = 'https://example.com/2'")
+
+    assert _urls(conn, '产品经理') == ['https://example.com/2']
+    assert _urls(conn, '数据分析') == ['https://example.com/4', 'https://example.com/3', 'https://example.com/0']
+    fts_rows = conn.execute('SELECT COUNT(*) FROM posted_jobs_fts').fetchone()[0]
+    docid_rows = conn.execute('SELECT COUNT(*) FROM posted_jobs_fts_docid').fetchone()[0]
+    assert fts_rows == docid_rows == 4
+
+
+def test_vacuum_keeps_fts_rowids(conn):
+    conn.execute('VACUUM')
+    with conn:
+        conn.execute("DELETE FROM posted_jobs WHERE url = 'https://example.com/3'")
+    assert 'https://example.com/3' not in _urls(conn, '数据分析')
+    assert len(_urls(conn, '数据分析')) == 4
@@ -0,0 +1,44 @@
+"""page_readiness 限速器共享测试"""
+
+import threading
+
+import pytest
+
+import page_readiness
+from page_readiness import get_rate_limiter, share_rate_limits
+
+
+@pytest.fixture(autouse=True)
+def reset_limiters():
+    share_rate_limits(1)
+    yield
+    share_rate_limits(1)
+
+
+def test_limiter_is_shared_per_site():
+    limiters = []
+    threads = [threading.Thread(target=lambda: limiters.append(get_rate_limiter('51job', (2.0, 0))))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(limiter is limiters[0] for limiter in limiters)
+    assert get_rate_limiter('boss', (2.0, 0)) is not limiters[0]
+
+
+def test_shared_limiter_spaces_requests_across_callers():
+    limiter = get_rate_limiter('51job', (2.0, 0))
+    delays = [limiter._reserve() for _ in range(3)]
+    assert delays[0] == pytest.approx(0, abs=0.05)
+    assert delays[1] == pytest.approx(2.0, abs=0.05)
+    assert delays[2] == pytest.approx(4.0, abs=0.05)
+
+
+def test_process_share_stretches_interval():
+    share_rate_limits(4)
+    assert get_rate_limiter('51job', (2.0, 0)).min_interval == 8.0
+    site = 'yingjiesheng'
+    expected = page_readiness.RATE_LIMITS.get(site, page_readiness.DEFAULT_RATE_LIMIT)[0] * 4
+    assert get_rate_limiter(site).min_interval == expected
@@ -0,0 +1,25 @@
+"""result_sink 结果文件保留测试"""
+
+import os
+
+from result_sink import ResultSink, prune_sink_files
+
+
+def test_prune_keeps_latest_sink_files(tmp_path):
+    names = [f"job_hunting_sink_20261018_0{hour}0000.db" for hour in range(1, 5)]
+    for name in names:
+        ResultSink(str(tmp_path / name)).close()
+    (tmp_path / (names[0] + '-wal')).write_bytes(b'')
+    (tmp_path / 'jobs.db').write_bytes(b'')
+
+    removed = prune_sink_files(keep=2, directory=str(tmp_path))
+
+    assert sorted(os.path.basename(path) for path in removed) == sorted(
+        [names[0], names[0] + '-wal', names[1]])
+    assert sorted(os.listdir(tmp_path)) == sorted(names[2:] + ['jobs.db'])
+
+
+def test_prune_disabled(tmp_path):
+    ResultSink(str(tmp_path / 'job_hunting_sink_20261018_010000.db')).close()
+    assert prune_sink_files(keep=0, directory=str(tmp_path)) == []
+    assert os.listdir(tmp_path)
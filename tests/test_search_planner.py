@@ -0,0 +1,37 @@
+"""search_planner 去重与结果分发测试"""
+
+from search_planner import build_search_plan
+
+
+CONFIGS = [
+    {'keywords': ['产品经理'], 'locations': ['上海'], 'grad_year': 2026, 'recruit_type': '校招'},
+    {'keywords': ['产品经理', '运营'], 'locations': ['上海'], 'grad_year': None, 'recruit_type': '社招'},
+]
+
+
+def _plan():
+    return build_search_plan(CONFIGS, lambda cities: list(cities), lambda config: True)
+
+
+def test_shared_search_merges_subscriber_gating():
+    plan = _plan()
+    assert plan.naive_count == 3
+    assert plan.unique_count == 2
+
+    shared = plan.tasks[0]
+    assert (shared['keyword'], shared['city']) == ('产品经理', '上海')
+    assert [sub['config_index'] for sub in shared['subscribers']] == [1, 2]
+    assert shared['grad_year'] == 2026
+    assert shared['recruit_type'] == '校招/社招'
+
+
+def test_fan_out_uses_each_subscribers_attribution():
+    plan = _plan()
+    job = {'url': 'https://example.com/1', 'job_title': '产品经理', 'company_name': '测试公司',
+           'config_keywords': '产品经理', 'recruit_type': '校招', 'recruit_target': '2026届'}
+    config_results = plan.fan_out({0: [job]})
+
+    first, second = config_results[1][0], config_results[2][0]
+    assert (first['recruit_type'], first['recruit_target']) == ('校招', '2026届')
+    assert second['config_keywords'] == '产品经理, 运营'
+    assert (second['recruit_type'], second['recruit_target']) == ('社招', '不限')
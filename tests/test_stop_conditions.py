@@ -0,0 +1,58 @@
+"""stop_conditions 水位线测试"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from stop_conditions import StopCondition, WatermarkStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return WatermarkStore(str(tmp_path / 'stop_watermarks.json'))
+
+
+def _crawl(store, dates, **kwargs):
+    condition = StopCondition('aceoffer', store=store, **kwargs)
+    for update_time in dates:
+        condition.observe(update_time)
+    condition.end_page()
+    return condition
+
+
+def test_truncated_run_does_not_advance_watermark(store):
+    condition = _crawl(store, ['2025-03-01', '2025-02-01'], sorted_by_date=True)
+    run = condition.finish(save=False)
+    assert run['complete'] is False
+    assert store.get('aceoffer') is None
+
+
+def test_exhausted_run_advances_watermark(store):
+    condition = _crawl(store, ['2025-03-01', '2025-02-01'], sorted_by_date=True)
+    condition.finish(exhausted=True, save=False)
+    assert store.get('aceoffer') == date(2025, 3, 1)
+
+
+def test_unsorted_list_ignores_watermark(store):
+    store.update('aceoffer', '', '', date(2025, 3, 1), {})
+    unsorted = StopCondition('aceoffer', store=store)
+    assert unsorted.watermark is None
+    assert not unsorted.is_stale('2025-01-01')
+
+    by_date = StopCondition('aceoffer', store=store, sorted_by_date=True)
+    assert by_date.is_stale('2025-01-01')
+    assert not by_date.is_stale('2025-03-01')
+
+
+def test_freshness_window_on_unsorted_list_ignores_watermark(store):
+    today = date.today()
+    store.update('aceoffer', '', '', today, {})
+    condition = StopCondition('aceoffer', store=store, freshness_days=2)
+    assert condition.watermark is None
+
+    # 昨天更新、从未抓取过的岗位在新鲜度窗口内，不算过期，也不会触发连续过期停止
+    yesterday = (today - timedelta(days=1)).isoformat()
+    for _ in range(condition.known_run + 5):
+        assert not condition.observe(yesterday)
+    assert condition.stats['stale'] == 0
+    assert condition.is_stale((today - timedelta(days=2)).isoformat())
@@ -0,0 +1,53 @@
+"""url_index 并发读写测试"""
+
+import threading
+
+from url_index import SeenUrlIndex, MIN_CAPACITY
+
+
+def test_lookups_during_growth_never_miss_known_urls():
+    index = SeenUrlIndex()
+    known = [f"https://example.com/known-{i}" for i in range(500)]
+    index.add_many(known)
+
+    stop = threading.Event()
+    misses = []
+
+    def reader():
+        while not stop.is_set():
+            for url in known:
+                if url not in index:
+                    misses.append(url)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    try:
+        # 多次扩容
+        for start in range(0, 100000, 500):
+            index.add_many(f"https://example.com/new-{i}" for i in range(start, start + 500))
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+    assert not misses
+    assert len(index) == 100500
+    assert index.memory_bytes() > MIN_CAPACITY * 8
+
+
+def test_concurrent_writers_do_not_lose_urls():
+    index = SeenUrlIndex()
+
+    def writer(worker_id):
+        for i in range(5000):
+            index.add(f"https://example.com/{worker_id}-{i}")
+
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+
+    assert len(index) == 20000
+    assert all(f"https://example.com/{w}-{i}" in index for w in range(4) for i in range(0, 5000, 97))
@@ -19,6 +19,7 @@ from selenium.common.exceptions import (
     InvalidSessionIdException,
 )
 from bs4 import BeautifulSoup
+from browser_pool import DriverPool
 
 
 # 配置
@@ -520,7 +521,7 @@ def save_results(results, file_path):
 
 
 def main():
-    driver = None
+    driver_pool = None
     all_results = []
     
     try:
@@ -536,9 +537,10 @@ def main():
             print("❌ 没有找到有效链接，程序退出")
             return
         
-        # 启动浏览器
+        # 启动浏览器（WebDriver池：处理每个链接前检查会话，按页面数/内存回收重启）
         print("\n2. 启动浏览器...")
-        driver = create_driver()
+        driver_pool = DriverPool(create_driver)
+        driver_lease = driver_pool.lease()
         time.sleep(2)
         
         # 处理每个链接
@@ -546,6 +548,7 @@ def main():
         for idx, url in enumerate(links, 1):
             try:
                 print(f"\n[{idx}/{len(links)}] 处理链接...")
+                driver = driver_lease.renew()
                 result = extract_job_info_from_url(driver, url)
                 all_results.append(result)
                 
@@ -561,7 +564,8 @@ def main():
                 print(f"\n⚠️  浏览器会话断开: {e}")
                 print("尝试保存已提取的数据...")
                 save_results(all_results, OUTPUT_FILE)
-                break
+                # 处理下一个链接前健康检查失败，WebDriver池会重启浏览器
+                continue
             except Exception as e:
                 print(f"   ❌ 处理链接时出错: {e}")
                 # 即使出错也保存一个空结果
@@ -607,12 +611,10 @@ def main():
         traceback.print_exc()
         save_results(all_results, OUTPUT_FILE)
     finally:
-        if driver:
-            try:
-                print("\n关闭浏览器...")
-                driver.quit()
-            except Exception:
-                pass
+        if driver_pool:
+            print("\n关闭浏览器...")
+            print(f"WebDriver池: {driver_pool.format_stats()}")
+            driver_pool.shutdown()
 
 
 if __name__ == "__main__":
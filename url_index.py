@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+已抓取岗位URL的内存索引
+启动时从 posted_jobs.url 一次性加载，之后的去重判断不再访问数据库
+
+实现方式：
+    - 每个URL计算64位指纹（blake2b），存放在 array('Q') 开放寻址哈希表中
+    - 每条URL只占 8 / 负载因子 字节（约12~24字节），百万级URL约16MB
+    - 查询为 O(1)：一次哈希 + 少量线性探测，不访问数据库
+    - 不同URL指纹相同的概率约为 n / 2^64，百万级数据下可忽略
+    - 线程安全：写入（add / add_many）持锁；查询不加锁，扩容时在局部变量中建好新表，
+      再以一次赋值替换 (槽位数组, 掩码)，查询始终看到完整的旧表或新表
+"""
+
+import sqlite3
+import threading
+import hashlib
+from array import array
+from typing import Iterable, Dict
+
+# 哈希表最大负载因子（超过后扩容为两倍）
+MAX_LOAD_FACTOR = 0.7
+
+# 哈希表初始容量（必须是2的幂）
+MIN_CAPACITY = 1024
+
+# 从数据库加载URL时每批读取的行数
+LOAD_BATCH_SIZE = 10000
+
+
+def url_fingerprint(url: str) -> int:
+    """计算URL的64位指纹（0保留为空槽标记）"""
+    fp = int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+    return fp or 1
+
+
+class SeenUrlIndex:
+    """已抓取URL索引（64位指纹开放寻址哈希表）"""
+
+    def __init__(self, capacity: int = MIN_CAPACITY):
+        """初始化索引
+
+        Args:
+            capacity: 预期存放的URL数量
+        """
+        size = MIN_CAPACITY
+        while size * MAX_LOAD_FACTOR < capacity:
+            size *= 2
+        # (槽位数组, 掩码) 作为整体替换，查询时只读取一次
+        self._table = (array('Q', bytes(8 * size)), size - 1)
+        self._lock = threading.Lock()
+        self._count = 0
+        self.lookups = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def _slots(self) -> array:
+        return self._table[0]
+
+    @staticmethod
+    def _find_slot(slots: array, mask: int, fp: int) -> int:
+        """查找指纹所在槽位（不存在时返回应插入的空槽位）"""
+        idx = fp & mask
+        while True:
+            value = slots[idx]
+            if value == 0 or value == fp:
+                return idx
+            idx = (idx + 1) & mask
+
+    def _grow(self):
+        """扩容为两倍并重新插入所有指纹（调用方持有写锁）"""
+        old_slots = self._table[0]
+        size = len(old_slots) * 2
+        slots = array('Q', bytes(8 * size))
+        mask = size - 1
+        for fp in old_slots:
+            if fp:
+                slots[self._find_slot(slots, mask, fp)] = fp
+        # 新表建好后一次性替换，并发查询不会看到未填充的新表
+        self._table = (slots, mask)
+
+    def _add(self, url: str) -> bool:
+        """添加URL（调用方持有写锁）"""
+        if not url:
+            return False
+        fp = url_fingerprint(url)
+        slots, mask = self._table
+        idx = self._find_slot(slots, mask, fp)
+        if slots[idx] == fp:
+            return False
+        slots[idx] = fp
+        self._count += 1
+        if self._count > len(slots) * MAX_LOAD_FACTOR:
+            self._grow()
+        return True
+
+    def add(self, url: str) -> bool:
+        """添加URL，返回是否为新URL"""
+        with self._lock:
+            return self._add(url)
+
+    def add_many(self, urls: Iterable[str]) -> int:
+        """批量添加URL，返回新增数量"""
+        added = 0
+        with self._lock:
+            for url in urls:
+                if self._add(url):
+                    added += 1
+        return added
+
+    def contains(self, url: str) -> bool:
+        """判断URL是否已存在（不加锁）"""
+        self.lookups += 1
+        if not url:
+            return False
+        fp = url_fingerprint(url)
+        slots, mask = self._table
+        if slots[self._find_slot(slots, mask, fp)] == fp:
+            self.hits += 1
+            return True
+        return False
+
+    __contains__ = contains
+
+    @classmethod
+    def from_database(cls, db_file: str) -> 'SeenUrlIndex':
+        """从 posted_jobs 表加载所有URL（分批读取，加载过程中内存同样有界）"""
+        conn = sqlite3.connect(db_file)
+        try:
+            try:
+                total = conn.execute('SELECT COUNT(*) FROM posted_jobs').fetchone()[0]
+            except sqlite3.OperationalError:
+                # 表还不存在（首次运行）
+                return cls()
+            index = cls(capacity=total)
+            cursor = conn.execute('SELECT url FROM posted_jobs')
+            while True:
+                rows = cursor.fetchmany(LOAD_BATCH_SIZE)
+                if not rows:
+                    break
+                index.add_many(url for (url,) in rows)
+            return index
+        finally:
+            conn.close()
+
+    def memory_bytes(self) -> int:
+        """索引占用的内存（哈希表数组大小）"""
+        return len(self._slots) * self._slots.itemsize
+
+    def false_positive_rate(self) -> float:
+        """新URL被误判为已存在的概率（与任一已存指纹碰撞）"""
+        return self._count / float(1 << 64)
+
+    def load_factor(self) -> float:
+        """当前负载因子"""
+        return self._count / len(self._slots)
+
+    def stats(self) -> Dict:
+        """索引统计信息"""
+        return {
+            'count': self._count,
+            'capacity': len(self._slots),
+            'load_factor': self.load_factor(),
+            'memory_bytes': self.memory_bytes(),
+            'bytes_per_url': self.memory_bytes() / self._count if self._count else 0,
+            'false_positive_rate': self.false_positive_rate(),
+            'lookups': self.lookups,
+            'hits': self.hits,
+        }
+
+    def format_stats(self) -> str:
+        """格式化统计信息（用于日志输出）"""
+        s = self.stats()
+        return (f"{s['count']} 条URL, 内存 {s['memory_bytes'] / (1024 * 1024):.2f}MB "
+                f"({s['bytes_per_url']:.1f} 字节/条), 负载因子 {s['load_factor']:.2f}, "
+                f"预估误判率 {s['false_positive_rate']:.2e}")